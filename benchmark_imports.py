@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark module import times (cold start)
+==========================================
+
+Imports each app module in a fresh interpreter with ``python -X importtime``,
+reports its cumulative import time, the slowest third-party packages it pulled
+in and which heavy libraries got loaded. A Streamlit page pays these costs the
+first time it is opened in a new container.
+
+Results can be saved and compared with a saved baseline to track regressions.
+
+Usage:
+    python benchmark_imports.py
+    python benchmark_imports.py utils frappe_report --repeat 7
+    python benchmark_imports.py --save import_times.json
+    python benchmark_imports.py --baseline import_times.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+DEFAULT_MODULES = [
+    "employee_manager",
+    "utils",
+    "ngteco_parser",
+    "frappe_client",
+    "report_model",
+    "report_cache",
+    "data_cache",
+    "job_queue",
+    "frappe_mirror",
+    "frappe_report",
+    "pdf_to_ngteco_script",
+    "frappe_import_script",
+]
+
+# Libraries that should only be loaded when a page actually needs them
+HEAVY_MODULES = ["streamlit", "pymongo", "reportlab", "pdfplumber", "plotly", "requests", "pandas"]
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+# Printed by the child after the import: heavy modules loaded and whether a MongoClient exists
+PROBE = (
+    "import gc, json, sys; import {module}; "
+    "mc = sys.modules.get('pymongo.synchronous.mongo_client') or sys.modules.get('pymongo.mongo_client'); "
+    "clients = sum(isinstance(o, mc.MongoClient) for o in gc.get_objects()) if mc else 0; "
+    "print(json.dumps({{'heavy': [m for m in {heavy!r} if m in sys.modules], 'mongo_clients': clients}}))"
+)
+
+
+def profile_import(module, python=sys.executable):
+    """
+    Import `module` once in a fresh interpreter.
+
+    Returns:
+        Dict with total_ms, top (slowest top-level packages as [name, ms]), heavy
+        (heavy libraries loaded) and mongo_clients, or error.
+    """
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed"}
+
+    total_us = None
+    packages = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative_us, depth, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        if name == module and depth == 1:
+            total_us = cumulative_us
+        elif depth <= 3 and "." not in name and not name.startswith("_"):
+            packages[name] = max(packages.get(name, 0), cumulative_us)
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    top = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:3]
+    return {
+        "total_ms": (total_us or 0) / 1000,
+        "top": [[name, us / 1000] for name, us in top],
+        "heavy": probe["heavy"],
+        "mongo_clients": probe["mongo_clients"],
+    }
+
+
+def benchmark(modules, repeat):
+    """Median of `repeat` cold imports per module (top/heavy are taken from the last run)."""
+    results = {}
+    for module in modules:
+        runs = [profile_import(module) for _ in range(repeat)]
+        failed = next((run for run in runs if "error" in run), None)
+        if failed:
+            results[module] = failed
+            continue
+        results[module] = {**runs[-1], "total_ms": statistics.median(run["total_ms"] for run in runs)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import times of the app modules.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="Modules to import (default: the app modules)")
+    parser.add_argument("--repeat", type=int, default=5, help="Cold imports per module; the median is reported")
+    parser.add_argument("--save", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare with results saved by --save")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown against the baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    results = benchmark(args.modules, args.repeat)
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print(f"{'Module':24} {'import (ms)':>11} {'baseline':>9}  {'slowest packages (ms)':44} heavy libraries loaded")
+    print("-" * 130)
+    ok = True
+    for module, result in results.items():
+        if "error" in result:
+            ok = False
+            print(f"{module:24} ❌ {result['error']}")
+            continue
+        before = baseline.get(module, {}).get("total_ms")
+        regressed = before is not None and result["total_ms"] > before * (1 + args.tolerance)
+        ok = ok and not regressed and not result["mongo_clients"]
+        top = ", ".join(f"{name} {ms:.0f}" for name, ms in result["top"])
+        heavy = ", ".join(result["heavy"]) or "-"
+        if result["mongo_clients"]:
+            heavy += "  ❌ MongoClient created at import"
+        print(
+            f"{module:24} {result['total_ms']:11.1f} {'' if before is None else f'{before:9.1f}':>9}"
+            f"{' ❌' if regressed else '  '}{top:44} {heavy}"
+        )
+    print("-" * 130)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Saved to {args.save}")
+    if not ok:
+        print("❌ Import time regressed, an import failed or a database connection is opened at import time")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
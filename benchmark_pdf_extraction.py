@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark the PDF to ngTeco extraction modes
+============================================
+
+Converts each PDF with the "tables" mode (pdfplumber table detection) and the
+"fast" mode (text positions + table grid), checks that both produce the same
+ngTeco CSV and prints the timings.
+
+Usage:
+    python benchmark_pdf_extraction.py reports/*.pdf
+    python benchmark_pdf_extraction.py reports_dir --repeat 5
+"""
+
+import argparse
+import glob
+import os
+import time
+
+from pdf_to_ngteco_script import convert_pdf_to_ngteco_csv, parse_pdf
+
+
+def collect_pdf_paths(paths):
+    pdf_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            pdf_paths.extend(sorted(glob.glob(os.path.join(path, "*.pdf"))))
+        else:
+            pdf_paths.append(path)
+    return pdf_paths
+
+
+def time_mode(pdf_content, mode, repeat):
+    """Best-of-`repeat` seconds for parse + convert, with the CSV and the mode actually used."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parsed = parse_pdf(pdf_content, mode=mode)
+        csv_content, error_message = convert_pdf_to_ngteco_csv(parsed)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, csv_content, error_message, parsed.mode
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the fast and table-detection PDF extraction modes.")
+    parser.add_argument("paths", nargs="+", help="PDF files or directories containing PDFs")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per file and mode; the best time is reported")
+    args = parser.parse_args()
+
+    pdf_paths = collect_pdf_paths(args.paths)
+    if not pdf_paths:
+        print("❌ No PDF files found")
+        return False
+
+    print(f"{'File':40} {'tables (s)':>10} {'fast (s)':>10} {'speedup':>8}  {'used':6}  same CSV")
+    print("-" * 90)
+    total_tables = total_fast = 0.0
+    all_same = True
+    for path in pdf_paths:
+        with open(path, "rb") as f:
+            pdf_content = f.read()
+        tables_s, tables_csv, tables_error, _ = time_mode(pdf_content, "tables", args.repeat)
+        fast_s, fast_csv, fast_error, used_mode = time_mode(pdf_content, "fast", args.repeat)
+        same = tables_csv == fast_csv and tables_error == fast_error
+        all_same = all_same and same
+        total_tables += tables_s
+        total_fast += fast_s
+        print(
+            f"{os.path.basename(path)[:40]:40} {tables_s:10.3f} {fast_s:10.3f} "
+            f"{tables_s / fast_s:7.2f}x  {used_mode:6}  {'✅' if same else '❌'}"
+        )
+    print("-" * 90)
+    print(f"{'Total':40} {total_tables:10.3f} {total_fast:10.3f} {total_tables / total_fast:7.2f}x")
+    if not all_same:
+        print("❌ Fast mode produced a different CSV for at least one file")
+    return all_same
+
+
+if __name__ == "__main__":
+    main()
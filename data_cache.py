@@ -0,0 +1,235 @@
+"""
+Cross-page cache for Frappe HR and MongoDB reads.
+
+Streamlit reruns a page on every widget interaction. These wrappers are built on
+``st.cache_data``, so they are shared by all sessions of the server process and
+an unchanged read is served from memory instead of a network round-trip.
+Cached values are copies, so callers may mutate what they get back.
+
+Each kind of data has a TTL as a safety net for changes made outside this app
+(Frappe desk, migration scripts). Writes made through the app call the matching
+``invalidate_*`` function right away:
+
+    upsert_employee_work_history(_changes) -> invalidate_work_history()
+    create/update/delete_employee_account   -> invalidate_employees()
+    create/delete_overtime_payout           -> invalidate_overtime_payouts()
+    import_to_frappe_hr                     -> invalidate_frappe_cache()
+    saving calendar_events.json             -> nothing (keyed on the file's mtime)
+
+The Frappe HR PDF page also memoizes its whole report pipeline (section 4), so
+reruns from unrelated widgets reuse the computed report instead of fetching
+Attendance and Employee Checkin again. The inputs of a report are fetched
+concurrently in one go (get_report_inputs) and shared by the steps.
+
+Below these caches, Attendance, Employee Checkin, Employee and Shift Type reads
+come from the local Frappe mirror (frappe_mirror) when it is up to date;
+invalidate_frappe_cache also asks it to sync right away.
+"""
+import os
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import streamlit as st
+
+from employee_manager import fetch_overtime_payouts, get_employees
+from frappe_client import fetch_employee_time_config, fetch_frappe_employees
+from utils import fetch_employee_work_history, load_calendar_events
+
+FRAPPE_CACHE_TTL_SECONDS = int(os.getenv("FRAPPE_CACHE_TTL_SECONDS", "300"))
+MONGO_CACHE_TTL_SECONDS = int(os.getenv("MONGO_CACHE_TTL_SECONDS", "120"))
+CALENDAR_EVENTS_FILE = "calendar_events.json"
+
+
+# ----------------------------------------------------------------------
+# 1. Frappe HR reads
+# ----------------------------------------------------------------------
+
+@st.cache_data(ttl=FRAPPE_CACHE_TTL_SECONDS, show_spinner="Loading employees from Frappe HR...")
+def get_frappe_employees(limit: int = 1000) -> List[Dict]:
+    """Cached fetch_frappe_employees. Errors are raised and not cached."""
+    return fetch_frappe_employees(limit=limit)
+
+
+@st.cache_data(ttl=FRAPPE_CACHE_TTL_SECONDS, show_spinner="Loading time configuration from Frappe HR...")
+def get_employee_time_config(
+    employee_code: str,
+    report_start_date: Optional[date] = None,
+    report_end_date: Optional[date] = None,
+) -> Dict[str, Optional[str]]:
+    """Cached fetch_employee_time_config, keyed by employee and report range."""
+    return fetch_employee_time_config(
+        employee_code,
+        report_start_date=report_start_date,
+        report_end_date=report_end_date,
+    )
+
+
+def invalidate_frappe_cache() -> None:
+    """Drop cached Frappe reads, e.g. after importing check-ins or to force a refresh."""
+    from frappe_mirror import request_mirror_sync
+
+    # Reads bypass the local mirror until it has synced the change
+    request_mirror_sync()
+    get_frappe_employees.clear()
+    get_employee_time_config.clear()
+    get_report_inputs.clear()
+    get_report_defaults.clear()
+    get_frappe_report.clear()
+
+
+def frappe_refresh_button(key: str) -> None:
+    """Button that drops the cached Frappe reads and reruns the page."""
+    if st.button("🔄 Refresh from Frappe HR", key=key, help="Reload employees and time configuration from Frappe HR"):
+        invalidate_frappe_cache()
+        st.rerun()
+
+
+# ----------------------------------------------------------------------
+# 2. MongoDB reads
+# ----------------------------------------------------------------------
+
+@st.cache_data(ttl=MONGO_CACHE_TTL_SECONDS, show_spinner=False)
+def get_employee_usernames(full_name=None) -> List[str]:
+    """Cached get_employees (usernames, with ``full_name``'s employee first when given)."""
+    return get_employees(full_name)
+
+
+@st.cache_data(ttl=MONGO_CACHE_TTL_SECONDS, show_spinner=False)
+def get_employee_work_history(employee_id, start_date=None, end_date=None, fill_missing_days=False):
+    """Cached fetch_employee_work_history; returns (work_history_df, hours_overtime, holiday_hours)."""
+    return fetch_employee_work_history(employee_id, start_date, end_date, fill_missing_days=fill_missing_days)
+
+
+@st.cache_data(ttl=MONGO_CACHE_TTL_SECONDS, show_spinner=False)
+def get_overtime_payouts(employee_code=None, start_date=None, end_date=None) -> List[Dict]:
+    """Cached fetch_overtime_payouts."""
+    return fetch_overtime_payouts(employee_code=employee_code, start_date=start_date, end_date=end_date)
+
+
+def invalidate_employees() -> None:
+    get_employee_usernames.clear()
+
+
+def invalidate_work_history() -> None:
+    # Entries are keyed by period as well as employee, so all of them are dropped
+    get_employee_work_history.clear()
+
+
+def invalidate_overtime_payouts() -> None:
+    get_overtime_payouts.clear()
+    # Report inputs hold the payouts; report defaults carry the opening balance after them
+    get_report_inputs.clear()
+    get_report_defaults.clear()
+
+
+# ----------------------------------------------------------------------
+# 3. Calendar events
+# ----------------------------------------------------------------------
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _calendar_events_for_mtime(mtime: Optional[float]) -> Dict[str, str]:
+    return load_calendar_events()
+
+
+def get_calendar_events() -> Dict[str, str]:
+    """Cached load_calendar_events; re-read whenever calendar_events.json changes on disk."""
+    mtime = os.path.getmtime(CALENDAR_EVENTS_FILE) if os.path.exists(CALENDAR_EVENTS_FILE) else None
+    return _calendar_events_for_mtime(mtime)
+
+
+# ----------------------------------------------------------------------
+# 4. Frappe HR report pipeline
+# ----------------------------------------------------------------------
+
+@st.cache_data(
+    ttl=FRAPPE_CACHE_TTL_SECONDS,
+    max_entries=32,
+    show_spinner="Loading the report data from Frappe HR...",
+)
+def get_report_inputs(employee_code: str, start_date: date, end_date: date, use_mirror: bool) -> Dict[str, Any]:
+    """
+    Cached fetch_report_inputs: Employee, shifts, time configuration, payouts, Attendance,
+    check-ins and holiday balances of one report, fetched concurrently (the period's data
+    from the Frappe mirror when use_mirror, see report_reads_mirror).
+    Errors are raised and not cached.
+    """
+    from frappe_report import fetch_report_inputs
+
+    return fetch_report_inputs(employee_code, start_date, end_date, use_mirror=use_mirror)
+
+
+@st.cache_data(ttl=FRAPPE_CACHE_TTL_SECONDS, max_entries=64, show_spinner=False)
+def get_report_defaults(
+    employee_code: str,
+    start_date: date,
+    end_date: date,
+    frappe_config: Dict[str, Any],
+    _report_inputs: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Cached build_report_defaults (period standard hours, opening balances, payouts).
+
+    _report_inputs (get_report_inputs for the same period, not part of the key) saves
+    the shift and payout reads.
+    """
+    from frappe_report import build_report_defaults
+
+    return build_report_defaults(employee_code, start_date, end_date, frappe_config, inputs=_report_inputs)
+
+
+@st.cache_data(
+    ttl=FRAPPE_CACHE_TTL_SECONDS,
+    max_entries=32,
+    show_spinner="Fetching Attendance and Employee Checkin data from Frappe HR...",
+)
+def get_frappe_report(
+    employee_code: str,
+    employee_name: str,
+    start_date: date,
+    end_date: date,
+    standard_work_hours: float,
+    initial_overtime_str: str,
+    holiday_hours: float,
+    in_period_payouts: List[Dict],
+    default_shift_hours_str: Optional[str],
+    calendar_events: Dict[str, str],
+    _report_inputs: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Memoized Frappe HR report: attendance and check-in fetch, gap filling, shifts,
+    break/cap rules, ledger and payouts, plus the ReportModel built from it.
+
+    The arguments are the whole key: employee, period, the report settings and the
+    calendar. The Frappe data version is the cache generation itself; it is dropped
+    by invalidate_frappe_cache (refresh button, imports) and by the TTL.
+    _report_inputs (get_report_inputs for the same period) is not part of the key;
+    the Frappe reads it holds are not repeated.
+
+    Returns:
+        Dict with df, model (ReportModel) and summary (DataFrame), or with error when
+        the period has no Attendance data. Frappe API errors are raised, not cached.
+    """
+    from frappe_report import FrappeReportError, build_frappe_report_model, compute_frappe_report_df
+
+    calendar_events_date = {
+        pd.to_datetime(date_str, format="%Y-%m-%d").date(): event
+        for date_str, event in calendar_events.items()
+    }
+    try:
+        df = compute_frappe_report_df(
+            employee_code=employee_code,
+            start_date=start_date,
+            end_date=end_date,
+            standard_work_hours=standard_work_hours,
+            initial_overtime_str=initial_overtime_str,
+            holiday_hours=holiday_hours,
+            in_period_payouts=in_period_payouts,
+            default_shift_hours_str=default_shift_hours_str,
+            calendar_events_date=calendar_events_date,
+            inputs=_report_inputs,
+        )
+    except FrappeReportError as e:
+        return {"error": str(e)}
+    model = build_frappe_report_model(df, employee_name, start_date, end_date, standard_work_hours, in_period_payouts)
+    return {"df": df, "model": model, "summary": model.summary_frame()}
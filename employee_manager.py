@@ -1,21 +1,45 @@
 import uuid
 from datetime import datetime
+from functools import lru_cache
 import pandas as pd
-from pymongo import MongoClient, UpdateOne
 from bson import ObjectId
 import os
 from dotenv import load_dotenv
-import streamlit as st
 load_dotenv()
 
-# MongoDB setup
-client = MongoClient(os.getenv("MONGODB_CLIENT"))  # Change if using a cloud DB
-db = client["bulldog_office"]  # Replace with actual database name
-work_history_collection = db["work_history"]  # Collection name
-temp_work_history_collection = db["temp_work_history"]  # Collection name
-employees_collection = db["employees"]
-users_collection = db["users"]
-overtime_payouts_collection = db["overtime_payouts"]
+
+# MongoDB setup: the client is created on first use, not at import time, so
+# importing this module (or utils) costs no connection or pymongo import.
+@lru_cache(maxsize=None)
+def get_db():
+    """The bulldog_office database; the MongoClient is created on the first call."""
+    from pymongo import MongoClient
+
+    client = MongoClient(os.getenv("MONGODB_CLIENT"))  # Change if using a cloud DB
+    return client["bulldog_office"]  # Replace with actual database name
+
+
+class LazyCollection:
+    """Stand-in for a Mongo collection that resolves it on first attribute access."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __getattr__(self, attr):
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        return getattr(get_db()[self.name], attr)
+
+    def __repr__(self):
+        return f"LazyCollection({self.name!r})"
+
+
+work_history_collection = LazyCollection("work_history")  # Collection name
+temp_work_history_collection = LazyCollection("temp_work_history")  # Collection name
+employees_collection = LazyCollection("employees")
+users_collection = LazyCollection("users")
+overtime_payouts_collection = LazyCollection("overtime_payouts")
+report_jobs_collection = LazyCollection("report_jobs")
 
 def get_employees(full_name=None):
     employees = list(employees_collection.find({}, {"username": 1, "full_name": 1}))
@@ -62,6 +86,8 @@ def update_employee_account(employee_id, **kwargs):
     return {"success": False, "message": "No changes made or employee not found!"}
 
 def upsert_employee_work_history(df: pd.DataFrame, employee_id=None):
+    from pymongo import UpdateOne
+
     try:
         df["Date"] = pd.to_datetime(df["Date"])  # Ensure "Date" is a datetime object
         records = df.to_dict(orient="records")
@@ -93,6 +119,91 @@ def upsert_employee_work_history(df: pd.DataFrame, employee_id=None):
     except Exception as e:
         return {"success": False, "message": f"Bad request when upserting work history: {str(e)}"}
 
+def _normalize_work_history_value(val):
+    # Same normalization the pages use for change highlighting: None/NaN/"nan"/"" are all empty.
+    try:
+        if val is None or pd.isna(val):
+            return ""
+    except (TypeError, ValueError):
+        pass
+    if str(val).strip().lower() in ["", "nan", "none", "null", "nat"]:
+        return ""
+    return str(val).strip()
+
+def _has_record_id(record_id):
+    try:
+        return record_id is not None and not pd.isna(record_id) and str(record_id).strip() != ""
+    except (TypeError, ValueError):
+        return True
+
+def upsert_employee_work_history_changes(df: pd.DataFrame, original_df: pd.DataFrame = None, employee_id=None):
+    """
+    Diff-aware variant of upsert_employee_work_history.
+
+    Rows of ``df`` that carry an ``_id`` present in ``original_df`` (the snapshot loaded
+    into the editor) are compared field by field and only the changed fields are sent
+    with ``$set``; unchanged rows are skipped. Rows without an ``_id`` (new rows,
+    filled missing days, uploaded CSV rows) are upserted in full by employee_id + Date.
+    """
+    from pymongo import UpdateOne
+
+    try:
+        if original_df is None or original_df.empty or "_id" not in original_df.columns:
+            return upsert_employee_work_history(df, employee_id)
+
+        df = df.copy()
+        df["Date"] = pd.to_datetime(df["Date"])
+        records = df.to_dict(orient="records")
+
+        original = original_df.copy()
+        original["Date"] = pd.to_datetime(original["Date"])
+        original_records = {
+            str(record["_id"]): record
+            for record in original.to_dict(orient="records")
+            if _has_record_id(record.get("_id"))
+        }
+
+        bulk_updates = []
+        updated_count = 0
+        inserted_count = 0
+        for record in records:
+            if employee_id:
+                record["employee_id"] = str(employee_id)
+
+            record_id = record.pop("_id", None)
+            if not _has_record_id(record_id):
+                filter_query = {"employee_id": record["employee_id"], "Date": record["Date"]}
+                bulk_updates.append(UpdateOne(filter_query, {"$set": record}, upsert=True))
+                inserted_count += 1
+                continue
+
+            original_record = original_records.get(str(record_id))
+            if original_record is None:
+                # Row not part of the loaded snapshot: nothing to diff against.
+                changes = record
+            else:
+                changes = {
+                    field: value
+                    for field, value in record.items()
+                    if _normalize_work_history_value(value) != _normalize_work_history_value(original_record.get(field))
+                }
+            if changes:
+                bulk_updates.append(UpdateOne({"_id": ObjectId(record_id)}, {"$set": changes}, upsert=True))
+                updated_count += 1
+
+        if bulk_updates:
+            work_history_collection.bulk_write(bulk_updates, ordered=False)
+
+        return {
+            "success": True,
+            "message": f"Work History saved ({updated_count} updated, {inserted_count} new)",
+            "updated": updated_count,
+            "inserted": inserted_count,
+        }
+
+    except Exception as e:
+        return {"success": False, "message": f"Bad request when upserting work history: {str(e)}"}
+
 def create_employee_account(**kwargs):
     try:
         timestamp = str(datetime.now().isoformat(sep=" ")).split(".")[0]
@@ -108,6 +219,8 @@ def create_employee_account(**kwargs):
 
 
 def upsert_employee_temp_work_history(source_record, employee_id=None, employee_username=None):
+    from pymongo import UpdateOne
+
     try:
         source_record["Date"] = pd.to_datetime(source_record["Date"])  # Ensure "Date" is a datetime object
 
@@ -1,8 +1,12 @@
 import os
 import json
+import atexit
+import threading
+from bisect import bisect_left
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional, Tuple, Any
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 import pandas as pd
@@ -57,12 +61,13 @@ def fetch_frappe_employees(limit: int = 1000) -> List[Dict]:
     Returns a list of dicts with at least:
       - name          (Employee ID/code)
       - employee_name (Human-readable name)
+      - status, prefered_email, company_email, personal_email
     """
     base_url, _, _ = _get_base_config()
     url = f"{base_url}/api/resource/Employee"
 
     params = {
-        "fields": '["name", "employee_name", "status"]',
+        "fields": '["name", "employee_name", "status", "prefered_email", "company_email", "personal_email"]',
         "limit_page_length": limit,
         "order_by": "employee_name asc",
     }
@@ -228,38 +233,62 @@ def _calculate_hours_from_time_range(start_time: str, end_time: str) -> Optional
         return None
 
 
-def fetch_employee_shifts_by_period(employee_code: str) -> List[Dict]:
+def _mirrored_doc(doctype: str, name: str) -> Optional[Dict[str, Any]]:
+    """Employee / Shift Type document from the local Frappe mirror, or None to fetch it from Frappe."""
+    from frappe_mirror import get_mirrored_doc
+
+    return get_mirrored_doc(doctype, name)
+
+
+def fetch_employee_doc(employee_code: str, use_mirror: bool = True) -> Dict[str, Any]:
     """
-    Fetch the custom_shifts_by_period child table from Employee doctype.
-    
-    Args:
-        employee_code: Frappe Employee code/name
-    
-    Returns:
-        List of shift period records with:
-        - start_date: Start date of the period (YYYY-MM-DD format)
-        - end_date: End date of the period (YYYY-MM-DD format)
-        - shift_type: Shift Type name (Link to Shift Type doctype)
+    Fetch the full Employee document, including custom fields and child tables.
+
+    Shifts by Period, the time configuration and the holiday allocation table all
+    live on this document; callers that need several of them can fetch it once and
+    pass it on as ``employee_doc``. Read from the local Frappe mirror when it is up to
+    date, unless use_mirror is False (reads that must match Frappe's current stamps).
     """
+    mirrored = _mirrored_doc("Employee", employee_code) if use_mirror else None
+    if mirrored is not None:
+        return mirrored
+
     base_url, _, _ = _get_base_config()
     headers = _build_auth_headers()
-    
-    # Fetch employee - don't specify fields to ensure custom fields and child tables are included
+
+    # Don't specify fields to ensure custom fields and child tables are included
     url = f"{base_url}/api/resource/Employee/{employee_code}"
-    params = {}
-    
-    resp = requests.get(url, headers=headers, params=params, timeout=30)
-    
+    resp = requests.get(url, headers=headers, params={}, timeout=30)
+
     if resp.status_code != 200:
         raise FrappeClientError(
             f"Frappe API error {resp.status_code}: {resp.text}"
         )
-    
+
     data = resp.json()
     if not isinstance(data, dict) or "data" not in data:
         raise FrappeClientError(f"Unexpected response format from Frappe: {data}")
+    return data["data"]
+
+
+def fetch_employee_shifts_by_period(
+    employee_code: str,
+    employee_doc: Optional[Dict[str, Any]] = None,
+) -> List[Dict]:
+    """
+    Fetch the custom_shifts_by_period child table from Employee doctype.
     
-    doc = data["data"]
+    Args:
+        employee_code: Frappe Employee code/name
+        employee_doc: Already fetched Employee document (skips the request)
+    
+    Returns:
+        List of shift period records with:
+        - start_date: Start date of the period (YYYY-MM-DD format)
+        - end_date: End date of the period (YYYY-MM-DD format)
+        - shift_type: Shift Type name (Link to Shift Type doctype)
+    """
+    doc = employee_doc if employee_doc is not None else fetch_employee_doc(employee_code)
     shifts_by_period = doc.get("custom_shifts_by_period", [])
     
     # Handle both list format (child table) and None/empty
@@ -531,6 +560,10 @@ def _historical_ensure_shift_cached(
         "daily_limit_hours": None,
     }
     shift_type_cache[shift_type] = dict(placeholder)
+    mirrored = _mirrored_doc("Shift Type", shift_type)
+    if mirrored is not None:
+        shift_type_cache[shift_type] = _historical_shift_doc_to_params(mirrored)
+        return
     try:
         shift_resp = requests.get(
             f"{base_url}/api/resource/Shift Type/{shift_type}",
@@ -551,6 +584,8 @@ def fetch_employee_time_config(
     employee_code: str,
     report_start_date: Optional[date] = None,
     report_end_date: Optional[date] = None,
+    employee_doc: Optional[Dict[str, Any]] = None,
+    leave_ledger: Optional["LeaveLedger"] = None,
 ) -> Dict[str, Optional[str]]:
     """
     Fetch per-employee configuration from Frappe for:
@@ -567,42 +602,38 @@ def fetch_employee_time_config(
     Optional report_end_date: when set with report_start_date, holiday balance from
     custom_initial_holiday_hours includes every allocation year up to max(start year, end year),
     so cross-year PDF ranges include all relevant annual pots.
+
+    Optional employee_doc: the already fetched Employee document; its Shifts by Period
+    are also used for the historical overtime calculation.
+    Optional leave_ledger: LeaveLedger shared with the report's other holiday calculations.
     """
     base_url, _, _ = _get_base_config()
 
     overtime_field = os.getenv("FRAPPE_INIT_OVERTIME_FIELD", "initial_overtime_balance")
     holiday_field = os.getenv("FRAPPE_INIT_HOLIDAY_FIELD", "initial_holiday_hours")
 
-    # First, fetch employee - don't specify fields to ensure custom fields are included
-    url = f"{base_url}/api/resource/Employee/{employee_code}"
-    # Note: Not specifying fields parameter to get all fields including custom fields
-    params = {}
-
+    # Employee doc, reused when the caller already fetched it
+    doc = employee_doc if employee_doc is not None else fetch_employee_doc(employee_code)
     headers = _build_auth_headers()
-    resp = requests.get(url, headers=headers, params=params, timeout=30)
-
-    if resp.status_code != 200:
-        raise FrappeClientError(
-            f"Frappe API error {resp.status_code}: {resp.text}"
-        )
-
-    data = resp.json()
-    if not isinstance(data, dict) or "data" not in data:
-        raise FrappeClientError(f"Unexpected response format from Frappe: {data}")
 
-    doc = data["data"]
     default_shift = doc.get("default_shift")
     # Fetch standard hours from Shift Type if default_shift exists
     # Uses the custom field "Standard Work Hours" from Shift Type DocType
     standard_work_hours = None
     if default_shift:
         try:
-            # Fetch Shift Type - don't specify fields to ensure custom fields are included
-            shift_url = f"{base_url}/api/resource/Shift Type/{default_shift}"
-            # Note: Not specifying fields parameter to get all fields including custom fields
-            shift_resp = requests.get(shift_url, headers=headers, timeout=30)
-            if shift_resp.status_code == 200:
-                shift_data = shift_resp.json()
+            shift_data = None
+            mirrored_shift = _mirrored_doc("Shift Type", default_shift)
+            if mirrored_shift is not None:
+                shift_data = {"data": mirrored_shift}
+            else:
+                # Fetch Shift Type - don't specify fields to ensure custom fields are included
+                shift_url = f"{base_url}/api/resource/Shift Type/{default_shift}"
+                # Note: Not specifying fields parameter to get all fields including custom fields
+                shift_resp = requests.get(shift_url, headers=headers, timeout=30)
+                if shift_resp.status_code == 200:
+                    shift_data = shift_resp.json()
+            if shift_data is not None:
                 if isinstance(shift_data, dict) and "data" in shift_data:
                     shift_doc = shift_data["data"]
                     # Try multiple possible field name variations
@@ -652,30 +683,20 @@ def fetch_employee_time_config(
             if ":" in custom_initial_overtime_str:
                 base_overtime_hours = custom_initial_overtime_str
     
-    # Calculate initial overtime from historical Employee Checkin data BEFORE report_start_date
-    historical_overtime = "00:00"
+    # Calculate initial overtime from historical Employee Checkin data BEFORE report_start_date.
+    # It runs in the background while the holiday balance below is calculated; both only
+    # need the standard hours.
+    historical_future = None
     if standard_work_hours and report_start_date:
-        try:
-            historical_overtime = calculate_historical_overtime_balance(
-                employee_code=employee_code,
-                standard_work_hours_hhmm=standard_work_hours,
-                start_date=report_start_date,
-            )
-        except Exception as e:
-            # If calculation fails, use "00:00"
-            print(f"Error calculating historical overtime balance: {e}")
-            historical_overtime = "00:00"
-    
-    # Combine base value with historical calculation based on the 3 scenarios:
-    # Scenario 1: base_overtime_hours has a value (e.g., "15:32" or "-15:32") → base + historical
-    # Scenario 2: base_overtime_hours is "00:00" → "00:00" + historical = historical
-    # Scenario 3: base_overtime_hours is None/empty → only historical (no base)
-    if base_overtime_hours is not None:
-        # Scenarios 1 & 2: Add base value to historical calculation
-        calculated_initial_overtime = _add_hhmm_times(base_overtime_hours, historical_overtime)
-    else:
-        # Scenario 3: Use only historical calculation (no base value from custom field)
-        calculated_initial_overtime = historical_overtime
+        historical_pool = ThreadPoolExecutor(max_workers=1)
+        historical_future = historical_pool.submit(
+            calculate_historical_overtime_balance,
+            employee_code=employee_code,
+            standard_work_hours_hhmm=standard_work_hours,
+            start_date=report_start_date,
+            shifts_by_period=fetch_employee_shifts_by_period(employee_code, employee_doc=doc),
+        )
+        historical_pool.shutdown(wait=False)
     
     # Get initial holiday hours from Employee DocType (custom_initial_holiday_hours table)
     # This is now a table (child table) with records containing "year" and "holiday_hours" fields
@@ -694,15 +715,18 @@ def fetch_employee_time_config(
                     standard_work_hours_hhmm=standard_work_hours or "08:00",
                     before_date=report_start_date,
                     report_end_date=report_end_date,
+                    leave_ledger=leave_ledger,
                 )
                 
                 # Update the custom_holiday_hours_balance field in Employee DocType
+                # (in the background, and only when the value changed)
                 try:
                     from utils import hhmm_to_decimal
                     balance_decimal = hhmm_to_decimal(calculated_initial_holiday_hours)
-                    update_employee_holiday_hours_balance(
+                    publish_holiday_hours_balance(
                         employee_code=employee_code,
                         balance_hours=balance_decimal,
+                        current_balance=doc.get("custom_holiday_hours_balance"),
                     )
                 except Exception as update_error:
                     print(f"Warning: Could not update holiday hours balance field: {update_error}")
@@ -749,6 +773,26 @@ def fetch_employee_time_config(
     if calculated_initial_holiday_hours is None:
         calculated_initial_holiday_hours = "00:00"
     
+    historical_overtime = "00:00"
+    if historical_future is not None:
+        try:
+            historical_overtime = historical_future.result()
+        except Exception as e:
+            # If calculation fails, use "00:00"
+            print(f"Error calculating historical overtime balance: {e}")
+            historical_overtime = "00:00"
+    
+    # Combine base value with historical calculation based on the 3 scenarios:
+    # Scenario 1: base_overtime_hours has a value (e.g., "15:32" or "-15:32") → base + historical
+    # Scenario 2: base_overtime_hours is "00:00" → "00:00" + historical = historical
+    # Scenario 3: base_overtime_hours is None/empty → only historical (no base)
+    if base_overtime_hours is not None:
+        # Scenarios 1 & 2: Add base value to historical calculation
+        calculated_initial_overtime = _add_hhmm_times(base_overtime_hours, historical_overtime)
+    else:
+        # Scenario 3: Use only historical calculation (no base value from custom field)
+        calculated_initial_overtime = historical_overtime
+    
     return {
         "name": doc.get("name"),
         "employee_name": doc.get("employee_name"),
@@ -763,6 +807,7 @@ def fetch_employee_attendance(
     start_date: date,
     end_date: date,
     limit: int = 10000,
+    use_mirror: bool = True,
 ) -> List[Dict]:
     """
     Fetch Attendance records for a single employee in a date range.
@@ -772,10 +817,17 @@ def fetch_employee_attendance(
         start_date: Start date (inclusive).
         end_date: End date (inclusive).
         limit: Max number of records to fetch.
+        use_mirror: False to read Frappe even when the local mirror is up to date.
 
     Returns:
-        List of raw Attendance documents from Frappe.
+        List of raw Attendance documents from Frappe (from the local mirror when it is up to date).
     """
+    from frappe_mirror import find_attendance
+
+    mirrored = find_attendance(employee_code, start_date=start_date, end_date=end_date, limit=limit) if use_mirror else None
+    if mirrored is not None:
+        return mirrored
+
     base_url, _, _ = _get_base_config()
     url = f"{base_url}/api/resource/Attendance"
 
@@ -873,6 +925,7 @@ def fetch_employee_checkins(
     start: datetime,
     end: datetime,
     limit: int = 5000,
+    use_mirror: bool = True,
 ) -> List[Dict]:
     """
     Fetch Employee Checkin records for a single employee in a date range.
@@ -882,10 +935,24 @@ def fetch_employee_checkins(
         start: Start datetime (inclusive).
         end: End datetime (inclusive).
         limit: Max number of records to fetch.
+        use_mirror: False to read Frappe even when the local mirror is up to date.
 
     Returns:
-        List of raw Employee Checkin documents from Frappe.
+        List of raw Employee Checkin documents from Frappe (from the local mirror when it is up to date).
     """
+    from frappe_mirror import find_checkins
+
+    mirrored = None
+    if use_mirror:
+        mirrored = find_checkins(
+            employee_code,
+            start=start.strftime("%Y-%m-%d 00:00:00"),
+            end=end.strftime("%Y-%m-%d 23:59:59"),
+            limit=limit,
+        )
+    if mirrored is not None:
+        return mirrored
+
     base_url, _, _ = _get_base_config()
     url = f"{base_url}/api/resource/Employee Checkin"
 
@@ -919,6 +986,50 @@ def fetch_employee_checkins(
     return data["data"]
 
 
+def fetch_modified_stamps(
+    doctype: str,
+    filters: List[List[Any]],
+    limit: int = 10000,
+) -> List[Tuple[str, str]]:
+    """
+    Fetch only (name, modified) for the documents matching ``filters``.
+
+    Used to fingerprint a set of documents cheaply (e.g. for the report cache):
+    any create, edit or delete in the set changes the returned list.
+
+    Args:
+        doctype: Frappe DocType (e.g. "Attendance", "Employee Checkin").
+        filters: Frappe filter list, as for the list API.
+        limit: Max number of records to fetch.
+
+    Returns:
+        List of (name, modified) tuples ordered by name.
+    """
+    base_url, _, _ = _get_base_config()
+    url = f"{base_url}/api/resource/{doctype}"
+
+    params = {
+        "fields": '["name", "modified"]',
+        "filters": json.dumps(filters),
+        "limit_page_length": limit,
+        "order_by": "name asc",
+    }
+
+    headers = _build_auth_headers()
+    resp = requests.get(url, headers=headers, params=params, timeout=30)
+
+    if resp.status_code != 200:
+        raise FrappeClientError(
+            f"Frappe API error {resp.status_code}: {resp.text}"
+        )
+
+    data = resp.json()
+    if not isinstance(data, dict) or "data" not in data:
+        raise FrappeClientError(f"Unexpected response format from Frappe: {data}")
+
+    return [(row.get("name"), str(row.get("modified"))) for row in data["data"]]
+
+
 def build_daily_checkins_from_employee_checkins(
     checkins: List[Dict],
 ) -> List[Dict]:
@@ -993,6 +1104,7 @@ def calculate_historical_overtime_balance(
     employee_code: str,
     standard_work_hours_hhmm: str = "08:00",
     start_date: Optional[date] = None,
+    shifts_by_period: Optional[List[Dict]] = None,
 ) -> str:
     """
     Cumulative overtime/undertime from Attendance + Checkins strictly BEFORE ``start_date``,
@@ -1002,6 +1114,8 @@ def calculate_historical_overtime_balance(
 
     ``standard_work_hours_hhmm`` is only a fallback when a date has no matching shift period
     or Shift Type fetch fails (same role as default shift in the PDF UI).
+
+    ``shifts_by_period`` may be passed when the Employee was already fetched.
     """
     from utils import (
         compute_work_duration,
@@ -1011,6 +1125,7 @@ def calculate_historical_overtime_balance(
         decimal_hours_to_hhmmss,
         load_calendar_events,
     )
+    from frappe_mirror import find_attendance, find_checkins
 
     if start_date is None:
         return "00:00"
@@ -1018,55 +1133,65 @@ def calculate_historical_overtime_balance(
     base_url, _, _ = _get_base_config()
     headers = _build_auth_headers()
 
-    attendance_url = f"{base_url}/api/resource/Attendance"
-    attendance_filters = [
-        ["Attendance", "employee", "=", employee_code],
-        ["Attendance", "attendance_date", "<", start_date.strftime("%Y-%m-%d")],
-    ]
-
-    attendance_params = {
-        "fields": '["name", "employee", "attendance_date", "status", "leave_type"]',
-        "filters": json.dumps(attendance_filters),
-        "limit_page_length": 10000,
-        "order_by": "attendance_date asc",
-    }
-
-    attendance_resp = requests.get(attendance_url, headers=headers, params=attendance_params, timeout=60)
-
-    if attendance_resp.status_code != 200:
-        raise FrappeClientError(
-            f"Frappe API error {attendance_resp.status_code}: {attendance_resp.text}"
-        )
+    # Local mirror when it is up to date, otherwise Frappe
+    attendance_records = find_attendance(employee_code, before_date=start_date)
+    if attendance_records is None:
+        attendance_url = f"{base_url}/api/resource/Attendance"
+        attendance_filters = [
+            ["Attendance", "employee", "=", employee_code],
+            ["Attendance", "attendance_date", "<", start_date.strftime("%Y-%m-%d")],
+        ]
+
+        attendance_params = {
+            "fields": '["name", "employee", "attendance_date", "status", "leave_type"]',
+            "filters": json.dumps(attendance_filters),
+            "limit_page_length": 10000,
+            "order_by": "attendance_date asc",
+        }
+
+        attendance_resp = requests.get(attendance_url, headers=headers, params=attendance_params, timeout=60)
+
+        if attendance_resp.status_code != 200:
+            raise FrappeClientError(
+                f"Frappe API error {attendance_resp.status_code}: {attendance_resp.text}"
+            )
 
-    attendance_data = attendance_resp.json()
-    if not isinstance(attendance_data, dict) or "data" not in attendance_data:
-        raise FrappeClientError(f"Unexpected response format from Frappe: {attendance_data}")
+        attendance_data = attendance_resp.json()
+        if not isinstance(attendance_data, dict) or "data" not in attendance_data:
+            raise FrappeClientError(f"Unexpected response format from Frappe: {attendance_data}")
 
-    attendance_records = attendance_data["data"]
+        attendance_records = attendance_data["data"]
 
     if not attendance_records:
         return "00:00"
 
-    checkin_url = f"{base_url}/api/resource/Employee Checkin"
-    checkin_filters = [
-        ["Employee Checkin", "employee", "=", employee_code],
-        ["Employee Checkin", "time", "<", start_date.strftime("%Y-%m-%d 00:00:00")],
-    ]
-
-    checkin_params = {
-        "fields": '["name", "employee", "time", "log_type", "skip_auto_attendance"]',
-        "filters": json.dumps(checkin_filters),
-        "limit_page_length": 50000,
-        "order_by": "time asc",
-    }
-
-    checkin_resp = requests.get(checkin_url, headers=headers, params=checkin_params, timeout=60)
-
-    all_checkins: List[Dict] = []
-    if checkin_resp.status_code == 200:
-        checkin_data = checkin_resp.json()
-        if isinstance(checkin_data, dict) and "data" in checkin_data:
-            all_checkins = checkin_data["data"]
+    all_checkins = find_checkins(
+        employee_code,
+        before=start_date.strftime("%Y-%m-%d 00:00:00"),
+        fields=["name", "employee", "time", "log_type", "skip_auto_attendance"],
+        limit=50000,
+    )
+    if all_checkins is None:
+        checkin_url = f"{base_url}/api/resource/Employee Checkin"
+        checkin_filters = [
+            ["Employee Checkin", "employee", "=", employee_code],
+            ["Employee Checkin", "time", "<", start_date.strftime("%Y-%m-%d 00:00:00")],
+        ]
+
+        checkin_params = {
+            "fields": '["name", "employee", "time", "log_type", "skip_auto_attendance"]',
+            "filters": json.dumps(checkin_filters),
+            "limit_page_length": 50000,
+            "order_by": "time asc",
+        }
+
+        checkin_resp = requests.get(checkin_url, headers=headers, params=checkin_params, timeout=60)
+
+        all_checkins = []
+        if checkin_resp.status_code == 200:
+            checkin_data = checkin_resp.json()
+            if isinstance(checkin_data, dict) and "data" in checkin_data:
+                all_checkins = checkin_data["data"]
 
     checkins_by_date: Dict[str, Dict[str, Optional[str]]] = {}
     if all_checkins:
@@ -1141,12 +1266,13 @@ def calculate_historical_overtime_balance(
     if missing_weekends_holidays:
         daily_rows.extend(missing_weekends_holidays)
 
-    shifts_by_period: List[Dict] = []
     shift_type_cache: Dict[str, Dict[str, Any]] = {}
-    try:
-        shifts_by_period = fetch_employee_shifts_by_period(employee_code)
-    except Exception as e:
-        print(f"Warning: shifts_by_period unavailable for historical OT: {e}")
+    if shifts_by_period is None:
+        shifts_by_period = []
+        try:
+            shifts_by_period = fetch_employee_shifts_by_period(employee_code)
+        except Exception as e:
+            print(f"Warning: shifts_by_period unavailable for historical OT: {e}")
 
     def get_hist_shift_params(date_obj: date) -> Tuple[str, str, str, Optional[float]]:
         st_name = _historical_resolve_shift_type_name(shifts_by_period, date_obj)
@@ -1466,12 +1592,154 @@ def _validate_holiday_allocation_rows_no_overlap(norm_rows: List[Dict[str, Any]]
                 )
 
 
+def _parse_attendance_date(value) -> Optional[date]:
+    """Parse an Attendance attendance_date (YYYY-MM-DD or DD-MM-YYYY)."""
+    if not value:
+        return None
+    for fmt in ("%Y-%m-%d", "%d-%m-%Y"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+class LeaveLedger:
+    """
+    One employee's On Leave Attendance, fetched once and indexed by date.
+
+    Leave days are kept as sorted day ordinals, so the usage of an allocation window or
+    a year is two bisects instead of a walk over every record. Pass one ledger to all
+    holiday balance calculations of a report so they share a single Attendance query.
+    """
+
+    def __init__(self, employee_code: str, records: List[Dict], before_date: Optional[date] = None):
+        """
+        Args:
+            employee_code: Frappe Employee name/code
+            records: On Leave Attendance records (attendance_date, leave_type)
+            before_date: The records are complete up to (not including) this date; None for all
+        """
+        self.employee_code = employee_code
+        self.before_date = before_date
+        self._leave_days: List[int] = []
+        # "Paid Holiday" on Monday-Friday: debited from the holiday allocation
+        self._paid_holiday_days: List[int] = []
+        # Any leave type except unpaid ones
+        self._paid_leave_days: List[int] = []
+        for record in records:
+            date_obj = _parse_attendance_date(record.get("attendance_date"))
+            if date_obj is None:
+                continue
+            day = date_obj.toordinal()
+            leave_type = str(record.get("leave_type") or "").strip()
+            self._leave_days.append(day)
+            if leave_type == "Paid Holiday" and date_obj.weekday() < 5:
+                self._paid_holiday_days.append(day)
+            if leave_type and "unpaid" not in leave_type.lower():
+                self._paid_leave_days.append(day)
+        for days in (self._leave_days, self._paid_holiday_days, self._paid_leave_days):
+            days.sort()
+
+    @classmethod
+    def fetch(cls, employee_code: str, before_date: Optional[date] = None) -> "LeaveLedger":
+        """Fetch the employee's On Leave Attendance (before before_date when given) in one request."""
+        from frappe_mirror import find_attendance
+
+        mirrored = find_attendance(employee_code, before_date=before_date, status="On Leave")
+        if mirrored is not None:
+            return cls(employee_code, mirrored, before_date)
+
+        base_url, _, _ = _get_base_config()
+        url = f"{base_url}/api/resource/Attendance"
+        filters = [
+            ["Attendance", "employee", "=", employee_code],
+            ["Attendance", "status", "=", "On Leave"],
+        ]
+        if before_date:
+            filters.append(["Attendance", "attendance_date", "<", before_date.strftime("%Y-%m-%d")])
+
+        params = {
+            "fields": '["name", "employee", "attendance_date", "status", "leave_type"]',
+            "filters": json.dumps(filters),
+            "limit_page_length": 10000,
+            "order_by": "attendance_date asc",
+        }
+
+        headers = _build_auth_headers()
+        resp = requests.get(url, headers=headers, params=params, timeout=60)
+
+        if resp.status_code != 200:
+            raise FrappeClientError(
+                f"Frappe API error {resp.status_code}: {resp.text}"
+            )
+
+        data = resp.json()
+        if not isinstance(data, dict) or "data" not in data:
+            raise FrappeClientError(f"Unexpected response format from Frappe: {data}")
+        return cls(employee_code, data["data"], before_date)
+
+    def covers(self, before_date: Optional[date]) -> bool:
+        """True if the ledger holds every leave day before before_date (None: every leave day)."""
+        if self.before_date is None:
+            return True
+        return before_date is not None and before_date <= self.before_date
+
+    @staticmethod
+    def _count(days: List[int], start: Optional[date] = None, stop: Optional[date] = None) -> int:
+        """Days with start <= day < stop (either bound optional)."""
+        lo = bisect_left(days, start.toordinal()) if start else 0
+        hi = bisect_left(days, stop.toordinal()) if stop else len(days)
+        return max(0, hi - lo)
+
+    def has_leave_before(self, before_date: date) -> bool:
+        return self._count(self._leave_days, stop=before_date) > 0
+
+    def paid_holiday_days(self, start: date, end: date, before_date: Optional[date] = None) -> int:
+        """Weekday Paid Holiday days in the inclusive window [start, end], before before_date."""
+        stop = end + timedelta(days=1)
+        if before_date and before_date < stop:
+            stop = before_date
+        return self._count(self._paid_holiday_days, start, stop)
+
+    def paid_leave_days(self, before_date: Optional[date] = None) -> int:
+        """Days on paid leave (any leave type except unpaid ones) before before_date."""
+        return self._count(self._paid_leave_days, stop=before_date)
+
+    def paid_leave_days_by_year(self, before_date: Optional[date] = None) -> Dict[int, int]:
+        """{year: days on paid leave} before before_date, for years with any."""
+        stop_index = bisect_left(self._paid_leave_days, before_date.toordinal()) if before_date else len(self._paid_leave_days)
+        if not stop_index:
+            return {}
+        first_year = date.fromordinal(self._paid_leave_days[0]).year
+        last_year = date.fromordinal(self._paid_leave_days[stop_index - 1]).year
+        by_year = {}
+        for year in range(first_year, last_year + 1):
+            stop = min(date(year + 1, 1, 1), before_date) if before_date else date(year + 1, 1, 1)
+            days = self._count(self._paid_leave_days, date(year, 1, 1), stop)
+            if days:
+                by_year[year] = days
+        return by_year
+
+
+def get_leave_ledger(
+    employee_code: str,
+    before_date: Optional[date] = None,
+    leave_ledger: Optional[LeaveLedger] = None,
+) -> LeaveLedger:
+    """leave_ledger if it covers the dates before before_date, otherwise a freshly fetched one."""
+    if leave_ledger is not None and leave_ledger.covers(before_date):
+        return leave_ledger
+    return LeaveLedger.fetch(employee_code, before_date)
+
+
 def compute_holiday_balance_by_year_at_report_start(
     employee_code: str,
     holiday_hours_table: List[Dict],
     standard_work_hours_hhmm: str = "08:00",
     before_date: Optional[date] = None,
     report_end_date: Optional[date] = None,
+    leave_ledger: Optional[LeaveLedger] = None,
 ) -> Tuple[Dict[int, float], Dict[int, float], List[Dict[str, Any]]]:
     """
     Per-year allocation and remaining holiday hours at report start (before before_date).
@@ -1488,6 +1756,8 @@ def compute_holiday_balance_by_year_at_report_start(
         ``hours``, ``opening_balance`` (remaining hours for that window at report start) and
         ``canonical_year``. Used to reset the running holiday column when the active window changes (e.g. April 1 new row with
         0 h). Empty dicts / list if there are no usable rows.
+
+    ``leave_ledger`` (see LeaveLedger) is reused when it covers the dates before before_date.
     """
     from utils import hhmm_to_decimal
 
@@ -1520,75 +1790,23 @@ def compute_holiday_balance_by_year_at_report_start(
     if not allocations_by_year:
         return {}, {}, []
 
-    base_url, _, _ = _get_base_config()
-    url = f"{base_url}/api/resource/Attendance"
-    filters = [
-        ["Attendance", "employee", "=", employee_code],
-        ["Attendance", "status", "=", "On Leave"],
-    ]
-
-    if before_date:
-        filters.append(["Attendance", "attendance_date", "<", before_date.strftime("%Y-%m-%d")])
-
-    params = {
-        "fields": '["name", "employee", "attendance_date", "status", "leave_type"]',
-        "filters": json.dumps(filters),
-        "limit_page_length": 10000,
-        "order_by": "attendance_date asc",
-    }
-
-    headers = _build_auth_headers()
-    resp = requests.get(url, headers=headers, params=params, timeout=60)
-
-    if resp.status_code != 200:
-        raise FrappeClientError(
-            f"Frappe API error {resp.status_code}: {resp.text}"
-        )
-
-    data = resp.json()
-    if not isinstance(data, dict) or "data" not in data:
-        raise FrappeClientError(f"Unexpected response format from Frappe: {data}")
-
-    attendance_records = data["data"]
+    ledger = get_leave_ledger(employee_code, before_date, leave_ledger)
     balance_by_year: Dict[int, float] = defaultdict(float)
     used_per_row: List[float] = [0.0] * len(norm_rows)
 
-    if not attendance_records and before_date:
+    if before_date and not ledger.has_leave_before(before_date):
         for r in norm_rows:
             if not row_in_scope(r):
                 continue
             balance_by_year[r["canonical_year"]] += r["hours"]
     else:
+        # Windows do not overlap, so a leave day debits the one row whose window holds it
         standard_hours_decimal = hhmm_to_decimal(standard_work_hours_hhmm)
-
-        for record in attendance_records:
-            try:
-                attendance_date_str = record.get("attendance_date")
-                if not attendance_date_str:
-                    continue
-
-                try:
-                    date_obj = datetime.strptime(attendance_date_str, "%Y-%m-%d").date()
-                except Exception:
-                    try:
-                        date_obj = datetime.strptime(attendance_date_str, "%d-%m-%Y").date()
-                    except Exception:
-                        continue
-
-                is_weekend = date_obj.weekday() >= 5
-                leave_type = record.get("leave_type", "")
-                leave_type_str = str(leave_type).strip() if leave_type else ""
-                is_paid_holiday = leave_type_str == "Paid Holiday"
-                is_sick = leave_type_str == "Sick"
-
-                if is_paid_holiday and not is_sick and not is_weekend:
-                    for i, r in enumerate(norm_rows):
-                        if r["eff_start"] <= date_obj <= r["eff_end"]:
-                            if r["hours"] > 0:
-                                used_per_row[i] += standard_hours_decimal
-                            break
-            except Exception:
-                continue
+        for i, r in enumerate(norm_rows):
+            if r["hours"] > 0:
+                used_per_row[i] = standard_hours_decimal * ledger.paid_holiday_days(
+                    r["eff_start"], r["eff_end"], before_date
+                )
 
         for i, r in enumerate(norm_rows):
             if not row_in_scope(r):
@@ -1621,24 +1839,18 @@ def fetch_holiday_year_balances_for_report(
     report_start_date: date,
     report_end_date: date,
     standard_work_hours_hhmm: str,
+    employee_doc: Optional[Dict[str, Any]] = None,
+    leave_ledger: Optional[LeaveLedger] = None,
 ) -> Optional[Tuple[Dict[int, float], Dict[int, float], List[Dict[str, Any]]]]:
     """
     Load Employee holiday child table and return per-year allocation, balance at report start,
     and ordered ``holiday_windows`` for running-balance resets between date windows.
     Returns None if there is no custom_initial_holiday_hours table data.
+    ``employee_doc`` and ``leave_ledger`` skip the Employee and leave requests when they
+    were already fetched.
     """
-    base_url, _, _ = _get_base_config()
-    headers = _build_auth_headers()
-    emp_url = f"{base_url}/api/resource/Employee/{employee_code}"
-    resp = requests.get(emp_url, headers=headers, params={}, timeout=30)
-    if resp.status_code != 200:
-        raise FrappeClientError(
-            f"Frappe API error {resp.status_code}: {resp.text}"
-        )
-    payload = resp.json()
-    if not isinstance(payload, dict) or "data" not in payload:
-        raise FrappeClientError(f"Unexpected response format from Frappe: {payload}")
-    table = payload["data"].get("custom_initial_holiday_hours")
+    doc = employee_doc if employee_doc is not None else fetch_employee_doc(employee_code)
+    table = doc.get("custom_initial_holiday_hours")
     if not table or not isinstance(table, list) or len(table) == 0:
         return None
     return compute_holiday_balance_by_year_at_report_start(
@@ -1647,6 +1859,7 @@ def fetch_holiday_year_balances_for_report(
         standard_work_hours_hhmm=standard_work_hours_hhmm,
         before_date=report_start_date,
         report_end_date=report_end_date,
+        leave_ledger=leave_ledger,
     )
 
 
@@ -1656,6 +1869,7 @@ def calculate_holiday_hours_balance_from_table(
     standard_work_hours_hhmm: str = "08:00",
     before_date: Optional[date] = None,
     report_end_date: Optional[date] = None,
+    leave_ledger: Optional[LeaveLedger] = None,
 ) -> str:
     """
     Calculate holiday hours balance from the custom_initial_holiday_hours table.
@@ -1674,6 +1888,7 @@ def calculate_holiday_hours_balance_from_table(
         before_date: Calculate balance up to (but not including) this date
         report_end_date: If set with before_date, allocation years through
             max(before_date.year, report_end_date.year) are included in the total
+        leave_ledger: Already fetched LeaveLedger to reuse
 
     Returns:
         Total remaining holiday hours balance in HH:MM format
@@ -1687,6 +1902,7 @@ def calculate_holiday_hours_balance_from_table(
             standard_work_hours_hhmm=standard_work_hours_hhmm,
             before_date=before_date,
             report_end_date=report_end_date,
+            leave_ledger=leave_ledger,
         )
     )
     if not balance_by_year:
@@ -1715,6 +1931,7 @@ def calculate_holiday_hours_balance_per_year(
     initial_holiday_hours_per_year: float,
     standard_work_hours_hhmm: str = "08:00",
     before_date: Optional[date] = None,
+    leave_ledger: Optional[LeaveLedger] = None,
 ) -> Dict[int, float]:
     """
     Calculate holiday hours balance per year for an employee.
@@ -1724,74 +1941,21 @@ def calculate_holiday_hours_balance_per_year(
         initial_holiday_hours_per_year: Initial holiday hours allocated per year (float)
         standard_work_hours_hhmm: Standard work hours per day
         before_date: Calculate balance up to (but not including) this date. If None, calculates for all years.
+        leave_ledger: Already fetched LeaveLedger to reuse
     
     Returns:
         Dict mapping year -> remaining holiday hours balance (float)
     """
     from utils import hhmm_to_decimal
     
-    base_url, _, _ = _get_base_config()
-    
-    # Fetch all Attendance records with "On Leave" status
-    url = f"{base_url}/api/resource/Attendance"
-    filters = [
-        ["Attendance", "employee", "=", employee_code],
-        ["Attendance", "status", "=", "On Leave"],
-    ]
-    
-    if before_date:
-        filters.append(["Attendance", "attendance_date", "<", before_date.strftime("%Y-%m-%d")])
+    ledger = get_leave_ledger(employee_code, before_date, leave_ledger)
     
-    params = {
-        "fields": '["name", "employee", "attendance_date", "status", "leave_type"]',
-        "filters": json.dumps(filters),
-        "limit_page_length": 10000,
-        "order_by": "attendance_date asc",
-    }
-    
-    headers = _build_auth_headers()
-    resp = requests.get(url, headers=headers, params=params, timeout=60)
-    
-    if resp.status_code != 200:
-        raise FrappeClientError(
-            f"Frappe API error {resp.status_code}: {resp.text}"
-        )
-    
-    data = resp.json()
-    if not isinstance(data, dict) or "data" not in data:
-        raise FrappeClientError(f"Unexpected response format from Frappe: {data}")
-    
-    attendance_records = data["data"]
-    
-    # Group attendance by year and calculate used hours per year
+    # Count as holiday hours if it's a paid leave type (exclude unpaid)
     standard_hours_decimal = hhmm_to_decimal(standard_work_hours_hhmm)
-    used_hours_by_year: Dict[int, float] = {}
-    
-    for record in attendance_records:
-        try:
-            attendance_date_str = record.get("attendance_date")
-            if not attendance_date_str:
-                continue
-            
-            # Parse date (Frappe format: YYYY-MM-DD or DD-MM-YYYY)
-            try:
-                date_obj = datetime.strptime(attendance_date_str, "%Y-%m-%d").date()
-            except:
-                try:
-                    date_obj = datetime.strptime(attendance_date_str, "%d-%m-%Y").date()
-                except:
-                    continue
-            
-            year = date_obj.year
-            leave_type = record.get("leave_type", "")
-            
-            # Count as holiday hours if it's a paid leave type (exclude unpaid)
-            if leave_type and "unpaid" not in str(leave_type).lower():
-                if year not in used_hours_by_year:
-                    used_hours_by_year[year] = 0.0
-                used_hours_by_year[year] += standard_hours_decimal
-        except Exception as e:
-            continue
+    used_hours_by_year = {
+        year: days * standard_hours_decimal
+        for year, days in ledger.paid_leave_days_by_year(before_date).items()
+    }
     
     # Calculate balance per year (initial - used)
     balance_by_year: Dict[int, float] = {}
@@ -1834,10 +1998,105 @@ def update_employee_holiday_hours_balance(
         )
 
 
+# Seconds a changed balance waits before it is written, so a burst of reports for the
+# same employee (page reruns, batch renders) ends in a single write of the last value
+HOLIDAY_BALANCE_FLUSH_SECONDS = float(os.getenv("HOLIDAY_BALANCE_FLUSH_SECONDS", "5"))
+# Balances closer than half a minute are considered equal (Frappe rounds float fields)
+HOLIDAY_BALANCE_TOLERANCE_HOURS = 1 / 120
+
+
+class HolidayBalancePublisher:
+    """
+    Write-behind publisher for the Employee custom_holiday_hours_balance field.
+
+    Reports compute the balance on every view; publishing it skips values equal to the
+    value on the Employee document (or to a write still in flight, which that document
+    may predate), keeps only the latest value per employee while a write is pending and
+    writes from a background thread, so reading a report never waits for a PUT and does
+    not bump the Employee's modified.
+    """
+
+    def __init__(self, delay_seconds: float = HOLIDAY_BALANCE_FLUSH_SECONDS):
+        self.delay_seconds = delay_seconds
+        self._lock = threading.Lock()
+        # Values being written right now, by employee
+        self._in_flight: Dict[str, float] = {}
+        self._pending: Dict[str, float] = {}
+        self._timer: Optional[threading.Timer] = None
+
+    def publish(self, employee_code: str, balance_hours: float, current_balance: Optional[float] = None) -> bool:
+        """
+        Schedule a write of balance_hours unless it is already what Frappe holds.
+
+        Args:
+            employee_code: Frappe Employee name/code
+            balance_hours: Holiday hours balance to set (float)
+            current_balance: custom_holiday_hours_balance of the Employee document, if known
+
+        Returns:
+            True if a write is pending for the employee, False if the value is unchanged
+        """
+        with self._lock:
+            # The document is authoritative (it may have been edited in Frappe desk) unless
+            # a write is in flight, which it may not show yet
+            known = self._in_flight.get(employee_code)
+            if known is None and current_balance not in (None, ""):
+                try:
+                    known = float(current_balance)
+                except (TypeError, ValueError):
+                    known = None
+            if known is not None and abs(known - balance_hours) < HOLIDAY_BALANCE_TOLERANCE_HOURS:
+                self._pending.pop(employee_code, None)
+                return False
+            self._pending[employee_code] = balance_hours
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+            return True
+
+    def flush(self) -> int:
+        """Write all pending balances now; returns the number written. Failed writes are retried on the next publish."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            # Recorded before the write so a publish of the same value meanwhile is skipped
+            self._in_flight.update(pending)
+        written = 0
+        for employee_code, balance_hours in pending.items():
+            try:
+                update_employee_holiday_hours_balance(employee_code=employee_code, balance_hours=balance_hours)
+                written += 1
+            except Exception as e:
+                print(f"Warning: Could not update holiday hours balance of {employee_code}: {e}")
+            finally:
+                with self._lock:
+                    if self._in_flight.get(employee_code) == balance_hours:
+                        del self._in_flight[employee_code]
+        return written
+
+
+holiday_balance_publisher = HolidayBalancePublisher()
+# Pending balances are written before the process exits
+atexit.register(holiday_balance_publisher.flush)
+
+
+def publish_holiday_hours_balance(
+    employee_code: str,
+    balance_hours: float,
+    current_balance: Optional[float] = None,
+) -> bool:
+    """Queue a custom_holiday_hours_balance update on the shared publisher (see HolidayBalancePublisher)."""
+    return holiday_balance_publisher.publish(employee_code, balance_hours, current_balance)
+
+
 def calculate_holiday_hours_used_before_date(
     employee_code: str,
     before_date: date,
     standard_work_hours_hhmm: str = "08:00",
+    leave_ledger: Optional[LeaveLedger] = None,
 ) -> str:
     """
     Calculate total holiday hours used (from Attendance records) before the specified date.
@@ -1846,58 +2105,18 @@ def calculate_holiday_hours_used_before_date(
         employee_code: Frappe Employee name/code
         before_date: Calculate holiday hours used before this date
         standard_work_hours_hhmm: Standard work hours per day (for calculating full day = 8 hours)
+        leave_ledger: Already fetched LeaveLedger to reuse
     
     Returns:
         Total holiday hours used in HH:MM format
     """
     from utils import hhmm_to_decimal, decimal_hours_to_hhmmss
     
-    base_url, _, _ = _get_base_config()
-    
-    # Fetch Attendance records with "On Leave" status before the date
-    url = f"{base_url}/api/resource/Attendance"
-    filters = [
-        ["Attendance", "employee", "=", employee_code],
-        ["Attendance", "attendance_date", "<", before_date.strftime("%Y-%m-%d")],
-        ["Attendance", "status", "=", "On Leave"],
-    ]
+    ledger = get_leave_ledger(employee_code, before_date, leave_ledger)
     
-    params = {
-        "fields": '["name", "employee", "attendance_date", "status", "leave_type"]',
-        "filters": json.dumps(filters),
-        "limit_page_length": 10000,
-        "order_by": "attendance_date asc",
-    }
-    
-    headers = _build_auth_headers()
-    resp = requests.get(url, headers=headers, params=params, timeout=60)
-    
-    if resp.status_code != 200:
-        raise FrappeClientError(
-            f"Frappe API error {resp.status_code}: {resp.text}"
-        )
-    
-    data = resp.json()
-    if not isinstance(data, dict) or "data" not in data:
-        raise FrappeClientError(f"Unexpected response format from Frappe: {data}")
-    
-    attendance_records = data["data"]
-    
-    if not attendance_records:
-        return "00:00"  # No holiday records found
-    
-    # Calculate total holiday hours used
     # Count days marked as "On Leave" with leave types that consume holiday hours
     # (Sick, Paid Holiday, Vacation, etc. - but exclude unpaid leave)
-    total_holiday_hours = 0.0
-    standard_hours_decimal = hhmm_to_decimal(standard_work_hours_hhmm)
-    
-    for record in attendance_records:
-        leave_type = record.get("leave_type", "")
-        # Count as holiday hours if it's a paid leave type
-        # Exclude "Leave Without Pay" or similar unpaid types
-        if leave_type and "unpaid" not in str(leave_type).lower():
-            total_holiday_hours += standard_hours_decimal
+    total_holiday_hours = ledger.paid_leave_days(before_date) * hhmm_to_decimal(standard_work_hours_hhmm)
     
     return decimal_hours_to_hhmmss(total_holiday_hours)
 
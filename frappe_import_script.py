@@ -13,7 +13,7 @@ This script:
 
 import pandas as pd
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 import calendar
 import requests
 import json
@@ -28,21 +28,7 @@ from frappe_client import (
     _float_hours_to_hhmm,
     resolve_frappe_employee_code,
 )
-import importlib.util
-import sys
-import os
-
-# Import from page with number in name using importlib.util
-# frappe_import_script.py is in bulldog_office root, pages/ is in the same directory
-script_dir = os.path.dirname(os.path.abspath(__file__))
-pages_dir = os.path.join(script_dir, "pages")
-csv_converter_path = os.path.join(pages_dir, "9 CSV to Frappe HR.py")
-spec = importlib.util.spec_from_file_location("csv_converter", csv_converter_path)
-csv_converter = importlib.util.module_from_spec(spec)
-sys.modules["csv_converter"] = csv_converter
-spec.loader.exec_module(csv_converter)
-parse_ngtecotime_csv = csv_converter.parse_ngtecotime_csv
-get_username_by_full_name = csv_converter.get_username_by_full_name
+from ngteco_parser import parse_ngtecotime_csv, get_username_by_full_name
 
 from utils import load_calendar_events, compute_work_duration, hhmm_to_decimal, decimal_hours_to_hhmmss
 
@@ -453,6 +439,9 @@ def generate_frappe_records_from_ngtecho_csv(
     user_selected_sick_dates: Optional[set] = None,
     user_selected_holiday_dates: Optional[set] = None,
     edited_dates_df: Optional[pd.DataFrame] = None,
+    employee_username: Optional[str] = None,
+    warn: Callable[[str], None] = print,
+    error: Callable[[str], None] = print,
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Generate both Employee Check-in and Attendance records from ngTecho CSV.
@@ -462,6 +451,9 @@ def generate_frappe_records_from_ngtecho_csv(
         standard_work_hours: Standard work hours per day (float). If None, will fetch from Frappe HR.
         auto_detect_weekends_holidays: Auto-create records for missing weekends/holidays
         multiply_sunday_hours: Multiply Sunday work hours by 2.0
+        employee_username: Username of the CSV's employee if already resolved (skips the lookup)
+        warn: Called with a message when the employee is not found (e.g. st.warning)
+        error: Called with a message when the employee lookup fails (e.g. st.error)
     
     Returns:
         (checkin_df, attendance_df) - Two DataFrames ready for Frappe HR import
@@ -472,7 +464,8 @@ def generate_frappe_records_from_ngtecho_csv(
     
     parsed_data = parse_ngtecotime_csv(file_content)
     employee_full_name = parsed_data['employee']
-    employee_username = get_username_by_full_name(employee_full_name)
+    if employee_username is None:
+        employee_username = get_username_by_full_name(employee_full_name, warn=warn, error=error)
     frappe_employee_code = resolve_frappe_employee_code(employee_full_name, employee_username)
     
     # Load calendar events for holiday detection
@@ -0,0 +1,433 @@
+"""
+Local MongoDB mirror of the Frappe HR doctypes the reports read.
+
+Reports, the data quality checks and the historical overtime/holiday balances read
+the same Attendance and Employee Checkin ranges over and over. The mirror keeps a
+copy of Attendance, Employee Checkin, Employee and Shift Type in Mongo
+(``frappe_mirror_*`` collections, indexed by employee and date), so those reads
+are local queries instead of HTTP round-trips to Frappe. A report whose doctypes
+are all mirrored also takes its cache key stamps (the Employee, its Shift Types and
+the period's Attendance and check-ins, see frappe_report_cache_key) from the
+mirror's stored `modified` values, so the key describes the data it is read from;
+otherwise both come from Frappe.
+
+Keeping it current:
+  - delta sync: a background thread pulls, every FRAPPE_MIRROR_SYNC_SECONDS, only
+    the documents modified since the newest one mirrored (with a few seconds of
+    overlap) and upserts them.
+  - reconciliation: deletions never show up in a delta, so every
+    FRAPPE_MIRROR_RECONCILE_SECONDS the (name, modified) list of each doctype is
+    compared with the mirror; documents gone from Frappe are removed and any that
+    differ are fetched again.
+
+Reads fall back to Frappe (the callers return None -> HTTP) while the mirror is
+turned off (FRAPPE_MIRROR=0), has not finished its first sync, has not synced for
+FRAPPE_MIRROR_MAX_LAG_SECONDS, or was marked stale by an import or a refresh
+(request_mirror_sync) and has not synced since.
+
+Usage (one-off sync, e.g. from cron):
+    python frappe_mirror.py
+    python frappe_mirror.py --reconcile
+"""
+import json
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from employee_manager import LazyCollection
+from frappe_client import FrappeClientError, _build_auth_headers, _get_base_config
+
+FRAPPE_MIRROR_ENABLED = os.getenv("FRAPPE_MIRROR", "1") not in ("0", "false", "False", "")
+FRAPPE_MIRROR_SYNC_SECONDS = int(os.getenv("FRAPPE_MIRROR_SYNC_SECONDS", "60"))
+FRAPPE_MIRROR_RECONCILE_SECONDS = int(os.getenv("FRAPPE_MIRROR_RECONCILE_SECONDS", str(6 * 3600)))
+# A mirror that has not synced for this long is not read (e.g. Frappe unreachable from the sync)
+FRAPPE_MIRROR_MAX_LAG_SECONDS = int(os.getenv("FRAPPE_MIRROR_MAX_LAG_SECONDS", "600"))
+MIRROR_PAGE_SIZE = 1000
+# Each delta sync reads again what was modified this long before the newest stamp mirrored
+MIRROR_SYNC_OVERLAP_SECONDS = 5
+
+ATTENDANCE_FIELDS = ["name", "employee", "attendance_date", "status", "leave_type"]
+CHECKIN_FIELDS = ["name", "employee", "time", "log_type", "skip_auto_attendance", "custom_is_edited"]
+
+# fields: what the list API returns into the mirror (None: the full document, fetched one by one
+# because child tables such as custom_shifts_by_period are not in list results)
+MIRROR_DOCTYPES: Dict[str, Dict[str, Any]] = {
+    "Attendance": {
+        "collection": LazyCollection("frappe_mirror_attendance"),
+        "fields": ATTENDANCE_FIELDS + ["modified"],
+        "indexes": [[("employee", 1), ("attendance_date", 1)], [("employee", 1), ("status", 1), ("attendance_date", 1)]],
+    },
+    "Employee Checkin": {
+        "collection": LazyCollection("frappe_mirror_employee_checkin"),
+        "fields": CHECKIN_FIELDS + ["modified"],
+        "indexes": [[("employee", 1), ("time", 1)]],
+    },
+    "Employee": {
+        "collection": LazyCollection("frappe_mirror_employee"),
+        "fields": None,
+        "indexes": [],
+    },
+    "Shift Type": {
+        "collection": LazyCollection("frappe_mirror_shift_type"),
+        "fields": None,
+        "indexes": [],
+    },
+}
+
+mirror_state_collection = LazyCollection("frappe_mirror_state")
+
+
+# ----------------------------------------------------------------------
+# 1. Frappe reads used by the sync
+# ----------------------------------------------------------------------
+
+def _frappe_get(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    base_url, _, _ = _get_base_config()
+    resp = requests.get(f"{base_url}/api/resource/{path}", headers=_build_auth_headers(), params=params or {}, timeout=60)
+    if resp.status_code != 200:
+        raise FrappeClientError(f"Frappe API error {resp.status_code}: {resp.text}")
+    data = resp.json()
+    if not isinstance(data, dict) or "data" not in data:
+        raise FrappeClientError(f"Unexpected response format from Frappe: {data}")
+    return data["data"]
+
+
+def _list_page(doctype: str, fields: List[str], filters: List[List[Any]], order_by: str) -> List[Dict]:
+    return _frappe_get(doctype, {
+        "fields": json.dumps(fields),
+        "filters": json.dumps(filters),
+        "order_by": order_by,
+        "limit_page_length": MIRROR_PAGE_SIZE,
+    })
+
+
+def _list_all(doctype: str, fields: List[str], filters: List[List[Any]]) -> List[Dict]:
+    """
+    Every matching row of the list API by name, page by page. Pages continue after the
+    last name seen (not at an offset), so rows added or deleted meanwhile shift nothing.
+    `fields` must include name.
+    """
+    rows: List[Dict] = []
+    while True:
+        after = [[doctype, "name", ">", rows[-1]["name"]]] if rows else []
+        page = _list_page(doctype, fields, filters + after, "name asc")
+        rows.extend(page)
+        if len(page) < MIRROR_PAGE_SIZE:
+            return rows
+
+
+def _list_modified_since(doctype: str, fields: List[str], since: Optional[str]) -> List[Dict]:
+    """
+    Rows modified at or after `since` (all when None), paged on (modified, name): each
+    page continues after the last row seen, so a row edited during the sync moves to the
+    end instead of shifting another one out of the pages. `fields` must include name
+    and modified.
+    """
+    rows: List[Dict] = []
+    filters = [[doctype, "modified", ">=", since]] if since else []
+    while True:
+        page = _list_page(doctype, fields, filters, "modified asc, name asc")
+        rows.extend(page)
+        if len(page) < MIRROR_PAGE_SIZE:
+            return rows
+        # The rest of the last page's stamp, then the stamps after it
+        last_modified = str(page[-1]["modified"])
+        rows.extend(_list_all(doctype, fields, [
+            [doctype, "modified", "=", last_modified],
+            [doctype, "name", ">", page[-1]["name"]],
+        ]))
+        filters = [[doctype, "modified", ">", last_modified]]
+
+
+def _fetch_documents(doctype: str, names: List[str]) -> List[Dict]:
+    """Mirror form of the named documents (list rows or full documents, see MIRROR_DOCTYPES)."""
+    fields = MIRROR_DOCTYPES[doctype]["fields"]
+    if fields is None:
+        return [_frappe_get(f"{doctype}/{name}") for name in names]
+    docs: List[Dict] = []
+    for i in range(0, len(names), 200):
+        docs.extend(_list_all(doctype, fields, [[doctype, "name", "in", names[i:i + 200]]]))
+    return docs
+
+
+# ----------------------------------------------------------------------
+# 2. Delta sync and reconciliation
+# ----------------------------------------------------------------------
+
+def _store(doctype: str, docs: List[Dict]) -> int:
+    from pymongo import ReplaceOne
+
+    if not docs:
+        return 0
+    collection = MIRROR_DOCTYPES[doctype]["collection"]
+    collection.bulk_write(
+        [ReplaceOne({"_id": doc["name"]}, {**doc, "_id": doc["name"]}, upsert=True) for doc in docs],
+        ordered=False,
+    )
+    return len(docs)
+
+
+def _parse_modified(stamp: str) -> datetime:
+    """Frappe ``modified`` ("YYYY-MM-DD HH:MM:SS[.ffffff]") as a datetime."""
+    return datetime.fromisoformat(stamp)
+
+
+def sync_doctype(doctype: str) -> int:
+    """
+    Pull the documents of `doctype` modified since the last sync into the mirror.
+
+    Returns:
+        Number of documents upserted.
+    """
+    state = mirror_state_collection.find_one({"_id": doctype}) or {}
+    last_modified = state.get("last_modified")
+    started_at = datetime.utcnow()
+
+    # Re-read a short overlap: rows saved with a stamp just before the last one mirrored can
+    # commit after the previous sync read past it (upserts make the overlap harmless)
+    since = None
+    if last_modified:
+        since = (_parse_modified(last_modified) - timedelta(seconds=MIRROR_SYNC_OVERLAP_SECONDS)).strftime("%Y-%m-%d %H:%M:%S.%f")
+    fields = MIRROR_DOCTYPES[doctype]["fields"]
+    rows = _list_modified_since(doctype, fields or ["name", "modified"], since)
+    docs = rows if fields is not None else _fetch_documents(doctype, [row["name"] for row in rows])
+    upserted = _store(doctype, docs)
+
+    newest = max([str(row["modified"]) for row in rows] + ([last_modified] if last_modified else []), default=None)
+    mirror_state_collection.update_one(
+        {"_id": doctype},
+        {"$set": {"last_modified": newest, "synced_from": started_at, "synced_at": datetime.utcnow()}},
+        upsert=True,
+    )
+    return upserted
+
+
+def reconcile_doctype(doctype: str) -> Dict[str, int]:
+    """
+    Compare the mirror of `doctype` with Frappe's (name, modified) list: delete the
+    documents gone from Frappe and fetch again the ones whose modified differs.
+
+    Returns:
+        Dict with deleted and refreshed counts.
+    """
+    collection = MIRROR_DOCTYPES[doctype]["collection"]
+    stamps = {row["name"]: str(row["modified"]) for row in _list_all(doctype, ["name", "modified"], [])}
+    mirrored = {doc["_id"]: str(doc.get("modified")) for doc in collection.find({}, {"modified": 1})}
+
+    gone = [name for name in mirrored if name not in stamps]
+    for i in range(0, len(gone), 1000):
+        collection.delete_many({"_id": {"$in": gone[i:i + 1000]}})
+    changed = [name for name, modified in stamps.items() if mirrored.get(name) != modified]
+    refreshed = _store(doctype, _fetch_documents(doctype, changed))
+
+    mirror_state_collection.update_one(
+        {"_id": doctype},
+        {"$set": {"reconciled_at": datetime.utcnow()}},
+        upsert=True,
+    )
+    return {"deleted": len(gone), "refreshed": refreshed}
+
+
+def sync_frappe_mirror(reconcile: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Delta-sync every mirrored doctype, reconciling those that are due.
+
+    Args:
+        reconcile: True to reconcile all doctypes now, False never; None when
+            FRAPPE_MIRROR_RECONCILE_SECONDS have passed since the last one.
+
+    Returns:
+        Dict with success, message and per-doctype counts (synced, deleted, refreshed).
+    """
+    counts: Dict[str, Dict[str, int]] = {}
+    errors: List[str] = []
+    for doctype in MIRROR_DOCTYPES:
+        try:
+            counts[doctype] = {"synced": sync_doctype(doctype)}
+            if reconcile is None:
+                reconciled_at = (mirror_state_collection.find_one({"_id": doctype}) or {}).get("reconciled_at")
+                due = reconciled_at is None or datetime.utcnow() - reconciled_at > timedelta(seconds=FRAPPE_MIRROR_RECONCILE_SECONDS)
+            else:
+                due = reconcile
+            if due:
+                counts[doctype].update(reconcile_doctype(doctype))
+        except Exception as e:
+            errors.append(f"{doctype}: {e}")
+    if errors:
+        return {"success": False, "message": "Frappe mirror sync failed for " + "; ".join(errors), "counts": counts}
+    return {"success": True, "message": "Frappe mirror is up to date", "counts": counts}
+
+
+# ----------------------------------------------------------------------
+# 3. Background sync thread
+# ----------------------------------------------------------------------
+
+_sync_thread: Optional[threading.Thread] = None
+_sync_lock = threading.Lock()
+_sync_now = threading.Event()
+# Reads ignore syncs that started before this (set by request_mirror_sync)
+_stale_since: Optional[datetime] = None
+
+
+def _sync_loop() -> None:
+    while True:
+        try:
+            result = sync_frappe_mirror()
+            if not result["success"]:
+                print(f"Warning: {result['message']}")
+        except Exception as e:
+            print(f"Warning: Frappe mirror sync failed: {e}")
+        _sync_now.wait(FRAPPE_MIRROR_SYNC_SECONDS)
+        _sync_now.clear()
+
+
+def ensure_mirror_sync() -> bool:
+    """Start the background sync for this process once (safe to call on every rerun); False when turned off."""
+    global _sync_thread
+    if not FRAPPE_MIRROR_ENABLED:
+        return False
+    with _sync_lock:
+        if _sync_thread is None:
+            try:
+                for spec in MIRROR_DOCTYPES.values():
+                    for index in spec["indexes"]:
+                        spec["collection"].create_index(index)
+            except Exception as e:
+                # Reads keep going to Frappe; retried on the next call
+                print(f"Warning: Could not start the Frappe mirror sync: {e}")
+                return False
+            _sync_thread = threading.Thread(target=_sync_loop, name="frappe-mirror-sync", daemon=True)
+            _sync_thread.start()
+    return True
+
+
+def request_mirror_sync() -> None:
+    """
+    Sync now, e.g. after an import or a refresh. Until that sync completes, reads
+    go to Frappe so nothing older than the request is served.
+    """
+    global _stale_since
+    _stale_since = datetime.utcnow()
+    _sync_now.set()
+
+
+# ----------------------------------------------------------------------
+# 4. Reads (None: not available, read Frappe instead)
+# ----------------------------------------------------------------------
+
+def mirror_ready(doctype: str) -> bool:
+    """True if `doctype` can be read from the mirror (see module docstring)."""
+    if not FRAPPE_MIRROR_ENABLED:
+        return False
+    try:
+        state = mirror_state_collection.find_one({"_id": doctype})
+    except Exception as e:
+        print(f"Warning: Frappe mirror state unavailable: {e}")
+        return False
+    if not state or not state.get("synced_at"):
+        return False
+    if datetime.utcnow() - state["synced_at"] > timedelta(seconds=FRAPPE_MIRROR_MAX_LAG_SECONDS):
+        return False
+    return _stale_since is None or state["synced_from"] >= _stale_since
+
+
+def _find(doctype: str, query: Dict[str, Any], fields: List[str], sort_field: str, limit: int) -> Optional[List[Dict]]:
+    if not mirror_ready(doctype):
+        return None
+    try:
+        cursor = MIRROR_DOCTYPES[doctype]["collection"].find(
+            query, {"_id": 0, **{field: 1 for field in fields}}
+        ).sort([(sort_field, 1), ("name", 1)]).limit(limit)
+        return [{field: doc.get(field) for field in fields} for doc in cursor]
+    except Exception as e:
+        print(f"Warning: Could not read {doctype} from the Frappe mirror: {e}")
+        return None
+
+
+def _date_range(field_query: Dict[str, str], start: Optional[str], end: Optional[str], before: Optional[str]) -> Dict[str, str]:
+    if start:
+        field_query["$gte"] = start
+    if end:
+        field_query["$lte"] = end
+    if before:
+        field_query["$lt"] = before
+    return field_query
+
+
+def find_attendance(
+    employee_code: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    before_date: Optional[date] = None,
+    status: Optional[str] = None,
+    limit: int = 10000,
+) -> Optional[List[Dict]]:
+    """Mirrored Attendance of an employee (dates inclusive, before_date exclusive), by attendance_date."""
+    query: Dict[str, Any] = {"employee": employee_code}
+    dates = _date_range(
+        {},
+        start_date.strftime("%Y-%m-%d") if start_date else None,
+        end_date.strftime("%Y-%m-%d") if end_date else None,
+        before_date.strftime("%Y-%m-%d") if before_date else None,
+    )
+    if dates:
+        query["attendance_date"] = dates
+    if status:
+        query["status"] = status
+    return _find("Attendance", query, ATTENDANCE_FIELDS, "attendance_date", limit)
+
+
+def find_checkins(
+    employee_code: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    before: Optional[str] = None,
+    fields: List[str] = CHECKIN_FIELDS,
+    limit: int = 5000,
+) -> Optional[List[Dict]]:
+    """Mirrored Employee Checkin of an employee by time ("YYYY-MM-DD HH:MM:SS" bounds, before exclusive)."""
+    query: Dict[str, Any] = {"employee": employee_code}
+    times = _date_range({}, start, end, before)
+    if times:
+        query["time"] = times
+    return _find("Employee Checkin", query, fields, "time", limit)
+
+
+def find_modified_stamps(doctype: str, query: Dict[str, Any], limit: int = 10000) -> Optional[List[Tuple[str, str]]]:
+    """Mirrored (name, modified) pairs matching a Mongo query, ordered by name like fetch_modified_stamps."""
+    if not mirror_ready(doctype):
+        return None
+    try:
+        cursor = MIRROR_DOCTYPES[doctype]["collection"].find(
+            query, {"_id": 0, "name": 1, "modified": 1}
+        ).sort([("name", 1)]).limit(limit)
+        return [(doc.get("name"), str(doc.get("modified"))) for doc in cursor]
+    except Exception as e:
+        print(f"Warning: Could not read {doctype} stamps from the Frappe mirror: {e}")
+        return None
+
+
+def get_mirrored_doc(doctype: str, name: str) -> Optional[Dict[str, Any]]:
+    """Full mirrored Employee / Shift Type document, or None (not mirrored yet: read Frappe)."""
+    if not mirror_ready(doctype):
+        return None
+    try:
+        return MIRROR_DOCTYPES[doctype]["collection"].find_one({"_id": name}, {"_id": 0})
+    except Exception as e:
+        print(f"Warning: Could not read {doctype} {name} from the Frappe mirror: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sync the local Frappe HR mirror once.")
+    parser.add_argument("--reconcile", action="store_true", help="Also remove deleted and refresh changed documents")
+    args = parser.parse_args()
+    outcome = sync_frappe_mirror(reconcile=True if args.reconcile else None)
+    for doctype, doctype_counts in outcome["counts"].items():
+        print(f"{doctype:18} " + ", ".join(f"{key} {value}" for key, value in doctype_counts.items()))
+    print(("✅ " if outcome["success"] else "❌ ") + outcome["message"])
@@ -0,0 +1,1465 @@
+import os
+import time
+import zipfile
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from datetime import date, datetime, timedelta
+from io import BytesIO
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import requests
+
+from employee_manager import fetch_overtime_payouts
+from frappe_client import (
+    FrappeClientError,
+    LeaveLedger,
+    fetch_employee_checkins,
+    build_daily_checkins_from_employee_checkins,
+    fetch_frappe_employees,
+    fetch_employee_time_config,
+    fetch_employee_attendance,
+    fetch_employee_doc,
+    fetch_employee_shifts_by_period,
+    build_daily_rows_from_attendance_and_checkins,
+    fetch_holiday_year_balances_for_report,
+    fetch_modified_stamps,
+    _get_base_config,
+    _build_auth_headers,
+    _float_hours_to_hhmm,
+    _mirrored_doc,
+)
+from utils import (
+    decimal_hours_to_hhmmss,
+    hhmm_to_decimal,
+    compute_work_duration,
+    adjust_work_time_and_break,
+    compute_time_difference,
+    compute_running_holiday_hours,
+    load_calendar_events,
+)
+
+# reportlab and the report assets are imported where a PDF is rendered, so the
+# pages that only compute or look up reports do not load them.
+from report_model import ReportModel, build_report_model
+from report_cache import report_cache_key, get_cached_report, store_report
+
+
+class FrappeReportError(Exception):
+    """Raised when a Frappe HR report cannot be built for the selected period (e.g. no Attendance)."""
+
+
+DEFAULT_BREAK_RULE_HHMM = "06:00"
+DEFAULT_BREAK_DURATION_HHMM = "00:30"
+
+# Upper bound on concurrent Frappe employees fetched by the batch renderer (network bound).
+BATCH_FETCH_WORKERS = 8
+# Concurrent requests while prefetching the inputs of one report (section 7).
+REPORT_FETCH_WORKERS = 6
+
+
+# ----------------------------------------------------------------------
+# 1. Shift and payout helpers
+# ----------------------------------------------------------------------
+
+def _sum_payout_hours(payout_records):
+    total_hours = 0.0
+    for payout in payout_records:
+        payout_hours = payout.get("payout_hours")
+        if payout_hours:
+            total_hours += hhmm_to_decimal(str(payout_hours))
+    return total_hours
+
+
+def _apply_overtime_payout_deductions(df, payout_records):
+    df = df.copy()
+    df["Overt. Paid"] = ""
+    df["Payout Date"] = ""
+
+    if df.empty or not payout_records:
+        return df
+
+    payout_hours_by_date = {}
+    payout_notes_by_date = {}
+    for payout in payout_records:
+        payout_date = payout.get("payout_date")
+        if payout_date is None:
+            continue
+
+        payout_hours_decimal = hhmm_to_decimal(str(payout.get("payout_hours") or "00:00"))
+        payout_hours_by_date[payout_date] = payout_hours_by_date.get(payout_date, 0.0) + payout_hours_decimal
+
+        payout_note = str(payout.get("note") or "").strip()
+        if payout_note:
+            payout_notes_by_date.setdefault(payout_date, []).append(payout_note)
+
+    running_paid_out = 0.0
+    for idx, row in df.iterrows():
+        row_date = row.get("Date")
+        if isinstance(row_date, pd.Timestamp):
+            row_date = row_date.date()
+        elif isinstance(row_date, str):
+            row_date = pd.to_datetime(row_date).date()
+
+        payout_today = payout_hours_by_date.get(row_date, 0.0)
+        if payout_today:
+            df.at[idx, "Overt. Paid"] = decimal_hours_to_hhmmss(payout_today)
+            payout_label = row_date.isoformat()
+            payout_notes = payout_notes_by_date.get(row_date, [])
+            if payout_notes:
+                payout_label = f"{payout_label} ({'; '.join(payout_notes)})"
+            df.at[idx, "Payout Date"] = payout_label
+
+        running_paid_out += payout_today
+        current_balance = hhmm_to_decimal(str(row.get("Hours Overtime Left") or "00:00"))
+        df.at[idx, "Hours Overtime Left"] = decimal_hours_to_hhmmss(current_balance - running_paid_out)
+
+    return df
+
+
+def _parse_shift_standard_hhmm(std_hours_raw: object, _float_hours_to_hhmm) -> Optional[str]:
+    if std_hours_raw is None:
+        return None
+    try:
+        if isinstance(std_hours_raw, (int, float)):
+            return _float_hours_to_hhmm(float(std_hours_raw))
+        if isinstance(std_hours_raw, str) and std_hours_raw.strip():
+            try:
+                return _float_hours_to_hhmm(float(std_hours_raw))
+            except ValueError:
+                return std_hours_raw.strip()
+    except Exception:
+        pass
+    return None
+
+
+def _parse_shift_optional_nonzero_float_to_hhmm(raw: object, _float_hours_to_hhmm) -> Optional[str]:
+    if raw is None:
+        return None
+    try:
+        if isinstance(raw, (int, float)):
+            v = float(raw)
+        elif isinstance(raw, str) and raw.strip():
+            v = float(raw.strip())
+        else:
+            return None
+        if v == 0:
+            return None
+        return _float_hours_to_hhmm(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_shift_daily_limit_hours(raw: object) -> Optional[float]:
+    if raw is None:
+        return None
+    try:
+        v = float(raw.strip()) if isinstance(raw, str) else float(raw)
+        if v <= 0:
+            return None
+        return v
+    except (TypeError, ValueError):
+        return None
+
+
+def _apply_daily_work_limit(work_time_str: object, limit_hours: Optional[float]) -> str:
+    """After break adjustment, cap credited work time at limit_hours (decimal hours)."""
+    if work_time_str is None:
+        work_time_str = ""
+    text = str(work_time_str).strip()
+    if limit_hours is None or text == "":
+        return text
+    wt = hhmm_to_decimal(text)
+    if wt <= limit_hours:
+        return text
+    return decimal_hours_to_hhmmss(limit_hours)
+
+
+def _parse_period_date(value: Optional[str]) -> Optional[date]:
+    """Parse a Shifts by Period start/end date (YYYY-MM-DD or DD-MM-YYYY)."""
+    if not value:
+        return None
+    for fmt in ("%Y-%m-%d", "%d-%m-%Y"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _get_date_obj(date_val) -> date:
+    """Convert various date formats to date object"""
+    if isinstance(date_val, date):
+        return date_val
+    elif isinstance(date_val, pd.Timestamp):
+        return date_val.date()
+    return pd.to_datetime(date_val).date()
+
+
+def fetch_shift_type_params(shift_type: str, use_mirror: bool = True) -> Dict[str, Any]:
+    """
+    Fetch a Shift Type and parse its report parameters.
+
+    Returns a dict with standard_hhmm, break_rule_hhmm, break_duration_hhmm and
+    daily_limit_hours; values are None when the shift cannot be loaded or the
+    custom field is not set. use_mirror=False skips the local Frappe mirror.
+    """
+    params = {
+        "standard_hhmm": None,
+        "break_rule_hhmm": None,
+        "break_duration_hhmm": None,
+        "daily_limit_hours": None,
+    }
+    try:
+        shift_doc = _mirrored_doc("Shift Type", shift_type) if use_mirror else None
+        if shift_doc is None:
+            base_url, _, _ = _get_base_config()
+            headers = _build_auth_headers()
+            shift_url = f"{base_url}/api/resource/Shift Type/{shift_type}"
+            shift_resp = requests.get(shift_url, headers=headers, timeout=10)
+            if shift_resp.status_code != 200:
+                return params
+            shift_data = shift_resp.json()
+            if not isinstance(shift_data, dict) or "data" not in shift_data:
+                return params
+            shift_doc = shift_data["data"]
+        params = {
+            "standard_hhmm": _parse_shift_standard_hhmm(
+                shift_doc.get("custom_standard_work_hours"), _float_hours_to_hhmm
+            ),
+            "break_rule_hhmm": _parse_shift_optional_nonzero_float_to_hhmm(
+                shift_doc.get("custom_break_rule"), _float_hours_to_hhmm
+            ),
+            "break_duration_hhmm": _parse_shift_optional_nonzero_float_to_hhmm(
+                shift_doc.get("custom_break_duration"), _float_hours_to_hhmm
+            ),
+            "daily_limit_hours": _parse_shift_daily_limit_hours(
+                shift_doc.get("custom_daily_limit")
+            ),
+        }
+    except Exception as e:
+        print(f"Error fetching shift type {shift_type}: {e}")
+    return params
+
+
+# ----------------------------------------------------------------------
+# 2. Report defaults (standard hours, opening balances, payouts)
+# ----------------------------------------------------------------------
+
+def normalize_time_value(value: object, fallback: str) -> str:
+    if value is None or value == "":
+        return fallback
+    try:
+        # Numeric value interpreted as decimal hours
+        if isinstance(value, (int, float)):
+            return decimal_hours_to_hhmmss(float(value))
+        # Already a time-like string
+        return str(value)
+    except Exception:
+        return fallback
+
+
+def _select_period_for_date(shifts_by_period: List[Dict], start_date: date) -> Optional[Dict]:
+    """Shifts by Period row containing start_date, else the most recent one ending before it."""
+    most_recent_before = None
+    most_recent_end_date = None
+    for period in shifts_by_period or []:
+        period_start = _parse_period_date(period.get("start_date"))
+        period_end = _parse_period_date(period.get("end_date"))
+        if not period_start or not period_end or not period.get("shift_type"):
+            continue
+
+        if period_start <= start_date <= period_end:
+            return period
+
+        # Track the most recent period that ends before start_date
+        if period_end < start_date and (most_recent_end_date is None or period_end > most_recent_end_date):
+            most_recent_end_date = period_end
+            most_recent_before = period
+    return most_recent_before
+
+
+def fetch_period_standard_hours(
+    employee_code: str,
+    start_date: date,
+    shifts_by_period: Optional[List[Dict]] = None,
+    shift_params: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Optional[str]:
+    """
+    Standard work hours (HH:MM) from custom_shifts_by_period for start_date.
+
+    Uses the period that contains start_date, or the most recent period that ends
+    before start_date. Returns None when no period/shift applies.
+
+    shifts_by_period and shift_params ({shift type: fetch_shift_type_params result})
+    may be passed when they were prefetched; missing ones are fetched here.
+    """
+    if shifts_by_period is None:
+        try:
+            shifts_by_period = fetch_employee_shifts_by_period(employee_code)
+        except Exception as e:
+            print(f"Warning: Could not fetch shifts_by_period for {employee_code}: {e}")
+            return None
+
+    selected_period = _select_period_for_date(shifts_by_period, start_date)
+    if not selected_period:
+        return None
+    shift_type = selected_period["shift_type"]
+    params = (shift_params or {}).get(shift_type) or fetch_shift_type_params(shift_type)
+    return params.get("standard_hhmm")
+
+
+def build_report_defaults(
+    employee_code: str,
+    start_date: date,
+    end_date: date,
+    frappe_config: Optional[Dict[str, Any]] = None,
+    inputs: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Default report inputs for one employee and period.
+
+    Args:
+        employee_code: Frappe Employee name/code.
+        start_date: Report start date (inclusive).
+        end_date: Report end date (inclusive).
+        frappe_config: Result of fetch_employee_time_config for the same period (may be empty).
+        inputs: Optional fetch_report_inputs result for the same period; the shift
+            periods, Shift Types and payouts in it are used instead of fetching them.
+
+    Returns:
+        Dict with standard_work_hours / initial_overtime / initial_holiday_hours (HH:MM),
+        prior_period_payouts and in_period_payouts.
+    """
+    frappe_config = frappe_config or {}
+    inputs = inputs or {}
+    std_default_from_period = fetch_period_standard_hours(
+        employee_code,
+        start_date,
+        shifts_by_period=inputs.get("shifts_by_period"),
+        shift_params=inputs.get("shift_params"),
+    )
+
+    all_payouts_until_end = inputs.get("payouts")
+    if all_payouts_until_end is None:
+        all_payouts_until_end = fetch_overtime_payouts(employee_code=employee_code, end_date=end_date)
+    prior_period_payouts = [
+        payout for payout in all_payouts_until_end
+        if payout.get("payout_date") and payout["payout_date"] < start_date
+    ]
+    in_period_payouts = [
+        payout for payout in all_payouts_until_end
+        if payout.get("payout_date") and start_date <= payout["payout_date"] <= end_date
+    ]
+
+    # Use period-based value if found, otherwise fallback to default_shift value
+    std_default = normalize_time_value(std_default_from_period or frappe_config.get("standard_work_hours"), "08:00")
+    overtime_default_raw = normalize_time_value(frappe_config.get("initial_overtime"), "00:00")
+    overtime_default = decimal_hours_to_hhmmss(
+        hhmm_to_decimal(overtime_default_raw) - _sum_payout_hours(prior_period_payouts)
+    )
+    holiday_default = normalize_time_value(frappe_config.get("initial_holiday_hours"), "00:00")
+
+    return {
+        "standard_work_hours": std_default,
+        "initial_overtime": overtime_default,
+        "initial_holiday_hours": holiday_default,
+        "prior_period_payouts": prior_period_payouts,
+        "in_period_payouts": in_period_payouts,
+    }
+
+
+# ----------------------------------------------------------------------
+# 3. Daily rows and ledger
+# ----------------------------------------------------------------------
+
+def _fetch_holiday_year_meta(
+    employee_code: str,
+    start_date: date,
+    end_date: date,
+    standard_hhmm: str,
+    employee_doc: Optional[Dict[str, Any]] = None,
+    leave_ledger: Optional[LeaveLedger] = None,
+):
+    """fetch_holiday_year_balances_for_report; Frappe API errors are raised, other failures give None."""
+    try:
+        return fetch_holiday_year_balances_for_report(
+            employee_code,
+            start_date,
+            end_date,
+            standard_hhmm,
+            employee_doc=employee_doc,
+            leave_ledger=leave_ledger,
+        )
+    except FrappeClientError:
+        raise
+    except Exception:
+        return None
+
+
+def compute_frappe_report_df(
+    employee_code: str,
+    start_date: date,
+    end_date: date,
+    standard_work_hours: float,
+    initial_overtime_str: str,
+    holiday_hours: float,
+    in_period_payouts: List[Dict],
+    default_shift_hours_str: Optional[str] = None,
+    calendar_events_date: Optional[Dict[date, Any]] = None,
+    inputs: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """
+    Build the Frappe HR report DataFrame for one employee.
+
+    Attendance is the primary source; Employee Checkin only fills IN/OUT. Missing
+    weekends/public holidays are added, shift-specific break rules and daily caps are
+    applied, then the running overtime/holiday ledger and in-period payouts.
+
+    Args:
+        employee_code: Frappe Employee name/code.
+        start_date: Report start date (inclusive).
+        end_date: Report end date (inclusive).
+        standard_work_hours: Standard hours per day (decimal) used when no shift applies.
+        initial_overtime_str: Opening overtime balance (HH:MM) after earlier payouts.
+        holiday_hours: Opening holiday hours (decimal).
+        in_period_payouts: Overtime payouts dated inside the period.
+        default_shift_hours_str: Standard hours of the employee's default shift (HH:MM).
+        calendar_events_date: Optional pre-parsed {date: label} calendar events.
+        inputs: Optional fetch_report_inputs result for the same period; whatever it
+            holds (Attendance, check-ins, shifts, holiday balances) is not fetched again.
+
+    Returns:
+        Report DataFrame sorted by Date.
+
+    Raises:
+        FrappeReportError: No Attendance data for the period.
+        FrappeClientError: Frappe API errors.
+    """
+    inputs = inputs or {}
+
+    # Fetch Attendance records as primary source
+    attendance_records = inputs.get("attendance")
+    if attendance_records is None:
+        attendance_records = fetch_employee_attendance(
+            employee_code=employee_code,
+            start_date=start_date,
+            end_date=end_date,
+            use_mirror=False,
+        )
+    if not attendance_records:
+        raise FrappeReportError("No Attendance data found for the selected period.")
+
+    # Fetch Employee Checkin records to get IN/OUT times for days when employee was present
+    raw_checkins = inputs.get("checkins")
+    if raw_checkins is None:
+        raw_checkins = fetch_employee_checkins(
+            employee_code=employee_code,
+            start=datetime.combine(start_date, datetime.min.time()),
+            end=datetime.combine(end_date, datetime.max.time()),
+            use_mirror=False,
+        )
+
+    # Build checkins by date dictionary for quick lookup
+    checkins_by_date: Dict[str, Dict[str, Optional[str]]] = {}
+    edited_times_by_date: Dict[str, Dict[str, bool]] = {}  # Track which IN/OUT times are edited
+    if raw_checkins:
+        daily_checkins = build_daily_checkins_from_employee_checkins(raw_checkins)
+        for checkin_row in daily_checkins:
+            date_key = checkin_row["Date"].isoformat() if isinstance(checkin_row["Date"], date) else str(checkin_row["Date"])
+            checkins_by_date[date_key] = {
+                "IN": checkin_row.get("IN"),
+                "OUT": checkin_row.get("OUT"),
+            }
+            edited_times_by_date[date_key] = {
+                "IN_Edited": checkin_row.get("IN_Edited", False),
+                "OUT_Edited": checkin_row.get("OUT_Edited", False),
+            }
+
+    # Build daily rows from Attendance records, filling in IN/OUT from checkins
+    daily_rows = build_daily_rows_from_attendance_and_checkins(
+        attendance_records=attendance_records,
+        checkins_by_date=checkins_by_date,
+    )
+
+    # Load calendar events for holidays
+    if calendar_events_date is None:
+        calendar_events_date = {
+            pd.to_datetime(date_str, format="%Y-%m-%d").date(): event
+            for date_str, event in load_calendar_events().items()
+        }
+
+    # Get dates that already have Attendance records
+    existing_dates = {row["Date"] for row in daily_rows if "Date" in row}
+
+    # Find missing dates (weekends and holidays without Attendance records)
+    current_date = start_date
+    while current_date <= end_date:
+        date_obj = current_date
+        current_date += timedelta(days=1)
+        if date_obj in existing_dates:
+            continue
+
+        # Check if it's a weekend (Saturday=5, Sunday=6)
+        is_weekend = date_obj.weekday() >= 5
+        # Check if it's in calendar events (could be weekend or public holiday)
+        holiday_label_from_calendar = calendar_events_date.get(date_obj)
+
+        # Determine if it's a public holiday:
+        # - If it's in calendar events AND NOT a weekend, it's a public holiday
+        # - If it's in calendar events AND is a weekend, the label must mention a holiday
+        is_public_holiday = False
+        if holiday_label_from_calendar is not None:
+            if not is_weekend:
+                is_public_holiday = True
+            else:
+                holiday_str = str(holiday_label_from_calendar).lower()
+                if "holiday" in holiday_str and holiday_str != "weekend":
+                    is_public_holiday = True
+
+        # Include weekends OR public holidays
+        if not (is_weekend or is_public_holiday):
+            continue
+        if is_weekend and is_public_holiday:
+            # Weekend that is also a public holiday
+            holiday_label = holiday_label_from_calendar or "Weekend/Holiday"
+            leave_type = "Public Holiday"
+        elif is_weekend:
+            # Just a weekend (not a public holiday) - weekends are NOT paid holidays
+            holiday_label = "Weekend"
+            leave_type = None
+        else:
+            # Public holiday that is NOT a weekend
+            holiday_label = holiday_label_from_calendar or "Holiday"
+            leave_type = "Public Holiday"
+
+        daily_rows.append({
+            "Day": date_obj.strftime("%a").upper(),
+            "Date": date_obj,
+            "IN": None,
+            "OUT": None,
+            "Status": "On Leave",
+            "Leave Type": leave_type,
+            "Holiday": holiday_label,
+        })
+
+    if not daily_rows:
+        raise FrappeReportError("No daily rows generated from Attendance data.")
+
+    df = pd.DataFrame(daily_rows)
+
+    # Add columns to track which IN/OUT times are edited
+    date_keys = df["Date"].apply(lambda d: d.isoformat() if isinstance(d, date) else str(d))
+    df["IN_Edited"] = date_keys.apply(lambda k: edited_times_by_date.get(k, {}).get("IN_Edited", False))
+    df["OUT_Edited"] = date_keys.apply(lambda k: edited_times_by_date.get(k, {}).get("OUT_Edited", False))
+
+    # First, populate Holiday column from calendar events (only for rows where Holiday is not already set)
+    # This preserves the Holiday values we set for missing weekends/holidays
+    if "Holiday" not in df.columns:
+        df["Holiday"] = None
+    df["Holiday"] = df.apply(
+        lambda row: row.get("Holiday") if pd.notnull(row.get("Holiday")) and str(row.get("Holiday")).strip() != ""
+        else calendar_events_date.get(row["Date"]),
+        axis=1
+    )
+
+    # "On Leave" with "Paid Holiday" leave type is considered a holiday, unless Holiday already has a label
+    paid_holiday_mask = (
+        (df["Status"] == "On Leave") &
+        (df["Leave Type"] == "Paid Holiday") &
+        (df["Holiday"].isna() | (df["Holiday"] == "") | (df["Holiday"].astype(str).str.strip() == ""))
+    )
+    df.loc[paid_holiday_mask, "Holiday"] = "Paid Holiday"
+
+    # "On Leave" with "Sick" leave type is marked as "sick" in Holiday column
+    sick_leave_mask = (
+        (df["Status"] == "On Leave") &
+        (df["Leave Type"] == "Sick")
+    )
+    df.loc[sick_leave_mask, "Holiday"] = "sick"
+    df["Break"] = None
+
+    # Date-specific Shift Type from custom_shifts_by_period: standard hours, optional break
+    # rules (custom_break_rule / custom_break_duration), and optional daily credit cap
+    # (custom_daily_limit) — all floats in decimal hours like custom_standard_work_hours.
+    shifts_by_period = inputs.get("shifts_by_period")
+    if shifts_by_period is None:
+        try:
+            shifts_by_period = fetch_employee_shifts_by_period(
+                employee_code, employee_doc=fetch_employee_doc(employee_code, use_mirror=False)
+            )
+        except Exception as e:
+            print(f"Warning: Could not fetch shifts_by_period for {employee_code}: {e}")
+            shifts_by_period = []
+
+    periods: List[Tuple[date, date, str]] = []
+    for period in shifts_by_period or []:
+        period_start = _parse_period_date(period.get("start_date"))
+        period_end = _parse_period_date(period.get("end_date"))
+        if period_start and period_end and period.get("shift_type"):
+            periods.append((period_start, period_end, period["shift_type"]))
+
+    shift_type_cache: Dict[str, Dict[str, Any]] = dict(inputs.get("shift_params") or {})
+    fallback_standard = default_shift_hours_str or decimal_hours_to_hhmmss(standard_work_hours)
+
+    def get_effective_shift_params_for_date(date_val) -> Tuple[str, str, str, Optional[float]]:
+        """Standard HH:MM, break rule HH:MM, break duration HH:MM, optional daily limit (hours)."""
+        try:
+            date_obj = _get_date_obj(date_val)
+        except Exception:
+            return fallback_standard, DEFAULT_BREAK_RULE_HHMM, DEFAULT_BREAK_DURATION_HHMM, None
+        shift_type = next((name for p_start, p_end, name in periods if p_start <= date_obj <= p_end), None)
+        if not shift_type:
+            return fallback_standard, DEFAULT_BREAK_RULE_HHMM, DEFAULT_BREAK_DURATION_HHMM, None
+        if shift_type not in shift_type_cache:
+            shift_type_cache[shift_type] = fetch_shift_type_params(shift_type, use_mirror=False)
+        p = shift_type_cache[shift_type]
+        return (
+            p.get("standard_hhmm") or fallback_standard,
+            p.get("break_rule_hhmm") or DEFAULT_BREAK_RULE_HHMM,
+            p.get("break_duration_hhmm") or DEFAULT_BREAK_DURATION_HHMM,
+            p.get("daily_limit_hours"),
+        )
+
+    df["Standard Time"] = df["Date"].apply(lambda d: get_effective_shift_params_for_date(d)[0])
+    df["Difference"] = None
+    df["Difference (Decimal)"] = None
+    df["Hours Overtime Left"] = None
+    df["Holiday Hours"] = None
+
+    # Daily Total = raw IN–OUT span; Work Time = after shift-specific break rules, then daily cap
+    df[" Daily Total"] = df.apply(
+        lambda row: compute_work_duration(row.get("IN", ""), row.get("OUT", ""))
+        if row.get("Status") in ["Present", "Half Day"]
+        else "",
+        axis=1,
+    )
+
+    def _work_time_and_break_for_row(row):
+        if row.get("Status") not in ["Present", "Half Day"]:
+            b = row.get("Break")
+            return "", b if b is not None else ""
+        br_rule, br_dur, cap = get_effective_shift_params_for_date(row["Date"])[1:]
+        wt, br = adjust_work_time_and_break(
+            row[" Daily Total"],
+            row.get("Break"),
+            br_rule,
+            br_dur,
+        )
+        return _apply_daily_work_limit(wt, cap), br
+
+    df["Work Time"], df["Break"] = zip(*df.apply(_work_time_and_break_for_row, axis=1))
+
+    df["Difference"] = df.apply(
+        lambda row: compute_time_difference(
+            row.get("Work Time", ""),
+            row.get("Standard Time", ""),
+            row.get("Holiday", ""),
+            True,
+        ),
+        axis=1,
+    )
+    df["Difference (Decimal)"] = df.apply(
+        lambda row: compute_time_difference(
+            row.get("Work Time", ""),
+            row.get("Standard Time", ""),
+            row.get("Holiday", ""),
+            False,
+        ),
+        axis=1,
+    )
+
+    # Include all dates with non-empty Holiday column (including "Paid Holiday")
+    valid_holiday_mask = df["Holiday"].apply(lambda v: pd.notnull(v) and str(v).strip() != "")
+    holiday_event_dates = set(
+        df.loc[valid_holiday_mask, "Date"].apply(lambda d: d.strftime("%Y-%m-%d"))
+    )
+
+    std_hhmm_for_holiday = decimal_hours_to_hhmmss(standard_work_hours)
+    # The prefetch used the default standard hours; a different value entered on the page
+    # changes the balances, so they are fetched again for it
+    prefetched_holiday = inputs.get("holiday_year_meta")
+    if prefetched_holiday and prefetched_holiday["standard_hhmm"] == std_hhmm_for_holiday:
+        holiday_year_meta = prefetched_holiday["balances"]
+    else:
+        holiday_year_meta = _fetch_holiday_year_meta(
+            employee_code,
+            start_date,
+            end_date,
+            std_hhmm_for_holiday,
+            inputs.get("employee_doc"),
+            inputs.get("leave_ledger"),
+        )
+
+    h_alloc = None
+    h_bal = None
+    h_windows = None
+    if holiday_year_meta:
+        h_alloc, h_bal, h_windows = holiday_year_meta
+
+    # Multiplication is 2.0 for Sundays and Public Holidays, but never for Saturdays
+    # (even if they are public holidays); the ledger multiplies overtime by it.
+    df_dates = df["Date"].apply(_get_date_obj)
+    is_saturday = df_dates.apply(lambda d: d.weekday() == 5)
+    is_sunday = df_dates.apply(lambda d: d.weekday() == 6)
+    is_public_holiday = df_dates.apply(lambda d: d in calendar_events_date)
+    df["Multiplication"] = 1.0
+    df.loc[(is_sunday | is_public_holiday) & ~is_saturday, "Multiplication"] = 2.0
+    df["Multiplication"] = df["Multiplication"].clip(lower=1.0, upper=2.0)
+
+    df = compute_running_holiday_hours(
+        df,
+        holiday_event_dates,
+        calendar_events_date,
+        holiday_hours,
+        initial_overtime_str,
+        holiday_allocations_by_year=h_alloc,
+        holiday_balance_by_year_at_report_start=h_bal,
+        holiday_allocation_windows=h_windows,
+    )
+    df = _apply_overtime_payout_deductions(df, in_period_payouts)
+
+    # Re-verify Multiplication after the ledger (it works on a sorted copy)
+    df_dates = df["Date"].apply(_get_date_obj)
+    is_saturday = df_dates.apply(lambda d: d.weekday() == 5)
+    is_sunday = df_dates.apply(lambda d: d.weekday() == 6)
+    is_public_holiday = df_dates.apply(lambda d: d in calendar_events_date)
+    df["Multiplication"] = 1.0
+    df.loc[(is_sunday | is_public_holiday) & ~is_saturday, "Multiplication"] = 2.0
+    df["Multiplication"] = df["Multiplication"].clip(lower=1.0, upper=2.0)
+
+    return df.sort_values("Date").reset_index(drop=True)
+
+
+# ----------------------------------------------------------------------
+# 4. PDF rendering
+# ----------------------------------------------------------------------
+
+def report_file_name(employee_name: str, start_date: date, end_date: date) -> str:
+    return f"{employee_name}_pay_period_{start_date} - {end_date}_frappe_hr.pdf"
+
+
+FRAPPE_TABLE_COLUMNS = [
+    "Date",
+    " Daily Total",
+    "Break",
+    "Day",
+    "Holiday",
+    "Holiday Hours",
+    "Hours Overtime Left",
+    "Overt. Paid",
+    "IN",
+    "OUT",
+    "Standard Time",
+    "Multiplication",
+    "Work Time",
+]
+FRAPPE_TABLE_COLUMN_WIDTHS = [55, 55, 42, 36, 160, 65, 89, 59, 38, 38, 60, 60, 48]
+
+
+def build_frappe_report_model(
+    df: pd.DataFrame,
+    employee_name: str,
+    start_date: date,
+    end_date: date,
+    standard_work_hours: float,
+    in_period_payouts: List[Dict],
+) -> ReportModel:
+    """ReportModel for the Frappe HR report; edited IN/OUT check-ins are highlighted."""
+    return build_report_model(
+        df,
+        employee_name=employee_name,
+        pay_period=f"{start_date} - {end_date}",
+        standard_work_hours=standard_work_hours,
+        table_columns=FRAPPE_TABLE_COLUMNS,
+        payouts=in_period_payouts,
+        column_widths=FRAPPE_TABLE_COLUMN_WIDTHS,
+        highlight_flags={"IN": "IN_Edited", "OUT": "OUT_Edited"},
+    )
+
+
+def build_frappe_report_pdf(
+    df: pd.DataFrame,
+    employee_name: str,
+    start_date: date,
+    end_date: date,
+    standard_work_hours: float,
+    in_period_payouts: List[Dict],
+) -> bytes:
+    """
+    Render the Frappe HR work hours report (summary, detailed log, payouts, explanations).
+
+    Args:
+        df: Report DataFrame from compute_frappe_report_df.
+        employee_name: Name shown on the report.
+        start_date: Report start date.
+        end_date: Report end date.
+        standard_work_hours: Standard hours per day (decimal), used for time off in days.
+        in_period_payouts: Overtime payouts dated inside the period.
+
+    Returns:
+        PDF bytes.
+    """
+    return render_frappe_report_pdf(
+        build_frappe_report_model(df, employee_name, start_date, end_date, standard_work_hours, in_period_payouts)
+    )
+
+
+def render_frappe_report_pdf(model: ReportModel) -> bytes:
+    """Render the Frappe HR report PDF from a ReportModel."""
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib import colors
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+    from report_template import get_report_styles, explanation_pages
+    from report_assets import report_logo
+
+    pdf_buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        pdf_buffer,
+        pagesize=landscape(A4),
+        leftMargin=30,
+        rightMargin=30,
+        topMargin=60,
+        bottomMargin=40,
+    )
+
+    report_styles = get_report_styles()
+    header_style = report_styles["header"]
+
+    def add_header_footer(canvas, doc_):
+        canvas.saveState()
+        canvas.setFont("Helvetica-Bold", 16)
+        canvas.setFillColor(colors.HexColor("#2c3e50"))
+        canvas.drawString(40, doc_.pagesize[1] - 40, "Bulldog Office - Work Hours Report (Frappe HR)")
+        canvas.setFont("Helvetica", 10)
+        canvas.setFillColor(colors.HexColor("#7f8c8d"))
+        canvas.drawRightString(doc_.pagesize[0] - 40, 30, f"Page {doc_.page}")
+        canvas.restoreState()
+
+    elements = []
+
+    # -- First Page: Enhanced Summary --
+    # Logo (local asset, decoded once per process)
+    elements.append(report_logo(width=200, height=60))
+    elements.append(Spacer(1, 30))
+
+    # Summary page
+    elements.append(Paragraph("WORK HOURS SUMMARY (Frappe HR)", header_style))
+    elements.append(Spacer(1, 30))
+
+    last_payout_date_str = model.last_payout_date.isoformat() if model.last_payout_date else "-"
+    summary_data = [
+        ["Metric", "Value", "What This Means"],
+        ["Employee", model.employee_name, "Your name as recorded in the system"],
+        ["Pay Period", model.pay_period, "The date range this report covers"],
+        ["Hours worked", model.hours_worked, "Total hours you actually worked (sum of all 'Work Time' entries)"],
+        ["Hours expected", model.hours_expected, "Total hours you were expected to work (sum of all 'Standard Time' entries, excluding holidays)"],
+        ["Overtime/Undertime Balance", model.overtime_balance, "Your current overtime balance. Positive = overtime earned, Negative = undertime owed"],
+        ["Overt. Paid", model.payouts_total, "Total overtime hours that were paid out during the selected period"],
+        ["Last Payout Date", last_payout_date_str, "The most recent overtime payout date inside the selected report period"],
+        ["Remaining Holiday Hours", model.holiday_hours, "Your remaining paid holiday hours that you can use"],
+        ["Total Sick Days", str(model.sick_days), "Number of days marked as sick leave in this period"],
+        ["Total Available Time Off (HH:MM)", model.available_time_off, "Combined hours of holiday time + overtime that you can use for time off"],
+        ["Total Available Time Off (Days)", f"{model.available_time_off_days:.2f}", "Your total available time off converted to full work days (assuming 8-hour workday)"],
+    ]
+
+    summary_table = Table(summary_data, colWidths=[150, 150, 420])
+    summary_table.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#3498db")),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("GRID", (0, 0), (-1, -1), 1, colors.HexColor("#bdc3c7")),
+                ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#f5f6fa")]),
+            ]
+        )
+    )
+    elements.append(summary_table)
+    elements.append(PageBreak())
+
+    # Detailed table
+    elements.append(Paragraph("DETAILED WORK LOG (Frappe HR)", header_style))
+    elements.append(Spacer(1, 20))
+
+    # Build table style with yellow highlighting for edited IN/OUT times
+    table_style_commands = [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#2ecc71")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#bdc3c7")),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#f5f6fa")]),
+    ]
+    table_style_commands.extend(
+        ("BACKGROUND", cell, cell, colors.yellow) for cell in model.highlight_cells
+    )
+
+    data_table = Table(model.table_data, colWidths=model.column_widths, repeatRows=1)
+    data_table.setStyle(TableStyle(table_style_commands))
+    elements.append(data_table)
+    elements.append(PageBreak())
+
+    if model.payouts:
+        elements.append(Paragraph("OVERTIME PAYOUTS", header_style))
+        elements.append(Spacer(1, 20))
+
+        payout_table_data = [["Payout Date", "Paid-Out Hours", "Note"]]
+        for payout in sorted(model.payouts, key=lambda item: item.get("payout_date")):
+            payout_date_value = payout.get("payout_date")
+            payout_table_data.append([
+                payout_date_value.isoformat() if payout_date_value else "",
+                str(payout.get("payout_hours") or "00:00"),
+                str(payout.get("note") or ""),
+            ])
+
+        payout_table = Table(payout_table_data, colWidths=[140, 140, 440], repeatRows=1)
+        payout_table.setStyle(
+            TableStyle(
+                [
+                    ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#9b59b6")),
+                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                    ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#bdc3c7")),
+                    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#f5f6fa")]),
+                ]
+            )
+        )
+        elements.append(payout_table)
+        elements.append(PageBreak())
+
+    # -- Detailed Explanation Pages (static, laid out once per process) --
+    elements.extend(explanation_pages("frappe"))
+
+    doc.build(elements, onFirstPage=add_header_footer, onLaterPages=add_header_footer)
+    return pdf_buffer.getvalue()
+
+
+# ----------------------------------------------------------------------
+# 5. Report cache key
+# ----------------------------------------------------------------------
+
+# Doctypes frappe_report_cache_key stamps
+REPORT_STAMPED_DOCTYPES = ("Employee", "Shift Type", "Attendance", "Employee Checkin")
+
+
+def report_reads_mirror() -> bool:
+    """
+    True if a report can take its stamped data and its cache key from the Frappe mirror.
+
+    Decided once per report and passed as use_mirror to frappe_report_cache_key and
+    fetch_report_inputs: the mirror only moves forward, so data read from it (or from
+    Frappe, if it falls behind meanwhile) after the key is never older than the key's
+    stamps. Otherwise both are read from Frappe.
+    """
+    from frappe_mirror import mirror_ready
+
+    return all(mirror_ready(doctype) for doctype in REPORT_STAMPED_DOCTYPES)
+
+
+def _report_stamps(doctype: str, filters: List[List[Any]], mirror_query: Dict[str, Any], use_mirror: bool) -> List[Tuple[str, str]]:
+    """(name, modified) of a report's source documents: from the mirror when asked and available, else Frappe."""
+    if use_mirror:
+        from frappe_mirror import find_modified_stamps
+
+        stamps = find_modified_stamps(doctype, mirror_query)
+        if stamps is not None:
+            return stamps
+    return fetch_modified_stamps(doctype, filters)
+
+
+def frappe_report_cache_key(
+    employee_code: str,
+    employee_name: str,
+    start_date: date,
+    end_date: date,
+    standard_work_hours: float,
+    initial_overtime_str: str,
+    holiday_hours: float,
+    in_period_payouts: List[Dict],
+    default_shift_hours_str: Optional[str] = None,
+    use_mirror: bool = False,
+) -> str:
+    """
+    Cache key for one Frappe HR report, from its inputs and the source documents' stamps.
+
+    Only (name, modified) is read for the Attendance and Employee Checkin set, the
+    Employee (shift periods, holiday table) and the Shift Types, so a changed, added or
+    deleted record yields a new key while a cache hit costs four small list requests.
+
+    Args:
+        use_mirror: Read the stamps from the Frappe mirror (see report_reads_mirror);
+            pass the same value to fetch_report_inputs so the report is computed from
+            the data the key describes. A doctype the mirror cannot serve is stamped
+            from Frappe.
+
+    Returns:
+        Hex cache key for report_cache.
+    """
+    from report_assets import preload_report_assets
+
+    start_str = start_date.strftime("%Y-%m-%d")
+    end_str = end_date.strftime("%Y-%m-%d")
+    checkin_start, checkin_end = f"{start_str} 00:00:00", f"{end_str} 23:59:59"
+    inputs = {
+        "report": "frappe_hr",
+        "employee_code": employee_code,
+        "employee_name": employee_name,
+        "period": [start_str, end_str],
+        "standard_work_hours": standard_work_hours,
+        "initial_overtime": initial_overtime_str,
+        "holiday_hours": holiday_hours,
+        "default_shift_hours": default_shift_hours_str,
+        "payouts": [
+            [str(p.get("_id")), str(p.get("payout_date")), p.get("payout_hours")]
+            for p in in_period_payouts
+        ],
+        "calendar_events": load_calendar_events(),
+        "logo": preload_report_assets(),
+        "employee": _report_stamps(
+            "Employee", [["Employee", "name", "=", employee_code]], {"name": employee_code}, use_mirror
+        ),
+        "shift_types": _report_stamps("Shift Type", [], {}, use_mirror),
+        "attendance": _report_stamps("Attendance", [
+            ["Attendance", "employee", "=", employee_code],
+            ["Attendance", "attendance_date", ">=", start_str],
+            ["Attendance", "attendance_date", "<=", end_str],
+        ], {"employee": employee_code, "attendance_date": {"$gte": start_str, "$lte": end_str}}, use_mirror),
+        "checkins": _report_stamps("Employee Checkin", [
+            ["Employee Checkin", "employee", "=", employee_code],
+            ["Employee Checkin", "time", ">=", checkin_start],
+            ["Employee Checkin", "time", "<=", checkin_end],
+        ], {"employee": employee_code, "time": {"$gte": checkin_start, "$lte": checkin_end}}, use_mirror),
+    }
+    return report_cache_key(inputs)
+
+
+# ----------------------------------------------------------------------
+# 6. Batch rendering for a whole pay period
+# ----------------------------------------------------------------------
+
+def prepare_employee_report(
+    employee_code: str,
+    employee_name: str,
+    start_date: date,
+    end_date: date,
+    calendar_events_date: Optional[Dict[date, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch Frappe/Mongo inputs and compute the report DataFrame for one employee,
+    using the same defaults the Frappe HR PDF page pre-fills.
+
+    Returns:
+        Dict with everything build_frappe_report_pdf needs plus cache_key and
+        fetch_seconds, or with cached_pdf instead when the report is in the cache.
+    """
+    started = time.perf_counter()
+    use_mirror = report_reads_mirror()
+    # What the cache key needs first; Attendance and check-ins only on a cache miss
+    inputs = fetch_report_inputs(
+        employee_code, start_date, end_date, targets=REPORT_DEFAULT_INPUTS, use_mirror=use_mirror
+    )
+    frappe_config = inputs["time_config"]
+    defaults = build_report_defaults(employee_code, start_date, end_date, frappe_config, inputs=inputs)
+    standard_work_hours = hhmm_to_decimal(defaults["standard_work_hours"])
+    cache_key = frappe_report_cache_key(
+        employee_code,
+        employee_name,
+        start_date,
+        end_date,
+        standard_work_hours,
+        defaults["initial_overtime"],
+        hhmm_to_decimal(defaults["initial_holiday_hours"]),
+        defaults["in_period_payouts"],
+        frappe_config.get("standard_work_hours"),
+        use_mirror=use_mirror,
+    )
+    cached = get_cached_report(cache_key)
+    if cached:
+        return {
+            "employee_name": employee_name,
+            "cache_key": cache_key,
+            "cached_pdf": cached["pdf"],
+            "fetch_seconds": time.perf_counter() - started,
+        }
+
+    inputs = fetch_report_inputs(employee_code, start_date, end_date, known=inputs, use_mirror=use_mirror)
+    df = compute_frappe_report_df(
+        employee_code=employee_code,
+        start_date=start_date,
+        end_date=end_date,
+        standard_work_hours=standard_work_hours,
+        initial_overtime_str=defaults["initial_overtime"],
+        holiday_hours=hhmm_to_decimal(defaults["initial_holiday_hours"]),
+        in_period_payouts=defaults["in_period_payouts"],
+        default_shift_hours_str=frappe_config.get("standard_work_hours"),
+        calendar_events_date=calendar_events_date,
+        inputs=inputs,
+    )
+    return {
+        "df": df,
+        "cache_key": cache_key,
+        "employee_name": employee_name,
+        "start_date": start_date,
+        "end_date": end_date,
+        "standard_work_hours": standard_work_hours,
+        "in_period_payouts": defaults["in_period_payouts"],
+        "fetch_seconds": time.perf_counter() - started,
+    }
+
+
+def render_employee_report(prepared: Dict[str, Any]) -> Tuple[bytes, float, List[Dict]]:
+    """Process-pool worker: render one prepared report, returning (pdf bytes, seconds, summary rows)."""
+    started = time.perf_counter()
+    model = build_frappe_report_model(
+        prepared["df"],
+        prepared["employee_name"],
+        prepared["start_date"],
+        prepared["end_date"],
+        prepared["standard_work_hours"],
+        prepared["in_period_payouts"],
+    )
+    pdf_data = render_frappe_report_pdf(model)
+    return pdf_data, time.perf_counter() - started, model.summary_frame().to_dict("records")
+
+
+def get_or_render_employee_report(
+    employee_code: str,
+    employee_name: str,
+    start_date: date,
+    end_date: date,
+) -> bytes:
+    """
+    PDF bytes of one employee's report with the page defaults, from the report cache
+    when the inputs are unchanged, otherwise rendered here and stored in the cache.
+    """
+    prepared = prepare_employee_report(employee_code, employee_name, start_date, end_date)
+    if prepared.get("cached_pdf") is not None:
+        return prepared["cached_pdf"]
+    pdf_data, _, summary_rows = render_employee_report(prepared)
+    store_report(
+        prepared["cache_key"],
+        pdf_data,
+        report_file_name(employee_name, start_date, end_date),
+        {"employee_code": employee_code, "summary": summary_rows},
+    )
+    return pdf_data
+
+
+def generate_period_reports(
+    start_date: date,
+    end_date: date,
+    employee_codes: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    fetch_workers: int = BATCH_FETCH_WORKERS,
+) -> Dict[str, Any]:
+    """
+    Render the Frappe HR PDF for every employee in a pay period.
+
+    Employee inputs are fetched concurrently in a thread pool; as each ledger is
+    computed its PDF is rendered in a process pool, so a period close is bounded by
+    the CPU count rather than by the number of employees. Reports whose inputs are
+    unchanged are taken from the report cache instead of being recomputed.
+
+    Args:
+        start_date: Report start date (inclusive).
+        end_date: Report end date (inclusive).
+        employee_codes: Frappe Employee codes; defaults to all Active employees.
+        max_workers: Render processes (defaults to the CPU count).
+        fetch_workers: Concurrent employees fetched from Frappe.
+
+    Returns:
+        Dict with success, message, zip_bytes and a per-employee summary list
+        (Employee, Employee Code, Status, Fetch (s), Render (s), File, Error).
+    """
+    from report_assets import preload_report_assets
+
+    employees = fetch_frappe_employees()
+    name_by_code = {emp.get("name"): emp.get("employee_name") or emp.get("name") for emp in employees}
+    if employee_codes is None:
+        employee_codes = [
+            emp.get("name") for emp in employees
+            if emp.get("name") and (emp.get("status") or "Active") == "Active"
+        ]
+    if not employee_codes:
+        return {"success": False, "message": "No employees selected", "zip_bytes": None, "summary": []}
+
+    calendar_events_date = {
+        pd.to_datetime(date_str, format="%Y-%m-%d").date(): event
+        for date_str, event in load_calendar_events().items()
+    }
+    summary = {
+        code: {
+            "Employee": name_by_code.get(code, code),
+            "Employee Code": code,
+            "Status": "pending",
+            "Fetch (s)": None,
+            "Render (s)": None,
+            "File": "",
+            "Error": "",
+        }
+        for code in employee_codes
+    }
+
+    # Fetch the logo to disk once here; each render process then decodes it once
+    preload_report_assets()
+
+    zip_buffer = BytesIO()
+    render_workers = max_workers or os.cpu_count() or 1
+    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as archive, \
+            ThreadPoolExecutor(max_workers=max(1, min(fetch_workers, len(employee_codes)))) as fetch_pool, \
+            ProcessPoolExecutor(max_workers=render_workers, mp_context=multiprocessing.get_context("spawn")) as render_pool:
+        fetch_futures = {
+            fetch_pool.submit(
+                prepare_employee_report,
+                code,
+                summary[code]["Employee"],
+                start_date,
+                end_date,
+                calendar_events_date,
+            ): code
+            for code in employee_codes
+        }
+        render_futures = {}
+        for future in as_completed(fetch_futures):
+            code = fetch_futures[future]
+            try:
+                prepared = future.result()
+            except FrappeReportError as e:
+                summary[code].update({"Status": "skipped", "Error": str(e)})
+                continue
+            except Exception as e:
+                summary[code].update({"Status": "failed", "Error": str(e)})
+                continue
+            summary[code]["Fetch (s)"] = round(prepared["fetch_seconds"], 2)
+            if prepared.get("cached_pdf") is not None:
+                file_name = report_file_name(summary[code]["Employee"], start_date, end_date)
+                archive.writestr(file_name, prepared["cached_pdf"])
+                summary[code].update({"Status": "cached", "File": file_name})
+                continue
+            render_futures[render_pool.submit(render_employee_report, prepared)] = (code, prepared["cache_key"])
+
+        for future in as_completed(render_futures):
+            code, cache_key = render_futures[future]
+            try:
+                pdf_data, render_seconds, summary_rows = future.result()
+            except Exception as e:
+                summary[code].update({"Status": "failed", "Error": f"Render failed: {e}"})
+                continue
+            file_name = report_file_name(summary[code]["Employee"], start_date, end_date)
+            archive.writestr(file_name, pdf_data)
+            store_report(cache_key, pdf_data, file_name, {"employee_code": code, "summary": summary_rows})
+            summary[code].update({"Status": "ok", "Render (s)": round(render_seconds, 2), "File": file_name})
+
+    rendered = sum(1 for row in summary.values() if row["Status"] == "ok")
+    cached = sum(1 for row in summary.values() if row["Status"] == "cached")
+    return {
+        "success": rendered + cached > 0,
+        "message": f"Rendered {rendered} and reused {cached} cached of {len(employee_codes)} employee reports",
+        "zip_bytes": zip_buffer.getvalue() if rendered + cached else None,
+        "summary": [summary[code] for code in employee_codes],
+    }
+
+
+# ----------------------------------------------------------------------
+# 7. Concurrent prefetch of report inputs
+# ----------------------------------------------------------------------
+
+# Inputs build_report_defaults needs (the rest is only needed to compute the report)
+REPORT_DEFAULT_INPUTS = ("time_config", "shifts_by_period", "shift_params", "payouts")
+
+
+def run_fetch_plan(
+    plan: Dict[str, Tuple[Callable[..., Any], Sequence[str]]],
+    targets: Optional[Iterable[str]] = None,
+    known: Optional[Dict[str, Any]] = None,
+    max_workers: int = REPORT_FETCH_WORKERS,
+) -> Dict[str, Any]:
+    """
+    Run a graph of fetches in a thread pool, each one as soon as its dependencies are done.
+
+    Args:
+        plan: {name: (func, dependency names)}; func is called with the results of its
+            dependencies as keyword arguments.
+        targets: Names to produce, with their dependencies (default: the whole plan).
+        known: Results already available; they are not fetched again.
+        max_workers: Concurrent fetches.
+
+    Returns:
+        Dict of results by name, including known.
+
+    Raises:
+        The first error raised by a fetch; fetches not started yet are cancelled.
+    """
+    results = dict(known or {})
+    pending = set()
+    stack = list(plan if targets is None else targets)
+    while stack:
+        name = stack.pop()
+        if name in results or name in pending:
+            continue
+        pending.add(name)
+        stack.extend(plan[name][1])
+    if not pending:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as pool:
+        running = {}
+        while pending or running:
+            for name in [n for n in pending if all(dep in results for dep in plan[n][1])]:
+                func, deps = plan[name]
+                running[pool.submit(func, **{dep: results[dep] for dep in deps})] = name
+                pending.discard(name)
+            if not running:
+                raise ValueError(f"Fetch plan has a dependency cycle: {sorted(pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception:
+                    for other in running:
+                        other.cancel()
+                    raise
+    return results
+
+
+def _report_shift_types(employee_doc: Dict[str, Any], shifts_by_period: List[Dict], start_date: date, end_date: date) -> List[str]:
+    """Shift Types a report uses: periods overlapping the range, the start date's period and the default shift."""
+    names = set()
+    for period in shifts_by_period or []:
+        period_start = _parse_period_date(period.get("start_date"))
+        period_end = _parse_period_date(period.get("end_date"))
+        if period_start and period_end and period.get("shift_type") and period_start <= end_date and period_end >= start_date:
+            names.add(period["shift_type"])
+    selected_period = _select_period_for_date(shifts_by_period, start_date)
+    if selected_period:
+        names.add(selected_period["shift_type"])
+    if employee_doc.get("default_shift"):
+        names.add(employee_doc["default_shift"])
+    return sorted(names)
+
+
+def report_fetch_plan(
+    employee_code: str,
+    start_date: date,
+    end_date: date,
+    use_mirror: bool = False,
+) -> Dict[str, Tuple[Callable[..., Any], Sequence[str]]]:
+    """
+    Dependency graph of the Frappe HR and Mongo reads behind one report.
+
+    The Employee document is fetched once and shared by the shift periods, the time
+    configuration and the holiday balances, and so is the leave ledger (On Leave
+    Attendance before the report). Attendance, check-ins, leave and payouts depend on
+    nothing and start right away; Shift Types start as soon as the Employee is in.
+
+    What frappe_report_cache_key stamps (the Employee, its Shift Types and the period's
+    Attendance and check-ins) is read from the local mirror only with use_mirror, i.e.
+    when the key was stamped from the mirror too (see report_reads_mirror); otherwise
+    from Frappe. Reads before the report start may always use the mirror: their results
+    (opening balances) are part of the cache key by value.
+    """
+    def shift_params(employee_doc, shifts_by_period):
+        names = _report_shift_types(employee_doc, shifts_by_period, start_date, end_date)
+        if not names:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(REPORT_FETCH_WORKERS, len(names))) as pool:
+            return dict(zip(names, pool.map(lambda name: fetch_shift_type_params(name, use_mirror=use_mirror), names)))
+
+    def holiday_year_meta(employee_doc, shifts_by_period, shift_params, leave_ledger):
+        # Same default as build_report_defaults: the start date's period, else the default shift
+        std_from_period = fetch_period_standard_hours(employee_code, start_date, shifts_by_period, shift_params)
+        std_from_default_shift = (shift_params.get(employee_doc.get("default_shift")) or {}).get("standard_hhmm")
+        std_default = normalize_time_value(std_from_period or std_from_default_shift, "08:00")
+        standard_hhmm = decimal_hours_to_hhmmss(hhmm_to_decimal(std_default))
+        return {
+            "standard_hhmm": standard_hhmm,
+            "balances": _fetch_holiday_year_meta(
+                employee_code, start_date, end_date, standard_hhmm, employee_doc, leave_ledger
+            ),
+        }
+
+    return {
+        "employee_doc": (lambda: fetch_employee_doc(employee_code, use_mirror=use_mirror), ()),
+        "shifts_by_period": (
+            lambda employee_doc: fetch_employee_shifts_by_period(employee_code, employee_doc=employee_doc),
+            ("employee_doc",),
+        ),
+        "shift_params": (shift_params, ("employee_doc", "shifts_by_period")),
+        "leave_ledger": (lambda: LeaveLedger.fetch(employee_code, before_date=start_date), ()),
+        "time_config": (
+            lambda employee_doc, leave_ledger: fetch_employee_time_config(
+                employee_code,
+                report_start_date=start_date,
+                report_end_date=end_date,
+                employee_doc=employee_doc,
+                leave_ledger=leave_ledger,
+            ),
+            ("employee_doc", "leave_ledger"),
+        ),
+        "payouts": (lambda: fetch_overtime_payouts(employee_code=employee_code, end_date=end_date), ()),
+        "attendance": (
+            lambda: fetch_employee_attendance(
+                employee_code=employee_code, start_date=start_date, end_date=end_date, use_mirror=use_mirror
+            ),
+            (),
+        ),
+        "checkins": (
+            lambda: fetch_employee_checkins(
+                employee_code=employee_code,
+                start=datetime.combine(start_date, datetime.min.time()),
+                end=datetime.combine(end_date, datetime.max.time()),
+                use_mirror=use_mirror,
+            ),
+            (),
+        ),
+        "holiday_year_meta": (
+            holiday_year_meta,
+            ("employee_doc", "shifts_by_period", "shift_params", "leave_ledger"),
+        ),
+    }
+
+
+def fetch_report_inputs(
+    employee_code: str,
+    start_date: date,
+    end_date: date,
+    targets: Optional[Iterable[str]] = None,
+    known: Optional[Dict[str, Any]] = None,
+    max_workers: int = REPORT_FETCH_WORKERS,
+    use_mirror: bool = False,
+) -> Dict[str, Any]:
+    """
+    Fetch everything one report needs concurrently, so its latency approaches that of
+    the slowest request rather than the sum of all of them.
+
+    Pass the result as ``inputs`` to build_report_defaults and compute_frappe_report_df.
+
+    Args:
+        employee_code: Frappe Employee name/code.
+        start_date: Report start date (inclusive).
+        end_date: Report end date (inclusive).
+        targets: Inputs to fetch (default: all), e.g. REPORT_DEFAULT_INPUTS.
+        known: An earlier result for the same report; only what it lacks is fetched.
+        max_workers: Concurrent requests.
+        use_mirror: Read the stamped data from the Frappe mirror (see report_fetch_plan);
+            the same value as for frappe_report_cache_key.
+
+    Returns:
+        Dict with employee_doc, shifts_by_period, shift_params ({shift type: params}),
+        leave_ledger (LeaveLedger), time_config, payouts, attendance, checkins and
+        holiday_year_meta ({standard_hhmm, balances}), or the targets and their dependencies.
+
+    Raises:
+        FrappeClientError and other errors of the first failing fetch.
+    """
+    return run_fetch_plan(
+        report_fetch_plan(employee_code, start_date, end_date, use_mirror=use_mirror),
+        targets=targets,
+        known=known,
+        max_workers=max_workers,
+    )
@@ -0,0 +1,344 @@
+"""
+Background job queue for PDF rendering and email delivery.
+
+Jobs are documents in the ``report_jobs`` Mongo collection; worker threads in the
+Streamlit server process claim them atomically, run the registered handler and
+record the outcome. A Streamlit rerun therefore no longer cancels a send, the
+page stays responsive while a whole team's reports go out, and failed jobs are
+retried with a backoff before being marked failed.
+
+Job states: queued -> running -> done | failed (a failed attempt goes back to
+queued until max_attempts is reached). The worker renews a running job's lease
+while it runs; a job left "running" by a stopped server is picked up again once
+its lease expires, and workers start on any page that shows or queues jobs.
+"""
+import os
+import socket
+import threading
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from bson import Binary
+import streamlit as st
+
+from employee_manager import report_jobs_collection
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_MAX_ATTEMPTS = 3
+# Retry n waits JOB_RETRY_DELAY_SECONDS * 2 ** (n - 1)
+JOB_RETRY_DELAY_SECONDS = 30
+# A running job not finished within the lease is considered abandoned and re-claimed
+JOB_LEASE_SECONDS = 600
+# A running job's lease is renewed this often, so a slow job is never claimed twice
+JOB_HEARTBEAT_SECONDS = JOB_LEASE_SECONDS / 4
+JOB_POLL_SECONDS = 1.0
+
+JOB_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Optional[str]]] = {}
+
+
+def job_handler(job_type: str):
+    """Register a handler for a job type; it receives the payload and may return a result note."""
+    def register(func):
+        JOB_HANDLERS[job_type] = func
+        return func
+    return register
+
+
+# ----------------------------------------------------------------------
+# 1. Handlers
+# ----------------------------------------------------------------------
+
+@job_handler("email_pdf")
+def _email_pdf(payload: Dict[str, Any]) -> str:
+    """Send an already rendered PDF (payload: pdf, file_name, email or employee_id)."""
+    from utils import deliver_pdf_email, get_employee_email
+
+    email = payload.get("email") or get_employee_email(payload["employee_id"])
+    if not email:
+        raise ValueError("Employee email not found.")
+    deliver_pdf_email(email, bytes(payload["pdf"]), payload["file_name"])
+    return f"Sent to {email}"
+
+
+@job_handler("frappe_report_email")
+def _frappe_report_email(payload: Dict[str, Any]) -> str:
+    """Render (or reuse from the cache) an employee's Frappe HR report and email it."""
+    from frappe_report import get_or_render_employee_report, report_file_name
+    from utils import deliver_pdf_email
+
+    start_date = date.fromisoformat(payload["start_date"])
+    end_date = date.fromisoformat(payload["end_date"])
+    pdf_data = get_or_render_employee_report(
+        payload["employee_code"],
+        payload["employee_name"],
+        start_date,
+        end_date,
+    )
+    deliver_pdf_email(
+        payload["email"],
+        pdf_data,
+        report_file_name(payload["employee_name"], start_date, end_date),
+        subject=f"Your work hours report {start_date} - {end_date}",
+        body="Please find attached your work hours report for the pay period.",
+    )
+    return f"Sent to {payload['email']}"
+
+
+# ----------------------------------------------------------------------
+# 2. Enqueue and progress
+# ----------------------------------------------------------------------
+
+def _new_job(job_type: str, payload: Dict[str, Any], label: str, batch_id: str, max_attempts: int) -> Dict[str, Any]:
+    if job_type not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job type: {job_type}")
+    now = datetime.utcnow()
+    if isinstance(payload.get("pdf"), (bytes, bytearray)):
+        payload = {**payload, "pdf": Binary(bytes(payload["pdf"]))}
+    return {
+        "type": job_type,
+        "label": label,
+        "batch_id": batch_id,
+        "payload": payload,
+        "status": "queued",
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "run_after": now,
+        "created_at": now,
+        "updated_at": now,
+        "error": "",
+        "result": "",
+    }
+
+
+def enqueue_jobs(
+    job_type: str,
+    jobs: List[Dict[str, Any]],
+    max_attempts: int = JOB_MAX_ATTEMPTS,
+) -> str:
+    """
+    Queue several jobs of one type as a batch and make sure the workers are running.
+
+    Args:
+        job_type: Registered job type (e.g. "email_pdf", "frappe_report_email").
+        jobs: List of {"label": str, "payload": dict}.
+        max_attempts: Attempts per job before it is marked failed.
+
+    Returns:
+        batch_id to pass to get_batch_progress / show_job_progress.
+    """
+    batch_id = uuid.uuid4().hex
+    docs = [_new_job(job_type, job["payload"], job.get("label", ""), batch_id, max_attempts) for job in jobs]
+    if docs:
+        report_jobs_collection.insert_many(docs)
+    ensure_job_workers()
+    return batch_id
+
+
+def enqueue_job(job_type: str, payload: Dict[str, Any], label: str = "", max_attempts: int = JOB_MAX_ATTEMPTS) -> str:
+    """Queue a single job; returns its batch_id."""
+    return enqueue_jobs(job_type, [{"label": label, "payload": payload}], max_attempts)
+
+
+def get_batch_progress(batch_id: str) -> Dict[str, Any]:
+    """
+    Status of a batch.
+
+    Returns:
+        Dict with total, counts per status, finished (done + failed) and a jobs list
+        (label, status, attempts, result, error) in creation order.
+    """
+    from pymongo import ASCENDING
+
+    jobs = list(report_jobs_collection.find(
+        {"batch_id": batch_id},
+        {"label": 1, "status": 1, "attempts": 1, "result": 1, "error": 1},
+    ).sort("created_at", ASCENDING))
+    counts = {status: 0 for status in ("queued", "running", "done", "failed")}
+    for job in jobs:
+        counts[job["status"]] = counts.get(job["status"], 0) + 1
+    return {
+        "total": len(jobs),
+        "counts": counts,
+        "finished": counts["done"] + counts["failed"],
+        "jobs": [
+            {
+                "Job": job.get("label", ""),
+                "Status": job["status"],
+                "Attempts": job.get("attempts", 0),
+                "Result": job.get("result", ""),
+                "Error": job.get("error", ""),
+            }
+            for job in jobs
+        ],
+    }
+
+
+@st.fragment(run_every=2)
+def show_job_progress(batch_id: str, title: str = "Background jobs"):
+    """Progress bar and job table for a batch, refreshed every 2 seconds without rerunning the page."""
+    # After a server restart nothing else may have started the workers for the queued jobs
+    ensure_job_workers()
+    progress = get_batch_progress(batch_id)
+    total = progress["total"] or 1
+    counts = progress["counts"]
+    st.progress(
+        progress["finished"] / total,
+        text=f"{title}: {counts['done']} done, {counts['failed']} failed, "
+             f"{counts['running']} running, {counts['queued']} queued",
+    )
+    if progress["total"] > 1 or counts["failed"]:
+        st.dataframe(progress["jobs"], use_container_width=True, hide_index=True)
+
+
+# ----------------------------------------------------------------------
+# 3. Workers
+# ----------------------------------------------------------------------
+
+def fail_abandoned_jobs() -> int:
+    """
+    Mark failed the abandoned running jobs that have used all their attempts (e.g. a job
+    whose render keeps killing the worker process), instead of reclaiming them forever.
+
+    Returns:
+        Number of jobs marked failed.
+    """
+    now = datetime.utcnow()
+    result = report_jobs_collection.update_many(
+        {
+            "status": "running",
+            "locked_at": {"$lt": now - timedelta(seconds=JOB_LEASE_SECONDS)},
+            "$expr": {"$gte": ["$attempts", "$max_attempts"]},
+        },
+        {"$set": {
+            "status": "failed",
+            "error": "Abandoned by its worker on the last attempt",
+            "updated_at": now,
+            "finished_at": now,
+        }},
+    )
+    return result.modified_count
+
+
+def claim_next_job(worker_name: str) -> Optional[Dict[str, Any]]:
+    """Atomically move the oldest due job (or an abandoned running one with attempts left) to running."""
+    from pymongo import ASCENDING, ReturnDocument
+
+    fail_abandoned_jobs()
+    now = datetime.utcnow()
+    return report_jobs_collection.find_one_and_update(
+        {
+            "$or": [
+                {"status": "queued", "run_after": {"$lte": now}},
+                {
+                    "status": "running",
+                    "locked_at": {"$lt": now - timedelta(seconds=JOB_LEASE_SECONDS)},
+                    "$expr": {"$lt": ["$attempts", "$max_attempts"]},
+                },
+            ]
+        },
+        {
+            "$set": {"status": "running", "locked_at": now, "worker": worker_name, "updated_at": now},
+            "$inc": {"attempts": 1},
+        },
+        sort=[("run_after", ASCENDING)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def _renew_lease(job: Dict[str, Any], finished: threading.Event) -> None:
+    """Keep a running job's lease fresh until `finished` is set."""
+    while not finished.wait(JOB_HEARTBEAT_SECONDS):
+        try:
+            report_jobs_collection.update_one(
+                {"_id": job["_id"], "status": "running", "worker": job.get("worker")},
+                {"$set": {"locked_at": datetime.utcnow()}},
+            )
+        except Exception as e:
+            print(f"Warning: Could not renew the lease of job {job['_id']}: {e}")
+
+
+def run_job(job: Dict[str, Any]) -> None:
+    """Run one claimed job, renewing its lease meanwhile, and record done, a retry, or the final failure."""
+    # A worker that lost its lease leaves the outcome to the worker that reclaimed the job
+    owned = {"_id": job["_id"], "worker": job.get("worker")}
+    finished = threading.Event()
+    heartbeat = threading.Thread(target=_renew_lease, args=(job, finished), name=f"job-lease-{job['_id']}", daemon=True)
+    heartbeat.start()
+    try:
+        result = JOB_HANDLERS[job["type"]](job.get("payload") or {})
+    except Exception as e:
+        finished.set()
+        now = datetime.utcnow()
+        attempts = job.get("attempts", 1)
+        if attempts < job.get("max_attempts", JOB_MAX_ATTEMPTS):
+            retry_at = now + timedelta(seconds=JOB_RETRY_DELAY_SECONDS * 2 ** (attempts - 1))
+            update = {"status": "queued", "run_after": retry_at, "error": str(e), "updated_at": now}
+        else:
+            update = {"status": "failed", "error": str(e), "updated_at": now, "finished_at": now}
+        report_jobs_collection.update_one(owned, {"$set": update})
+        return
+    finished.set()
+    now = datetime.utcnow()
+    report_jobs_collection.update_one(
+        owned,
+        {
+            "$set": {"status": "done", "result": result or "", "error": "", "updated_at": now, "finished_at": now},
+            # The rendered PDF is no longer needed once it has been sent
+            "$unset": {"payload.pdf": ""},
+        },
+    )
+
+
+class JobWorkerPool:
+    """Worker threads polling report_jobs; one pool per server process."""
+
+    def __init__(self, size: int = JOB_WORKERS):
+        self.size = size
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        for i in range(self.size):
+            thread = threading.Thread(target=self._loop, args=(f"{prefix}:{i}",), name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _loop(self, worker_name: str) -> None:
+        while not self._stop.is_set():
+            try:
+                job = claim_next_job(worker_name)
+            except Exception as e:
+                print(f"Warning: Job queue poll failed: {e}")
+                job = None
+            if job is None:
+                self._stop.wait(JOB_POLL_SECONDS)
+                continue
+            try:
+                run_job(job)
+            except Exception as e:
+                print(f"Warning: Could not record outcome of job {job.get('_id')}: {e}")
+
+
+_workers: Optional[JobWorkerPool] = None
+_workers_lock = threading.Lock()
+
+
+def ensure_job_workers(size: int = JOB_WORKERS) -> JobWorkerPool:
+    """Start the worker threads for this process once (safe to call on every rerun)."""
+    from pymongo import ASCENDING
+
+    global _workers
+    with _workers_lock:
+        if _workers is None:
+            report_jobs_collection.create_index([("status", ASCENDING), ("run_after", ASCENDING)])
+            report_jobs_collection.create_index([("batch_id", ASCENDING), ("created_at", ASCENDING)])
+            _workers = JobWorkerPool(size)
+            _workers.start()
+    return _workers
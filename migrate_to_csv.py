@@ -49,22 +49,22 @@ def main():
             return False
         
         try:
-            # Fetch and process data
-            records = migrator.fetch_and_process_data()
-            
-            if not records:
-                print("⚠️  No data to migrate")
-                return False
+            # Stream processed records straight into the CSV file
+            records = migrator.iter_processed_records()
             
             # Export to CSV only
             csv_file = f"frappe_hr_employee_checkin_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
             success = migrator.export_to_csv(records, csv_file)
             
+            if not migrator.stats.get("processed_records"):
+                print("⚠️  No data to migrate")
+                return False
+            
             print()
             if success:
                 print("🎉 CSV migration completed successfully!")
                 print(f"📁 CSV file: {csv_file}")
-                print(f"📊 Total records: {len(records)}")
+                print(f"📊 Total records: {migrator.stats['processed_records']}")
                 print(f"📋 Check migration.log for detailed information")
                 print()
                 print("Next steps:")
@@ -10,12 +10,17 @@ Author: Senior Python Developer
 Date: 2025
 """
 
+import csv
+import multiprocessing
 import os
+import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 import pandas as pd
 from pymongo import MongoClient
+from openpyxl import Workbook
 from bson import ObjectId
 from dotenv import load_dotenv
 import logging
@@ -34,6 +39,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Rows per file that Frappe's Data Import handles comfortably in one upload
+MAX_ROWS_PER_IMPORT_FILE = 5000
+
 class FrappeHRMigrator:
     """Handles migration of employee data from MongoDB to Frappe HR Excel format."""
     
@@ -51,6 +59,10 @@ class FrappeHRMigrator:
         self.db = None
         self.employees_collection = None
         self.work_history_collection = None
+        self.employee_usernames = None
+        self.cursor_batch_size = 2000
+        self.stats = {}
+        self.exported_files = []
         
     def connect_to_mongodb(self) -> bool:
         """Establish connection to MongoDB."""
@@ -69,16 +81,42 @@ class FrappeHRMigrator:
             logger.error(f"Failed to connect to MongoDB: {str(e)}")
             return False
     
+    def load_employee_usernames(self) -> Dict[str, str]:
+        """
+        Preload the employee ID -> username map with a single query.
+        
+        Work history rows store the employee's ``_id`` as a string, so keys are
+        ``str(_id)`` for both ObjectId and plain ``_id`` values.
+        
+        Returns:
+            Mapping of employee ID string to username
+        """
+        self.employee_usernames = {
+            str(employee["_id"]): employee.get("username")
+            for employee in self.employees_collection.find({}, {"username": 1})
+        }
+        logger.info(f"Loaded {len(self.employee_usernames)} employee usernames")
+        return self.employee_usernames
+    
     def get_employee_username(self, employee_id: str) -> Optional[str]:
         """
         Get username for a given employee ID.
         
+        Uses the preloaded username map when available and only falls back to
+        per-ID lookups when it has not been loaded.
+        
         Args:
             employee_id: Employee ID to look up
             
         Returns:
             Username if found, None otherwise
         """
+        if self.employee_usernames is not None:
+            username = self.employee_usernames.get(str(employee_id))
+            if not username:
+                logger.warning(f"Employee not found for ID: {employee_id}")
+            return username
+        
         try:
             # Try to find by _id first (ObjectId)
             if ObjectId.is_valid(employee_id):
@@ -172,18 +210,19 @@ class FrappeHRMigrator:
             logger.error(f"Error creating datetime string for {date_obj}, {time_str}: {str(e)}")
             return ""
     
-    def generate_record_id(self, month: int, sequence: int) -> str:
+    def generate_record_id(self, month: int, sequence: int, year: int = 2025) -> str:
         """
-        Generate unique record ID in the format EMP-CKIN-{month}-2025-{sequence}.
+        Generate unique record ID in the format EMP-CKIN-{month}-{year}-{sequence}.
         
         Args:
             month: Month number (1-12)
             sequence: Sequence number starting from 1
+            year: Year used in the ID (2025 unless IDs are numbered per month)
             
         Returns:
             Formatted record ID
         """
-        return f"EMP-CKIN-{month:02d}-2025-{sequence:06d}"
+        return f"EMP-CKIN-{month:02d}-{year}-{sequence:06d}"
     
     def is_weekend_non_working_day(self, record: Dict[str, Any]) -> bool:
         """
@@ -217,40 +256,58 @@ class FrappeHRMigrator:
         # Return True if it's weekend AND both times are empty
         return in_empty and out_empty
 
-    def fetch_and_process_data(self, start_date: Optional[datetime] = None, include_ids: bool = True) -> List[Dict[str, Any]]:
+    def iter_processed_records(self, start_date: Optional[datetime] = None, include_ids: bool = True,
+                               end_date: Optional[datetime] = None, sequence_per_month: bool = False) -> Iterator[Dict[str, Any]]:
         """
-        Fetch data from MongoDB and process it for Frappe HR format.
+        Stream work history from MongoDB and yield Frappe HR check-in records one by one.
+        
+        The cursor is sorted by Date on the server and read in batches, and usernames
+        come from the preloaded map, so memory stays bounded by the cursor batch size
+        regardless of how much history is migrated. Counters are left in ``self.stats``.
         
         Args:
             start_date: Optional start date to filter records (only records from this date onwards)
             include_ids: Whether to include unique ID generation in output
+            end_date: Optional exclusive end date (used by partitioned migrations)
+            sequence_per_month: Number IDs per (year, month) and put the record's year in the
+                ID, so every month gets its own deterministic, non-colliding ID range
         
-        Returns:
-            List of processed records ready for Excel export
+        Yields:
+            Processed records in chronological order
         """
         logger.info("Starting data fetch and processing...")
         
         if start_date:
             logger.info(f"Filtering records from {start_date.strftime('%Y-%m-%d')} onwards")
         
-        try:
-            # Build query filter
-            query_filter = {}
+        # Build query filter
+        query_filter = {}
+        if start_date or end_date:
+            query_filter["Date"] = {}
             if start_date:
-                query_filter["Date"] = {"$gte": start_date}
-            
-            # Fetch work history records
-            work_history_cursor = self.work_history_collection.find(query_filter)
-            work_history_data = list(work_history_cursor)
-            
-            logger.info(f"Found {len(work_history_data)} work history records")
-            
-            processed_records = []
-            sequence_counter = 1
-            skipped_weekend_records = 0
-            
+                query_filter["Date"]["$gte"] = start_date
+            if end_date:
+                query_filter["Date"]["$lt"] = end_date
+        
+        if self.employee_usernames is None:
+            self.load_employee_usernames()
+        
+        # Stream work history records instead of materializing the whole collection
+        work_history_cursor = (
+            self.work_history_collection
+            .find(query_filter, {"employee_id": 1, "Date": 1, "Day": 1, "IN": 1, "OUT": 1}, allow_disk_use=True)
+            .sort([("Date", 1), ("_id", 1)])
+            .batch_size(self.cursor_batch_size)
+        )
+        
+        self.stats = {"work_history_records": 0, "processed_records": 0, "skipped_weekend_records": 0}
+        sequence_counter = 1
+        month_sequences = {}
+        
+        try:
             # Process each work history record
-            for record in work_history_data:
+            for record in work_history_cursor:
+                self.stats["work_history_records"] += 1
                 try:
                     employee_id = record.get("employee_id")
                     if not employee_id:
@@ -259,7 +316,7 @@ class FrappeHRMigrator:
                     
                     # Check if this is a weekend non-working day (skip it)
                     if self.is_weekend_non_working_day(record):
-                        skipped_weekend_records += 1
+                        self.stats["skipped_weekend_records"] += 1
                         logger.debug(f"Skipping weekend non-working day: {record.get('_id')} - {record.get('Day')}")
                         continue
                     
@@ -286,57 +343,177 @@ class FrappeHRMigrator:
                     # Get month for ID generation
                     month = date_obj.month if hasattr(date_obj, 'month') else pd.to_datetime(date_field).month
                     
-                    # Process IN time
-                    in_time = record.get("IN")
-                    if in_time and str(in_time).strip() and str(in_time).strip() != "nan":
-                        datetime_str = self.create_datetime_string(date_obj, str(in_time))
-                        if datetime_str:
-                            record_data = {
-                                "Employee": username,
-                                "Time": datetime_str,
-                                "Log Type": "IN"
-                            }
-                            if include_ids:
-                                record_data["ID"] = self.generate_record_id(month, sequence_counter)
-                            processed_records.append(record_data)
-                            sequence_counter += 1
-                    
-                    # Process OUT time
-                    out_time = record.get("OUT")
-                    if out_time and str(out_time).strip() and str(out_time).strip() != "nan":
-                        datetime_str = self.create_datetime_string(date_obj, str(out_time))
-                        if datetime_str:
-                            record_data = {
-                                "Employee": username,
-                                "Time": datetime_str,
-                                "Log Type": "OUT"
-                            }
-                            if include_ids:
-                                record_data["ID"] = self.generate_record_id(month, sequence_counter)
-                            processed_records.append(record_data)
-                            sequence_counter += 1
+                    # Process IN and OUT times
+                    for log_type in ("IN", "OUT"):
+                        log_time = record.get(log_type)
+                        if log_time and str(log_time).strip() and str(log_time).strip() != "nan":
+                            datetime_str = self.create_datetime_string(date_obj, str(log_time))
+                            if datetime_str:
+                                record_data = {
+                                    "Employee": username,
+                                    "Time": datetime_str,
+                                    "Log Type": log_type
+                                }
+                                if include_ids and sequence_per_month:
+                                    month_key = (date_obj.year, month)
+                                    month_sequences[month_key] = month_sequences.get(month_key, 0) + 1
+                                    record_data["ID"] = self.generate_record_id(month, month_sequences[month_key], year=date_obj.year)
+                                elif include_ids:
+                                    record_data["ID"] = self.generate_record_id(month, sequence_counter)
+                                sequence_counter += 1
+                                self.stats["processed_records"] += 1
+                                yield record_data
                     
                 except Exception as e:
                     logger.error(f"Error processing record {record.get('_id')}: {str(e)}")
                     continue
-            
-            # Sort records by time for better organization
-            processed_records.sort(key=lambda x: x["Time"])
-            
-            logger.info(f"Successfully processed {len(processed_records)} records")
-            logger.info(f"Skipped {skipped_weekend_records} weekend non-working day records")
-            return processed_records
-            
+        finally:
+            work_history_cursor.close()
+        
+        logger.info(f"Found {self.stats['work_history_records']} work history records")
+        logger.info(f"Successfully processed {self.stats['processed_records']} records")
+        logger.info(f"Skipped {self.stats['skipped_weekend_records']} weekend non-working day records")
+
+    def fetch_and_process_data(self, start_date: Optional[datetime] = None, include_ids: bool = True) -> List[Dict[str, Any]]:
+        """
+        Fetch data from MongoDB and process it for Frappe HR format.
+        
+        Collects ``iter_processed_records`` into a list; prefer the iterator for
+        large migrations.
+        
+        Args:
+            start_date: Optional start date to filter records (only records from this date onwards)
+            include_ids: Whether to include unique ID generation in output
+        
+        Returns:
+            List of processed records ready for Excel export
+        """
+        try:
+            return list(self.iter_processed_records(start_date=start_date, include_ids=include_ids))
         except Exception as e:
             logger.error(f"Error fetching and processing data: {str(e)}")
             return []
     
-    def export_to_excel(self, records: List[Dict[str, Any]], output_file: str = "frappe_hr_employee_checkin.xlsx", include_ids: bool = True) -> bool:
+    def get_export_columns(self, include_ids: bool = True) -> List[str]:
+        """Column order of the exported files."""
+        if include_ids:
+            return ["ID", "Employee", "Time", "Log Type"]
+        return ["Employee", "Time", "Log Type"]
+    
+    def get_record_month(self, record: Dict[str, Any]) -> str:
         """
-        Export processed records to Excel file.
+        Month key (YYYY-MM) of a processed record, taken from its DD-MM-YYYY Time string.
+        """
+        time_str = record.get("Time", "")
+        return f"{time_str[6:10]}-{time_str[3:5]}"
+    
+    def get_shard_file(self, output_file: str, month: Optional[str], part: int) -> str:
+        """
+        File name of an export shard, e.g. ``checkin_2025-01.xlsx`` or ``checkin_2025-01_part2.xlsx``.
+        """
+        base, ext = os.path.splitext(output_file)
+        if month:
+            base = f"{base}_{month}"
+        if part > 1:
+            base = f"{base}_part{part}"
+        return f"{base}{ext}"
+    
+    def export_records(self, records: Iterable[Dict[str, Any]], output_file: str = "frappe_hr_employee_checkin.xlsx",
+                       include_ids: bool = True, export_excel: bool = True, export_csv: bool = True,
+                       split_by_month: bool = True, max_rows_per_file: Optional[int] = MAX_ROWS_PER_IMPORT_FILE) -> List[str]:
+        """
+        Stream processed records into Excel and/or CSV files in a single pass.
+        
+        Excel files are written with openpyxl's write-only mode and CSV files through a
+        buffered ``csv.writer``, so memory stays constant no matter how many records the
+        iterable yields. Output is split into Frappe Data Import-sized files: one per
+        month when ``split_by_month`` is set, and a new part every ``max_rows_per_file`` rows.
+        Records are expected in chronological order (as ``iter_processed_records`` yields
+        them); a month that shows up again later goes into a new part instead of
+        overwriting the earlier file.
         
         Args:
-            records: List of processed records
+            records: Iterable of processed records
+            output_file: Base output file path (.xlsx); CSV shards use the same name with .csv
+            include_ids: Whether IDs are included in the records
+            export_excel: Whether to write Excel files
+            export_csv: Whether to write CSV files
+            split_by_month: Whether to write one file per month
+            max_rows_per_file: Maximum data rows per file (None for no limit)
+            
+        Returns:
+            List of written file paths (empty if nothing was written)
+        """
+        columns = self.get_export_columns(include_ids)
+        csv_output_file = output_file.replace('.xlsx', '.csv').replace('.xls', '.csv')
+        written_files = []
+        parts_per_month = {}
+        shard = None
+        total_rows = 0
+        
+        def close_shard(shard):
+            if shard["workbook"] is not None:
+                shard["workbook"].save(shard["excel_file"])
+                written_files.append(shard["excel_file"])
+            if shard["csv_handle"] is not None:
+                shard["csv_handle"].close()
+                written_files.append(shard["csv_file"])
+            logger.info(f"Wrote {shard['rows']} records for {shard['month'] or 'all months'} (part {shard['part']})")
+        
+        def open_shard(month):
+            part = parts_per_month.get(month, 0) + 1
+            parts_per_month[month] = part
+            new_shard = {"month": month, "part": part, "rows": 0,
+                         "workbook": None, "sheet": None, "csv_handle": None, "csv_writer": None,
+                         "excel_file": self.get_shard_file(output_file, month, part),
+                         "csv_file": self.get_shard_file(csv_output_file, month, part)}
+            if export_excel:
+                new_shard["workbook"] = Workbook(write_only=True)
+                new_shard["sheet"] = new_shard["workbook"].create_sheet()
+                new_shard["sheet"].append(columns)
+            if export_csv:
+                new_shard["csv_handle"] = open(new_shard["csv_file"], "w", newline="", encoding="utf-8", buffering=1 << 20)
+                new_shard["csv_writer"] = csv.writer(new_shard["csv_handle"])
+                new_shard["csv_writer"].writerow(columns)
+            return new_shard
+        
+        try:
+            for record in records:
+                month = self.get_record_month(record) if split_by_month else None
+                if shard is not None and (shard["month"] != month or (max_rows_per_file and shard["rows"] >= max_rows_per_file)):
+                    close_shard(shard)
+                    shard = None
+                if shard is None:
+                    shard = open_shard(month)
+                
+                row = [record.get(column, "") for column in columns]
+                if shard["sheet"] is not None:
+                    shard["sheet"].append(row)
+                if shard["csv_writer"] is not None:
+                    shard["csv_writer"].writerow(row)
+                shard["rows"] += 1
+                total_rows += 1
+            
+            if shard is not None:
+                close_shard(shard)
+                shard = None
+        finally:
+            # Release an unfinished shard if the record stream failed
+            if shard is not None and shard["csv_handle"] is not None:
+                shard["csv_handle"].close()
+        
+        if not total_rows:
+            logger.warning("No records to export")
+        else:
+            logger.info(f"Successfully exported {total_rows} records to {len(written_files)} files")
+        return written_files
+    
+    def export_to_excel(self, records: Iterable[Dict[str, Any]], output_file: str = "frappe_hr_employee_checkin.xlsx", include_ids: bool = True) -> bool:
+        """
+        Export processed records to a single Excel file.
+        
+        Args:
+            records: Iterable of processed records (a list or a generator)
             output_file: Output Excel file path
             include_ids: Whether IDs are included in the records
             
@@ -344,36 +521,20 @@ class FrappeHRMigrator:
             True if successful, False otherwise
         """
         try:
-            if not records:
-                logger.warning("No records to export")
-                return False
-            
-            # Create DataFrame
-            df = pd.DataFrame(records)
-            
-            # Ensure proper column order based on whether IDs are included
-            if include_ids:
-                column_order = ["ID", "Employee", "Time", "Log Type"]
-            else:
-                column_order = ["Employee", "Time", "Log Type"]
-            df = df[column_order]
-            
-            # Export to Excel
-            df.to_excel(output_file, index=False, engine='openpyxl')
-            
-            logger.info(f"Successfully exported {len(records)} records to {output_file}")
-            return True
+            written_files = self.export_records(records, output_file, include_ids=include_ids, export_csv=False,
+                                                split_by_month=False, max_rows_per_file=None)
+            return bool(written_files)
             
         except Exception as e:
             logger.error(f"Error exporting to Excel: {str(e)}")
             return False
     
-    def export_to_csv(self, records: List[Dict[str, Any]], output_file: str = "frappe_hr_employee_checkin.csv", include_ids: bool = True) -> bool:
+    def export_to_csv(self, records: Iterable[Dict[str, Any]], output_file: str = "frappe_hr_employee_checkin.csv", include_ids: bool = True) -> bool:
         """
-        Export processed records to CSV file.
+        Export processed records to a single CSV file.
         
         Args:
-            records: List of processed records
+            records: Iterable of processed records (a list or a generator)
             output_file: Output CSV file path
             include_ids: Whether IDs are included in the records
             
@@ -381,25 +542,9 @@ class FrappeHRMigrator:
             True if successful, False otherwise
         """
         try:
-            if not records:
-                logger.warning("No records to export")
-                return False
-            
-            # Create DataFrame
-            df = pd.DataFrame(records)
-            
-            # Ensure proper column order based on whether IDs are included
-            if include_ids:
-                column_order = ["ID", "Employee", "Time", "Log Type"]
-            else:
-                column_order = ["Employee", "Time", "Log Type"]
-            df = df[column_order]
-            
-            # Export to CSV
-            df.to_csv(output_file, index=False, encoding='utf-8')
-            
-            logger.info(f"Successfully exported {len(records)} records to {output_file}")
-            return True
+            written_files = self.export_records(records, output_file, include_ids=include_ids, export_excel=False,
+                                                split_by_month=False, max_rows_per_file=None)
+            return bool(written_files)
             
         except Exception as e:
             logger.error(f"Error exporting to CSV: {str(e)}")
@@ -410,8 +555,11 @@ class FrappeHRMigrator:
         """
         Run the complete migration process.
         
+        Records are streamed from MongoDB straight into per-month Excel/CSV files
+        (see ``export_records``); the written paths are kept in ``self.exported_files``.
+        
         Args:
-            output_file: Output Excel file path
+            output_file: Base output Excel file path
             export_csv: Whether to also export CSV format
             start_date: Optional start date to filter records
             include_ids: Whether to include unique ID generation
@@ -420,39 +568,26 @@ class FrappeHRMigrator:
             True if successful, False otherwise
         """
         logger.info("Starting Frappe HR migration process...")
+        self.exported_files = []
         
         # Connect to MongoDB
         if not self.connect_to_mongodb():
             return False
         
         try:
-            # Fetch and process data
-            records = self.fetch_and_process_data(start_date=start_date, include_ids=include_ids)
+            # Fetch, process and export in one streaming pass
+            records = self.iter_processed_records(start_date=start_date, include_ids=include_ids)
+            self.exported_files = self.export_records(records, output_file, include_ids=include_ids, export_csv=export_csv)
             
-            if not records:
+            if not self.exported_files:
                 logger.warning("No data to migrate")
                 return False
             
-            # Export to Excel
-            excel_success = self.export_to_excel(records, output_file, include_ids=include_ids)
-            
-            # Export to CSV if requested
-            csv_success = True
-            if export_csv:
-                csv_file = output_file.replace('.xlsx', '.csv').replace('.xls', '.csv')
-                csv_success = self.export_to_csv(records, csv_file, include_ids=include_ids)
-            
-            if excel_success and csv_success:
-                logger.info(f"Migration completed successfully!")
-                logger.info(f"Excel file: {output_file}")
-                if export_csv:
-                    csv_file = output_file.replace('.xlsx', '.csv').replace('.xls', '.csv')
-                    logger.info(f"CSV file: {csv_file}")
-                logger.info(f"Total records migrated: {len(records)}")
-                return True
-            else:
-                logger.error("Failed to export data")
-                return False
+            logger.info(f"Migration completed successfully!")
+            for exported_file in self.exported_files:
+                logger.info(f"Exported file: {exported_file}")
+            logger.info(f"Total records migrated: {self.stats.get('processed_records', 0)}")
+            return True
                 
         except Exception as e:
             logger.error(f"Migration failed: {str(e)}")
@@ -464,6 +599,161 @@ class FrappeHRMigrator:
                 self.client.close()
                 logger.info("MongoDB connection closed")
 
+    def get_month_partitions(self, start_date: Optional[datetime] = None) -> List[tuple]:
+        """
+        Split the work history date range into calendar-month partitions.
+        
+        Args:
+            start_date: Optional start date; the first partition starts here
+            
+        Returns:
+            List of (partition_start, partition_end) tuples, end exclusive
+        """
+        match = {"Date": {"$gte": start_date}} if start_date else {"Date": {"$ne": None}}
+        bounds = list(self.work_history_collection.aggregate([
+            {"$match": match},
+            {"$group": {"_id": None, "first": {"$min": "$Date"}, "last": {"$max": "$Date"}}},
+        ]))
+        if not bounds or not bounds[0].get("first"):
+            return []
+        
+        first = pd.to_datetime(bounds[0]["first"]).to_pydatetime()
+        last = pd.to_datetime(bounds[0]["last"]).to_pydatetime()
+        if start_date:
+            first = max(first, start_date)
+        partitions = []
+        month_start = datetime(first.year, first.month, 1)
+        while month_start <= last:
+            next_month = datetime(month_start.year + month_start.month // 12, month_start.month % 12 + 1, 1)
+            partitions.append((max(month_start, start_date) if start_date else month_start, next_month))
+            month_start = next_month
+        return partitions
+    
+    def merge_csv_shards(self, shard_files: List[str], output_file: str) -> bool:
+        """
+        Concatenate CSV shards (in the given order) into one CSV file, keeping a single header.
+        
+        Args:
+            shard_files: CSV shard paths in output order
+            output_file: Merged CSV file path
+            
+        Returns:
+            True if anything was merged, False otherwise
+        """
+        if not shard_files:
+            return False
+        with open(output_file, "w", newline="", encoding="utf-8") as merged:
+            for index, shard_file in enumerate(shard_files):
+                with open(shard_file, "r", newline="", encoding="utf-8") as shard:
+                    header = shard.readline()
+                    if index == 0:
+                        merged.write(header)
+                    shutil.copyfileobj(shard, merged, 1 << 20)
+        logger.info(f"Merged {len(shard_files)} CSV shards into {output_file}")
+        return True
+    
+    def run_partitioned_migration(self, output_file: str = "frappe_hr_employee_checkin.xlsx", export_csv: bool = True,
+                                  start_date: Optional[datetime] = None, include_ids: bool = True,
+                                  max_workers: Optional[int] = None) -> bool:
+        """
+        Run the migration split by month across a process pool.
+        
+        Each month is processed by its own worker with its own MongoDB connection and
+        written to its own shard files. IDs are numbered per month with the record's
+        year in the ID, so shards never collide and re-runs produce the same IDs.
+        When CSV export is enabled the shards are merged into one CSV at the end.
+        
+        Args:
+            output_file: Base output Excel file path
+            export_csv: Whether to also export CSV format (and the merged CSV)
+            start_date: Optional start date to filter records
+            include_ids: Whether to include unique ID generation
+            max_workers: Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            True if every partition succeeded, False otherwise
+        """
+        logger.info("Starting partitioned Frappe HR migration process...")
+        self.exported_files = []
+        
+        if not self.connect_to_mongodb():
+            return False
+        
+        try:
+            partitions = self.get_month_partitions(start_date)
+        finally:
+            self.client.close()
+        
+        if not partitions:
+            logger.warning("No data to migrate")
+            return False
+        
+        max_workers = max_workers or os.cpu_count() or 1
+        logger.info(f"Processing {len(partitions)} monthly partitions with {max_workers} workers")
+        
+        results = {}
+        # spawn: every worker opens its own MongoClient (pymongo clients are not fork-safe)
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = {
+                executor.submit(migrate_partition, self.mongodb_uri, self.database_name,
+                                partition_start, partition_end, output_file, include_ids, export_csv): partition_start
+                for partition_start, partition_end in partitions
+            }
+            for future in as_completed(futures):
+                partition_start = futures[future]
+                try:
+                    results[partition_start] = future.result()
+                except Exception as e:
+                    results[partition_start] = {"files": [], "records": 0, "error": str(e)}
+                result = results[partition_start]
+                if result["error"]:
+                    logger.error(f"Partition {partition_start.strftime('%Y-%m')} failed: {result['error']}")
+                else:
+                    logger.info(f"Partition {partition_start.strftime('%Y-%m')} done: {result['records']} records")
+        
+        failed = [partition_start for partition_start, result in results.items() if result["error"]]
+        shard_files = [f for partition_start in sorted(results) for f in results[partition_start]["files"]]
+        self.exported_files = list(shard_files)
+        self.stats = {"processed_records": sum(result["records"] for result in results.values()),
+                      "partitions": len(partitions), "failed_partitions": len(failed)}
+        
+        if export_csv and not failed:
+            merged_csv = output_file.replace('.xlsx', '.csv').replace('.xls', '.csv')
+            if self.merge_csv_shards([f for f in shard_files if f.endswith(".csv")], merged_csv):
+                self.exported_files.append(merged_csv)
+        
+        if failed:
+            logger.error(f"{len(failed)} of {len(partitions)} partitions failed; shards of the other months were kept")
+            return False
+        if not shard_files:
+            logger.warning("No data to migrate")
+            return False
+        
+        logger.info(f"Partitioned migration completed successfully!")
+        logger.info(f"Total records migrated: {self.stats['processed_records']}")
+        return True
+
+def migrate_partition(mongodb_uri: str, database_name: str, partition_start: datetime, partition_end: datetime,
+                      output_file: str, include_ids: bool = True, export_csv: bool = True) -> Dict[str, Any]:
+    """
+    Process-pool worker: migrate one month partition into its own shard files.
+    
+    Returns:
+        Dict with the written files, the record count and an error message (or None)
+    """
+    migrator = FrappeHRMigrator(mongodb_uri, database_name)
+    if not migrator.connect_to_mongodb():
+        return {"files": [], "records": 0, "error": "Failed to connect to MongoDB"}
+    try:
+        records = migrator.iter_processed_records(start_date=partition_start, end_date=partition_end,
+                                                  include_ids=include_ids, sequence_per_month=True)
+        files = migrator.export_records(records, output_file, include_ids=include_ids, export_csv=export_csv)
+        return {"files": files, "records": migrator.stats.get("processed_records", 0), "error": None}
+    except Exception as e:
+        return {"files": [], "records": 0, "error": str(e)}
+    finally:
+        migrator.client.close()
+
 def main():
     """Main function to run the migration with interactive prompts."""
     print("🚀 Frappe HR Migration Tool")
@@ -522,6 +812,29 @@ def main():
         else:
             print("❌ Please enter 'y' or 'n'")
     
+    print()
+    
+    # Prompt for partitioned mode
+    print("⚡ Parallel Partitioned Mode")
+    print("-" * 60)
+    print("Process each month in its own worker process (uses every CPU core).")
+    print("IDs are numbered per month: EMP-CKIN-{month}-{year}-{sequence}")
+    print()
+    
+    while True:
+        partition_input = input("Run partitioned by month in parallel? (y/n) [n]: ").strip().lower()
+        
+        if partition_input in ['', 'n', 'no']:
+            partitioned = False
+            print("✅ Will run as a single sequential migration")
+            break
+        elif partition_input in ['y', 'yes']:
+            partitioned = True
+            print("✅ Will process months in parallel and merge the shards at the end")
+            break
+        else:
+            print("❌ Please enter 'y' or 'n'")
+    
     print()
     print("🔄 Starting migration process...")
     print()
@@ -534,7 +847,8 @@ def main():
     output_file = f"frappe_hr_employee_checkin_{timestamp}.xlsx"
     
     # Run migration with user preferences
-    success = migrator.run_migration(
+    run = migrator.run_partitioned_migration if partitioned else migrator.run_migration
+    success = run(
         output_file=output_file, 
         export_csv=True,
         start_date=start_date,
@@ -543,9 +857,9 @@ def main():
     
     if success:
         print(f"\n✅ Migration completed successfully!")
-        print(f"📁 Excel file: {output_file}")
-        csv_file = output_file.replace('.xlsx', '.csv')
-        print(f"📁 CSV file: {csv_file}")
+        print(f"📁 Files written ({len(migrator.exported_files)}):")
+        for exported_file in migrator.exported_files:
+            print(f"   {exported_file}")
         if start_date:
             print(f"📅 Filtered from: {start_date.strftime('%Y-%m-%d')}")
         print(f"🆔 IDs included: {'Yes' if include_ids else 'No'}")
@@ -0,0 +1,183 @@
+"""
+ngTeco (NGTecoTime) timecard CSV parser and employee name resolution.
+
+Dependency-light on purpose: importing this module only needs the standard
+library, so CLI scripts, tests and batch jobs can parse timecards without
+importing Streamlit or opening a MongoDB connection. MongoDB is only connected
+(lazily, once) when a name has to be resolved and no collection is passed in.
+
+Timecard layout (one block per employee; a file may hold several blocks):
+
+    ,,,,Timecard Report,,
+    Pay Period,,,20250101-20250115,,,
+    Employee,,,Jane Doe (3),,,
+    Date,,IN,OUT,Work Time, Daily Total, Note
+    WED,20250101,08:00,17:00,,
+    ...
+    Total Hours,,,,,,
+"""
+import io
+import os
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+_employees_collection = None
+
+
+# ----------------------------------------------------------------------
+# 1. Streaming CSV parser
+# ----------------------------------------------------------------------
+
+def _header_value(line: str, label: str) -> Optional[str]:
+    """Value of a 'Pay Period,,,<value>,,,' / 'Employee,,,<value>,,,' line."""
+    for part in line.split(','):
+        if part and part != label and part.strip():
+            return part.strip()
+    return None
+
+
+def iter_ngteco_timecards(lines: Iterable[str]) -> Iterator[Dict]:
+    """
+    Parse ngTeco timecards from an iterable of text lines (e.g. an open file), one block at a time.
+
+    Lines are consumed as they come, so a large multi-employee export is never held in memory
+    as a whole.
+
+    Args:
+        lines: Text lines of one or more timecard blocks
+
+    Yields:
+        dict with 'employee', 'pay_period' and 'records' (list of dicts with day, date,
+        in_time, out_time) for each timecard block
+    """
+    employee_name = None
+    pay_period = None
+    records: List[Dict] = []
+    data_started = False
+
+    for raw_line in lines:
+        line = raw_line.rstrip('\r\n')
+        if not data_started:
+            if line.startswith('Pay Period'):
+                pay_period = _header_value(line, 'Pay Period')
+            elif line.startswith('Employee'):
+                employee_name = _header_value(line, 'Employee')
+            elif 'Date' in line and 'IN' in line and 'OUT' in line:
+                data_started = True
+            continue
+
+        # A block ends at Total Hours or an empty line
+        if line.startswith('Total Hours') or not line.strip():
+            yield {'employee': employee_name, 'pay_period': pay_period, 'records': records}
+            employee_name, pay_period, records, data_started = None, None, [], False
+            continue
+
+        parts = [p.strip() for p in line.split(',')]
+        if len(parts) < 4:
+            continue
+        date_str = parts[1] or None
+        # Skip rows without a date
+        if not date_str or not date_str.isdigit():
+            continue
+        # Include all rows with valid dates, even if IN/OUT are empty
+        # (they can be marked as paid holidays or sick days in the data editor)
+        records.append({
+            'day': parts[0] or None,
+            'date': date_str,
+            'in_time': parts[2] or '',
+            'out_time': parts[3] or '',
+        })
+
+    if data_started or employee_name or pay_period:
+        yield {'employee': employee_name, 'pay_period': pay_period, 'records': records}
+
+
+def parse_ngtecotime_csv(file_content: Union[bytes, str]) -> Dict:
+    """
+    Parse NGTecoTime CSV format and extract relevant information.
+
+    Only the first timecard block is returned; use iter_ngteco_timecards for files with
+    several employees.
+
+    Returns:
+        dict with 'employee', 'pay_period', and 'records' (list of dicts)
+    """
+    text = file_content.decode('utf-8') if isinstance(file_content, bytes) else file_content
+    first = next(iter_ngteco_timecards(io.StringIO(text.strip())), None)
+    return first or {'employee': None, 'pay_period': None, 'records': []}
+
+
+def parse_ngteco_file(path: str) -> List[Dict]:
+    """Parse every timecard block of a CSV file on disk, streaming it line by line."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return list(iter_ngteco_timecards(f))
+
+
+# ----------------------------------------------------------------------
+# 2. Employee name -> username resolution
+# ----------------------------------------------------------------------
+
+def clean_employee_name(full_name: str) -> str:
+    """Strip an ngTeco ID suffix: "Patricia Bruckner (3)" -> "Patricia Bruckner"."""
+    if full_name and '(' in full_name and ')' in full_name:
+        return full_name.split('(')[0].strip()
+    return full_name
+
+
+def username_from_employee(employee: Optional[Dict]) -> Optional[str]:
+    """username2 if set, otherwise username, from an employees document."""
+    if not employee:
+        return None
+    return employee.get("username2") or employee.get("username") or None
+
+
+def _get_employees_collection():
+    """Mongo employees collection, connected on first use only."""
+    global _employees_collection
+    if _employees_collection is None:
+        from dotenv import load_dotenv
+        from pymongo import MongoClient
+
+        load_dotenv()
+        _employees_collection = MongoClient(os.getenv("MONGODB_CLIENT"))["bulldog_office"]["employees"]
+    return _employees_collection
+
+
+def get_username_by_full_name(
+    full_name: str,
+    employees_collection=None,
+    warn: Callable[[str], None] = print,
+    error: Callable[[str], None] = print,
+) -> str:
+    """
+    Look up employee username2 (or username) by full name in MongoDB.
+
+    Args:
+        full_name: Employee full name to search for
+        employees_collection: Collection to search (defaults to a lazily opened connection)
+        warn: Called with a message when the name is not found (e.g. st.warning)
+        error: Called with a message when the lookup fails (e.g. st.error)
+
+    Returns:
+        username2 if found, otherwise username, otherwise the original full_name
+    """
+    try:
+        clean_name = clean_employee_name(full_name)
+        collection = employees_collection if employees_collection is not None else _get_employees_collection()
+
+        # Try exact match first, then case-insensitive
+        for query in (
+            {"full_name": clean_name},
+            {"full_name": {"$regex": f"^{re.escape(clean_name)}$", "$options": "i"}},
+        ):
+            username = username_from_employee(collection.find_one(query, {"username2": 1, "username": 1}))
+            if username:
+                return username
+
+        # If no match found, return the cleaned name
+        warn(f"⚠️ Employee '{clean_name}' not found in database. Using name as-is.")
+        return clean_name
+
+    except Exception as e:
+        error(f"❌ Error looking up employee: {str(e)}")
+        return full_name
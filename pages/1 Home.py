@@ -1,12 +1,10 @@
 from datetime import date, datetime
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Image
+from report_model import build_report_model
 import streamlit as st
 import io
 from io import BytesIO
 from utils import *
+from data_cache import get_employee_usernames, get_employee_work_history, get_calendar_events, invalidate_work_history
 from streamlit_extras.switch_page_button import switch_page
 
 # ----------------------
@@ -61,14 +59,14 @@ def main():
     if file_type_choice == "Single CSV Upload":
         uploaded_file = st.file_uploader("Upload your timecard CSV", type=["csv"], on_change=reset_file)
     elif file_type_choice == "From Bulk Timecard":
-        all_usernames = get_employees()
+        all_usernames = get_employee_usernames()
         selected_username = st.selectbox("Select Employee", all_usernames)
         if "selected_employee" in st.session_state and st.session_state["selected_employee"] != selected_username:
             employee_id, full_name = get_employee_id(selected_username)
             work_history_asked, first_date, last_date = fetch_employee_temp_work_history(employee_id)
             if work_history_asked.empty == False:
                 # Load holiday events from the JSON file.
-                calendar_events_for_bulk = load_calendar_events()  # keys are like "2025-01-04", values like "Weekend/Holiday"
+                calendar_events_for_bulk = get_calendar_events()  # keys are like "2025-01-04", values like "Weekend/Holiday"
 
                 # Convert the keys from string to date objects.
                 calendar_events_date_for_bulk = {
@@ -94,7 +92,7 @@ def main():
             work_history_asked, first_date, last_date = fetch_employee_temp_work_history(employee_id)
             if work_history_asked.empty == False:
                 # Load holiday events from the JSON file.
-                calendar_events_for_bulk = load_calendar_events()  # keys are like "2025-01-04", values like "Weekend/Holiday"
+                calendar_events_for_bulk = get_calendar_events()  # keys are like "2025-01-04", values like "Weekend/Holiday"
 
                 # Convert the keys from string to date objects.
                 calendar_events_date_for_bulk = {
@@ -159,10 +157,10 @@ def main():
         with col13:
             employee_name = st.text_input("**Employee Name:**", value=employee_name, disabled=True)
         with col14:
-            all_usernames = get_employees(employee_name)
+            all_usernames = get_employee_usernames(employee_name)
             selected_username = st.selectbox("Selected Employee", all_usernames)
         employee_id, full_name = get_employee_id(selected_username)
-        old_work_history, previous_hours_overtime, previous_holiday_hours = fetch_employee_work_history(employee_id)
+        old_work_history, previous_hours_overtime, previous_holiday_hours = get_employee_work_history(employee_id)
         latest_hours_overtime = previous_hours_overtime if previous_hours_overtime else old_work_history["Hours Overtime Left"].iloc[-1] if "Hours Overtime Left" in old_work_history and old_work_history["Hours Overtime Left"].iloc[-1] else "00:00"
         col3, col4, colstnhr = st.columns(3)
         with col3:
@@ -192,7 +190,7 @@ def main():
         multiplication_input = 1.0
     
         # Load holiday events from the JSON file (needed for both CSV and bulk timecard)
-        calendar_events = load_calendar_events()  # keys are like "2025-01-04", values like "Weekend/Holiday"
+        calendar_events = get_calendar_events()  # keys are like "2025-01-04", values like "Weekend/Holiday"
 
         # Convert the keys from string to date objects.
         calendar_events_date = {
@@ -275,83 +273,30 @@ def main():
             # For bulk timecard data, ensure original data is stored for comparison
             st.session_state["original_data"] = st.session_state["edited_data"].copy()
     
-        # Use the appropriate data source for the editor
-        data_to_edit = st.session_state["edited_data"]
-        edited_data = st.data_editor(
-            data=data_to_edit,
+        # Edit the data (one month at a time for long ranges); edited_data is the full range
+        edited_data, shown_rows = windowed_data_editor(
+            "edited_data",
+            key="edited_data_editor",
             num_rows="dynamic",
-            key="edited_data_editor"
-        )       
+        )
 
     
         # Compare current data with original data to find differences
         current_data = edited_data  # Use the data from the editor
         original_data = st.session_state.get("original_data", current_data)
         
-        # Create a DataFrame to track which cells have changed
-        changed_cells = pd.DataFrame(False, index=current_data.index, columns=current_data.columns)
-        
-        # Helper function to normalize values for comparison
-        def normalize_value(val):
-            if pd.isna(val) or val is None or str(val).strip() == "" or str(val).lower() in ["nan", "none", "null"]:
-                return ""
-            return str(val).strip()
-        
-        # Determine the correct Note column name
-        note_column = None
-        if " Note" in current_data.columns:
-            note_column = " Note"
-        elif "Note" in current_data.columns:
-            note_column = "Note"
-        
-        # Compare IN, OUT, and Note columns
-        columns_to_compare = ["IN", "OUT"]
-        if note_column:
-            columns_to_compare.append(note_column)
-            
-        for col in columns_to_compare:
-            if col in current_data.columns and col in original_data.columns:
-                # Normalize both current and original values before comparison
-                current_normalized = current_data[col].apply(normalize_value)
-                original_normalized = original_data[col].apply(normalize_value)
-                changed_cells[col] = current_normalized != original_normalized
-        
+        # Cells of IN/OUT/Note that differ from the upload, aligned by Date
+        columns_to_compare = modification_columns(current_data)
+        changed_cells = change_mask(current_data, original_data, columns_to_compare)
+
         # Update manual_modifications field based on changes
-        if not changed_cells.empty:
-            for idx in current_data.index:
-                modified_columns = []
-                for col in columns_to_compare:
-                    if col in changed_cells.columns and changed_cells.loc[idx, col]:
-                        modified_columns.append(col)
-                
-                if modified_columns:
-                    current_data.loc[idx, 'manual_modifications'] = ", ".join(modified_columns)
-                else:
-                    current_data.loc[idx, 'manual_modifications'] = None
-        
+        current_data['manual_modifications'] = manual_modifications_from_mask(changed_cells)
+
         # Apply styling to highlight changed cells
         if not changed_cells.empty:
-            # Create a styled DataFrame for display
-            styled_data = edited_data.copy()  # Use the data from the editor
-            
-            # Add a visual indicator for changed cells
-            for col in columns_to_compare:
-                if col in changed_cells.columns:
-                    changed_mask = changed_cells[col]
-                    
-                    # Only add yellow indicator if the cell actually has a value
-                    for idx in changed_mask[changed_mask].index:
-                        current_val = styled_data.loc[idx, col]
-                        if (pd.isna(current_val) or current_val is None or 
-                            str(current_val).strip() == "" or 
-                            str(current_val).lower() in ["nan", "none", "null"]):
-                            styled_data.loc[idx, col] = "🟡 (empty)"
-                        else:
-                            styled_data.loc[idx, col] = "🟡 " + str(current_val)
-            
-            # Display the styled data
+            # Display the data from the editor with changed cells marked
             st.dataframe(
-                styled_data,
+                highlight_changes(edited_data.loc[shown_rows], changed_cells.loc[shown_rows]),
                 use_container_width=True,
                 hide_index=True
             )
@@ -365,32 +310,15 @@ def main():
                 # Use the data from the editor, not session state
                 updated_df = safe_convert_to_df(edited_data).copy()
                 updated_df["Standard Time"] = decimal_hours_to_hhmmss(standard_work_hours)
-                
-                # Set multiplication to 2 for Sundays and holidays (but not Saturdays)
-                updated_df['Multiplication'] = updated_df.apply(
-                    lambda row: 2.0 if (
-                        (row['Date'] in calendar_events_date and row['Date'].weekday() != 5)  # Holiday but not Saturday
-                    ) else multiplication_input, 
-                    axis=1
-                )
-                
-                updated_df[" Daily Total"] = updated_df.apply(
-                    lambda row: compute_work_duration(row.get("IN", ""), row.get("OUT", "")), axis=1
-                )
-                updated_df["Work Time"], updated_df["Break"] = zip(*updated_df.apply(
-                    lambda row: adjust_work_time_and_break(row[" Daily Total"], row.get("Break"), break_rule_hours, break_hours), axis=1
-                ))
-
-                # Calculate the difference between "Work Time" and "Standard Time"
-                # Both columns are in "hh:mm" string format.
-                updated_df["Difference"] = updated_df.apply(
-                    lambda row: compute_time_difference(row.get("Work Time", ""), row.get("Standard Time", ""), row.get("Holiday", ""), True),
-                    axis=1
-                )
 
-                updated_df["Difference (Decimal)"] = updated_df.apply(
-                    lambda row: compute_time_difference(row.get("Work Time", ""), row.get("Standard Time", ""), row.get("Holiday", ""), False),
-                    axis=1
+                # Only rows edited since the last calculation are recomputed
+                updated_df, st.session_state["home_duration_snapshot"], _ = recompute_work_duration(
+                    updated_df,
+                    calendar_events_date,
+                    break_rule_hours,
+                    break_hours,
+                    base_multiplication=multiplication_input,
+                    snapshot=st.session_state.get("home_duration_snapshot"),
                 )
 
                 # Preserve manual_modifications field from the editor data
@@ -418,8 +346,15 @@ def main():
                     df.loc[valid_holiday_mask, 'Date'].apply(lambda d: d.strftime('%Y-%m-%d'))
                 )
                 
-                # Compute running holiday hours using the extracted holiday dates.
-                df = compute_running_holiday_hours(df, holiday_event_dates, calendar_events_date, holiday_hours, hours_overtime_str)
+                # Re-run the running balances from the first date edited since the last calculation.
+                df, st.session_state["home_balance_snapshot"], _ = recompute_running_balances(
+                    df,
+                    holiday_event_dates,
+                    calendar_events_date,
+                    holiday_hours,
+                    hours_overtime_str,
+                    snapshot=st.session_state.get("home_balance_snapshot"),
+                )
                 
                 # Preserve manual_modifications field from the editor data
                 if 'manual_modifications' in edited_data.columns:
@@ -434,8 +369,14 @@ def main():
             if st.button("Save Data to DB", use_container_width=True):
                 # Use the data from the editor, not session state
                 updated_df = safe_convert_to_df(edited_data).copy()
-                work_history_created = upsert_employee_work_history(updated_df, employee_id)
+                # Rows with an _id are diffed against the loaded snapshot; new rows are upserted in full
+                work_history_created = upsert_employee_work_history_changes(
+                    updated_df,
+                    st.session_state.get("original_data"),
+                    employee_id
+                )
                 if work_history_created["success"] == True:
+                    invalidate_work_history()
                     st.success("Successfully Saved Data!")
                     if "selected_employee" in st.session_state:
                         delete_employee_temp_work_history(employee_id)
@@ -476,105 +417,48 @@ def main():
                 use_container_width=True
             )
 
-        # --- Calculate Summary Metrics ---
+        # --- Calculate Summary Metrics (once; the PDF summary and table render from the model) ---
         df_to_download = df_to_download.fillna('')
 
-        # Hours expected to work: sum of "Standard Time"
-        total_standard = 0.0
-        for index, row in df_to_download.iterrows():
-            standard_time = row["Standard Time"]
-            is_holiday = row["Holiday"]
-
-            if standard_time and standard_time.strip() != "" and (not is_holiday or str(is_holiday).strip() == ""):
-                try:
-                    total_standard += hhmm_to_decimal(standard_time)
-                except Exception:
-                    pass
-                
-        hours_expected = decimal_hours_to_hhmmss(total_standard)
-
-        # Hours worked: sum of "Work Time"
-        total_work = 0.0
-        for t in df_to_download["Work Time"]:
-            if t and t.strip() != "":
-                try:
-                    total_work += hhmm_to_decimal(t)
-                except Exception:
-                    pass
-        hours_worked = decimal_hours_to_hhmmss(total_work)
-
-        consumed_deficit = 0.0
-
-        # Loop over each row in the DataFrame
-        for _, row in df_to_download.iterrows():
-            # Check if this is a non-holiday row
-            if not row["Holiday"] or str(row["Holiday"]).strip() == "":
-                standard_time = hhmm_to_decimal(row["Standard Time"])
-                worked_time = hhmm_to_decimal(row["Work Time"])
-                # Only if the employee worked less than standard time, add the deficit
-                if worked_time < standard_time:
-                    consumed_deficit += (standard_time - worked_time)
-
-
-
-
-        # Number of breaks: count of rows where "Break" is not empty and not "00:00"
-        breaks_count = df_to_download["Break"].apply(
-            lambda x: bool(x and x.strip() != "" and x != "00:00")
-        ).sum()
-
-        # Duration of breaks: sum of all valid "Break" values
-        total_breaks = 0.0
-        for t in df_to_download["Break"]:
-            if t and t.strip() != "" and t != "00:00":
-                try:
-                    total_breaks += hhmm_to_decimal(t)
-                except Exception:
-                    pass
-        breaks_duration = decimal_hours_to_hhmmss(total_breaks)
-
-        # Total hours availability: sum of "Daily Total"
-        total_daily = 0.0
-        for t in df_to_download[" Daily Total"]:
-            if t and t.strip() != "":
-                try:
-                    total_daily += hhmm_to_decimal(t)
-                except Exception:
-                    pass
-        total_hours_availability = decimal_hours_to_hhmmss(total_daily)
-
         # Update column selection and ordering
         desired_columns = ["Date", " Daily Total", "Break", "Day", "Holiday", "Holiday Hours", 
                         "Hours Overtime Left", "IN", "OUT", "Standard Time", "Multiplication", "Work Time"]
+        # Mark modified cells for the PDF table, compared with the upload
+        modified = change_mask(
+            df_to_download,
+            st.session_state.get("original_data", df_to_download),
+            modification_columns(df_to_download),
+            include_recorded=True,
+        )
+        report_model = build_report_model(
+            df_to_download.assign(**{f"{col}_Modified": modified[col] for col in modified.columns}),
+            employee_name=employee_name,
+            pay_period=pay_period,
+            standard_work_hours=standard_work_hours,
+            table_columns=desired_columns,
+            highlight_flags={col: f"{col}_Modified" for col in modified.columns},
+        )
         df_to_download = df_to_download[desired_columns]
 
+        # reportlab is only loaded once there is data to render
+        from reportlab.lib.pagesizes import A4, landscape
+        from reportlab.lib import colors
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+        from report_template import get_report_styles, explanation_pages
+        from report_assets import report_logo
+
         # --- Build the PDF File with Enhanced Styling ---
         pdf_buffer = BytesIO()
         doc = SimpleDocTemplate(pdf_buffer, pagesize=landscape(A4),
                                 leftMargin=30, rightMargin=30, 
                                 topMargin=60, bottomMargin=40)  # Increased top margin for header
 
-        styles = getSampleStyleSheet()
+        report_styles = get_report_styles()
 
         # Custom Styles
-        header_style = ParagraphStyle(
-            'Header',
-            parent=styles['Heading1'],
-            fontName='Helvetica-Bold',
-            fontSize=24,
-            textColor=colors.HexColor("#2c3e50"),
-            alignment=1,
-            spaceAfter=20
-        )
+        header_style = report_styles["header"]
 
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontName='Helvetica-Oblique',
-            fontSize=10,
-            textColor=colors.HexColor("#7f8c8d"),
-            alignment=2
-        )
+        footer_style = report_styles["footer"]
 
         # Create header and footer templates
         def add_header_footer(canvas, doc):
@@ -593,35 +477,28 @@ def main():
         elements = []
 
         # -- First Page: Enhanced Summary --
-        # Resize logo
-        logo = Image("https://bulldogsliving.com/img/brand_logo/logo.png", width=200, height=60)
-        elements.append(logo)
+        # Logo (local asset, decoded once per process)
+        elements.append(report_logo(width=200, height=60))
         elements.append(Spacer(1, 30))
 
         # Summary Title
         elements.append(Paragraph("WORK HOURS SUMMARY", header_style))
         elements.append(Spacer(1, 30))
-        updated_df_pdf = safe_convert_to_df(edited_data).copy()
         # Summary Table with modern styling and explanations
         summary_data = [
             ["Metric", "Value", "What This Means"],
             ["Employee", employee_name, "Your name as recorded in the system"],
             ["Pay Period", pay_period, "The date range this report covers"],
-            ["Hours worked", hours_worked, "Total hours you actually worked (sum of all 'Work Time' entries)"],
-            ["Hours expected", hours_expected, "Total hours you were expected to work (sum of all 'Standard Time' entries, excluding holidays)"],
-            ["Overtime or Undertime Balance", updated_df_pdf["Hours Overtime Left"].iloc[-1], "Your current overtime balance. Positive = overtime earned, Negative = undertime owed"],
-            ["Remaining Holiday Hours", updated_df_pdf["Holiday Hours"].iloc[-1], "Your remaining paid holiday hours that you can use"],
-            ["Total Sick Days", updated_df_pdf["Holiday"].apply(lambda x: 1 if x == "sick" or x == "Sick" else 0).sum(), "Number of days marked as sick leave in this period"],
-            ["Total Available Time Off", decimal_hours_to_hhmmss(hhmm_to_decimal(updated_df_pdf["Holiday Hours"].iloc[-1]) + hhmm_to_decimal(updated_df_pdf["Hours Overtime Left"].iloc[-1])), "Combined hours of holiday time + overtime that you can use for time off"]
+            ["Hours worked", report_model.hours_worked, "Total hours you actually worked (sum of all 'Work Time' entries)"],
+            ["Hours expected", report_model.hours_expected, "Total hours you were expected to work (sum of all 'Standard Time' entries, excluding holidays)"],
+            ["Overtime or Undertime Balance", report_model.overtime_balance, "Your current overtime balance. Positive = overtime earned, Negative = undertime owed"],
+            ["Remaining Holiday Hours", report_model.holiday_hours, "Your remaining paid holiday hours that you can use"],
+            ["Total Sick Days", report_model.sick_days, "Number of days marked as sick leave in this period"],
+            ["Total Available Time Off", report_model.available_time_off, "Combined hours of holiday time + overtime that you can use for time off"]
         ]
 
-        # Calculate Total Available Time Off in Days
-        total_available_hours = hhmm_to_decimal(updated_df_pdf["Holiday Hours"].iloc[-1]) + hhmm_to_decimal(updated_df_pdf["Hours Overtime Left"].iloc[-1])
-        standard_work_hours_per_day = standard_work_hours # Convert "08:00" to decimal hours
-        total_available_days = total_available_hours / standard_work_hours_per_day if standard_work_hours_per_day > 0 else 0
-        
         # Add the days calculation to the summary
-        summary_data.append(["Total Available Time Off (Days)", f"{total_available_days:.1f} days", "Your total available time off converted to full work days (assuming 8-hour workday)"])
+        summary_data.append(["Total Available Time Off (Days)", f"{report_model.available_time_off_days:.1f} days", "Your total available time off converted to full work days (assuming 8-hour workday)"])
 
         summary_table = Table(summary_data, colWidths=[150, 150, 420])
         summary_table.setStyle(TableStyle([
@@ -644,34 +521,13 @@ def main():
         elements.append(Spacer(1, 20))
 
         # Add legend for yellow indicators
-        legend_style = ParagraphStyle(
-            'Legend',
-            parent=styles['Normal'],
-            fontName='Helvetica',
-            fontSize=10,
-            textColor=colors.HexColor("#2c3e50"),
-            alignment=0,
-            spaceAfter=10
-        )
+        legend_style = report_styles["legend"]
         elements.append(Paragraph("Note: Cells with yellow background indicate manually modified data from the original upload.", legend_style))
         elements.append(Spacer(1, 10))
 
         # Create styled data table
-        table_data = [df_to_download.columns.tolist()] + df_to_download.astype(str).values.tolist()
-        # Adjust the column widths based on the longest value between the column name and its data
-        max_column_widths = [
-            max(
-                len(str(col)),  # Length of the column header
-                max(len(str(item)) for item in df_to_download[col].astype(str).values)  # Length of longest value
-            ) * 4.9  # Width multiplier (adjust as needed for your font)
-            for col in df_to_download.columns
-        ]
-
-        # Ensure a minimum width of 40
-        max_column_widths = [max(40, width) for width in max_column_widths]
-
-        # Create the table with calculated column widths
-        data_table = Table(table_data, repeatRows=1, colWidths=max_column_widths)
+        # Column widths are sized from the longest header/value of each column
+        data_table = Table(report_model.table_data, repeatRows=1, colWidths=report_model.column_widths)
 
         # Prepare styling for yellow indicators
         table_style = [
@@ -686,234 +542,22 @@ def main():
             ('RIGHTPADDING', (0,0), (-1,-1), 5),
         ]
 
-        # Add yellow background for manually modified cells
-        # Determine the correct Note column name
-        note_column = None
-        if " Note" in df_to_download.columns:
-            note_column = " Note"
-        elif "Note" in df_to_download.columns:
-            note_column = "Note"
-        
-        # Columns to check for modifications
-        columns_to_check = ["IN", "OUT"]
-        if note_column:
-            columns_to_check.append(note_column)
-        
-        # Get the original data for comparison
-        original_data = st.session_state.get("original_data", df_to_download)
-        
-        # Helper function to normalize values for comparison
-        def normalize_value(val):
-            if pd.isna(val) or val is None or str(val).strip() == "" or str(val).lower() in ["nan", "none", "null"]:
-                return ""
-            return str(val).strip()
-        
-        # Check for manual modifications and add yellow styling
-        for row_idx, (_, row) in enumerate(df_to_download.iterrows(), start=1):  # start=1 because row 0 is header
-            for col_name in columns_to_check:
-                if col_name in df_to_download.columns:
-                    col_idx = df_to_download.columns.get_loc(col_name)
-                    current_val = normalize_value(row[col_name])
-                    
-                    # Check if this cell was manually modified
-                    is_modified = False
-                    if 'manual_modifications' in row and pd.notna(row['manual_modifications']):
-                        modified_cols = [col.strip() for col in str(row['manual_modifications']).split(",")]
-                        if col_name in modified_cols:
-                            is_modified = True
-                    else:
-                        # Fallback: compare with original data
-                        if col_name in original_data.columns and row_idx <= len(original_data):
-                            original_val = normalize_value(original_data.iloc[row_idx-1][col_name])
-                            if current_val != original_val:
-                                is_modified = True
-                    
-                    if is_modified:
-                        table_style.append(('BACKGROUND', (col_idx, row_idx), (col_idx, row_idx), colors.HexColor("#fff3cd")))
-                        table_style.append(('GRID', (col_idx, row_idx), (col_idx, row_idx), 2, colors.HexColor("#ffc107")))
+        # Add yellow background for manually modified cells (recorded or differing from the upload)
+        table_style.extend(
+            command
+            for cell in report_model.highlight_cells
+            for command in (
+                ('BACKGROUND', cell, cell, colors.HexColor("#fff3cd")),
+                ('GRID', cell, cell, 2, colors.HexColor("#ffc107")),
+            )
+        )
 
         data_table.setStyle(TableStyle(table_style))
         elements.append(data_table)
         elements.append(PageBreak())
 
-        # -- Detailed Explanation Page --
-        elements.append(Paragraph("📋 COMPLETE REPORT EXPLANATION", header_style))
-        elements.append(Spacer(1, 20))
-
-        # Create explanation styles
-        explanation_style = ParagraphStyle(
-            'Explanation',
-            parent=styles['Normal'],
-            fontName='Helvetica',
-            fontSize=11,
-            textColor=colors.HexColor("#2c3e50"),
-            alignment=0,
-            spaceAfter=8,
-            leftIndent=0
-        )
-
-        section_style = ParagraphStyle(
-            'Section',
-            parent=styles['Heading2'],
-            fontName='Helvetica-Bold',
-            fontSize=14,
-            textColor=colors.HexColor("#2c3e50"),
-            alignment=0,
-            spaceAfter=10,
-            spaceBefore=15
-        )
-
-        # Page 1: Summary Metrics Explanation
-        elements.append(Paragraph("📊 SUMMARY METRICS EXPLANATION", section_style))
-        
-        summary_explanations = [
-            "🏢 <b>Employee & Pay Period:</b> Basic identification information showing your name and the time period covered by this report.",
-            "",
-            "⏰ <b>Hours Worked:</b> The total number of hours you actually worked during this period. This is calculated by adding up all your 'Work Time' entries from each day.",
-            "",
-            "📅 <b>Hours Expected:</b> The total number of hours you were supposed to work during this period. This is calculated by adding up all your 'Standard Time' entries (usually 8 hours per day), excluding holidays and weekends.",
-            "",
-            "💰 <b>Overtime or Undertime Balance:</b> This shows your current overtime balance. A positive number means you've worked extra hours that you can use as time off. A negative number means you owe hours to the company.",
-            "",
-            "🏖️ <b>Remaining Holiday Hours:</b> Your remaining paid holiday hours that you can use for vacation or other time off.",
-            "",
-            "🏥 <b>Total Sick Days:</b> The number of days in this period that were marked as sick leave.",
-            "",
-            "📈 <b>Total Available Time Off:</b> The combined total of your holiday hours plus overtime balance - this is the total time you can take off.",
-            "",
-            "📊 <b>Total Available Time Off (Days):</b> Your available time off converted to full work days (assuming an 8-hour workday)."
-        ]
-        
-        for explanation in summary_explanations:
-            if explanation.strip():
-                elements.append(Paragraph(explanation, explanation_style))
-            else:
-                elements.append(Spacer(1, 5))
-
-        elements.append(Spacer(1, 15))
-
-        # Page 2: Detailed Work Log Explanation
-        elements.append(Paragraph("📋 DETAILED WORK LOG EXPLANATION", section_style))
-        
-        work_log_explanations = [
-            "📅 <b>Date:</b> The specific date of the work entry.",
-            "",
-            "⏰ <b>Daily Total:</b> The total time you were present at work (from check-in to check-out).",
-            "",
-            "☕ <b>Break:</b> The total break time taken during your work day.",
-            "",
-            "📆 <b>Day:</b> The day of the week (MON, TUE, WED, etc.).",
-            "",
-            "🎉 <b>Holiday:</b> Any holiday or special event on this date (Weekend, Holiday, Vacation, Sick, etc.).",
-            "",
-            "🏖️ <b>Holiday Hours:</b> Your running balance of remaining holiday hours after this date.",
-            "",
-            "💰 <b>Hours Overtime Left:</b> Your running balance of overtime hours after this date.",
-            "",
-            "🕐 <b>IN:</b> Your check-in time for the day.",
-            "",
-            "🕕 <b>OUT:</b> Your check-out time for the day.",
-            "",
-            "⏱️ <b>Standard Time:</b> The number of hours you were expected to work on this day (usually 8 hours).",
-            "",
-            "📊 <b>Multiplication:</b> Any multiplier applied to your hours (e.g., 2x for holiday work).",
-            "",
-            "💼 <b>Work Time:</b> The actual hours you worked after subtracting break time."
-        ]
-        
-        for explanation in work_log_explanations:
-            if explanation.strip():
-                elements.append(Paragraph(explanation, explanation_style))
-            else:
-                elements.append(Spacer(1, 5))
-
-        elements.append(Spacer(1, 15))
-
-        # Page 3: How Calculations Work
-        elements.append(Paragraph("🧮 HOW CALCULATIONS WORK", section_style))
-        
-        calculation_explanations = [
-            "📊 <b>Work Time Calculation:</b>",
-            "   Work Time = Daily Total - Break Time",
-            "   Example: If you were at work for 9 hours and took 1 hour break, your Work Time = 8 hours",
-            "",
-            "💰 <b>Overtime Calculation:</b>",
-            "   Overtime = Work Time - Standard Time",
-            "   Example: If you worked 9 hours and standard time is 8 hours, overtime = 1 hour",
-            "",
-            "🏖️ <b>Holiday Hours:</b>",
-            "   • You start with a certain number of holiday hours per year",
-            "   • Each day you take vacation, sick leave, or personal time, hours are deducted",
-            "   • The remaining balance is shown in the 'Holiday Hours' column",
-            "",
-            "💰 <b>Overtime Balance:</b>",
-            "   • Positive overtime hours accumulate when you work more than standard time",
-            "   • These can be used for time off or paid out",
-            "   • The running balance is shown in the 'Hours Overtime Left' column",
-            "",
-            "📈 <b>Available Time Off:</b>",
-            "   Total Available = Holiday Hours + Overtime Balance",
-            "   This is the total time you can take off."
-        ]
-        
-        for explanation in calculation_explanations:
-            if explanation.strip():
-                elements.append(Paragraph(explanation, explanation_style))
-            else:
-                elements.append(Spacer(1, 5))
-
-        elements.append(Spacer(1, 15))
-
-        # Page 4: Understanding the Data
-        elements.append(Paragraph("🔍 UNDERSTANDING YOUR DATA", section_style))
-        
-        understanding_explanations = [
-            "🟡 <b>Yellow Highlighted Cells:</b>",
-            "   These indicate data that was manually modified from the original upload. This helps you see what changes were made to your timecard data.",
-            "",
-            "📊 <b>Reading the Summary:</b>",
-            "   • Compare 'Hours Worked' vs 'Hours Expected' to see if you met your work requirements",
-            "   • Check 'Overtime Balance' to see if you have extra time available",
-            "   • Review 'Holiday Hours' to know how much vacation time you have left",
-            "",
-            "📅 <b>Understanding Patterns:</b>",
-            "   • Look for consistent work patterns",
-            "   • Identify days with high overtime",
-            "   • Check your break time usage",
-            "",
-            "⚠️ <b>What to Watch For:</b>",
-            "   • Negative overtime balance (means you owe hours)",
-            "   • Low holiday hours remaining",
-            "   • Inconsistent check-in/check-out times",
-            "   • Missing break times on long work days"
-        ]
-        
-        for explanation in understanding_explanations:
-            if explanation.strip():
-                elements.append(Paragraph(explanation, explanation_style))
-            else:
-                elements.append(Spacer(1, 5))
-
-        elements.append(Spacer(1, 15))
-
-        # Page 5: Contact Information
-        elements.append(Paragraph("📞 NEED HELP?", section_style))
-        
-        help_explanations = [
-            "If you have questions about this report or need clarification on any of the data:",
-            "",
-            "📧 <b>Contact your supervisor or HR department</b>",
-            "📱 <b>Check the documentation in the Bulldog Office system</b>",
-            "📋 <b>Review your timecard entries for accuracy</b>",
-            "",
-            "This report is generated automatically based on your timecard data. If you notice any discrepancies, please contact your supervisor immediately."
-        ]
-        
-        for explanation in help_explanations:
-            if explanation.strip():
-                elements.append(Paragraph(explanation, explanation_style))
-            else:
-                elements.append(Spacer(1, 5))
+        # -- Detailed Explanation Pages (static, laid out once per process) --
+        elements.extend(explanation_pages("timecard"))
 
         # Build document with header/footer
         doc.build(elements, onFirstPage=add_header_footer, onLaterPages=add_header_footer)
@@ -1,154 +1,31 @@
 import streamlit as st
 import pandas as pd
-from datetime import date, datetime, timedelta
-from io import BytesIO
-from typing import Any, Dict, Optional, Tuple
+from datetime import date
 
 from streamlit_extras.switch_page_button import switch_page
 
-from employee_manager import fetch_overtime_payouts
-from frappe_client import (
-    FrappeClientError,
-    fetch_employee_checkins,
-    build_daily_checkins_from_employee_checkins,
-    fetch_frappe_employees,
-    fetch_employee_time_config,
-    fetch_employee_attendance,
-    build_daily_rows_from_attendance_and_checkins,
-    fetch_holiday_year_balances_for_report,
+from frappe_client import FrappeClientError
+from data_cache import (
+    frappe_refresh_button,
+    get_calendar_events,
+    get_employee_time_config,
+    get_frappe_employees,
+    get_frappe_report,
+    get_report_defaults,
+    get_report_inputs,
 )
-from utils import (
-    decimal_hours_to_hhmmss,
-    hhmm_to_decimal,
-    compute_work_duration,
-    adjust_work_time_and_break,
-    compute_time_difference,
-    compute_running_holiday_hours,
-    load_calendar_events,
-    safe_convert_to_df,
+from frappe_report import (
+    FrappeReportError,
+    render_frappe_report_pdf,
+    report_file_name,
+    frappe_report_cache_key,
+    generate_period_reports,
+    report_reads_mirror,
 )
-
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Image
-
-
-def _sum_payout_hours(payout_records):
-    total_hours = 0.0
-    for payout in payout_records:
-        payout_hours = payout.get("payout_hours")
-        if payout_hours:
-            total_hours += hhmm_to_decimal(str(payout_hours))
-    return total_hours
-
-
-def _apply_overtime_payout_deductions(df, payout_records):
-    df = df.copy()
-    df["Overt. Paid"] = ""
-    df["Payout Date"] = ""
-
-    if df.empty or not payout_records:
-        return df
-
-    payout_hours_by_date = {}
-    payout_notes_by_date = {}
-    for payout in payout_records:
-        payout_date = payout.get("payout_date")
-        if payout_date is None:
-            continue
-
-        payout_hours_decimal = hhmm_to_decimal(str(payout.get("payout_hours") or "00:00"))
-        payout_hours_by_date[payout_date] = payout_hours_by_date.get(payout_date, 0.0) + payout_hours_decimal
-
-        payout_note = str(payout.get("note") or "").strip()
-        if payout_note:
-            payout_notes_by_date.setdefault(payout_date, []).append(payout_note)
-
-    running_paid_out = 0.0
-    for idx, row in df.iterrows():
-        row_date = row.get("Date")
-        if isinstance(row_date, pd.Timestamp):
-            row_date = row_date.date()
-        elif isinstance(row_date, str):
-            row_date = pd.to_datetime(row_date).date()
-
-        payout_today = payout_hours_by_date.get(row_date, 0.0)
-        if payout_today:
-            df.at[idx, "Overt. Paid"] = decimal_hours_to_hhmmss(payout_today)
-            payout_label = row_date.isoformat()
-            payout_notes = payout_notes_by_date.get(row_date, [])
-            if payout_notes:
-                payout_label = f"{payout_label} ({'; '.join(payout_notes)})"
-            df.at[idx, "Payout Date"] = payout_label
-
-        running_paid_out += payout_today
-        current_balance = hhmm_to_decimal(str(row.get("Hours Overtime Left") or "00:00"))
-        df.at[idx, "Hours Overtime Left"] = decimal_hours_to_hhmmss(current_balance - running_paid_out)
-
-    return df
-
-
-DEFAULT_BREAK_RULE_HHMM = "06:00"
-DEFAULT_BREAK_DURATION_HHMM = "00:30"
-
-
-def _parse_shift_standard_hhmm(std_hours_raw: object, _float_hours_to_hhmm) -> Optional[str]:
-    if std_hours_raw is None:
-        return None
-    try:
-        if isinstance(std_hours_raw, (int, float)):
-            return _float_hours_to_hhmm(float(std_hours_raw))
-        if isinstance(std_hours_raw, str) and std_hours_raw.strip():
-            try:
-                return _float_hours_to_hhmm(float(std_hours_raw))
-            except ValueError:
-                return std_hours_raw.strip()
-    except Exception:
-        pass
-    return None
-
-
-def _parse_shift_optional_nonzero_float_to_hhmm(raw: object, _float_hours_to_hhmm) -> Optional[str]:
-    if raw is None:
-        return None
-    try:
-        if isinstance(raw, (int, float)):
-            v = float(raw)
-        elif isinstance(raw, str) and raw.strip():
-            v = float(raw.strip())
-        else:
-            return None
-        if v == 0:
-            return None
-        return _float_hours_to_hhmm(v)
-    except (TypeError, ValueError):
-        return None
-
-
-def _parse_shift_daily_limit_hours(raw: object) -> Optional[float]:
-    if raw is None:
-        return None
-    try:
-        v = float(raw.strip()) if isinstance(raw, str) else float(raw)
-        if v <= 0:
-            return None
-        return v
-    except (TypeError, ValueError):
-        return None
-
-
-def _apply_daily_work_limit(work_time_str: object, limit_hours: Optional[float]) -> str:
-    """After break adjustment, cap credited work time at limit_hours (decimal hours)."""
-    if work_time_str is None:
-        work_time_str = ""
-    text = str(work_time_str).strip()
-    if limit_hours is None or text == "":
-        return text
-    wt = hhmm_to_decimal(text)
-    if wt <= limit_hours:
-        return text
-    return decimal_hours_to_hhmmss(limit_hours)
+from report_cache import get_cached_report, store_report
+from job_queue import enqueue_jobs, ensure_job_workers, show_job_progress
+from frappe_mirror import ensure_mirror_sync
+from utils import hhmm_to_decimal
 
 
 def main():
@@ -159,6 +36,11 @@ def main():
         switch_page("Login")
         return
 
+    # Attendance, check-ins and shifts are read from the local Frappe mirror once it is synced
+    ensure_mirror_sync()
+    # Picks up report emails queued before a server restart
+    ensure_job_workers()
+
     st.title("Frappe HR – Employee PDF Report")
 
     st.markdown(
@@ -171,16 +53,13 @@ def main():
         """
     )
 
-    # --- Load employees from Frappe (cached in session) ---
-    if "frappe_employees" not in st.session_state:
-        try:
-            with st.spinner("Loading employees from Frappe HR..."):
-                st.session_state["frappe_employees"] = fetch_frappe_employees()
-        except Exception as e:
-            st.error(f"Failed to load employees from Frappe HR: {e}")
-            st.session_state["frappe_employees"] = []
-
-    employees = st.session_state.get("frappe_employees", [])
+    # --- Load employees from Frappe (shared cache, see data_cache) ---
+    try:
+        employees = get_frappe_employees()
+    except Exception as e:
+        st.error(f"Failed to load employees from Frappe HR: {e}")
+        employees = []
+    frappe_refresh_button("frappe_pdf_refresh_frappe")
     employee_options = []
     code_by_label = {}
     name_by_code = {}
@@ -216,46 +95,24 @@ def main():
             single = date_input_value if not isinstance(date_input_value, (list, tuple)) else date_input_value[0]
             start_date, end_date = single, single
 
-    # --- Load per-employee time config from Frappe ---
-    def normalize_time_value(value: object, fallback: str) -> str:
-        if value is None or value == "":
-            return fallback
-        try:
-            # Numeric value interpreted as decimal hours
-            if isinstance(value, (int, float)):
-                return decimal_hours_to_hhmmss(float(value))
-            # Already a time-like string
-            return str(value)
-        except Exception:
-            return fallback
-
     frappe_config = {}
+    report_inputs = None
     if employee_code:
-        # Always fetch fresh data (no caching) to ensure latest data from Frappe HR
+        # All Frappe/Mongo reads of the report at once, concurrently; cached for
+        # FRAPPE_CACHE_TTL_SECONDS and "Refresh from Frappe HR" forces a reload
         try:
-            # Try calling with report_start_date parameter
-            import inspect
-            sig = inspect.signature(fetch_employee_time_config)
-            if 'report_start_date' in sig.parameters:
-                kwargs = {"report_start_date": start_date}
-                if "report_end_date" in sig.parameters:
-                    kwargs["report_end_date"] = end_date
-                frappe_config = fetch_employee_time_config(employee_code, **kwargs)
-            else:
-                # Fallback for cached old version - call without the parameter
-                frappe_config = fetch_employee_time_config(employee_code)
-                # Manually calculate overtime if needed
-                if start_date and frappe_config.get("standard_work_hours"):
-                    from frappe_client import calculate_historical_overtime_balance
-                    try:
-                        calculated_overtime = calculate_historical_overtime_balance(
-                            employee_code=employee_code,
-                            standard_work_hours_hhmm=frappe_config.get("standard_work_hours"),
-                            start_date=start_date,
-                        )
-                        frappe_config["initial_overtime"] = calculated_overtime
-                    except Exception:
-                        pass
+            report_inputs = get_report_inputs(employee_code, start_date, end_date, True)
+            frappe_config = report_inputs["time_config"]
+        except Exception as e:
+            # Load step by step instead, so the failing read is reported where it occurs
+            print(f"Warning: Could not prefetch the report data for {employee_code}: {e}")
+    if employee_code and report_inputs is None:
+        try:
+            frappe_config = get_employee_time_config(
+                employee_code,
+                report_start_date=start_date,
+                report_end_date=end_date,
+            )
         except FrappeClientError as e:
             st.error(str(e))
             frappe_config = {}
@@ -263,113 +120,15 @@ def main():
             st.warning(f"Could not load time configuration from Frappe for {employee_code}: {e}")
             frappe_config = {}
 
-    # Get standard work hours from custom_shifts_by_period for the start_date
-    # Find the period that contains start_date, or the most recent period before start_date
-    std_default_from_period = None
-    if employee_code and start_date:
-        try:
-            from frappe_client import fetch_employee_shifts_by_period, _get_base_config, _build_auth_headers, _float_hours_to_hhmm
-            import requests
-            
-            shifts_by_period = fetch_employee_shifts_by_period(employee_code)
-            
-            if shifts_by_period:
-                # Find the period that contains start_date, or the most recent period before start_date
-                matching_period = None
-                most_recent_before = None
-                most_recent_end_date = None
-                
-                for period in shifts_by_period:
-                    start_date_str = period.get("start_date")
-                    end_date_str = period.get("end_date")
-                    shift_type = period.get("shift_type")
-                    
-                    if not start_date_str or not end_date_str or not shift_type:
-                        continue
-                    
-                    try:
-                        try:
-                            period_start = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-                        except:
-                            try:
-                                period_start = datetime.strptime(start_date_str, "%d-%m-%Y").date()
-                            except:
-                                continue
-                        
-                        try:
-                            period_end = datetime.strptime(end_date_str, "%Y-%m-%d").date()
-                        except:
-                            try:
-                                period_end = datetime.strptime(end_date_str, "%d-%m-%Y").date()
-                            except:
-                                continue
-                        
-                        # Check if start_date falls within this period
-                        if period_start <= start_date <= period_end:
-                            matching_period = period
-                            break
-                        
-                        # Track the most recent period that ends before start_date
-                        if period_end < start_date:
-                            if most_recent_end_date is None or period_end > most_recent_end_date:
-                                most_recent_end_date = period_end
-                                most_recent_before = period
-                    except Exception:
-                        continue
-                
-                # Use matching period if found, otherwise use most recent period before start_date
-                selected_period = matching_period if matching_period else most_recent_before
-                
-                if selected_period:
-                    shift_type = selected_period.get("shift_type")
-                    if shift_type:
-                        try:
-                            base_url, _, _ = _get_base_config()
-                            headers = _build_auth_headers()
-                            
-                            shift_url = f"{base_url}/api/resource/Shift Type/{shift_type}"
-                            shift_resp = requests.get(shift_url, headers=headers, timeout=10)
-                            
-                            if shift_resp.status_code == 200:
-                                shift_data = shift_resp.json()
-                                if isinstance(shift_data, dict) and "data" in shift_data:
-                                    shift_doc = shift_data["data"]
-                                    std_hours_raw = shift_doc.get("custom_standard_work_hours")
-                                    
-                                    if std_hours_raw is not None:
-                                        try:
-                                            if isinstance(std_hours_raw, (int, float)):
-                                                std_default_from_period = _float_hours_to_hhmm(float(std_hours_raw))
-                                            elif isinstance(std_hours_raw, str) and std_hours_raw.strip():
-                                                try:
-                                                    float_val = float(std_hours_raw)
-                                                    std_default_from_period = _float_hours_to_hhmm(float_val)
-                                                except ValueError:
-                                                    std_default_from_period = std_hours_raw.strip()
-                                        except Exception:
-                                            pass
-                        except Exception as e:
-                            print(f"Error fetching shift type {shift_type}: {e}")
-        except Exception as e:
-            print(f"Warning: Could not fetch shifts_by_period for {employee_code}: {e}")
-    
-    all_payouts_until_end = fetch_overtime_payouts(employee_code=employee_code, end_date=end_date) if employee_code else []
-    prior_period_payouts = [
-        payout for payout in all_payouts_until_end
-        if payout.get("payout_date") and payout["payout_date"] < start_date
-    ]
-    in_period_payouts = [
-        payout for payout in all_payouts_until_end
-        if payout.get("payout_date") and start_date <= payout["payout_date"] <= end_date
-    ]
-
-    # Use period-based value if found, otherwise fallback to default_shift value
-    std_default = normalize_time_value(std_default_from_period or frappe_config.get("standard_work_hours"), "08:00")
-    overtime_default_raw = normalize_time_value(frappe_config.get("initial_overtime"), "00:00")
-    overtime_default = decimal_hours_to_hhmmss(
-        hhmm_to_decimal(overtime_default_raw) - _sum_payout_hours(prior_period_payouts)
-    )
-    holiday_default = normalize_time_value(frappe_config.get("initial_holiday_hours"), "00:00")
+    # Standard hours come from custom_shifts_by_period for start_date (fallback: default_shift);
+    # the overtime default already has payouts dated before start_date deducted.
+    report_defaults = {}
+    if employee_code:
+        report_defaults = get_report_defaults(employee_code, start_date, end_date, frappe_config, report_inputs)
+    in_period_payouts = report_defaults.get("in_period_payouts", [])
+    std_default = report_defaults.get("standard_work_hours", "08:00")
+    overtime_default = report_defaults.get("initial_overtime", "00:00")
+    holiday_default = report_defaults.get("initial_holiday_hours", "00:00")
 
     col3, col4, col5 = st.columns(3)
     with col3:
@@ -390,902 +149,180 @@ def main():
         )
         holiday_hours = hhmm_to_decimal(holiday_hours_str)
 
-    if st.button("Generate PDF from Frappe HR", use_container_width=True):
-        if not employee_code:
-            st.error("Please select a Frappe employee.")
-            return
-
+    # --- Report data: memoized per employee, period and settings (see data_cache) ---
+    report = None
+    if employee_code:
+        employee_name = employee_display_name or employee_code
+        report_args = (
+            employee_code,
+            employee_name,
+            start_date,
+            end_date,
+            standard_work_hours,
+            initial_overtime_str,
+            holiday_hours,
+            in_period_payouts,
+            frappe_config.get("standard_work_hours"),
+            get_calendar_events(),
+        )
         try:
-            with st.spinner("Fetching Attendance data from Frappe HR..."):
-                # Fetch Attendance records as primary source
-                attendance_records = fetch_employee_attendance(
-                    employee_code=employee_code,
-                    start_date=start_date,
-                    end_date=end_date,
-                )
-
-            if not attendance_records:
-                st.warning("No Attendance data found for the selected period.")
-                return
-
-            # Fetch Employee Checkin records to get IN/OUT times for days when employee was present
-            with st.spinner("Fetching Employee Checkin data for work hours..."):
-                raw_checkins = fetch_employee_checkins(
-                    employee_code=employee_code,
-                    start=datetime.combine(start_date, datetime.min.time()),
-                    end=datetime.combine(end_date, datetime.max.time()),
-                )
-            
-            # Build checkins by date dictionary for quick lookup
-            checkins_by_date: Dict[str, Dict[str, Optional[str]]] = {}
-            edited_times_by_date: Dict[str, Dict[str, bool]] = {}  # Track which IN/OUT times are edited
-            if raw_checkins:
-                daily_checkins = build_daily_checkins_from_employee_checkins(raw_checkins)
-                for checkin_row in daily_checkins:
-                    date_key = checkin_row["Date"].isoformat() if isinstance(checkin_row["Date"], date) else str(checkin_row["Date"])
-                    checkins_by_date[date_key] = {
-                        "IN": checkin_row.get("IN"),
-                        "OUT": checkin_row.get("OUT"),
-                    }
-                    edited_times_by_date[date_key] = {
-                        "IN_Edited": checkin_row.get("IN_Edited", False),
-                        "OUT_Edited": checkin_row.get("OUT_Edited", False),
-                    }
-            
-            # Build daily rows from Attendance records, filling in IN/OUT from checkins
-            daily_rows = build_daily_rows_from_attendance_and_checkins(
-                attendance_records=attendance_records,
-                checkins_by_date=checkins_by_date,
-            )
-            
-            # Load calendar events for holidays
-            calendar_events = load_calendar_events()
-            calendar_events_date = {
-                pd.to_datetime(date_str, format="%Y-%m-%d").date(): event
-                for date_str, event in calendar_events.items()
-            }
-            
-            # Get all dates in the selected range
-            all_dates_in_range = set()
-            current_date = start_date
-            while current_date <= end_date:
-                all_dates_in_range.add(current_date)
-                current_date += timedelta(days=1)
-            
-            # Get dates that already have Attendance records
-            existing_dates = {row["Date"] for row in daily_rows if "Date" in row}
-            
-            # Find missing dates (weekends and holidays without Attendance records)
-            missing_weekends_holidays = []
-            for date_obj in all_dates_in_range:
-                if date_obj not in existing_dates:
-                    # Check if it's a weekend (Saturday=5, Sunday=6)
-                    is_weekend = date_obj.weekday() >= 5
-                    # Check if it's in calendar events (could be weekend or public holiday)
-                    holiday_label_from_calendar = calendar_events_date.get(date_obj)
-                    is_in_calendar = holiday_label_from_calendar is not None
-                    
-                    # Determine if it's a public holiday:
-                    # - If it's in calendar events AND NOT a weekend, it's a public holiday
-                    # - If it's in calendar events AND is a weekend, check the label
-                    is_public_holiday = False
-                    if is_in_calendar:
-                        if not is_weekend:
-                            # Not a weekend but in calendar = public holiday
-                            is_public_holiday = True
-                        else:
-                            # It's a weekend, check if calendar label indicates it's also a holiday
-                            holiday_str = str(holiday_label_from_calendar).lower()
-                            # If label contains "holiday" (and not just "weekend"), it's a public holiday on weekend
-                            if "holiday" in holiday_str and holiday_str != "weekend":
-                                is_public_holiday = True
-                    
-                    # Include weekends OR public holidays
-                    if is_weekend or is_public_holiday:
-                        # Determine holiday label and leave type
-                        if is_weekend and is_public_holiday:
-                            # Weekend that is also a public holiday
-                            holiday_label = holiday_label_from_calendar or "Weekend/Holiday"
-                            leave_type = "Public Holiday"  # It's a public holiday, so mark as Paid Holiday
-                        elif is_weekend:
-                            # Just a weekend (not a public holiday)
-                            holiday_label = "Weekend"
-                            leave_type = None  # Weekends are NOT paid holidays
-                        else:
-                            # Public holiday that is NOT a weekend
-                            holiday_label = holiday_label_from_calendar or "Holiday"
-                            leave_type = "Public Holiday"  # Public holidays are paid holidays
-                        
-                        # Create a row for this missing weekend/holiday
-                        day_name = date_obj.strftime("%a").upper()
-                        missing_weekends_holidays.append({
-                            "Day": day_name,
-                            "Date": date_obj,
-                            "IN": None,
-                            "OUT": None,
-                            "Status": "On Leave",
-                            "Leave Type": leave_type,
-                            "Holiday": holiday_label,
-                        })
-            
-            # Combine Attendance records with missing weekends/holidays
-            if missing_weekends_holidays:
-                daily_rows.extend(missing_weekends_holidays)
-            
-            if not daily_rows:
-                st.warning("No daily rows generated from Attendance data.")
-                return
-            
-            df = pd.DataFrame(daily_rows)
-            
-            # Add columns to track which IN/OUT times are edited
-            df["IN_Edited"] = df.apply(
-                lambda row: edited_times_by_date.get(
-                    row["Date"].isoformat() if isinstance(row["Date"], date) else str(row["Date"]),
-                    {}
-                ).get("IN_Edited", False),
-                axis=1
-            )
-            df["OUT_Edited"] = df.apply(
-                lambda row: edited_times_by_date.get(
-                    row["Date"].isoformat() if isinstance(row["Date"], date) else str(row["Date"]),
-                    {}
-                ).get("OUT_Edited", False),
-                axis=1
-            )
-
-            # First, populate Holiday column from calendar events (only for rows where Holiday is not already set)
-            # This preserves the Holiday values we set for missing weekends/holidays
-            df["Holiday"] = df.apply(
-                lambda row: row.get("Holiday") if pd.notnull(row.get("Holiday")) and str(row.get("Holiday")).strip() != "" 
-                else calendar_events_date.get(row["Date"]), 
-                axis=1
-            )
-            
-            # Then, mark "Paid Holiday" leave types as holidays (only if Holiday is not already set to a specific value)
-            # This ensures "On Leave" with "Paid Holiday" leave type is considered as holiday
-            # But don't override if Holiday already has a meaningful value (like holiday name)
-            paid_holiday_mask = (
-                (df["Status"] == "On Leave") & 
-                (df["Leave Type"] == "Paid Holiday") &
-                (df["Holiday"].isna() | (df["Holiday"] == "") | (df["Holiday"].astype(str).str.strip() == ""))
-            )
-            df.loc[paid_holiday_mask, "Holiday"] = "Paid Holiday"
-            
-            # Mark "Sick" leave types in the Holiday column
-            # This ensures "On Leave" with "Sick" leave type is marked as "sick" in Holiday column
-            sick_leave_mask = (
-                (df["Status"] == "On Leave") & 
-                (df["Leave Type"] == "Sick")
-            )
-            df.loc[sick_leave_mask, "Holiday"] = "sick"
-            df["Break"] = None
-            
-            # Helper function to convert date values to date objects
-            def get_date_obj(date_val):
-                """Convert various date formats to date object"""
-                if isinstance(date_val, date):
-                    return date_val
-                elif isinstance(date_val, pd.Timestamp):
-                    return date_val.date()
-                elif isinstance(date_val, str):
-                    return pd.to_datetime(date_val).date()
-                else:
-                    # Try to convert using pd.to_datetime
-                    return pd.to_datetime(date_val).date()
-            
-            # Date-specific Shift Type from custom_shifts_by_period: standard hours, optional break
-            # rules (custom_break_rule / custom_break_duration), and optional daily credit cap
-            # (custom_daily_limit) — all floats in decimal hours like custom_standard_work_hours.
-            from frappe_client import fetch_employee_shifts_by_period, _get_base_config, _build_auth_headers, _float_hours_to_hhmm
-            import requests
-
-            shifts_by_period: list = []
-            shift_type_cache: Dict[str, Dict[str, Any]] = {}
-            default_shift_hours_str: Optional[str] = None
-
-            try:
-                shifts_by_period = fetch_employee_shifts_by_period(employee_code)
-
-                try:
-                    time_config = fetch_employee_time_config(
-                        employee_code,
-                        report_start_date=start_date,
-                        report_end_date=end_date,
-                    )
-                    default_shift_hours_str = time_config.get("standard_work_hours")
-                except Exception:
-                    pass
-            except Exception as e:
-                print(f"Warning: Could not fetch shifts_by_period for {employee_code}: {e}")
-                shifts_by_period = []
-
-            def resolve_shift_type_for_date(date_obj: date) -> Optional[str]:
-                for period in shifts_by_period:
-                    start_date_str = period.get("start_date")
-                    end_date_str = period.get("end_date")
-                    period_shift_type = period.get("shift_type")
-                    if not start_date_str or not end_date_str or not period_shift_type:
-                        continue
-                    try:
-                        try:
-                            period_start = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-                        except Exception:
-                            try:
-                                period_start = datetime.strptime(start_date_str, "%d-%m-%Y").date()
-                            except Exception:
-                                continue
-                        try:
-                            period_end = datetime.strptime(end_date_str, "%Y-%m-%d").date()
-                        except Exception:
-                            try:
-                                period_end = datetime.strptime(end_date_str, "%d-%m-%Y").date()
-                            except Exception:
-                                continue
-                        if period_start <= date_obj <= period_end:
-                            return period_shift_type
-                    except Exception:
-                        continue
-                return None
-
-            def ensure_shift_type_cached(shift_type: str) -> None:
-                if shift_type in shift_type_cache:
-                    return
-                empty = {
-                    "standard_hhmm": None,
-                    "break_rule_hhmm": None,
-                    "break_duration_hhmm": None,
-                    "daily_limit_hours": None,
-                }
-                shift_type_cache[shift_type] = empty.copy()
-                try:
-                    base_url, _, _ = _get_base_config()
-                    headers = _build_auth_headers()
-                    shift_url = f"{base_url}/api/resource/Shift Type/{shift_type}"
-                    shift_resp = requests.get(shift_url, headers=headers, timeout=10)
-                    if shift_resp.status_code != 200:
-                        return
-                    shift_data = shift_resp.json()
-                    if not isinstance(shift_data, dict) or "data" not in shift_data:
-                        return
-                    shift_doc = shift_data["data"]
-                    shift_type_cache[shift_type] = {
-                        "standard_hhmm": _parse_shift_standard_hhmm(
-                            shift_doc.get("custom_standard_work_hours"), _float_hours_to_hhmm
-                        ),
-                        "break_rule_hhmm": _parse_shift_optional_nonzero_float_to_hhmm(
-                            shift_doc.get("custom_break_rule"), _float_hours_to_hhmm
-                        ),
-                        "break_duration_hhmm": _parse_shift_optional_nonzero_float_to_hhmm(
-                            shift_doc.get("custom_break_duration"), _float_hours_to_hhmm
-                        ),
-                        "daily_limit_hours": _parse_shift_daily_limit_hours(
-                            shift_doc.get("custom_daily_limit")
-                        ),
-                    }
-                except Exception as e:
-                    print(f"Error fetching shift type {shift_type}: {e}")
-
-            def fallback_standard_str() -> str:
-                if default_shift_hours_str:
-                    return default_shift_hours_str
-                return decimal_hours_to_hhmmss(standard_work_hours)
-
-            def get_effective_shift_params_for_date(date_val) -> Tuple[str, str, str, Optional[float]]:
-                """Standard HH:MM, break rule HH:MM, break duration HH:MM, optional daily limit (hours)."""
-                try:
-                    date_obj = get_date_obj(date_val)
-                except Exception:
-                    return (
-                        fallback_standard_str(),
-                        DEFAULT_BREAK_RULE_HHMM,
-                        DEFAULT_BREAK_DURATION_HHMM,
-                        None,
-                    )
-                st_name = resolve_shift_type_for_date(date_obj)
-                if not st_name:
-                    return (
-                        fallback_standard_str(),
-                        DEFAULT_BREAK_RULE_HHMM,
-                        DEFAULT_BREAK_DURATION_HHMM,
-                        None,
-                    )
-                ensure_shift_type_cached(st_name)
-                p = shift_type_cache.get(st_name) or {}
-                std = p.get("standard_hhmm") or fallback_standard_str()
-                br = p.get("break_rule_hhmm") or DEFAULT_BREAK_RULE_HHMM
-                bd = p.get("break_duration_hhmm") or DEFAULT_BREAK_DURATION_HHMM
-                cap = p.get("daily_limit_hours")
-                return std, br, bd, cap
-
-            df["Standard Time"] = df["Date"].apply(lambda d: get_effective_shift_params_for_date(d)[0])
-            df["Difference"] = None
-            df["Difference (Decimal)"] = None
-            # Initialize Multiplication to 1.0 for all rows first
-            df["Multiplication"] = 1.0
-            df["Hours Overtime Left"] = None
-            df["Holiday Hours"] = None
-            
-            # Set Multiplication to 2.0 for Sundays and Public Holidays (but NOT Saturdays)
-            # Sunday is weekday() == 6, Saturday is weekday() == 5
-            # Public Holidays are in calendar_events_date
-            # Saturdays should always be 1.0, even if they're public holidays
-            # Use vectorized operations for better performance and reliability
-            
-            # Convert all dates to date objects for comparison
-            df_dates = df["Date"].apply(get_date_obj)
-            
-            # Check for Saturdays (weekday == 5) - these should NEVER get 2.0 multiplication
-            is_saturday = df_dates.apply(lambda d: d.weekday() == 5)
-            
-            # Check for Sundays (weekday == 6)
-            is_sunday = df_dates.apply(lambda d: d.weekday() == 6)
-            
-            # Check for Public Holidays
-            is_public_holiday = df_dates.apply(lambda d: d in calendar_events_date)
-            
-            # Set Multiplication to 2.0 for Sundays or Public Holidays, but NOT for Saturdays (even if public holiday)
-            # Use .copy() to ensure we're working with a proper boolean Series
-            mask = ((is_sunday | is_public_holiday) & ~is_saturday).copy()
-            df.loc[mask, "Multiplication"] = 2.0
-            
-            # Ensure Multiplication is explicitly set (defensive check)
-            # This ensures no row has Multiplication > 2.0 or < 1.0
-            df["Multiplication"] = df["Multiplication"].clip(lower=1.0, upper=2.0)
-
-            # Daily Total = raw IN–OUT span; Work Time = after shift-specific break rules, then daily cap
-            df[" Daily Total"] = df.apply(
-                lambda row: compute_work_duration(row.get("IN", ""), row.get("OUT", ""))
-                if row.get("Status") in ["Present", "Half Day"]
-                else "",
-                axis=1,
-            )
-
-            def _work_time_and_break_for_row(row):
-                if row.get("Status") not in ["Present", "Half Day"]:
-                    b = row.get("Break")
-                    return "", b if b is not None else ""
-                br_rule, br_dur, cap = get_effective_shift_params_for_date(row["Date"])[1:]
-                wt, br = adjust_work_time_and_break(
-                    row[" Daily Total"],
-                    row.get("Break"),
-                    br_rule,
-                    br_dur,
-                )
-                wt_capped = _apply_daily_work_limit(wt, cap)
-                return wt_capped, br
-
-            df["Work Time"], df["Break"] = zip(*df.apply(_work_time_and_break_for_row, axis=1))
-
-            df["Difference"] = df.apply(
-                lambda row: compute_time_difference(
-                    row.get("Work Time", ""),
-                    row.get("Standard Time", ""),
-                    row.get("Holiday", ""),
-                    True,
-                ),
-                axis=1,
-            )
-            df["Difference (Decimal)"] = df.apply(
-                lambda row: compute_time_difference(
-                    row.get("Work Time", ""),
-                    row.get("Standard Time", ""),
-                    row.get("Holiday", ""),
-                    False,
-                ),
-                axis=1,
-            )
-
-            # Include all dates with non-empty Holiday column (including "Paid Holiday")
-            valid_holiday_mask = df["Holiday"].apply(lambda v: pd.notnull(v) and str(v).strip() != "")
-            holiday_event_dates = set(
-                df.loc[valid_holiday_mask, "Date"].apply(lambda d: d.strftime("%Y-%m-%d"))
-            )
+            report = get_frappe_report(*report_args, report_inputs)
+        except FrappeClientError as e:
+            st.error(str(e))
+        except Exception as e:
+            st.error(f"Failed to load the report data from Frappe HR: {e}")
+    if report and report.get("error"):
+        st.warning(report["error"])
+        report = None
+    if report:
+        st.dataframe(report["summary"], use_container_width=True, hide_index=True)
+
+    # Rendered PDF of the current selection; kept across reruns until the selection changes
+    pdf_state_key = (
+        employee_code, start_date, end_date, standard_work_hours_str, initial_overtime_str, holiday_hours_str,
+        tuple(str(p.get("_id")) for p in in_period_payouts),
+    )
+    if st.session_state.get("frappe_pdf", {}).get("key") != pdf_state_key:
+        st.session_state.pop("frappe_pdf", None)
 
-            std_hhmm_for_holiday = decimal_hours_to_hhmmss(standard_work_hours)
-            holiday_year_meta = None
-            try:
-                holiday_year_meta = fetch_holiday_year_balances_for_report(
+    if st.button("Generate PDF from Frappe HR", use_container_width=True, disabled=report is None):
+        try:
+            file_name = report_file_name(employee_name, start_date, end_date)
+            with st.spinner("Checking Frappe HR for changes since the last report..."):
+                use_mirror = report_reads_mirror()
+                cache_key = frappe_report_cache_key(
                     employee_code,
+                    employee_name,
                     start_date,
                     end_date,
-                    std_hhmm_for_holiday,
+                    standard_work_hours,
+                    initial_overtime_str,
+                    holiday_hours,
+                    in_period_payouts,
+                    frappe_config.get("standard_work_hours"),
+                    use_mirror=use_mirror,
                 )
-            except FrappeClientError:
-                raise
-            except Exception:
-                holiday_year_meta = None
-
-            h_alloc = None
-            h_bal = None
-            h_windows = None
-            if holiday_year_meta:
-                h_alloc, h_bal, h_windows = holiday_year_meta
-
-            df = compute_running_holiday_hours(
-                df,
-                holiday_event_dates,
-                calendar_events_date,
-                holiday_hours,
-                initial_overtime_str,
-                holiday_allocations_by_year=h_alloc,
-                holiday_balance_by_year_at_report_start=h_bal,
-                holiday_allocation_windows=h_windows,
-            )
-            df = _apply_overtime_payout_deductions(df, in_period_payouts)
-
-            # Re-verify and fix Multiplication after compute_running_holiday_hours
-            # This ensures Multiplication is always correct, even if something went wrong
-            def get_date_obj_safe(date_val):
-                """Convert various date formats to date object"""
-                if isinstance(date_val, date):
-                    return date_val
-                elif isinstance(date_val, pd.Timestamp):
-                    return date_val.date()
-                elif isinstance(date_val, str):
-                    return pd.to_datetime(date_val).date()
-                else:
-                    return pd.to_datetime(date_val).date()
-            
-            # Re-check and set Multiplication correctly
-            df_dates_after = df["Date"].apply(get_date_obj_safe)
-            is_saturday_after = df_dates_after.apply(lambda d: d.weekday() == 5)
-            is_sunday_after = df_dates_after.apply(lambda d: d.weekday() == 6)
-            is_public_holiday_after = df_dates_after.apply(lambda d: d in calendar_events_date)
-            
-            # Reset Multiplication to 1.0 first, then set to 2.0 for Sundays and Public Holidays, but NOT for Saturdays
-            df["Multiplication"] = 1.0
-            df.loc[(is_sunday_after | is_public_holiday_after) & ~is_saturday_after, "Multiplication"] = 2.0
-            
-            # Final safeguard: clip to ensure no value is outside 1.0-2.0 range
-            df["Multiplication"] = df["Multiplication"].clip(lower=1.0, upper=2.0)
+                cached = get_cached_report(cache_key)
 
-            df = df.sort_values("Date").reset_index(drop=True)
-
-            # Metrics for PDF summary
-            hours_expected_total = 0.0
-            for _, row in df.iterrows():
-                std = row.get("Standard Time")
-                is_holiday = row.get("Holiday")
-                if std and str(std).strip() != "" and (not is_holiday or str(is_holiday).strip() == ""):
-                    try:
-                        hours_expected_total += hhmm_to_decimal(str(std))
-                    except Exception:
-                        pass
-            hours_expected_str = decimal_hours_to_hhmmss(hours_expected_total)
-
-            total_work = 0.0
-            for t in df["Work Time"]:
-                if t and str(t).strip() != "":
-                    try:
-                        total_work += hhmm_to_decimal(str(t))
-                    except Exception:
-                        pass
-            hours_worked_str = decimal_hours_to_hhmmss(total_work)
-
-            # Build PDF (simplified version based on Home page)
-            employee_name = employee_display_name or employee_code
-            pay_period = f"{start_date} - {end_date}"
-
-            pdf_buffer = BytesIO()
-            doc = SimpleDocTemplate(
-                pdf_buffer,
-                pagesize=landscape(A4),
-                leftMargin=30,
-                rightMargin=30,
-                topMargin=60,
-                bottomMargin=40,
-            )
-
-            styles = getSampleStyleSheet()
-
-            header_style = ParagraphStyle(
-                "Header",
-                parent=styles["Heading1"],
-                fontName="Helvetica-Bold",
-                fontSize=24,
-                textColor=colors.HexColor("#2c3e50"),
-                alignment=1,
-                spaceAfter=20,
-            )
-
-            def add_header_footer(canvas, doc_):
-                canvas.saveState()
-                canvas.setFont("Helvetica-Bold", 16)
-                canvas.setFillColor(colors.HexColor("#2c3e50"))
-                canvas.drawString(40, doc_.pagesize[1] - 40, "Bulldog Office - Work Hours Report (Frappe HR)")
-                canvas.setFont("Helvetica", 10)
-                canvas.setFillColor(colors.HexColor("#7f8c8d"))
-                canvas.drawRightString(doc_.pagesize[0] - 40, 30, f"Page {doc_.page}")
-                canvas.restoreState()
-
-            elements = []
-
-            # -- First Page: Enhanced Summary --
-            # Resize logo
-            logo = Image("https://bulldogsliving.com/img/brand_logo/logo.png", width=200, height=60)
-            elements.append(logo)
-            elements.append(Spacer(1, 30))
-
-            # Summary page
-            elements.append(Paragraph("WORK HOURS SUMMARY (Frappe HR)", header_style))
-            elements.append(Spacer(1, 30))
-
-            last_row = df.iloc[-1]
-            
-            # Calculate Total Sick Days
-            sick_days_count = 0
-            for _, row in df.iterrows():
-                holiday_val = row.get("Holiday", "")
-                leave_type = row.get("Leave Type", "")
-                if (holiday_val and str(holiday_val).strip().lower() == "sick") or \
-                   (leave_type and str(leave_type).strip() == "Sick"):
-                    sick_days_count += 1
-            
-            # Calculate Total Available Time Off (HH:MM)
-            # Combine holiday hours + overtime balance (negative undertime will be deducted)
-            holiday_hours_str = last_row.get("Holiday Hours", "00:00") or "00:00"
-            overtime_balance_str = last_row.get("Hours Overtime Left", "00:00") or "00:00"
-            
-            holiday_hours_decimal = hhmm_to_decimal(holiday_hours_str)
-            overtime_balance_decimal = hhmm_to_decimal(overtime_balance_str)
-            
-            # Add overtime balance (positive adds, negative deducts)
-            total_available_time_off_decimal = holiday_hours_decimal + overtime_balance_decimal
-            
-            total_available_time_off_hhmm = decimal_hours_to_hhmmss(total_available_time_off_decimal)
-            
-            # Calculate Total Available Time Off (Days)
-            # Convert HH:MM to days based on standard work hours per day
-            total_available_time_off_days = total_available_time_off_decimal / standard_work_hours
-            total_available_time_off_days_str = f"{total_available_time_off_days:.2f}"
-            total_paid_out_in_period_str = decimal_hours_to_hhmmss(_sum_payout_hours(in_period_payouts))
-            last_payout_date = max(
-                (payout["payout_date"] for payout in in_period_payouts if payout.get("payout_date")),
-                default=None,
-            )
-            last_payout_date_str = last_payout_date.isoformat() if last_payout_date else "-"
-            
-            summary_data = [
-                ["Metric", "Value", "What This Means"],
-                ["Employee", employee_name, "Your name as recorded in the system"],
-                ["Pay Period", pay_period, "The date range this report covers"],
-                ["Hours worked", hours_worked_str, "Total hours you actually worked (sum of all 'Work Time' entries)"],
-                ["Hours expected", hours_expected_str, "Total hours you were expected to work (sum of all 'Standard Time' entries, excluding holidays)"],
-                ["Overtime/Undertime Balance", overtime_balance_str, "Your current overtime balance. Positive = overtime earned, Negative = undertime owed"],
-                ["Overt. Paid", total_paid_out_in_period_str, "Total overtime hours that were paid out during the selected period"],
-                ["Last Payout Date", last_payout_date_str, "The most recent overtime payout date inside the selected report period"],
-                ["Remaining Holiday Hours", holiday_hours_str, "Your remaining paid holiday hours that you can use"],
-                ["Total Sick Days", str(sick_days_count), "Number of days marked as sick leave in this period"],
-                ["Total Available Time Off (HH:MM)", total_available_time_off_hhmm, "Combined hours of holiday time + overtime that you can use for time off"],
-                ["Total Available Time Off (Days)", total_available_time_off_days_str, "Your total available time off converted to full work days (assuming 8-hour workday)"],
-            ]
-
-            summary_table = Table(summary_data, colWidths=[150, 150, 420])
-            summary_table.setStyle(
-                TableStyle(
-                    [
-                        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#3498db")),
-                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                        ("GRID", (0, 0), (-1, -1), 1, colors.HexColor("#bdc3c7")),
-                        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#f5f6fa")]),
-                    ]
+            if cached:
+                st.info(
+                    f"⚡ Served from the report cache: nothing changed in Frappe HR since this report "
+                    f"was generated ({cached['created_at']:%Y-%m-%d %H:%M} UTC)."
                 )
-            )
-            elements.append(summary_table)
-            elements.append(PageBreak())
-
-            # Detailed table
-            elements.append(Paragraph("DETAILED WORK LOG (Frappe HR)", header_style))
-            elements.append(Spacer(1, 20))
-
-            desired_columns = [
-                "Date",
-                " Daily Total",
-                "Break",
-                "Day",
-                "Holiday",
-                "Holiday Hours",
-                "Hours Overtime Left",
-                "Overt. Paid",
-                "IN",
-                "OUT",
-                "Standard Time",
-                "Multiplication",
-                "Work Time",
-            ]
-            df_table = df[desired_columns].copy()
-
-            table_data = [df_table.columns.tolist()] + df_table.astype(str).values.tolist()
-            
-            # Find column indices for IN and OUT
-            in_col_idx = desired_columns.index("IN") if "IN" in desired_columns else None
-            out_col_idx = desired_columns.index("OUT") if "OUT" in desired_columns else None
-            
-            # Build table style with yellow highlighting for edited times
-            table_style_commands = [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#2ecc71")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, -1), 9),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#bdc3c7")),
-                ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#f5f6fa")]),
-            ]
-            
-            # Add yellow background for edited IN/OUT times
-            # Row 0 is header, so data rows start from row 1
-            for row_idx in range(1, len(table_data)):
-                df_row_idx = row_idx - 1  # DataFrame index (0-based)
-                if df_row_idx < len(df):
-                    row_data = df.iloc[df_row_idx]
-                    in_edited = row_data.get("IN_Edited", False)
-                    out_edited = row_data.get("OUT_Edited", False)
-                    
-                    # Apply yellow background to IN column if edited
-                    if in_edited and in_col_idx is not None:
-                        table_style_commands.append(
-                            ("BACKGROUND", (in_col_idx, row_idx), (in_col_idx, row_idx), colors.yellow)
-                        )
-                    
-                    # Apply yellow background to OUT column if edited
-                    if out_edited and out_col_idx is not None:
-                        table_style_commands.append(
-                            ("BACKGROUND", (out_col_idx, row_idx), (out_col_idx, row_idx), colors.yellow)
-                        )
-            
-            detailed_col_widths = [55, 55, 42, 36, 160, 65, 89, 59, 38, 38, 60, 60, 48]
-            data_table = Table(table_data, colWidths=detailed_col_widths, repeatRows=1)
-            data_table.setStyle(TableStyle(table_style_commands))
-            elements.append(data_table)
-            elements.append(PageBreak())
-
-            if in_period_payouts:
-                elements.append(Paragraph("OVERTIME PAYOUTS", header_style))
-                elements.append(Spacer(1, 20))
-
-                payout_table_data = [["Payout Date", "Paid-Out Hours", "Note"]]
-                for payout in sorted(in_period_payouts, key=lambda item: item.get("payout_date")):
-                    payout_date_value = payout.get("payout_date")
-                    payout_table_data.append([
-                        payout_date_value.isoformat() if payout_date_value else "",
-                        str(payout.get("payout_hours") or "00:00"),
-                        str(payout.get("note") or ""),
-                    ])
-
-                payout_table = Table(payout_table_data, colWidths=[140, 140, 440], repeatRows=1)
-                payout_table.setStyle(
-                    TableStyle(
-                        [
-                            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#9b59b6")),
-                            ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                            ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#bdc3c7")),
-                            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#f5f6fa")]),
-                        ]
+                pdf_data = cached["pdf"]
+            else:
+                # The memoized report can be up to FRAPPE_CACHE_TTL_SECONDS older than the stamps in
+                # cache_key, so it is read again, from the source the key was stamped from, before
+                # it is stored under that key
+                with st.spinner("Reading the latest data from Frappe HR..."):
+                    get_report_inputs.clear(employee_code, start_date, end_date, use_mirror)
+                    get_frappe_report.clear(*report_args)
+                    report = get_frappe_report(
+                        *report_args, get_report_inputs(employee_code, start_date, end_date, use_mirror)
                     )
+                if report.get("error"):
+                    raise FrappeReportError(report["error"])
+                with st.spinner("Building PDF..."):
+                    pdf_data = render_frappe_report_pdf(report["model"])
+                store_report(
+                    cache_key,
+                    pdf_data,
+                    file_name,
+                    {"employee_code": employee_code, "summary": report["summary"].to_dict("records")},
                 )
-                elements.append(payout_table)
-                elements.append(PageBreak())
-
-            # -- Detailed Explanation Pages --
-            elements.append(Paragraph("📋 COMPLETE REPORT EXPLANATION", header_style))
-            elements.append(Spacer(1, 20))
-
-            # Create explanation styles
-            explanation_style = ParagraphStyle(
-                'Explanation',
-                parent=styles['Normal'],
-                fontName='Helvetica',
-                fontSize=11,
-                textColor=colors.HexColor("#2c3e50"),
-                alignment=0,
-                spaceAfter=8,
-                leftIndent=0
-            )
-
-            section_style = ParagraphStyle(
-                'Section',
-                parent=styles['Heading2'],
-                fontName='Helvetica-Bold',
-                fontSize=14,
-                textColor=colors.HexColor("#2c3e50"),
-                alignment=0,
-                spaceAfter=10,
-                spaceBefore=15
-            )
-
-            # Page 1: Summary Metrics Explanation
-            elements.append(Paragraph("📊 SUMMARY METRICS EXPLANATION", section_style))
-            
-            summary_explanations = [
-                "🏢 <b>Employee & Pay Period:</b> Basic identification information showing your name and the time period covered by this report.",
-                "",
-                "⏰ <b>Hours Worked:</b> The total number of hours you actually worked during this period. This is calculated by adding up all your 'Work Time' entries from each day.",
-                "",
-                "📅 <b>Hours Expected:</b> The total number of hours you were supposed to work during this period. This is calculated by adding up all your 'Standard Time' entries (usually 8 hours per day), excluding holidays and weekends.",
-                "",
-                "💰 <b>Overtime or Undertime Balance:</b> This shows your current overtime balance. A positive number means you've worked extra hours that you can use as time off. A negative number means you owe hours to the company.",
-                "",
-                "💸 <b>Overt. Paid:</b> The total overtime hours that were already paid out during this report period.",
-                "",
-                "🗓️ <b>Last Payout Date:</b> The most recent overtime payout date inside the selected report period.",
-                "",
-                "🏖️ <b>Remaining Holiday Hours:</b> Your remaining paid holiday hours that you can use for vacation or other time off.",
-                "",
-                "🏥 <b>Total Sick Days:</b> The number of days in this period that were marked as sick leave.",
-                "",
-                "📈 <b>Total Available Time Off (HH:MM):</b> The combined total of your holiday hours plus overtime balance (positive overtime adds, negative undertime deducts) - this is the total time you can take off in hours and minutes.",
-                "",
-                "📊 <b>Total Available Time Off (Days):</b> Your available time off converted to full work days (based on your standard work hours per day)."
-            ]
-            
-            for explanation in summary_explanations:
-                if explanation.strip():
-                    elements.append(Paragraph(explanation, explanation_style))
-                else:
-                    elements.append(Spacer(1, 5))
-
-            elements.append(Spacer(1, 15))
-
-            # Page 2: Detailed Work Log Explanation
-            elements.append(Paragraph("📋 DETAILED WORK LOG EXPLANATION", section_style))
-            
-            work_log_explanations = [
-                "📅 <b>Date:</b> The specific date of the work entry.",
-                "",
-                "⏰ <b>Daily Total:</b> The total time you were present at work (from check-in to check-out).",
-                "",
-                "☕ <b>Break:</b> The total break time taken during your work day.",
-                "",
-                "📆 <b>Day:</b> The day of the week (MON, TUE, WED, etc.).",
-                "",
-                "🎉 <b>Holiday:</b> Any holiday or special event on this date (Weekend, Holiday, Vacation, Sick, etc.).",
-                "",
-                "🏖️ <b>Holiday Hours:</b> Your running balance of remaining holiday hours after this date.",
-                "",
-                "💰 <b>Hours Overtime Left:</b> Your running balance of overtime hours after this date.",
-                "",
-                "💸 <b>Overt. Paid:</b> Any overtime hours paid out on that specific date.",
-                "",
-                "🕐 <b>IN:</b> Your check-in time for the day.",
-                "",
-                "🕕 <b>OUT:</b> Your check-out time for the day.",
-                "",
-                "⏱️ <b>Standard Time:</b> The number of hours you were expected to work on this day (usually 8 hours).",
-                "",
-                "📊 <b>Multiplication:</b> Any multiplier applied to your hours (e.g., 2.0 for Sunday or public holiday work).",
-                "",
-                "💼 <b>Work Time:</b> Hours credited for the day: time at work minus break (using your shift's break rules when set in Frappe), then capped by the shift's daily limit when configured."
-            ]
-            
-            for explanation in work_log_explanations:
-                if explanation.strip():
-                    elements.append(Paragraph(explanation, explanation_style))
-                else:
-                    elements.append(Spacer(1, 5))
-
-            elements.append(Spacer(1, 15))
-
-            # Page 3: How Calculations Work
-            elements.append(Paragraph("🧮 HOW CALCULATIONS WORK", section_style))
-            
-            calculation_explanations = [
-                "📊 <b>Work Time Calculation:</b>",
-                "   Daily Total = time from IN to OUT. Break: default is 30 minutes once Daily Total reaches 6 hours;",
-                "   or your Shift Type's custom_break_rule / custom_break_duration (decimal hours) when set in Frappe.",
-                "   Work Time = Daily Total minus that break. If custom_daily_limit is set on the shift, Work Time is capped — extra time does not count toward overtime.",
-                "",
-                "💰 <b>Overtime Calculation:</b>",
-                "   Overtime = Work Time - Standard Time",
-                "   Example: If you worked 9 hours and standard time is 8 hours, overtime = 1 hour",
-                "",
-                "📊 <b>Multiplication for Sundays and Public Holidays:</b>",
-                "   • Work hours on Sundays are multiplied by 2.0",
-                "   • Work hours on public holidays are multiplied by 2.0",
-                "   • This multiplied time is added to your overtime balance",
-                "",
-                "🏖️ <b>Holiday Hours:</b>",
-                "   • You start with a certain number of holiday hours per year",
-                "   • Each day you take vacation (Paid Holiday) deducts hours from your balance",
-                "   • Sick days do NOT deduct from holiday hours",
-                "   • Weekends and public holidays are free and do NOT deduct from holiday hours",
-                "   • The remaining balance is shown in the 'Holiday Hours' column",
-                "",
-                "💰 <b>Overtime Balance:</b>",
-                "   • Positive overtime hours accumulate when you work more than standard time",
-                "   • Work on Sundays and public holidays is multiplied by 2.0 and added to overtime",
-                "   • These can be used for time off or paid out",
-                "   • Paid-out overtime is deducted starting from the payout date",
-                "   • The running balance is shown in the 'Hours Overtime Left' column",
-                "",
-                "📈 <b>Available Time Off:</b>",
-                "   Total Available = Holiday Hours + Overtime Balance",
-                "   • Positive overtime adds to your available time off",
-                "   • Negative undertime deducts from your available time off",
-                "   This is the total time you can take off."
-            ]
-            
-            for explanation in calculation_explanations:
-                if explanation.strip():
-                    elements.append(Paragraph(explanation, explanation_style))
-                else:
-                    elements.append(Spacer(1, 5))
-
-            elements.append(Spacer(1, 15))
-
-            # Page 4: Understanding the Data
-            elements.append(Paragraph("🔍 UNDERSTANDING YOUR DATA", section_style))
-            
-            understanding_explanations = [
-                "📊 <b>Reading the Summary:</b>",
-                "   • Compare 'Hours Worked' vs 'Hours Expected' to see if you met your work requirements",
-                "   • Check 'Overtime Balance' to see if you have extra time available",
-                "   • Review 'Holiday Hours' to know how much vacation time you have left",
-                "   • Check 'Total Available Time Off' to see your combined time off balance",
-                "",
-                "📅 <b>Understanding Patterns:</b>",
-                "   • Look for consistent work patterns",
-                "   • Identify days with high overtime",
-                "   • Check your break time usage",
-                "   • Note Sundays and public holidays with 2.0 multiplication",
-                "",
-                "⚠️ <b>What to Watch For:</b>",
-                "   • Negative overtime balance (means you owe hours)",
-                "   • Low holiday hours remaining",
-                "   • Inconsistent check-in/check-out times",
-                "   • Missing break times on long work days",
-                "",
-                "📋 <b>Data Source:</b>",
-                "   This report is generated from Frappe HR Attendance and Employee Checkin records.",
-                "   Recorded overtime payouts are loaded from Bulldog Office MongoDB storage and applied from their payout dates."
-            ]
-            
-            for explanation in understanding_explanations:
-                if explanation.strip():
-                    elements.append(Paragraph(explanation, explanation_style))
-                else:
-                    elements.append(Spacer(1, 5))
-
-            elements.append(Spacer(1, 15))
+            st.session_state["frappe_pdf"] = {"key": pdf_state_key, "pdf": pdf_data, "file_name": file_name}
 
-            # Page 5: Contact Information
-            elements.append(Paragraph("📞 NEED HELP?", section_style))
-            
-            help_explanations = [
-                "If you have questions about this report or need clarification on any of the data:",
-                "",
-                "📧 <b>Contact your supervisor or HR department</b>",
-                "📱 <b>Check the documentation in the Bulldog Office system</b>",
-                "📋 <b>Review your attendance records in Frappe HR for accuracy</b>",
-                "",
-                "This report is generated automatically based on your Frappe HR Attendance and Employee Checkin data. If you notice any discrepancies, please contact your supervisor immediately."
-            ]
-            
-            for explanation in help_explanations:
-                if explanation.strip():
-                    elements.append(Paragraph(explanation, explanation_style))
-                else:
-                    elements.append(Spacer(1, 5))
+        except FrappeReportError as e:
+            st.warning(str(e))
+        except FrappeClientError as e:
+            st.error(str(e))
+        except Exception as e:
+            st.error(f"Failed to generate PDF from Frappe HR: {e}")
 
-            doc.build(elements, onFirstPage=add_header_footer, onLaterPages=add_header_footer)
-            pdf_data = pdf_buffer.getvalue()
+    if st.session_state.get("frappe_pdf"):
+        st.download_button(
+            label="Download Frappe HR PDF",
+            data=st.session_state["frappe_pdf"]["pdf"],
+            file_name=st.session_state["frappe_pdf"]["file_name"],
+            mime="application/pdf",
+            use_container_width=True,
+        )
 
+    # --- Batch: every employee for the selected pay period ---
+    st.divider()
+    st.subheader("Batch PDFs for the Pay Period")
+    st.caption(
+        "Generates the report for every selected employee using the defaults from Frappe HR "
+        "(standard hours, opening overtime and holiday balances) and downloads them as one ZIP."
+    )
+    active_labels = [
+        f"{emp.get('employee_name') or emp.get('name')} ({emp.get('name')})"
+        for emp in employees
+        if (emp.get("status") or "Active") == "Active"
+    ]
+    batch_labels = st.multiselect(
+        "Employees",
+        employee_options,
+        default=[label for label in active_labels if label in code_by_label],
+    )
+    if st.button("Generate PDFs for All Selected Employees", use_container_width=True):
+        if not batch_labels:
+            st.error("Please select at least one employee.")
+        else:
+            with st.spinner(f"Generating {len(batch_labels)} reports for {start_date} - {end_date}..."):
+                try:
+                    batch_result = generate_period_reports(
+                        start_date,
+                        end_date,
+                        employee_codes=[code_by_label[label] for label in batch_labels],
+                    )
+                except Exception as e:
+                    batch_result = {"success": False, "message": f"Batch generation failed: {e}", "zip_bytes": None, "summary": []}
+            st.session_state["frappe_batch_result"] = batch_result
+
+    employee_by_code = {emp.get("name"): emp for emp in employees}
+    if st.button("Email Reports to All Selected Employees", use_container_width=True):
+        jobs = []
+        missing_email = []
+        for label in batch_labels:
+            emp = employee_by_code.get(code_by_label[label], {})
+            email = emp.get("prefered_email") or emp.get("company_email") or emp.get("personal_email")
+            if not email:
+                missing_email.append(label)
+                continue
+            jobs.append({
+                "label": label,
+                "payload": {
+                    "employee_code": code_by_label[label],
+                    "employee_name": name_by_code.get(code_by_label[label], code_by_label[label]),
+                    "email": email,
+                    "start_date": start_date.isoformat(),
+                    "end_date": end_date.isoformat(),
+                },
+            })
+        if missing_email:
+            st.warning(f"No email address in Frappe HR for: {', '.join(missing_email)}")
+        if jobs:
+            st.session_state["frappe_email_batch"] = enqueue_jobs("frappe_report_email", jobs)
+            st.success(f"Queued {len(jobs)} report emails. They are rendered and sent in the background.")
+    if st.session_state.get("frappe_email_batch"):
+        show_job_progress(st.session_state["frappe_email_batch"], title="Report emails")
+
+    batch_result = st.session_state.get("frappe_batch_result")
+    if batch_result:
+        if batch_result["success"]:
+            st.success(batch_result["message"])
             st.download_button(
-                label="Download Frappe HR PDF",
-                data=pdf_data,
-                file_name=f"{employee_name}_pay_period_{pay_period}_frappe_hr.pdf",
-                mime="application/pdf",
+                label="Download ZIP of PDFs",
+                data=batch_result["zip_bytes"],
+                file_name=f"frappe_hr_reports_{start_date}_{end_date}.zip",
+                mime="application/zip",
                 use_container_width=True,
             )
-
-        except FrappeClientError as e:
-            st.error(str(e))
-        except Exception as e:
-            st.error(f"Failed to generate PDF from Frappe HR: {e}")
+        else:
+            st.error(batch_result["message"])
+        if batch_result["summary"]:
+            st.dataframe(pd.DataFrame(batch_result["summary"]), use_container_width=True, hide_index=True)
 
 
 if __name__ == "__main__":
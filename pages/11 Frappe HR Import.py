@@ -11,9 +11,6 @@ import tempfile
 import os
 
 from streamlit_extras.switch_page_button import switch_page
-import importlib.util
-import sys
-import os
 
 # Import functions from frappe_import_script
 from frappe_import_script import (
@@ -24,14 +21,8 @@ from frappe_import_script import (
     validate_business_days_have_times,
 )
 
-# Import from page with number in name using importlib.util
-pages_dir = os.path.dirname(os.path.abspath(__file__))
-csv_converter_path = os.path.join(pages_dir, "9 CSV to Frappe HR.py")
-spec = importlib.util.spec_from_file_location("csv_converter", csv_converter_path)
-csv_converter = importlib.util.module_from_spec(spec)
-sys.modules["csv_converter"] = csv_converter
-spec.loader.exec_module(csv_converter)
-parse_ngtecotime_csv = csv_converter.parse_ngtecotime_csv
+from ngteco_parser import parse_ngtecotime_csv, get_username_by_full_name
+from data_cache import get_calendar_events, invalidate_frappe_cache
 
 
 def main():
@@ -76,8 +67,7 @@ def main():
                 st.info(f"**Pay Period:** {parsed_data['pay_period']}")
             
             # Load calendar events to check for weekends and public holidays
-            from utils import load_calendar_events
-            calendar_events = load_calendar_events()
+            calendar_events = get_calendar_events()
             
             # Create DataFrame for date selection
             # Filter out weekends and public holidays that don't have IN/OUT times
@@ -191,8 +181,7 @@ def main():
             st.markdown("### 🔄 Step 3: Generate Records")
             
             # Validate business days before allowing generation
-            from utils import load_calendar_events
-            calendar_events = load_calendar_events()
+            calendar_events = get_calendar_events()
             is_valid, missing_days = validate_business_days_have_times(
                 dates_df=edited_df,
                 calendar_events=calendar_events,
@@ -224,9 +213,9 @@ def main():
                         
                         # Get employee username to fetch and display standard work hours
                         employee_full_name = parsed_data['employee']
-                        # Get username from the CSV converter module
-                        get_username_by_full_name = csv_converter.get_username_by_full_name
-                        employee_username = get_username_by_full_name(employee_full_name)
+                        employee_username = get_username_by_full_name(
+                            employee_full_name, warn=st.warning, error=st.error
+                        )
                         
                         # Note: We pass None for standard_work_hours to enable date-specific shift type support
                         # The function will fetch date-specific standard work hours from custom_shifts_by_period
@@ -241,6 +230,9 @@ def main():
                             user_selected_sick_dates=sick_dates,
                             user_selected_holiday_dates=holiday_dates,
                             edited_dates_df=edited_df,  # Pass edited dates with IN/OUT times
+                            employee_username=employee_username,
+                            warn=st.warning,
+                            error=st.error,
                         )
                         
                         # Store in session state so they persist across reruns
@@ -365,6 +357,8 @@ def main():
                         if dry_run_existing:
                             st.info(f"Dry run completed: {results.get('checkin_count', 0)} check-ins, {results.get('attendance_count', 0)} attendance records would be imported.")
                         else:
+                            # Imported check-ins and attendance change the balances Frappe reports
+                            invalidate_frappe_cache()
                             st.success(f"✅ Import completed!")
                             st.metric("Check-ins Imported", results.get('checkin_imported', 0))
                             st.metric("Attendance Imported", results.get('attendance_imported', 0))
@@ -426,6 +420,7 @@ def main():
                         overwrite_existing=False,
                     )
                     
+                    invalidate_frappe_cache()
                     st.success(f"✅ Reimport completed!")
                     st.metric("Check-ins Reimported", results.get('checkin_imported', 0))
                     st.metric("Attendance Reimported", results.get('attendance_imported', 0))
@@ -4,13 +4,107 @@ Extracts IN/OUT times and dates from PDF reports and converts them to ngTeco CSV
 """
 
 import streamlit as st
+import hashlib
 from datetime import datetime, date
 from io import BytesIO
 import pandas as pd
 
 from streamlit_extras.switch_page_button import switch_page
-from pdf_to_ngteco_script import convert_pdf_to_ngteco_csv
-from frappe_client import fetch_frappe_employees
+from pdf_to_ngteco_script import (
+    convert_pdf_to_ngteco_csv,
+    parse_pdf,
+    expand_pdf_uploads,
+    convert_pdfs_in_parallel,
+    build_combined_ngteco_csv,
+    build_ngteco_csv_zip,
+)
+from data_cache import get_frappe_employees
+
+
+def get_parsed_pdf(pdf_content):
+    """Parse an uploaded PDF once per session; reruns and manual retries reuse it (keyed by content hash)."""
+    parsed_pdfs = st.session_state.setdefault("parsed_pdfs", {})
+    pdf_hash = hashlib.sha256(pdf_content).hexdigest()
+    if pdf_hash not in parsed_pdfs:
+        parsed_pdfs[pdf_hash] = parse_pdf(pdf_content)
+    return parsed_pdfs[pdf_hash]
+
+
+def render_batch_mode():
+    """Convert many PDFs (or ZIPs of PDFs) at once across worker processes."""
+    st.markdown("### 📁 Upload PDF Files or ZIP Archives")
+    uploaded_files = st.file_uploader(
+        "Choose PDF files or ZIP archives",
+        type=['pdf', 'zip'],
+        accept_multiple_files=True,
+        help="Upload per-employee PDF reports, or ZIP files containing them",
+    )
+    if not uploaded_files:
+        st.info("👆 Please upload PDF files or a ZIP archive to get started.")
+        return
+
+    if st.button("🔄 Convert All", use_container_width=True, type="primary"):
+        pdf_files = expand_pdf_uploads([(f.name, f.getvalue()) for f in uploaded_files])
+        if not pdf_files:
+            st.warning("⚠️ No PDF files found in the upload.")
+            return
+        order = {name: i for i, (name, _) in enumerate(pdf_files)}
+        results = []
+        progress = st.progress(0.0, text=f"Converting {len(pdf_files)} PDFs...")
+        table_placeholder = st.empty()
+        for result in convert_pdfs_in_parallel(pdf_files):
+            results.append(result)
+            progress.progress(len(results) / len(pdf_files), text=f"Converted {len(results)} of {len(pdf_files)} PDFs")
+            table_placeholder.dataframe(batch_results_frame(results), use_container_width=True, hide_index=True)
+        results.sort(key=lambda r: order.get(r['file'], 0))
+        st.session_state["ngteco_batch_results"] = results
+        st.rerun()
+
+    results = st.session_state.get("ngteco_batch_results")
+    if not results:
+        return
+    converted = [r for r in results if r.get('csv_content')]
+    failed = len(results) - len(converted)
+    if failed:
+        st.warning(f"⚠️ {len(converted)} of {len(results)} PDFs converted, {failed} failed")
+    else:
+        st.success(f"✅ All {len(results)} PDFs converted")
+    st.dataframe(batch_results_frame(results), use_container_width=True, hide_index=True)
+
+    if converted:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="📥 Download Combined ngTeco CSV",
+                data=build_combined_ngteco_csv(converted).encode('utf-8'),
+                file_name=f"ngteco_csv_combined_{timestamp}.csv",
+                mime="text/csv",
+                use_container_width=True,
+            )
+        with col2:
+            st.download_button(
+                label="📥 Download ZIP of CSV Files",
+                data=build_ngteco_csv_zip(converted),
+                file_name=f"ngteco_csv_{timestamp}.zip",
+                mime="application/zip",
+                use_container_width=True,
+            )
+
+
+def batch_results_frame(results):
+    return pd.DataFrame([
+        {
+            "File": r['file'],
+            "Employee": r.get('employee') or "",
+            "Pay Period": r.get('pay_period') or "",
+            "Records": r.get('records', 0),
+            "Seconds": r.get('seconds'),
+            "Status": "✅ OK" if r.get('csv_content') else "❌ Failed",
+            "Error": r.get('error') or "",
+        }
+        for r in results
+    ])
 
 
 def main():
@@ -31,6 +125,16 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
+    mode = st.radio(
+        "Mode",
+        ["Single PDF", "Batch (many PDFs or ZIP)"],
+        horizontal=True,
+        help="Batch mode converts many per-employee PDFs in parallel into one combined CSV and a ZIP of individual CSVs",
+    )
+    if mode != "Single PDF":
+        render_batch_mode()
+        return
+
     # File upload section
     st.markdown("### 📁 Upload PDF File")
     uploaded_file = st.file_uploader(
@@ -65,7 +169,7 @@ def main():
                 st.markdown("### 🔄 Converting PDF to ngTeco CSV")
                 
                 with st.spinner("Extracting data from PDF and converting to ngTeco CSV format..."):
-                    csv_content, error_message = convert_pdf_to_ngteco_csv(pdf_content)
+                    csv_content, error_message = convert_pdf_to_ngteco_csv(get_parsed_pdf(pdf_content))
                 
                 # If automatic extraction succeeded, store it
                 if csv_content and not error_message:
@@ -81,15 +185,11 @@ def main():
                 st.info("💡 Please provide the employee name and pay period manually below.")
                 
                 # Load employees for dropdown
-                if "frappe_employees" not in st.session_state:
-                    try:
-                        with st.spinner("Loading employees from Frappe HR..."):
-                            st.session_state["frappe_employees"] = fetch_frappe_employees()
-                    except Exception as e:
-                        st.warning(f"Could not load employees from Frappe HR: {e}")
-                        st.session_state["frappe_employees"] = []
-                
-                employees = st.session_state.get("frappe_employees", [])
+                try:
+                    employees = get_frappe_employees()
+                except Exception as e:
+                    st.warning(f"Could not load employees from Frappe HR: {e}")
+                    employees = []
                 employee_options = []
                 code_by_label = {}
                 name_by_code = {}
@@ -146,7 +246,7 @@ def main():
                     if st.button("🔄 Convert with Manual Input", use_container_width=True, type="primary"):
                         with st.spinner("Converting PDF with manual inputs..."):
                             csv_content_new, error_message_new = convert_pdf_to_ngteco_csv(
-                                pdf_content,
+                                get_parsed_pdf(pdf_content),
                                 employee_name=manual_employee,
                                 pay_period=manual_pay_period
                             )
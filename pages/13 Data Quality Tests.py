@@ -9,7 +9,9 @@ import pandas as pd
 from io import BytesIO
 
 from streamlit_extras.switch_page_button import switch_page
-from frappe_client import fetch_frappe_employees, fetch_employee_checkins, fetch_employee_attendance
+from frappe_client import fetch_employee_checkins, fetch_employee_attendance
+from data_cache import get_frappe_employees
+from frappe_mirror import ensure_mirror_sync
 from collections import defaultdict
 
 
@@ -21,6 +23,9 @@ def main():
         switch_page("Login")
         return
 
+    # Attendance, check-ins and shifts are read from the local Frappe mirror once it is synced
+    ensure_mirror_sync()
+
     st.title("🔍 Data Quality Tests")
     
     st.markdown("""
@@ -32,7 +37,7 @@ def main():
     
     # Get list of employees
     try:
-        employees = fetch_frappe_employees(limit=1000)
+        employees = get_frappe_employees(limit=1000)
         employee_dict = {emp.get('employee_name', ''): emp.get('name') for emp in employees}
         employee_names = sorted([name for name in employee_dict.keys() if name])
     except Exception as e:
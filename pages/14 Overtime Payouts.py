@@ -4,13 +4,16 @@ from datetime import date
 
 from streamlit_extras.switch_page_button import switch_page
 
-from employee_manager import (
-    create_overtime_payout,
-    delete_overtime_payout,
-    fetch_overtime_payouts,
+from employee_manager import create_overtime_payout, delete_overtime_payout
+from data_cache import (
+    frappe_refresh_button,
+    get_employee_time_config,
+    get_frappe_employees,
+    get_overtime_payouts,
+    invalidate_overtime_payouts,
 )
-from frappe_client import fetch_employee_time_config, fetch_frappe_employees
 from utils import decimal_hours_to_hhmmss, hhmm_to_decimal
+from frappe_mirror import ensure_mirror_sync
 
 
 def _sum_payout_hours(payout_records):
@@ -46,6 +49,9 @@ def main():
         switch_page("Login")
         return
 
+    # Attendance, check-ins and shifts are read from the local Frappe mirror once it is synced
+    ensure_mirror_sync()
+
     st.title("Frappe HR - Overtime Payouts")
 
     col1, col2 = st.columns([3, 1])
@@ -62,16 +68,13 @@ def main():
     with col2:
         if st.button("📚 View Documentation", use_container_width=True):
             switch_page("documentation")
+        frappe_refresh_button("overtime_payouts_refresh_frappe")
 
-    if "frappe_employees" not in st.session_state:
-        try:
-            with st.spinner("Loading employees from Frappe HR..."):
-                st.session_state["frappe_employees"] = fetch_frappe_employees()
-        except Exception as e:
-            st.error(f"Failed to load employees from Frappe HR: {e}")
-            st.session_state["frappe_employees"] = []
-
-    employees = st.session_state.get("frappe_employees", [])
+    try:
+        employees = get_frappe_employees()
+    except Exception as e:
+        st.error(f"Failed to load employees from Frappe HR: {e}")
+        employees = []
     employee_options, code_by_label, name_by_code = _build_employee_options(employees)
 
     if not employee_options:
@@ -83,7 +86,7 @@ def main():
     employee_name = name_by_code.get(employee_code, employee_code)
 
     today = date.today()
-    employee_payouts = fetch_overtime_payouts(employee_code=employee_code)
+    employee_payouts = get_overtime_payouts(employee_code=employee_code)
     paid_out_through_today_decimal = _sum_payout_hours(
         [payout for payout in employee_payouts if payout.get("payout_date") and payout["payout_date"] <= today]
     )
@@ -91,7 +94,7 @@ def main():
     frappe_balance_before_payouts = "00:00"
     adjusted_balance_after_payouts = "00:00"
     try:
-        time_config = fetch_employee_time_config(employee_code, report_start_date=today)
+        time_config = get_employee_time_config(employee_code, report_start_date=today)
         frappe_balance_before_payouts = time_config.get("initial_overtime") or "00:00"
         adjusted_balance_after_payouts = decimal_hours_to_hhmmss(
             hhmm_to_decimal(frappe_balance_before_payouts) - paid_out_through_today_decimal
@@ -137,6 +140,7 @@ def main():
                     note=note,
                 )
                 if result["success"]:
+                    invalidate_overtime_payouts()
                     st.success(result["message"])
                     st.rerun()
                 else:
@@ -177,6 +181,7 @@ def main():
     if st.button("Delete Selected Payout", type="secondary", use_container_width=True):
         delete_result = delete_overtime_payout(delete_options[selected_delete_label])
         if delete_result["success"]:
+            invalidate_overtime_payouts()
             st.success(delete_result["message"])
             st.rerun()
         else:
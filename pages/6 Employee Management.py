@@ -1,18 +1,10 @@
 import streamlit as st
 from datetime import datetime
 import pandas as pd
-import os
-from dotenv import load_dotenv
-from employee_manager import create_employee_account, update_employee_account, delete_employee_account
-from pymongo import MongoClient
+from employee_manager import create_employee_account, update_employee_account, delete_employee_account, employees_collection
+from data_cache import invalidate_employees
 import time
 from streamlit_extras.switch_page_button import switch_page
-load_dotenv()
-
-# MongoDB Setup
-client = MongoClient(os.getenv("MONGODB_CLIENT"))
-db = client["bulldog_office"]
-employees_collection = db["employees"]
 
 def get_profile_dataset(pd_output=True):
     items = list(employees_collection.find({}))  # Retrieve all employees, excluding MongoDB ID field
@@ -96,6 +88,7 @@ def emp_manage_main():
             account_is_created = create_employee_account(**employee)
             with st.status("Loading employee creation process...", expanded=True) as status:
                 if account_is_created["success"]:
+                    invalidate_employees()
                     del st.session_state["employees_manager"]
                     status.update(label="employee Account Creation Completed!", state="complete", expanded=True)
                     st.switch_page("./pages/6 Employee Management.py")
@@ -116,6 +109,7 @@ def emp_manage_main():
         with st.status("Loading employee management process...", expanded=True) as status:
             st.write("Searching for exact employee with username or email...")
             if account_is_updated["success"]:
+                invalidate_employees()
                 del st.session_state["employees_manager"]
                 st.write("Updating employee Account...")
                 st.success("employee Updated!")
@@ -133,6 +127,7 @@ def emp_manage_main():
             employee_deleted = delete_employee_account(old_employee_data["_id"])
             with st.status("Loading employee management process...", expanded=True) as status:
                 if employee_deleted["success"]:
+                    invalidate_employees()
                     st.write("Deleting employee Account...")
                     st.success("employee Deleted!")
                     status.update(label="employee Account Deletion Completed!", state="complete", expanded=True)
@@ -3,65 +3,9 @@ import pandas as pd
 from datetime import datetime
 import io
 from streamlit_extras.switch_page_button import switch_page
-import os
-from dotenv import load_dotenv
-from pymongo import MongoClient
+from employee_manager import employees_collection
 from frappe_client import resolve_frappe_employee_code
-
-# Load environment variables and setup MongoDB
-load_dotenv()
-client = MongoClient(os.getenv("MONGODB_CLIENT"))
-db = client["bulldog_office"]
-employees_collection = db["employees"]
-
-def get_username_by_full_name(full_name):
-    """
-    Look up employee username2 (or username) by full name in MongoDB.
-    
-    Args:
-        full_name: Employee full name to search for
-        
-    Returns:
-        username2 if found, otherwise username, otherwise the original full_name
-    """
-    try:
-        # Clean the full name (remove any ID in parentheses)
-        clean_name = full_name
-        if '(' in full_name and ')' in full_name:
-            clean_name = full_name.split('(')[0].strip()
-        
-        # Try exact match first
-        employee = employees_collection.find_one(
-            {"full_name": clean_name},
-            {"username2": 1, "username": 1}
-        )
-        
-        if employee:
-            # Prefer username2 if it exists, otherwise use username
-            if "username2" in employee and employee["username2"]:
-                return employee["username2"]
-            elif "username" in employee and employee["username"]:
-                return employee["username"]
-        
-        # Try case-insensitive match
-        employee = employees_collection.find_one(
-            {"full_name": {"$regex": f"^{clean_name}$", "$options": "i"}},
-            {"username2": 1, "username": 1}
-        )
-        
-        if employee:
-            if "username2" in employee and employee["username2"]:
-                return employee["username2"]
-            elif "username" in employee and employee["username"]:
-                return employee["username"]
-        
-        # If no match found, return the cleaned name
-        st.warning(f"⚠️ Employee '{clean_name}' not found in database. Using name as-is.")
-        return clean_name
-        
-    except Exception as e:
-        st.error(f"❌ Error looking up employee: {str(e)}")
-        return full_name
+from ngteco_parser import parse_ngtecotime_csv, get_username_by_full_name
 
 def check_for_missing_times(parsed_data):
     """
@@ -108,82 +52,6 @@ def check_for_missing_times(parsed_data):
         'missing_details': missing_details
     }
 
-def parse_ngtecotime_csv(file_content):
-    """
-    Parse NGTecoTime CSV format and extract relevant information.
-    
-    Returns:
-        dict with 'employee', 'pay_period', and 'records' (list of dicts)
-    """
-    lines = file_content.decode('utf-8').strip().split('\n')
-    
-    # Extract metadata
-    employee_name = None
-    pay_period = None
-    
-    for line in lines[:5]:  # Check first 5 lines for metadata
-        if line.startswith('Pay Period'):
-            parts = line.split(',')
-            for part in parts:
-                if part and part != 'Pay Period' and part.strip():
-                    pay_period = part.strip()
-                    break
-        elif line.startswith('Employee'):
-            parts = line.split(',')
-            for part in parts:
-                if part and part != 'Employee' and part.strip():
-                    employee_name = part.strip()
-                    # Extract employee ID from parentheses if present
-                    # e.g., "Patricia Bruckner (3)" -> "Patricia Bruckner"
-                    if '(' in employee_name and ')' in employee_name:
-                        # Keep the full name with ID for now
-                        pass
-                    break
-    
-    # Find the data rows
-    records = []
-    data_started = False
-    
-    for line in lines:
-        # Skip until we find the Date column header
-        if 'Date' in line and 'IN' in line and 'OUT' in line:
-            data_started = True
-            continue
-        
-        if not data_started:
-            continue
-        
-        # Stop at Total Hours or empty lines
-        if line.startswith('Total Hours') or not line.strip():
-            break
-        
-        parts = [p.strip() for p in line.split(',')]
-        
-        if len(parts) >= 4:
-            day = parts[0] if parts[0] else None
-            date_str = parts[1] if parts[1] else None
-            in_time = parts[2] if parts[2] else None
-            out_time = parts[3] if parts[3] else None
-            
-            # Skip rows without a date
-            if not date_str or not date_str.isdigit():
-                continue
-            
-            # Include all rows with valid dates, even if IN/OUT are empty
-            # This allows users to mark them as paid holidays or sick days in the data editor
-            records.append({
-                'day': day,
-                'date': date_str,
-                'in_time': in_time or '',
-                'out_time': out_time or ''
-            })
-    
-    return {
-        'employee': employee_name,
-        'pay_period': pay_period,
-        'records': records
-    }
-
 def convert_to_frappe_format(parsed_data, include_ids=True):
     """
     Convert parsed NGTecoTime data to Frappe HR format.
@@ -195,7 +63,9 @@ def convert_to_frappe_format(parsed_data, include_ids=True):
     employee_full_name = parsed_data['employee']
     
     # Look up username2 (or username) from MongoDB by full name; map CSV full name to Frappe Employee.name
-    employee_username = get_username_by_full_name(employee_full_name)
+    employee_username = get_username_by_full_name(
+        employee_full_name, employees_collection, warn=st.warning, error=st.error
+    )
     frappe_employee_code = resolve_frappe_employee_code(employee_full_name, employee_username)
     
     sequence = 1
@@ -6,64 +6,229 @@ This script:
 1. Parses PDF files generated by the platform
 2. Extracts table data (Date, IN, OUT, Day, etc.)
 3. Converts to ngTeco CSV format
+
+Many PDFs (or ZIPs of PDFs) can be converted at once with convert_pdfs_in_parallel.
 """
 
+import os
+import time
+import bisect
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
+from dataclasses import dataclass, field
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 import re
-import pdfplumber
 from io import BytesIO
 
 
-def extract_table_from_pdf(pdf_content: bytes) -> Optional[pd.DataFrame]:
+# Extraction modes: "fast" reads the work log table from text positions and falls back to
+# "tables" (pdfplumber table detection) when the layout does not validate.
+EXTRACTION_MODES = ("fast", "tables")
+
+# Characters whose tops differ by less than this (points) are on the same text line
+LINE_TOLERANCE = 3.0
+
+@dataclass
+class ParsedPDF:
+    """Text and tables of a PDF, read in a single pass over its pages."""
+    # Tables of every page (pdfplumber extract_tables() output), in page order;
+    # empty when the work log was read in fast mode
+    page_tables: List[List[List[Optional[str]]]] = field(default_factory=list)
+    first_page_text: str = ""
+    # Work log table (header row + data rows) read from the page layout in fast mode
+    work_log: Optional[List[List[str]]] = None
+    mode: str = "tables"
+
+    @property
+    def first_page_tables(self) -> List[List[Optional[str]]]:
+        return self.page_tables[0] if self.page_tables else []
+
+
+def _group_lines(chars: List[Dict]) -> List[List[Dict]]:
+    """Group pdfplumber chars into text lines (top to bottom), each sorted left to right."""
+    lines: List[List[Dict]] = []
+    for char in sorted(chars, key=lambda c: (round(c['top']), c['x0'])):
+        if lines and abs(lines[-1][0]['top'] - char['top']) <= LINE_TOLERANCE:
+            lines[-1].append(char)
+        else:
+            lines.append([char])
+    return [sorted(line, key=lambda c: c['x0']) for line in lines]
+
+
+def _split_cells(line: List[Dict], edges: List[float]) -> Optional[List[str]]:
+    """Cell texts of one text line, by column x-range; None if a character lies outside the table."""
+    cells = [''] * (len(edges) - 1)
+    for char in line:
+        center = (char['x0'] + char['x1']) / 2
+        if center < edges[0] or center > edges[-1]:
+            return None
+        cells[min(bisect.bisect_right(edges, center) - 1, len(cells) - 1)] += char['text']
+    return [' '.join(cell.split()) for cell in cells]
+
+
+def _work_log_from_layout(page) -> Tuple[Optional[List[str]], List[List[str]], bool]:
+    """
+    Read the work log table of one page from character positions and the table grid.
+    
+    The report templates draw every table with a full-height GRID, so the vertical rules
+    give the exact column x-ranges; characters are assigned to columns by their center and
+    to rows by their text line. No pdfplumber table detection (edge intersection) is run.
+    
+    Returns:
+        (header, rows, valid): header is None when the page has no work log table;
+        valid is False when the layout does not validate and table detection should be used
+    """
+    spans: Dict[Tuple[int, int], set] = {}
+    for line in page.lines:
+        if abs(line['x0'] - line['x1']) < 0.5 and line['bottom'] - line['top'] > LINE_TOLERANCE:
+            spans.setdefault((round(line['top']), round(line['bottom'])), set()).add(round(line['x0'], 1))
+    if not spans:
+        return None, [], True
+
+    # Rules of one table may be drawn in segments (e.g. header row and body): merge
+    # vertically touching spans that have the same column edges
+    tables: List[List] = []
+    for (top, bottom), xs in sorted(spans.items()):
+        if tables and tables[-1][2] == xs and top - tables[-1][1] <= LINE_TOLERANCE:
+            tables[-1][1] = max(tables[-1][1], bottom)
+        else:
+            tables.append([top, bottom, xs])
+
+    text_lines = _group_lines(page.chars)
+    for top, bottom, xs in tables:
+        edges = sorted(xs)
+        if len(edges) < 4:
+            continue
+        table_lines = [
+            line for line in text_lines
+            if top - LINE_TOLERANCE <= line[0]['top'] and line[0]['bottom'] <= bottom + LINE_TOLERANCE
+        ]
+        if not table_lines:
+            continue
+        header = _split_cells(table_lines[0], edges)
+        if header is None:
+            continue
+        names = [name.lower() for name in header]
+        if not ('date' in names and 'in' in names and 'out' in names):
+            continue
+        date_idx = names.index('date')
+        rows: List[List[str]] = []
+        for line in table_lines[1:]:
+            row = _split_cells(line, edges)
+            if row is None or not parse_date_from_table(row[date_idx]):
+                return header, rows, False
+            rows.append(row)
+        return header, rows, bool(rows)
+    return None, [], True
+
+
+def parse_pdf(pdf_content: bytes, mode: str = "fast") -> ParsedPDF:
+    """
+    Open the PDF once and read everything the converter needs from it.
+
+    Args:
+        pdf_content: PDF file content as bytes
+        mode: "fast" reads the work log from character positions and the table grid,
+            falling back to table detection when the layout does not validate;
+            "tables" always uses pdfplumber extract_tables()
+
+    Returns:
+        ParsedPDF with the work log (fast mode) or the tables of every page, and the
+        text of the first page
+    """
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"Unknown extraction mode: {mode}")
+    # Imported on first parse; the page loads without pdfplumber until a PDF is uploaded
+    import pdfplumber
+
+    parsed = ParsedPDF(mode=mode)
+    with pdfplumber.open(BytesIO(pdf_content)) as pdf:
+        if mode == "fast":
+            header = None
+            rows: List[List[str]] = []
+            valid = True
+            for page_num, page in enumerate(pdf.pages):
+                if page_num == 0:
+                    parsed.first_page_text = page.extract_text() or ""
+                page_header, page_rows, page_valid = _work_log_from_layout(page)
+                page.close()
+                if page_header is None and header is not None:
+                    # The work log is one contiguous table; the pages after it
+                    # (payouts, explanations) need not be parsed
+                    break
+                if page_header is not None:
+                    if not page_valid or (header is not None and page_header != header):
+                        valid = False
+                        break
+                    header = page_header
+                    rows.extend(page_rows)
+            if valid and header and rows:
+                parsed.work_log = [header] + rows
+                return parsed
+            # Fallback: table detection on the same open document
+            parsed.mode = "tables"
+        for page_num, page in enumerate(pdf.pages):
+            if page_num == 0:
+                parsed.first_page_text = page.extract_text() or ""
+            parsed.page_tables.append(page.extract_tables() or [])
+            # Drop the page's parsed objects; only the extracted text/tables are kept
+            page.close()
+    return parsed
+
+
+def _as_parsed(pdf: Union[bytes, ParsedPDF]) -> ParsedPDF:
+    return pdf if isinstance(pdf, ParsedPDF) else parse_pdf(pdf)
+
+
+def extract_table_from_pdf(pdf: Union[bytes, ParsedPDF]) -> Optional[pd.DataFrame]:
     """
     Extract the detailed work log table from PDF.
     Extracts from all pages and combines all matching tables.
     
     Args:
-        pdf_content: PDF file content as bytes
+        pdf: PDF file content as bytes, or a ParsedPDF from parse_pdf
     
     Returns:
         DataFrame with extracted table data from all pages, or None if extraction fails
     """
     try:
-        pdf_file = BytesIO(pdf_content)
+        parsed = _as_parsed(pdf)
         all_data_rows = []
         header_row = None
         
-        with pdfplumber.open(pdf_file) as pdf:
-            for page_num, page in enumerate(pdf.pages):
-                # Extract tables from each page
-                page_tables = page.extract_tables()
-                
-                if not page_tables:
+        # A work log read in fast mode goes through the same filtering as a detected table
+        tables_by_page = [[parsed.work_log]] if parsed.work_log else parsed.page_tables
+        for page_tables in tables_by_page:
+            if not page_tables:
+                continue
+            
+            for table in page_tables:
+                if not table or len(table) < 2:
                     continue
                 
-                for table in page_tables:
-                    if not table or len(table) < 2:
-                        continue
-                    
-                    # Check if this table has the expected columns
-                    current_header = table[0]
-                    header_str = ' '.join([str(cell) if cell else '' for cell in current_header]).lower()
+                # Check if this table has the expected columns
+                current_header = table[0]
+                header_str = ' '.join([str(cell) if cell else '' for cell in current_header]).lower()
+                
+                if 'date' in header_str and 'in' in header_str and 'out' in header_str:
+                    # Found a detailed work log table
+                    # Store header if not already stored
+                    if header_row is None:
+                        header_row = current_header
                     
-                    if 'date' in header_str and 'in' in header_str and 'out' in header_str:
-                        # Found a detailed work log table
-                        # Store header if not already stored
-                        if header_row is None:
-                            header_row = current_header
+                    # Add data rows (skip header row)
+                    for row in table[1:]:
+                        # Skip if this looks like a header row (contains "Date", "IN", "OUT" as text)
+                        row_str = ' '.join([str(cell) if cell else '' for cell in row]).lower()
+                        if 'date' in row_str and ('in' in row_str or 'out' in row_str):
+                            continue  # Skip header rows that appear in the middle
                         
-                        # Add data rows (skip header row)
-                        for row in table[1:]:
-                            # Skip if this looks like a header row (contains "Date", "IN", "OUT" as text)
-                            row_str = ' '.join([str(cell) if cell else '' for cell in row]).lower()
-                            if 'date' in row_str and ('in' in row_str or 'out' in row_str):
-                                continue  # Skip header rows that appear in the middle
-                            
-                            # Only add rows that have at least some data
-                            if row and any(cell and str(cell).strip() for cell in row):
-                                all_data_rows.append(row)
+                        # Only add rows that have at least some data
+                        if row and any(cell and str(cell).strip() for cell in row):
+                            all_data_rows.append(row)
         
         # If we found data, create DataFrame
         if header_row and all_data_rows:
@@ -99,7 +264,7 @@ def extract_table_from_pdf(pdf_content: bytes) -> Optional[pd.DataFrame]:
         return None
 
 
-def extract_metadata_from_pdf(pdf_content: bytes) -> Dict[str, Optional[str]]:
+def extract_metadata_from_pdf(pdf: Union[bytes, ParsedPDF]) -> Dict[str, Optional[str]]:
     """
     Extract employee name and pay period from PDF.
     Supports two PDF formats:
@@ -107,7 +272,7 @@ def extract_metadata_from_pdf(pdf_content: bytes) -> Dict[str, Optional[str]]:
     2. Working Hours PDF format (with "WORK HOURS — Employee Name" in title and "Period" in summary table)
     
     Args:
-        pdf_content: PDF file content as bytes
+        pdf: PDF file content as bytes, or a ParsedPDF from parse_pdf
     
     Returns:
         Dict with 'employee' and 'pay_period' keys
@@ -118,170 +283,165 @@ def extract_metadata_from_pdf(pdf_content: bytes) -> Dict[str, Optional[str]]:
     }
     
     try:
-        pdf_file = BytesIO(pdf_content)
+        parsed = _as_parsed(pdf)
         
-        with pdfplumber.open(pdf_file) as pdf:
-            # Extract text from all pages to find title (title might be on any page)
-            all_text = ""
-            first_page = pdf.pages[0]
-            first_page_text = first_page.extract_text() or ""
-            all_text = first_page_text
-            
-            # Also try extracting from tables on first page (summary table)
-            first_page_tables = first_page.extract_tables()
+        # Title and summary table are on the first page
+        first_page_text = parsed.first_page_text
+        all_text = first_page_text
+        first_page_tables = parsed.first_page_tables
+        
+        # Try to extract employee name from title (for Working Hours format)
+        # Pattern: "WORK HOURS — Employee Name (number)" or "WORK HOURS — Employee Name"
+        # Try multiple patterns for title extraction
+        title_match = None
+        if all_text:
+            # Pattern 1: "WORK HOURS — Employee Name (number)" with em dash
+            title_match = re.search(r'WORK\s+HOURS\s*[—]\s*([^(]+?)(?:\s*\([^)]+\))?', all_text, re.IGNORECASE)
+            if not title_match:
+                # Pattern 2: "WORK HOURS — Employee Name (number)" with en dash
+                title_match = re.search(r'WORK\s+HOURS\s*[–]\s*([^(]+?)(?:\s*\([^)]+\))?', all_text, re.IGNORECASE)
+            if not title_match:
+                # Pattern 3: "WORK HOURS - Employee Name (number)" with regular dash
+                title_match = re.search(r'WORK\s+HOURS\s*[-]\s*([^(]+?)(?:\s*\([^)]+\))?', all_text, re.IGNORECASE)
+            if not title_match:
+                # Pattern 4: "WORK HOURS — Employee Name" (without number) with em dash
+                title_match = re.search(r'WORK\s+HOURS\s*[—]\s*([^\n(]+)', all_text, re.IGNORECASE)
+            if not title_match:
+                # Pattern 5: "WORK HOURS — Employee Name" (without number) with en dash
+                title_match = re.search(r'WORK\s+HOURS\s*[–]\s*([^\n(]+)', all_text, re.IGNORECASE)
+            if not title_match:
+                # Pattern 6: "WORK HOURS - Employee Name" (without number) with regular dash
+                title_match = re.search(r'WORK\s+HOURS\s*[-]\s*([^\n(]+)', all_text, re.IGNORECASE)
+            if not title_match:
+                # Pattern 7: More flexible - any dash-like character
+                title_match = re.search(r'WORK\s+HOURS\s*[—–\-]\s*([^\n(]+?)(?:\s*\([^)]+\))?', all_text, re.IGNORECASE)
             
-            # Try to extract employee name from title (for Working Hours format)
-            # Pattern: "WORK HOURS — Employee Name (number)" or "WORK HOURS — Employee Name"
-            # Try multiple patterns for title extraction
-            title_match = None
-            if all_text:
-                # Pattern 1: "WORK HOURS — Employee Name (number)" with em dash
-                title_match = re.search(r'WORK\s+HOURS\s*[—]\s*([^(]+?)(?:\s*\([^)]+\))?', all_text, re.IGNORECASE)
-                if not title_match:
-                    # Pattern 2: "WORK HOURS — Employee Name (number)" with en dash
-                    title_match = re.search(r'WORK\s+HOURS\s*[–]\s*([^(]+?)(?:\s*\([^)]+\))?', all_text, re.IGNORECASE)
-                if not title_match:
-                    # Pattern 3: "WORK HOURS - Employee Name (number)" with regular dash
-                    title_match = re.search(r'WORK\s+HOURS\s*[-]\s*([^(]+?)(?:\s*\([^)]+\))?', all_text, re.IGNORECASE)
-                if not title_match:
-                    # Pattern 4: "WORK HOURS — Employee Name" (without number) with em dash
-                    title_match = re.search(r'WORK\s+HOURS\s*[—]\s*([^\n(]+)', all_text, re.IGNORECASE)
-                if not title_match:
-                    # Pattern 5: "WORK HOURS — Employee Name" (without number) with en dash
-                    title_match = re.search(r'WORK\s+HOURS\s*[–]\s*([^\n(]+)', all_text, re.IGNORECASE)
-                if not title_match:
-                    # Pattern 6: "WORK HOURS - Employee Name" (without number) with regular dash
-                    title_match = re.search(r'WORK\s+HOURS\s*[-]\s*([^\n(]+)', all_text, re.IGNORECASE)
-                if not title_match:
-                    # Pattern 7: More flexible - any dash-like character
-                    title_match = re.search(r'WORK\s+HOURS\s*[—–\-]\s*([^\n(]+?)(?:\s*\([^)]+\))?', all_text, re.IGNORECASE)
+            if title_match:
+                employee_name = title_match.group(1).strip()
+                # Remove any trailing parentheses content if captured
+                employee_name = re.sub(r'\s*\([^)]+\)\s*$', '', employee_name)
+                employee_name = ' '.join(employee_name.split())
+                if employee_name:
+                    metadata['employee'] = employee_name
+        
+        # Use first_page_text for other extractions
+        text = first_page_text
+        
+        # Try to extract from summary table first (more reliable)
+        if first_page_tables:
+            for table in first_page_tables:
+                if not table or len(table) < 2:
+                    continue
                 
-                if title_match:
-                    employee_name = title_match.group(1).strip()
-                    # Remove any trailing parentheses content if captured
-                    employee_name = re.sub(r'\s*\([^)]+\)\s*$', '', employee_name)
-                    employee_name = ' '.join(employee_name.split())
-                    if employee_name:
-                        metadata['employee'] = employee_name
-            
-            # Use first_page_text for other extractions
-            text = first_page_text
-            
-            # Try to extract from summary table first (more reliable)
-            if first_page_tables:
-                for table in first_page_tables:
-                    if not table or len(table) < 2:
-                        continue
-                    
-                    # Look for summary table with "Metric", "Value" columns (both formats)
-                    header_row = table[0]
-                    header_str = ' '.join([str(cell) if cell else '' for cell in header_row]).lower()
-                    
-                    if 'metric' in header_str and 'value' in header_str:
-                        # Found summary table, extract employee and pay period from Value column
-                        for row in table[1:]:
-                            if len(row) < 2:
-                                continue
-                            
-                            metric = str(row[0] if row[0] else '').strip().lower()
-                            value = str(row[1] if len(row) > 1 and row[1] else '').strip()
-                            
-                            # Extract employee name (Format 1: "Employee" metric)
-                            if 'employee' in metric and value and not metadata.get('employee'):
-                                # Clean up employee name (remove explanatory text)
-                                employee_name = re.sub(r'\s+Your name as recorded.*$', '', value, flags=re.IGNORECASE)
-                                employee_name = re.sub(r'\s+as recorded.*$', '', employee_name, flags=re.IGNORECASE)
-                                employee_name = re.sub(r'\s+in the system.*$', '', employee_name, flags=re.IGNORECASE)
-                                employee_name = ' '.join(employee_name.split())
-                                metadata['employee'] = employee_name
-                            
-                            # Extract pay period (Format 1: "Pay Period" metric, Format 2: "Period" metric)
-                            if ('pay period' in metric or metric == 'period') and value and not metadata.get('pay_period'):
-                                # Clean up pay period (remove explanatory text)
-                                pay_period_raw = value
-                                pay_period_raw = re.sub(r'\s+The date range.*$', '', pay_period_raw, flags=re.IGNORECASE)
-                                pay_period_raw = re.sub(r'\s+this report covers.*$', '', pay_period_raw, flags=re.IGNORECASE)
-                                pay_period_raw = re.sub(r'\s+The date.*$', '', pay_period_raw, flags=re.IGNORECASE)
-                                # Extract just the date range part - try multiple patterns
-                                date_range_match = re.search(r'(\d{4}[-/]\d{2}[-/]\d{2}\s*[–—-to]+\s*\d{4}[-/]\d{2}[-/]\d{2})', pay_period_raw)
-                                if not date_range_match:
-                                    # Try without spaces around dash
-                                    date_range_match = re.search(r'(\d{4}[-/]\d{2}[-/]\d{2}[–—-]\d{4}[-/]\d{2}[-/]\d{2})', pay_period_raw)
-                                if date_range_match:
-                                    pay_period_raw = date_range_match.group(1).strip()
-                                # Convert format
-                                pay_period = convert_pay_period_format(pay_period_raw)
-                                if pay_period and pay_period != pay_period_raw:  # Only set if conversion succeeded
-                                    metadata['pay_period'] = pay_period
-            
-            # Fallback to text extraction if not found in tables
-            if not metadata.get('employee') or not metadata.get('pay_period'):
-                if text:
-                    # Extract employee name (look for "Employee" label or try title again)
-                    if not metadata.get('employee'):
-                        # Try title extraction again with all patterns (in case it wasn't found earlier)
-                        title_match = None
-                        if text:
-                            title_match = re.search(r'WORK\s+HOURS\s*[—]\s*([^(]+?)(?:\s*\([^)]+\))?', text, re.IGNORECASE)
-                            if not title_match:
-                                title_match = re.search(r'WORK\s+HOURS\s*[–]\s*([^(]+?)(?:\s*\([^)]+\))?', text, re.IGNORECASE)
-                            if not title_match:
-                                title_match = re.search(r'WORK\s+HOURS\s*[-]\s*([^(]+?)(?:\s*\([^)]+\))?', text, re.IGNORECASE)
-                            if not title_match:
-                                title_match = re.search(r'WORK\s+HOURS\s*[—–\-]\s*([^\n(]+)', text, re.IGNORECASE)
+                # Look for summary table with "Metric", "Value" columns (both formats)
+                header_row = table[0]
+                header_str = ' '.join([str(cell) if cell else '' for cell in header_row]).lower()
+                
+                if 'metric' in header_str and 'value' in header_str:
+                    # Found summary table, extract employee and pay period from Value column
+                    for row in table[1:]:
+                        if len(row) < 2:
+                            continue
                         
-                        if title_match:
-                            employee_name = title_match.group(1).strip()
-                            employee_name = re.sub(r'\s*\([^)]+\)\s*$', '', employee_name)
-                            employee_name = ' '.join(employee_name.split())
-                            if employee_name:
-                                metadata['employee'] = employee_name
+                        metric = str(row[0] if row[0] else '').strip().lower()
+                        value = str(row[1] if len(row) > 1 and row[1] else '').strip()
                         
-                        # If still not found, try "Employee" label pattern
-                        if not metadata.get('employee'):
-                            employee_match = re.search(r'Employee[:\s]+([^\n]+?)(?:\s+Your name as recorded|$)', text, re.IGNORECASE)
-                            if not employee_match:
-                                # Fallback: try without the lookahead
-                                employee_match = re.search(r'Employee[:\s]+([^\n]+)', text, re.IGNORECASE)
-                            
-                            if employee_match:
-                                employee_name = employee_match.group(1).strip()
-                                # Remove extra explanatory text that might have been captured
-                                employee_name = re.sub(r'\s+Your name as recorded.*$', '', employee_name, flags=re.IGNORECASE)
-                                employee_name = re.sub(r'\s+as recorded.*$', '', employee_name, flags=re.IGNORECASE)
-                                employee_name = re.sub(r'\s+in the system.*$', '', employee_name, flags=re.IGNORECASE)
-                                # Remove extra whitespace and clean up
-                                employee_name = ' '.join(employee_name.split())
-                                if employee_name:
-                                    metadata['employee'] = employee_name
-                    
-                    # Extract pay period (look for "Pay Period" or "Period" label)
-                    if not metadata.get('pay_period'):
-                        # Pattern: "Pay Period" or "Period" followed by date range
-                        pay_period_match = re.search(r'(?:Pay\s+)?Period[:\s]+([^\n]+?)(?:\s+The date range|$)', text, re.IGNORECASE)
-                        if not pay_period_match:
-                            # Fallback: try without the lookahead
-                            pay_period_match = re.search(r'(?:Pay\s+)?Period[:\s]+([^\n]+)', text, re.IGNORECASE)
+                        # Extract employee name (Format 1: "Employee" metric)
+                        if 'employee' in metric and value and not metadata.get('employee'):
+                            # Clean up employee name (remove explanatory text)
+                            employee_name = re.sub(r'\s+Your name as recorded.*$', '', value, flags=re.IGNORECASE)
+                            employee_name = re.sub(r'\s+as recorded.*$', '', employee_name, flags=re.IGNORECASE)
+                            employee_name = re.sub(r'\s+in the system.*$', '', employee_name, flags=re.IGNORECASE)
+                            employee_name = ' '.join(employee_name.split())
+                            metadata['employee'] = employee_name
                         
-                        if pay_period_match:
-                            pay_period_raw = pay_period_match.group(1).strip()
-                            # Remove extra explanatory text that might have been captured
+                        # Extract pay period (Format 1: "Pay Period" metric, Format 2: "Period" metric)
+                        if ('pay period' in metric or metric == 'period') and value and not metadata.get('pay_period'):
+                            # Clean up pay period (remove explanatory text)
+                            pay_period_raw = value
                             pay_period_raw = re.sub(r'\s+The date range.*$', '', pay_period_raw, flags=re.IGNORECASE)
                             pay_period_raw = re.sub(r'\s+this report covers.*$', '', pay_period_raw, flags=re.IGNORECASE)
                             pay_period_raw = re.sub(r'\s+The date.*$', '', pay_period_raw, flags=re.IGNORECASE)
-                            # Extract just the date range part (before any explanatory text)
-                            # Look for date pattern: YYYY-MM-DD - YYYY-MM-DD or YYYY-MM-DD to YYYY-MM-DD
-                            # Also handle em dash (—) and en dash (–)
-                            date_range_match = re.search(r'(\d{4}[-/]\d{2}[-/]\d{2}\s*[–—-to]+\s*\d{4}[-/]\d{2}[-/]\d{2})', pay_period_raw)
+                            # Extract just the date range part - try multiple patterns
+                            date_range_match = re.search(r'(\d{4}[-/]\d{2}[-/]\d{2}\s*(?:[–—-]|to)\s*\d{4}[-/]\d{2}[-/]\d{2})', pay_period_raw)
                             if not date_range_match:
                                 # Try without spaces around dash
                                 date_range_match = re.search(r'(\d{4}[-/]\d{2}[-/]\d{2}[–—-]\d{4}[-/]\d{2}[-/]\d{2})', pay_period_raw)
                             if date_range_match:
                                 pay_period_raw = date_range_match.group(1).strip()
-                            # Convert format from "2025-01-01 - 2025-01-15" to "20250101-20250115"
+                            # Convert format
                             pay_period = convert_pay_period_format(pay_period_raw)
                             if pay_period and pay_period != pay_period_raw:  # Only set if conversion succeeded
                                 metadata['pay_period'] = pay_period
+        
+        # Fallback to text extraction if not found in tables
+        if not metadata.get('employee') or not metadata.get('pay_period'):
+            if text:
+                # Extract employee name (look for "Employee" label or try title again)
+                if not metadata.get('employee'):
+                    # Try title extraction again with all patterns (in case it wasn't found earlier)
+                    title_match = None
+                    if text:
+                        title_match = re.search(r'WORK\s+HOURS\s*[—]\s*([^(]+?)(?:\s*\([^)]+\))?', text, re.IGNORECASE)
+                        if not title_match:
+                            title_match = re.search(r'WORK\s+HOURS\s*[–]\s*([^(]+?)(?:\s*\([^)]+\))?', text, re.IGNORECASE)
+                        if not title_match:
+                            title_match = re.search(r'WORK\s+HOURS\s*[-]\s*([^(]+?)(?:\s*\([^)]+\))?', text, re.IGNORECASE)
+                        if not title_match:
+                            title_match = re.search(r'WORK\s+HOURS\s*[—–\-]\s*([^\n(]+)', text, re.IGNORECASE)
+                    
+                    if title_match:
+                        employee_name = title_match.group(1).strip()
+                        employee_name = re.sub(r'\s*\([^)]+\)\s*$', '', employee_name)
+                        employee_name = ' '.join(employee_name.split())
+                        if employee_name:
+                            metadata['employee'] = employee_name
+                    
+                    # If still not found, try "Employee" label pattern
+                    if not metadata.get('employee'):
+                        employee_match = re.search(r'Employee[:\s]+([^\n]+?)(?:\s+Your name as recorded|$)', text, re.IGNORECASE)
+                        if not employee_match:
+                            # Fallback: try without the lookahead
+                            employee_match = re.search(r'Employee[:\s]+([^\n]+)', text, re.IGNORECASE)
+                        
+                        if employee_match:
+                            employee_name = employee_match.group(1).strip()
+                            # Remove extra explanatory text that might have been captured
+                            employee_name = re.sub(r'\s+Your name as recorded.*$', '', employee_name, flags=re.IGNORECASE)
+                            employee_name = re.sub(r'\s+as recorded.*$', '', employee_name, flags=re.IGNORECASE)
+                            employee_name = re.sub(r'\s+in the system.*$', '', employee_name, flags=re.IGNORECASE)
+                            # Remove extra whitespace and clean up
+                            employee_name = ' '.join(employee_name.split())
+                            if employee_name:
+                                metadata['employee'] = employee_name
+                
+                # Extract pay period (look for "Pay Period" or "Period" label)
+                if not metadata.get('pay_period'):
+                    # Pattern: "Pay Period" or "Period" followed by date range
+                    pay_period_match = re.search(r'(?:Pay\s+)?Period[:\s]+([^\n]+?)(?:\s+The date range|$)', text, re.IGNORECASE)
+                    if not pay_period_match:
+                        # Fallback: try without the lookahead
+                        pay_period_match = re.search(r'(?:Pay\s+)?Period[:\s]+([^\n]+)', text, re.IGNORECASE)
+                    
+                    if pay_period_match:
+                        pay_period_raw = pay_period_match.group(1).strip()
+                        # Remove extra explanatory text that might have been captured
+                        pay_period_raw = re.sub(r'\s+The date range.*$', '', pay_period_raw, flags=re.IGNORECASE)
+                        pay_period_raw = re.sub(r'\s+this report covers.*$', '', pay_period_raw, flags=re.IGNORECASE)
+                        pay_period_raw = re.sub(r'\s+The date.*$', '', pay_period_raw, flags=re.IGNORECASE)
+                        # Extract just the date range part (before any explanatory text)
+                        # Look for date pattern: YYYY-MM-DD - YYYY-MM-DD or YYYY-MM-DD to YYYY-MM-DD
+                        # Also handle em dash (—) and en dash (–)
+                        date_range_match = re.search(r'(\d{4}[-/]\d{2}[-/]\d{2}\s*(?:[–—-]|to)\s*\d{4}[-/]\d{2}[-/]\d{2})', pay_period_raw)
+                        if not date_range_match:
+                            # Try without spaces around dash
+                            date_range_match = re.search(r'(\d{4}[-/]\d{2}[-/]\d{2}[–—-]\d{4}[-/]\d{2}[-/]\d{2})', pay_period_raw)
+                        if date_range_match:
+                            pay_period_raw = date_range_match.group(1).strip()
+                        # Convert format from "2025-01-01 - 2025-01-15" to "20250101-20250115"
+                        pay_period = convert_pay_period_format(pay_period_raw)
+                        if pay_period and pay_period != pay_period_raw:  # Only set if conversion succeeded
+                            metadata['pay_period'] = pay_period
     except Exception as e:
         print(f"Error extracting metadata from PDF: {e}")
     
@@ -439,12 +599,15 @@ def get_day_abbreviation(date_obj: date) -> str:
     return days[date_obj.weekday()]
 
 
-def convert_pdf_to_ngteco_csv(pdf_content: bytes, employee_name: Optional[str] = None, pay_period: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+def convert_pdf_to_ngteco_csv(pdf_content: Union[bytes, ParsedPDF], employee_name: Optional[str] = None, pay_period: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
     """
     Convert PDF report to ngTeco CSV format.
     
+    The PDF is parsed once; metadata and table are both read from the same ParsedPDF.
+    
     Args:
-        pdf_content: PDF file content as bytes
+        pdf_content: PDF file content as bytes, or a ParsedPDF from parse_pdf (e.g. cached
+            by the caller so a retry with manual inputs does not parse the file again)
         employee_name: Optional employee name (if extraction fails, can be provided manually)
         pay_period: Optional pay period in format YYYYMMDD-YYYYMMDD (if extraction fails, can be provided manually)
     
@@ -454,9 +617,14 @@ def convert_pdf_to_ngteco_csv(pdf_content: bytes, employee_name: Optional[str] =
         error_message: Error message if conversion fails, None otherwise
     """
     try:
+        try:
+            parsed = _as_parsed(pdf_content)
+        except Exception as e:
+            return None, f"Could not read PDF: {e}"
+        
         # Extract metadata (only if not provided)
         if not employee_name or not pay_period:
-            metadata = extract_metadata_from_pdf(pdf_content)
+            metadata = extract_metadata_from_pdf(parsed)
             if not employee_name:
                 employee_name = metadata.get('employee')
             if not pay_period:
@@ -469,7 +637,7 @@ def convert_pdf_to_ngteco_csv(pdf_content: bytes, employee_name: Optional[str] =
             return None, "Could not extract pay period from PDF"
         
         # Extract table data
-        df = extract_table_from_pdf(pdf_content)
+        df = extract_table_from_pdf(parsed)
         if df is None or df.empty:
             return None, "Could not extract table data from PDF"
         
@@ -606,3 +774,124 @@ def convert_pdf_to_ngteco_csv(pdf_content: bytes, employee_name: Optional[str] =
     except Exception as e:
         return None, f"Error converting PDF to ngTeco CSV: {str(e)}"
 
+
+
+def _ngteco_header_value(csv_content: str, label: str) -> Optional[str]:
+    """Value of a 'Pay Period,,,<value>,,,' / 'Employee,,,<value>,,,' header line."""
+    for line in csv_content.split('\n', 4)[:4]:
+        if line.startswith(label):
+            parts = [part.strip() for part in line.split(',')]
+            return next((part for part in parts[1:] if part), None)
+    return None
+
+
+def convert_pdf_file(file_name: str, pdf_content: bytes) -> Dict[str, object]:
+    """
+    Convert one PDF for the batch converter (process-pool worker).
+    
+    Args:
+        file_name: Name of the uploaded PDF (or path inside the uploaded ZIP)
+        pdf_content: PDF file content as bytes
+    
+    Returns:
+        Dict with file, employee, pay_period, records, seconds, csv_content and error
+    """
+    started = time.perf_counter()
+    csv_content, error_message = convert_pdf_to_ngteco_csv(pdf_content)
+    records = 0
+    if csv_content:
+        records = sum(1 for line in csv_content.split('\n')[4:] if line and not line.startswith('Total Hours'))
+    return {
+        'file': file_name,
+        'employee': _ngteco_header_value(csv_content, 'Employee') if csv_content else None,
+        'pay_period': _ngteco_header_value(csv_content, 'Pay Period') if csv_content else None,
+        'records': records,
+        'seconds': round(time.perf_counter() - started, 2),
+        'csv_content': csv_content,
+        'error': error_message,
+    }
+
+
+def expand_pdf_uploads(files: List[Tuple[str, bytes]]) -> List[Tuple[str, bytes]]:
+    """
+    Flatten uploaded files into (name, PDF bytes) pairs; PDFs inside ZIP archives are extracted.
+    
+    Args:
+        files: (file name, content) of each uploaded .pdf or .zip file
+    
+    Returns:
+        List of (name, PDF bytes); names of extracted files are "<zip name>/<member path>"
+    """
+    pdfs = []
+    for file_name, content in files:
+        if file_name.lower().endswith('.zip'):
+            with zipfile.ZipFile(BytesIO(content)) as archive:
+                for member in archive.infolist():
+                    member_name = member.filename
+                    if member.is_dir() or not member_name.lower().endswith('.pdf'):
+                        continue
+                    if member_name.startswith('__MACOSX/') or os.path.basename(member_name).startswith('._'):
+                        continue
+                    pdfs.append((f"{file_name}/{member_name}", archive.read(member)))
+        else:
+            pdfs.append((file_name, content))
+    return pdfs
+
+
+def convert_pdfs_in_parallel(files: List[Tuple[str, bytes]], max_workers: Optional[int] = None) -> Iterator[Dict[str, object]]:
+    """
+    Convert many PDFs across a process pool (pdfplumber parsing is CPU bound).
+    
+    Args:
+        files: (file name, PDF bytes) pairs, e.g. from expand_pdf_uploads
+        max_workers: Worker processes (defaults to the CPU count)
+    
+    Yields:
+        convert_pdf_file results in completion order, so callers can show progress
+    """
+    if not files:
+        return
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(files)))
+    if workers == 1:
+        for file_name, pdf_content in files:
+            yield convert_pdf_file(file_name, pdf_content)
+        return
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = {pool.submit(convert_pdf_file, file_name, pdf_content): file_name for file_name, pdf_content in files}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {
+                    'file': futures[future],
+                    'employee': None,
+                    'pay_period': None,
+                    'records': 0,
+                    'seconds': None,
+                    'csv_content': None,
+                    'error': f"Conversion failed: {e}",
+                }
+
+
+def build_combined_ngteco_csv(results: List[Dict[str, object]]) -> str:
+    """One multi-employee ngTeco CSV: the timecard blocks of all converted files, one after another."""
+    return '\n'.join(result['csv_content'] for result in results if result.get('csv_content'))
+
+
+def build_ngteco_csv_zip(results: List[Dict[str, object]]) -> bytes:
+    """ZIP with one ngTeco CSV per converted PDF, named after the source file."""
+    zip_buffer = BytesIO()
+    used_names = set()
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for result in results:
+            if not result.get('csv_content'):
+                continue
+            stem = os.path.splitext(os.path.basename(str(result['file'])))[0] or 'timecard'
+            csv_name = f"{stem}.csv"
+            counter = 2
+            while csv_name in used_names:
+                csv_name = f"{stem}_{counter}.csv"
+                counter += 1
+            used_names.add(csv_name)
+            archive.writestr(csv_name, result['csv_content'])
+    return zip_buffer.getvalue()
@@ -0,0 +1,98 @@
+"""
+Local assets for the reportlab PDF reports.
+
+The logo used to be passed to ``Image()`` as a URL, so reportlab downloaded and
+decoded it on every render. Here it is kept on local disk (downloaded once into
+``REPORT_ASSETS_DIR`` if it is not shipped there) and decoded once per process;
+every report reuses the same ``ImageReader``.
+"""
+import os
+import threading
+import time
+from typing import Optional
+
+import requests
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Image, Spacer
+
+LOGO_URL = "https://bulldogsliving.com/img/brand_logo/logo.png"
+REPORT_ASSETS_DIR = os.getenv(
+    "REPORT_ASSETS_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets"),
+)
+LOGO_PATH = os.path.join(REPORT_ASSETS_DIR, "logo.png")
+# After a failed download or decode, reports go without a logo for this long before it is tried again
+LOGO_RETRY_SECONDS = 300
+
+_lock = threading.Lock()
+_logo_reader: Optional[ImageReader] = None
+_logo_failed_at: Optional[float] = None
+
+
+def _logo_backing_off() -> bool:
+    return _logo_failed_at is not None and time.monotonic() - _logo_failed_at < LOGO_RETRY_SECONDS
+
+
+def ensure_logo_file(timeout: int = 10) -> Optional[str]:
+    """
+    Make sure the logo exists on local disk, downloading it once if needed.
+
+    Returns:
+        Path to the logo file, or None if it is missing and cannot be downloaded.
+    """
+    if os.path.exists(LOGO_PATH):
+        return LOGO_PATH
+    try:
+        resp = requests.get(LOGO_URL, timeout=timeout)
+        resp.raise_for_status()
+        os.makedirs(REPORT_ASSETS_DIR, exist_ok=True)
+        # Write to a temp file first so concurrent processes never read a partial image
+        tmp_path = f"{LOGO_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(resp.content)
+        os.replace(tmp_path, LOGO_PATH)
+        return LOGO_PATH
+    except Exception as e:
+        print(f"Warning: Could not download report logo from {LOGO_URL}: {e}")
+        return None
+
+
+def get_logo_reader() -> Optional[ImageReader]:
+    """Decoded logo shared by all renders in this process (None when unavailable, retried after LOGO_RETRY_SECONDS)."""
+    global _logo_reader, _logo_failed_at
+    if _logo_reader is not None or _logo_backing_off():
+        return _logo_reader
+    with _lock:
+        if _logo_reader is None and not _logo_backing_off():
+            path = ensure_logo_file()
+            try:
+                reader = ImageReader(path) if path else None
+                if reader is not None:
+                    reader.getRGBData()  # decode now so renders only copy the pixels
+                _logo_reader = reader
+            except Exception as e:
+                print(f"Warning: Could not decode report logo {path}: {e}")
+                _logo_reader = None
+            _logo_failed_at = time.monotonic() if _logo_reader is None else None
+    return _logo_reader
+
+
+def preload_report_assets() -> bool:
+    """Load the report assets up front (e.g. before starting render workers)."""
+    return get_logo_reader() is not None
+
+
+def report_logo(width: float = 200, height: float = 60):
+    """
+    Logo flowable for the top of a report.
+
+    Falls back to an empty spacer of the same size when the logo is not available,
+    so reports still render offline.
+    """
+    reader = get_logo_reader()
+    if reader is None:
+        return Spacer(width, height)
+    logo = Image(LOGO_PATH, width=width, height=height)
+    # Image() would otherwise build (and decode) its own ImageReader from the path
+    logo._img = reader
+    return logo
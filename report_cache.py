@@ -0,0 +1,148 @@
+"""
+Content-addressed cache for rendered PDF reports, stored in MongoDB GridFS.
+
+A report is keyed by a SHA-256 hash of all of its inputs (employee, period,
+shift config, holiday table, payouts and the ``modified`` stamps of the source
+documents). If none of them changed, the stored PDF bytes are served as-is
+instead of fetching everything again and re-rendering.
+
+The cache is bounded by ``REPORT_CACHE_MAX_BYTES``; when it grows past that, the
+least recently used reports are evicted first.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from employee_manager import LazyCollection, get_db
+
+# Bump when the PDF layout changes so older cached reports are not served.
+REPORT_CACHE_VERSION = 1
+REPORT_CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+report_cache_files = LazyCollection("report_cache.files")
+
+
+@lru_cache(maxsize=None)
+def _report_cache_fs():
+    """GridFS bucket of the cache, opened on first use."""
+    import gridfs
+
+    return gridfs.GridFS(get_db(), collection="report_cache")
+
+
+def report_cache_key(inputs: Dict[str, Any]) -> str:
+    """
+    Hash report inputs into a cache key.
+
+    Args:
+        inputs: JSON-like dict of everything the report depends on. Dates and other
+            non-JSON values are hashed by their string form.
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    payload = json.dumps(
+        {"version": REPORT_CACHE_VERSION, "inputs": inputs},
+        sort_keys=True,
+        default=str,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_report(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a cached report and mark it as recently used.
+
+    Returns:
+        Dict with pdf (bytes), file_name, metadata and created_at, or None on a miss
+        (or when the cache is unreachable).
+    """
+    try:
+        grid_out = _report_cache_fs().find_one({"filename": key})
+        if grid_out is None:
+            return None
+        pdf_data = grid_out.read()
+        report_cache_files.update_one(
+            {"_id": grid_out._id},
+            {"$set": {"last_accessed": datetime.utcnow()}, "$inc": {"hits": 1}},
+        )
+        metadata = grid_out.metadata or {}
+        return {
+            "pdf": pdf_data,
+            "file_name": metadata.get("file_name"),
+            "metadata": metadata,
+            "created_at": grid_out.upload_date,
+        }
+    except Exception as e:
+        print(f"Warning: Report cache lookup failed: {e}")
+        return None
+
+
+def store_report(key: str, pdf_data: bytes, file_name: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Store rendered report bytes under ``key`` and evict old reports past the size budget.
+
+    Args:
+        key: Cache key from report_cache_key.
+        pdf_data: Rendered PDF bytes.
+        file_name: Download file name of the report.
+        metadata: Extra data to serve with a hit (e.g. the summary table rows).
+
+    Returns:
+        True when stored (or already present), False on error.
+    """
+    try:
+        if _report_cache_fs().exists({"filename": key}):
+            return True
+        _report_cache_fs().put(
+            pdf_data,
+            filename=key,
+            content_type="application/pdf",
+            metadata={**(metadata or {}), "file_name": file_name},
+            last_accessed=datetime.utcnow(),
+            hits=0,
+        )
+        evict_reports()
+        return True
+    except Exception as e:
+        print(f"Warning: Could not store report in cache: {e}")
+        return False
+
+
+def evict_reports(max_bytes: int = REPORT_CACHE_MAX_BYTES) -> int:
+    """
+    Delete least recently used reports until the cache fits in ``max_bytes``.
+
+    Returns:
+        Number of reports deleted.
+    """
+    total = next(
+        report_cache_files.aggregate([{"$group": {"_id": None, "bytes": {"$sum": "$length"}}}]),
+        {"bytes": 0},
+    )["bytes"]
+    deleted = 0
+    if total <= max_bytes:
+        return deleted
+    from pymongo import ASCENDING
+
+    cursor = report_cache_files.find({}, {"length": 1}).sort("last_accessed", ASCENDING)
+    for file_doc in cursor:
+        if total <= max_bytes:
+            break
+        _report_cache_fs().delete(file_doc["_id"])
+        total -= file_doc.get("length", 0)
+        deleted += 1
+    return deleted
+
+
+def clear_report_cache() -> int:
+    """Delete every cached report. Returns the number deleted."""
+    deleted = 0
+    for file_doc in report_cache_files.find({}, {"_id": 1}):
+        _report_cache_fs().delete(file_doc["_id"])
+        deleted += 1
+    return deleted
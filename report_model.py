@@ -0,0 +1,176 @@
+"""
+Report model shared by the work hours reports.
+
+The summary metrics, table rows and column widths of a report are computed once
+from the report DataFrame with column-wise (vectorized) aggregation. The PDF
+builders, Streamlit tables and the email path all render from the same
+ReportModel instead of walking the frame again.
+"""
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from utils import decimal_hours_to_hhmmss, hhmm_series_to_decimal
+
+# Width per character and minimum width used for auto-sized detail table columns.
+COLUMN_WIDTH_PER_CHAR = 4.9
+MIN_COLUMN_WIDTH = 40
+
+
+@dataclass
+class ReportModel:
+    employee_name: str
+    pay_period: str
+    columns: List[str]
+    rows: List[List[str]]
+    column_widths: List[float]
+    hours_worked: str
+    hours_expected: str
+    total_daily: str
+    breaks_count: int
+    breaks_duration: str
+    overtime_balance: str
+    holiday_hours: str
+    sick_days: int
+    available_time_off: str
+    available_time_off_days: float
+    payouts: List[Dict] = field(default_factory=list)
+    payouts_total: str = "00:00"
+    last_payout_date: Optional[date] = None
+    # (column index, table row index) pairs to highlight; row 0 is the header.
+    highlight_cells: List[Tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def table_data(self) -> List[List[str]]:
+        """Header plus rows, as passed to a reportlab Table."""
+        return [self.columns] + self.rows
+
+    def summary_frame(self) -> pd.DataFrame:
+        """Summary metrics as a two-column frame for st.dataframe / st.table."""
+        metrics = [
+            ("Employee", self.employee_name),
+            ("Pay Period", self.pay_period),
+            ("Hours worked", self.hours_worked),
+            ("Hours expected", self.hours_expected),
+            ("Overtime/Undertime Balance", self.overtime_balance),
+            ("Remaining Holiday Hours", self.holiday_hours),
+            ("Total Sick Days", str(self.sick_days)),
+            ("Total Available Time Off (HH:MM)", self.available_time_off),
+            ("Total Available Time Off (Days)", f"{self.available_time_off_days:.2f}"),
+        ]
+        if self.payouts:
+            metrics.append(("Overt. Paid", self.payouts_total))
+            metrics.append(("Last Payout Date", self.last_payout_date.isoformat() if self.last_payout_date else "-"))
+        return pd.DataFrame(metrics, columns=["Metric", "Value"])
+
+
+def _is_blank(series: pd.Series) -> pd.Series:
+    return series.isna() | (series.astype(str).str.strip() == "")
+
+
+def _last_value(df: pd.DataFrame, column: str) -> str:
+    if column not in df.columns or df.empty:
+        return "00:00"
+    value = df[column].iloc[-1]
+    if value is None or (not isinstance(value, str) and pd.isna(value)) or str(value).strip() == "":
+        return "00:00"
+    return str(value)
+
+
+def auto_column_widths(table_df: pd.DataFrame) -> List[float]:
+    """Width per column from the longest of its header and cell texts."""
+    if table_df.empty:
+        lengths = [len(str(col)) for col in table_df.columns]
+    else:
+        value_lengths = table_df.astype(str).apply(lambda col: col.str.len().max())
+        lengths = [max(len(str(col)), int(value_lengths[col])) for col in table_df.columns]
+    return [max(MIN_COLUMN_WIDTH, length * COLUMN_WIDTH_PER_CHAR) for length in lengths]
+
+
+def build_report_model(
+    df: pd.DataFrame,
+    employee_name: str,
+    pay_period: str,
+    standard_work_hours: float,
+    table_columns: Sequence[str],
+    payouts: Optional[List[Dict]] = None,
+    column_widths: Optional[List[float]] = None,
+    highlight_flags: Optional[Dict[str, str]] = None,
+) -> ReportModel:
+    """
+    Compute a ReportModel from a report DataFrame.
+
+    Args:
+        df: Report rows sorted by Date (Work Time, Standard Time, Holiday, balances...).
+        employee_name: Name shown on the report.
+        pay_period: Pay period label.
+        standard_work_hours: Standard hours per day (decimal), for time off in days.
+        table_columns: Columns of the detailed work log table, in order.
+        payouts: Overtime payouts dated inside the period.
+        column_widths: Fixed detail table widths; auto-sized from the content when omitted.
+        highlight_flags: {table column: boolean column in df} marking cells to highlight
+            (e.g. {"IN": "IN_Edited"}).
+
+    Returns:
+        ReportModel.
+    """
+    payouts = payouts or []
+    empty = pd.Series([""] * len(df), index=df.index, dtype=object)
+
+    def column(name):
+        return df[name] if name in df.columns else empty
+
+    holiday = column("Holiday")
+    not_holiday = _is_blank(holiday)
+
+    work = hhmm_series_to_decimal(column("Work Time"))
+    standard = hhmm_series_to_decimal(column("Standard Time"))
+    daily_total = hhmm_series_to_decimal(column(" Daily Total"))
+    breaks = column("Break").fillna("").astype(str).str.strip()
+    has_break = (breaks != "") & (breaks != "00:00")
+
+    sick = holiday.fillna("").astype(str).str.strip().str.lower() == "sick"
+    if "Leave Type" in df.columns:
+        sick |= df["Leave Type"].fillna("").astype(str).str.strip() == "Sick"
+
+    overtime_balance = _last_value(df, "Hours Overtime Left")
+    holiday_hours = _last_value(df, "Holiday Hours")
+    available = float(hhmm_series_to_decimal(pd.Series([holiday_hours, overtime_balance])).sum())
+
+    table_df = df.reindex(columns=list(table_columns))
+    rows = table_df.astype(str).values.tolist()
+
+    highlight_cells = []
+    for table_column, flag_column in (highlight_flags or {}).items():
+        if table_column not in table_df.columns or flag_column not in df.columns:
+            continue
+        col_idx = table_df.columns.get_loc(table_column)
+        flagged = df[flag_column].fillna(False).astype(bool).to_numpy().nonzero()[0]
+        highlight_cells.extend((col_idx, int(pos) + 1) for pos in flagged)
+
+    payout_dates = [payout["payout_date"] for payout in payouts if payout.get("payout_date")]
+    payouts_total = float(hhmm_series_to_decimal(pd.Series([p.get("payout_hours") for p in payouts], dtype=object)).sum())
+
+    return ReportModel(
+        employee_name=employee_name,
+        pay_period=pay_period,
+        columns=list(table_columns),
+        rows=rows,
+        column_widths=list(column_widths) if column_widths else auto_column_widths(table_df),
+        hours_worked=decimal_hours_to_hhmmss(float(work.sum())),
+        hours_expected=decimal_hours_to_hhmmss(float(standard[not_holiday].sum())),
+        total_daily=decimal_hours_to_hhmmss(float(daily_total.sum())),
+        breaks_count=int(has_break.sum()),
+        breaks_duration=decimal_hours_to_hhmmss(float(hhmm_series_to_decimal(breaks[has_break]).sum())),
+        overtime_balance=overtime_balance,
+        holiday_hours=holiday_hours,
+        sick_days=int(sick.sum()),
+        available_time_off=decimal_hours_to_hhmmss(available),
+        available_time_off_days=available / standard_work_hours if standard_work_hours else 0.0,
+        payouts=payouts,
+        payouts_total=decimal_hours_to_hhmmss(payouts_total),
+        last_payout_date=max(payout_dates) if payout_dates else None,
+        highlight_cells=highlight_cells,
+    )
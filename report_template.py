@@ -0,0 +1,369 @@
+"""
+Shared reportlab template for the work hours PDF reports.
+
+Paragraph styles are built once per process, and the static explanation pages
+(identical for every employee) are parsed into flowables once and reused, so a
+report only lays out its employee-specific summary and work log.
+"""
+import copy
+import threading
+from typing import Dict, List, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import Paragraph, Spacer
+
+# (section title, lines) - an empty line becomes a small spacer.
+
+TIMECARD_EXPLANATION_SECTIONS = [
+    (
+        "📊 SUMMARY METRICS EXPLANATION",
+        [
+            "🏢 <b>Employee & Pay Period:</b> Basic identification information showing your name and the time period covered by this report.",
+            "",
+            "⏰ <b>Hours Worked:</b> The total number of hours you actually worked during this period. This is calculated by adding up all your 'Work Time' entries from each day.",
+            "",
+            "📅 <b>Hours Expected:</b> The total number of hours you were supposed to work during this period. This is calculated by adding up all your 'Standard Time' entries (usually 8 hours per day), excluding holidays and weekends.",
+            "",
+            "💰 <b>Overtime or Undertime Balance:</b> This shows your current overtime balance. A positive number means you've worked extra hours that you can use as time off. A negative number means you owe hours to the company.",
+            "",
+            "🏖️ <b>Remaining Holiday Hours:</b> Your remaining paid holiday hours that you can use for vacation or other time off.",
+            "",
+            "🏥 <b>Total Sick Days:</b> The number of days in this period that were marked as sick leave.",
+            "",
+            "📈 <b>Total Available Time Off:</b> The combined total of your holiday hours plus overtime balance - this is the total time you can take off.",
+            "",
+            "📊 <b>Total Available Time Off (Days):</b> Your available time off converted to full work days (assuming an 8-hour workday).",
+        ],
+    ),
+    (
+        "📋 DETAILED WORK LOG EXPLANATION",
+        [
+            "📅 <b>Date:</b> The specific date of the work entry.",
+            "",
+            "⏰ <b>Daily Total:</b> The total time you were present at work (from check-in to check-out).",
+            "",
+            "☕ <b>Break:</b> The total break time taken during your work day.",
+            "",
+            "📆 <b>Day:</b> The day of the week (MON, TUE, WED, etc.).",
+            "",
+            "🎉 <b>Holiday:</b> Any holiday or special event on this date (Weekend, Holiday, Vacation, Sick, etc.).",
+            "",
+            "🏖️ <b>Holiday Hours:</b> Your running balance of remaining holiday hours after this date.",
+            "",
+            "💰 <b>Hours Overtime Left:</b> Your running balance of overtime hours after this date.",
+            "",
+            "🕐 <b>IN:</b> Your check-in time for the day.",
+            "",
+            "🕕 <b>OUT:</b> Your check-out time for the day.",
+            "",
+            "⏱️ <b>Standard Time:</b> The number of hours you were expected to work on this day (usually 8 hours).",
+            "",
+            "📊 <b>Multiplication:</b> Any multiplier applied to your hours (e.g., 2x for holiday work).",
+            "",
+            "💼 <b>Work Time:</b> The actual hours you worked after subtracting break time.",
+        ],
+    ),
+    (
+        "🧮 HOW CALCULATIONS WORK",
+        [
+            "📊 <b>Work Time Calculation:</b>",
+            "   Work Time = Daily Total - Break Time",
+            "   Example: If you were at work for 9 hours and took 1 hour break, your Work Time = 8 hours",
+            "",
+            "💰 <b>Overtime Calculation:</b>",
+            "   Overtime = Work Time - Standard Time",
+            "   Example: If you worked 9 hours and standard time is 8 hours, overtime = 1 hour",
+            "",
+            "🏖️ <b>Holiday Hours:</b>",
+            "   • You start with a certain number of holiday hours per year",
+            "   • Each day you take vacation, sick leave, or personal time, hours are deducted",
+            "   • The remaining balance is shown in the 'Holiday Hours' column",
+            "",
+            "💰 <b>Overtime Balance:</b>",
+            "   • Positive overtime hours accumulate when you work more than standard time",
+            "   • These can be used for time off or paid out",
+            "   • The running balance is shown in the 'Hours Overtime Left' column",
+            "",
+            "📈 <b>Available Time Off:</b>",
+            "   Total Available = Holiday Hours + Overtime Balance",
+            "   This is the total time you can take off.",
+        ],
+    ),
+    (
+        "🔍 UNDERSTANDING YOUR DATA",
+        [
+            "🟡 <b>Yellow Highlighted Cells:</b>",
+            "   These indicate data that was manually modified from the original upload. This helps you see what changes were made to your timecard data.",
+            "",
+            "📊 <b>Reading the Summary:</b>",
+            "   • Compare 'Hours Worked' vs 'Hours Expected' to see if you met your work requirements",
+            "   • Check 'Overtime Balance' to see if you have extra time available",
+            "   • Review 'Holiday Hours' to know how much vacation time you have left",
+            "",
+            "📅 <b>Understanding Patterns:</b>",
+            "   • Look for consistent work patterns",
+            "   • Identify days with high overtime",
+            "   • Check your break time usage",
+            "",
+            "⚠️ <b>What to Watch For:</b>",
+            "   • Negative overtime balance (means you owe hours)",
+            "   • Low holiday hours remaining",
+            "   • Inconsistent check-in/check-out times",
+            "   • Missing break times on long work days",
+        ],
+    ),
+    (
+        "📞 NEED HELP?",
+        [
+            "If you have questions about this report or need clarification on any of the data:",
+            "",
+            "📧 <b>Contact your supervisor or HR department</b>",
+            "📱 <b>Check the documentation in the Bulldog Office system</b>",
+            "📋 <b>Review your timecard entries for accuracy</b>",
+            "",
+            "This report is generated automatically based on your timecard data. If you notice any discrepancies, please contact your supervisor immediately.",
+        ],
+    ),
+]
+
+FRAPPE_EXPLANATION_SECTIONS = [
+    (
+        "📊 SUMMARY METRICS EXPLANATION",
+        [
+            "🏢 <b>Employee & Pay Period:</b> Basic identification information showing your name and the time period covered by this report.",
+            "",
+            "⏰ <b>Hours Worked:</b> The total number of hours you actually worked during this period. This is calculated by adding up all your 'Work Time' entries from each day.",
+            "",
+            "📅 <b>Hours Expected:</b> The total number of hours you were supposed to work during this period. This is calculated by adding up all your 'Standard Time' entries (usually 8 hours per day), excluding holidays and weekends.",
+            "",
+            "💰 <b>Overtime or Undertime Balance:</b> This shows your current overtime balance. A positive number means you've worked extra hours that you can use as time off. A negative number means you owe hours to the company.",
+            "",
+            "💸 <b>Overt. Paid:</b> The total overtime hours that were already paid out during this report period.",
+            "",
+            "🗓️ <b>Last Payout Date:</b> The most recent overtime payout date inside the selected report period.",
+            "",
+            "🏖️ <b>Remaining Holiday Hours:</b> Your remaining paid holiday hours that you can use for vacation or other time off.",
+            "",
+            "🏥 <b>Total Sick Days:</b> The number of days in this period that were marked as sick leave.",
+            "",
+            "📈 <b>Total Available Time Off (HH:MM):</b> The combined total of your holiday hours plus overtime balance (positive overtime adds, negative undertime deducts) - this is the total time you can take off in hours and minutes.",
+            "",
+            "📊 <b>Total Available Time Off (Days):</b> Your available time off converted to full work days (based on your standard work hours per day).",
+        ],
+    ),
+    (
+        "📋 DETAILED WORK LOG EXPLANATION",
+        [
+            "📅 <b>Date:</b> The specific date of the work entry.",
+            "",
+            "⏰ <b>Daily Total:</b> The total time you were present at work (from check-in to check-out).",
+            "",
+            "☕ <b>Break:</b> The total break time taken during your work day.",
+            "",
+            "📆 <b>Day:</b> The day of the week (MON, TUE, WED, etc.).",
+            "",
+            "🎉 <b>Holiday:</b> Any holiday or special event on this date (Weekend, Holiday, Vacation, Sick, etc.).",
+            "",
+            "🏖️ <b>Holiday Hours:</b> Your running balance of remaining holiday hours after this date.",
+            "",
+            "💰 <b>Hours Overtime Left:</b> Your running balance of overtime hours after this date.",
+            "",
+            "💸 <b>Overt. Paid:</b> Any overtime hours paid out on that specific date.",
+            "",
+            "🕐 <b>IN:</b> Your check-in time for the day.",
+            "",
+            "🕕 <b>OUT:</b> Your check-out time for the day.",
+            "",
+            "⏱️ <b>Standard Time:</b> The number of hours you were expected to work on this day (usually 8 hours).",
+            "",
+            "📊 <b>Multiplication:</b> Any multiplier applied to your hours (e.g., 2.0 for Sunday or public holiday work).",
+            "",
+            "💼 <b>Work Time:</b> Hours credited for the day: time at work minus break (using your shift's break rules when set in Frappe), then capped by the shift's daily limit when configured.",
+        ],
+    ),
+    (
+        "🧮 HOW CALCULATIONS WORK",
+        [
+            "📊 <b>Work Time Calculation:</b>",
+            "   Daily Total = time from IN to OUT. Break: default is 30 minutes once Daily Total reaches 6 hours;",
+            "   or your Shift Type's custom_break_rule / custom_break_duration (decimal hours) when set in Frappe.",
+            "   Work Time = Daily Total minus that break. If custom_daily_limit is set on the shift, Work Time is capped — extra time does not count toward overtime.",
+            "",
+            "💰 <b>Overtime Calculation:</b>",
+            "   Overtime = Work Time - Standard Time",
+            "   Example: If you worked 9 hours and standard time is 8 hours, overtime = 1 hour",
+            "",
+            "📊 <b>Multiplication for Sundays and Public Holidays:</b>",
+            "   • Work hours on Sundays are multiplied by 2.0",
+            "   • Work hours on public holidays are multiplied by 2.0",
+            "   • This multiplied time is added to your overtime balance",
+            "",
+            "🏖️ <b>Holiday Hours:</b>",
+            "   • You start with a certain number of holiday hours per year",
+            "   • Each day you take vacation (Paid Holiday) deducts hours from your balance",
+            "   • Sick days do NOT deduct from holiday hours",
+            "   • Weekends and public holidays are free and do NOT deduct from holiday hours",
+            "   • The remaining balance is shown in the 'Holiday Hours' column",
+            "",
+            "💰 <b>Overtime Balance:</b>",
+            "   • Positive overtime hours accumulate when you work more than standard time",
+            "   • Work on Sundays and public holidays is multiplied by 2.0 and added to overtime",
+            "   • These can be used for time off or paid out",
+            "   • Paid-out overtime is deducted starting from the payout date",
+            "   • The running balance is shown in the 'Hours Overtime Left' column",
+            "",
+            "📈 <b>Available Time Off:</b>",
+            "   Total Available = Holiday Hours + Overtime Balance",
+            "   • Positive overtime adds to your available time off",
+            "   • Negative undertime deducts from your available time off",
+            "   This is the total time you can take off.",
+        ],
+    ),
+    (
+        "🔍 UNDERSTANDING YOUR DATA",
+        [
+            "📊 <b>Reading the Summary:</b>",
+            "   • Compare 'Hours Worked' vs 'Hours Expected' to see if you met your work requirements",
+            "   • Check 'Overtime Balance' to see if you have extra time available",
+            "   • Review 'Holiday Hours' to know how much vacation time you have left",
+            "   • Check 'Total Available Time Off' to see your combined time off balance",
+            "",
+            "📅 <b>Understanding Patterns:</b>",
+            "   • Look for consistent work patterns",
+            "   • Identify days with high overtime",
+            "   • Check your break time usage",
+            "   • Note Sundays and public holidays with 2.0 multiplication",
+            "",
+            "⚠️ <b>What to Watch For:</b>",
+            "   • Negative overtime balance (means you owe hours)",
+            "   • Low holiday hours remaining",
+            "   • Inconsistent check-in/check-out times",
+            "   • Missing break times on long work days",
+            "",
+            "📋 <b>Data Source:</b>",
+            "   This report is generated from Frappe HR Attendance and Employee Checkin records.",
+            "   Recorded overtime payouts are loaded from Bulldog Office MongoDB storage and applied from their payout dates.",
+        ],
+    ),
+    (
+        "📞 NEED HELP?",
+        [
+            "If you have questions about this report or need clarification on any of the data:",
+            "",
+            "📧 <b>Contact your supervisor or HR department</b>",
+            "📱 <b>Check the documentation in the Bulldog Office system</b>",
+            "📋 <b>Review your attendance records in Frappe HR for accuracy</b>",
+            "",
+            "This report is generated automatically based on your Frappe HR Attendance and Employee Checkin data. If you notice any discrepancies, please contact your supervisor immediately.",
+        ],
+    ),
+]
+
+EXPLANATION_SECTIONS = {
+    "timecard": TIMECARD_EXPLANATION_SECTIONS,
+    "frappe": FRAPPE_EXPLANATION_SECTIONS,
+}
+
+_lock = threading.RLock()
+_styles: Dict[str, ParagraphStyle] = {}
+_explanation_flowables: Dict[str, Tuple] = {}
+
+
+def get_report_styles() -> Dict[str, ParagraphStyle]:
+    """Paragraph styles shared by all reports (header, footer, legend, explanation, section)."""
+    if _styles:
+        return _styles
+    with _lock:
+        if not _styles:
+            styles = getSampleStyleSheet()
+            _styles.update({
+                "header": ParagraphStyle(
+                    'Header',
+                    parent=styles['Heading1'],
+                    fontName='Helvetica-Bold',
+                    fontSize=24,
+                    textColor=colors.HexColor("#2c3e50"),
+                    alignment=1,
+                    spaceAfter=20
+                ),
+                "footer": ParagraphStyle(
+                    'Footer',
+                    parent=styles['Normal'],
+                    fontName='Helvetica-Oblique',
+                    fontSize=10,
+                    textColor=colors.HexColor("#7f8c8d"),
+                    alignment=2
+                ),
+                "legend": ParagraphStyle(
+                    'Legend',
+                    parent=styles['Normal'],
+                    fontName='Helvetica',
+                    fontSize=10,
+                    textColor=colors.HexColor("#2c3e50"),
+                    alignment=0,
+                    spaceAfter=10
+                ),
+                "explanation": ParagraphStyle(
+                    'Explanation',
+                    parent=styles['Normal'],
+                    fontName='Helvetica',
+                    fontSize=11,
+                    textColor=colors.HexColor("#2c3e50"),
+                    alignment=0,
+                    spaceAfter=8,
+                    leftIndent=0
+                ),
+                "section": ParagraphStyle(
+                    'Section',
+                    parent=styles['Heading2'],
+                    fontName='Helvetica-Bold',
+                    fontSize=14,
+                    textColor=colors.HexColor("#2c3e50"),
+                    alignment=0,
+                    spaceAfter=10,
+                    spaceBefore=15
+                ),
+            })
+    return _styles
+
+
+def _build_explanation_flowables(variant: str) -> Tuple:
+    styles = get_report_styles()
+    flowables = [
+        Paragraph("📋 COMPLETE REPORT EXPLANATION", styles["header"]),
+        Spacer(1, 20),
+    ]
+    sections = EXPLANATION_SECTIONS[variant]
+    for section_idx, (title, lines) in enumerate(sections):
+        flowables.append(Paragraph(title, styles["section"]))
+        for line in lines:
+            if line.strip():
+                flowables.append(Paragraph(line, styles["explanation"]))
+            else:
+                flowables.append(Spacer(1, 5))
+        if section_idx < len(sections) - 1:
+            flowables.append(Spacer(1, 15))
+    return tuple(flowables)
+
+
+def explanation_pages(variant: str = "timecard") -> List:
+    """
+    Flowables for the "COMPLETE REPORT EXPLANATION" pages.
+
+    Args:
+        variant: "timecard" (Home / Work History reports) or "frappe" (Frappe HR report).
+
+    Returns:
+        Fresh shallow copies of the cached flowables; the parsed paragraph text is
+        shared, while layout state set during a build stays on the copy, so
+        concurrent builds do not interfere.
+    """
+    cached = _explanation_flowables.get(variant)
+    if cached is None:
+        with _lock:
+            cached = _explanation_flowables.get(variant)
+            if cached is None:
+                cached = _build_explanation_flowables(variant)
+                _explanation_flowables[variant] = cached
+    return [copy.copy(flowable) for flowable in cached]
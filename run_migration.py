@@ -81,6 +81,29 @@ def main():
             else:
                 print("❌ Please enter 'y' or 'n'")
         
+        print()
+        
+        # Prompt for partitioned mode
+        print("⚡ Parallel Partitioned Mode")
+        print("-" * 60)
+        print("Process each month in its own worker process (uses every CPU core).")
+        print("IDs are numbered per month: EMP-CKIN-{month}-{year}-{sequence}")
+        print()
+        
+        while True:
+            partition_input = input("Run partitioned by month in parallel? (y/n) [n]: ").strip().lower()
+            
+            if partition_input in ['', 'n', 'no']:
+                partitioned = False
+                print("✅ Will run as a single sequential migration")
+                break
+            elif partition_input in ['y', 'yes']:
+                partitioned = True
+                print("✅ Will process months in parallel and merge the shards at the end")
+                break
+            else:
+                print("❌ Please enter 'y' or 'n'")
+        
         print()
         print("🔄 Starting migration process...")
         print()
@@ -93,7 +116,8 @@ def main():
         output_file = f"frappe_hr_employee_checkin_{timestamp}.xlsx"
         
         # Run migration with user preferences
-        success = migrator.run_migration(
+        run = migrator.run_partitioned_migration if partitioned else migrator.run_migration
+        success = run(
             output_file=output_file,
             export_csv=True,
             start_date=start_date,
@@ -103,9 +127,9 @@ def main():
         print()
         if success:
             print("🎉 Migration completed successfully!")
-            print(f"📁 Excel file: {output_file}")
-            csv_file = output_file.replace('.xlsx', '.csv')
-            print(f"📁 CSV file: {csv_file}")
+            print(f"📁 Files written ({len(migrator.exported_files)}, one per month):")
+            for exported_file in migrator.exported_files:
+                print(f"   {exported_file}")
             if start_date:
                 print(f"📅 Filtered from: {start_date.strftime('%Y-%m-%d')}")
             print(f"🆔 IDs included: {'Yes' if include_ids else 'No'}")
@@ -113,7 +137,7 @@ def main():
             print()
             print("Next steps:")
             print("1. Review the generated Excel and CSV files")
-            print("2. Import the data into Frappe HR")
+            print("2. Import the files into Frappe HR (one Data Import per file)")
             print("3. Verify the imported data")
         else:
             print("❌ Migration failed!")
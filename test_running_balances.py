@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental running balances
+================================================
+
+recompute_running_balances resumes the overtime/holiday ledger at the first edited
+date. This checks on random Work History frames (sub-minute Multiplication, several
+edits and a deletion) that it always ends with the same Hours Overtime Left and
+Holiday Hours as a full compute_running_holiday_hours.
+"""
+
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+
+from utils import compute_running_holiday_hours, decimal_hours_to_hhmmss, recompute_running_balances
+
+BALANCE_COLUMNS = ["Hours Overtime Left", "Holiday Hours"]
+
+
+def _day(row_date, rng, multiplication):
+    """One Work History row with a random work time, leave or holiday."""
+    minutes = rng.choice([0, rng.randint(300, 600)])
+    work_time = decimal_hours_to_hhmmss(minutes / 60)
+    leave_type = "Paid Holiday" if minutes == 0 and rng.random() < 0.3 else ""
+    return {
+        "Date": row_date,
+        "Work Time": work_time,
+        "Standard Time": "08:00",
+        "Difference": decimal_hours_to_hhmmss(minutes / 60 - 8),
+        "Difference (Decimal)": minutes / 60 - 8,
+        "Multiplication": multiplication,
+        "Holiday": "",
+        "Leave Type": leave_type,
+    }
+
+
+def _random_frame(rng, days=120, multiplication=1.25):
+    start = date(2025, 1, 1)
+    return pd.DataFrame([_day(start + timedelta(days=i), rng, multiplication) for i in range(days)])
+
+
+def test_resumed_balances_match_full_recompute(cases=50, seed=7):
+    """Edits and deletions, balances resumed from the snapshot == a full recompute."""
+    rng = random.Random(seed)
+    for case in range(cases):
+        df = _random_frame(rng)
+        holiday_dates = {str(d.date()) for d in pd.to_datetime(df["Date"].sample(5, random_state=case))}
+        args = (holiday_dates, set(), 120.0, "01:07")
+
+        df, snapshot, _ = recompute_running_balances(df, *args)
+        for _ in range(3):
+            idx = rng.choice(list(df.index))
+            edited = _day(df.at[idx, "Date"], rng, rng.choice([1.0, 1.25, 1.5]))
+            for col, value in edited.items():
+                df.at[idx, col] = value
+            if rng.random() < 0.2:
+                df = df.drop(rng.choice(list(df.index)))
+            df, snapshot, _ = recompute_running_balances(df, *args, snapshot=snapshot)
+
+        full = compute_running_holiday_hours(df, *args)
+        assert df[BALANCE_COLUMNS].equals(full[BALANCE_COLUMNS]), f"case {case}: balances differ from a full recompute"
+
+
+if __name__ == "__main__":
+    print("🧪 Testing incremental running balances")
+    test_resumed_balances_match_full_recompute()
+    print("✅ Resumed balances match a full recompute")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for the month-windowed data editor
+==============================================
+
+windowed_data_editor shows one month of a long range in st.data_editor and merges
+the editor's output back with merge_window_edits. This applies editor changes the
+way Streamlit does (cell edits, deletions and appended rows on the window frame)
+and checks that they all land in the full frame.
+"""
+
+from datetime import date, timedelta
+
+import pandas as pd
+from streamlit.elements.widgets.data_editor import _apply_dataframe_edits
+
+from utils import merge_window_edits, month_window_labels
+
+
+def _full_frame(days=90):
+    """Three months of Work History-like rows with a shuffled integer index."""
+    start = date(2025, 1, 1)
+    df = pd.DataFrame({
+        "Date": [(start + timedelta(days=i)).isoformat() for i in range(days)],
+        "Work Time": ["08:00"] * days,
+    })
+    return df.set_axis(pd.Index([days - i for i in range(days)]))
+
+
+def _edit_window(full, month, editing_state):
+    """Cut one month out of full, edit it like st.data_editor and merge it back."""
+    window_index = full.index[month_window_labels(full) == month]
+    window = full.loc[window_index].reset_index(drop=True)
+    schema = {"_index": "int", "Date": "string", "Work Time": "string"}
+    _apply_dataframe_edits(window, editing_state, schema)
+    return window_index, merge_window_edits(full, window_index, window)
+
+
+def test_row_appended_through_window():
+    full = _full_frame()
+    window_index, (merged, shown) = _edit_window(full, "2025-02", {
+        "added_rows": [{"Date": "2025-02-10", "Work Time": "04:00"}],
+    })
+
+    assert len(merged) == len(full) + 1, "the appended row was lost"
+    assert merged.index.is_unique
+    assert merged.iloc[-1].to_dict() == {"Date": "2025-02-10", "Work Time": "04:00"}
+    assert list(shown[:-1]) == list(window_index) and shown[-1] == merged.index[-1]
+    assert merged.drop(index=shown[-1:]).equals(full)
+
+
+def test_edits_and_deletions_keep_labels():
+    full = _full_frame()
+    window_index, (merged, shown) = _edit_window(full, "2025-03", {
+        "edited_rows": {2: {"Work Time": "06:30"}},
+        "deleted_rows": [0],
+        "added_rows": [{"Date": "2025-03-31", "Work Time": "01:00"}],
+    })
+
+    assert window_index[0] not in merged.index, "the deleted row is still there"
+    assert merged.at[window_index[2], "Work Time"] == "06:30"
+    assert len(merged) == len(full)
+    assert list(shown[:-1]) == list(window_index[1:])
+    assert merged.loc[shown[-1], "Date"] == "2025-03-31"
+
+
+def test_unchanged_window_returns_full_frame():
+    full = _full_frame()
+    window_index, (merged, shown) = _edit_window(full, "2025-01", {})
+
+    assert merged is full
+    assert shown.equals(window_index)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing the month-windowed data editor")
+    test_row_appended_through_window()
+    print("✅ A row appended through a window is kept")
+    test_edits_and_deletions_keep_labels()
+    print("✅ Edits and deletions land on the right rows")
+    test_unchanged_window_returns_full_frame()
+    print("✅ An unchanged window leaves the full frame alone")
@@ -3,9 +3,11 @@ import pandas as pd
 import json
 import os
 import numpy as np
-from pymongo import ASCENDING, DESCENDING
 from employee_manager import *
 import smtplib
+import queue
+import threading
+from contextlib import contextmanager
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
@@ -100,6 +102,18 @@ def hhmm_to_decimal(time_str):
 
     return -decimal if negative else decimal
 
+# ----------------------
+# 4b. Helper: Vectorized hhmm_to_decimal for a whole column (unparseable/empty -> 0)
+# ----------------------
+def hhmm_series_to_decimal(series):
+    text = pd.Series(series).fillna("").astype(str).str.strip()
+    parts = text.str.extract(r"^(-?)(\d+):(\d+)(?::(\d+))?$")
+    hours = pd.to_numeric(parts[1], errors="coerce")
+    minutes = pd.to_numeric(parts[2], errors="coerce")
+    seconds = pd.to_numeric(parts[3], errors="coerce").fillna(0)
+    decimal = (hours + minutes / 60 + seconds / 3600).fillna(0.0)
+    return decimal.where(parts[0] != "-", -decimal)
+
 # ----------------------
 # 5. Helper: Convert a dict (from st.data_editor) safely to a DataFrame
 # ----------------------
@@ -203,7 +217,15 @@ def compute_running_holiday_hours(
     holiday_allocations_by_year=None,
     holiday_balance_by_year_at_report_start=None,
     holiday_allocation_windows=None,
+    with_decimal_balances=False,
 ):
+    """
+    Running overtime ("Hours Overtime Left") and holiday ("Holiday Hours") balances per row.
+
+    initial_overtime may be "HH:MM" or decimal hours. With with_decimal_balances, returns
+    (df, balances) where balances holds the unrounded running "overtime" and "holiday"
+    hours per row, to resume the ledger from without the HH:MM rounding.
+    """
     # Ensure DataFrame is sorted by Date ascending.
     df_sorted = df.sort_values(by="Date").copy()
 
@@ -215,7 +237,9 @@ def compute_running_holiday_hours(
     )
     
     # Initialize running_overtime based on initial_overtime
-    if initial_overtime != "00:00":
+    if isinstance(initial_overtime, (int, float)):
+        running_overtime = float(initial_overtime)
+    elif initial_overtime != "00:00":
         running_overtime = hhmm_to_decimal(initial_overtime)
     else:
         # Start with 0 when initial_overtime is "00:00"
@@ -224,6 +248,8 @@ def compute_running_holiday_hours(
     
     overtime_list = []
     holiday_hours_list = []
+    overtime_decimal_list = []
+    holiday_decimal_list = []
     remaining_holiday_hours = holiday_hours_count if holiday_hours_count else 0  # Initialize holiday hours count
     remaining_holiday_hours_str = decimal_hours_to_hhmmss(remaining_holiday_hours)
     prev_calendar_year = None
@@ -395,10 +421,18 @@ def compute_running_holiday_hours(
         
         holiday_hours_list.append(remaining_holiday_hours_str)
         overtime_list.append(running_overtime_str)
+        holiday_decimal_list.append(float(remaining_holiday_hours))
+        overtime_decimal_list.append(running_overtime)
     
     df_sorted["Hours Overtime Left"] = overtime_list
     df_sorted["Holiday Hours"] = holiday_hours_list
     
+    if with_decimal_balances:
+        balances = pd.DataFrame(
+            {"overtime": overtime_decimal_list, "holiday": holiday_decimal_list},
+            index=df_sorted.index,
+        )
+        return df_sorted, balances
     return df_sorted
 
 
@@ -457,38 +491,92 @@ def compute_time_difference(work_time, standard_time, is_holiday=None, default=T
     else:
         return diff / 60 if not sign else -diff / 60
 
+# Fields rendered/edited by the Home and Work History pages. Anything else stored on a
+# work_history document is left out of the payload (saves use $set, so it is kept in the DB).
+WORK_HISTORY_FIELDS = [
+    "_id", "employee_id", "Day", "Date", "IN", "OUT", "Work Time", " Daily Total", " Note", "Note",
+    "Break", "Standard Time", "Difference", "Difference (Decimal)", "Multiplication",
+    "Holiday", "Holiday Hours", "Hours Overtime Left", "manual_modifications", "is_new_record",
+]
+WORK_HISTORY_BATCH_SIZE = 1000
+
+
+def _work_history_pipeline(employee_id, start_date=None, end_date=None):
+    """
+    One aggregation for the range rows plus the carry-over record before start_date.
+    The carry-over row is appended with $unionWith and tagged with ``_carry_over``.
+    """
+    from pymongo import ASCENDING, DESCENDING
+
+    match = {"employee_id": str(employee_id)}
+    if start_date and end_date:
+        match["Date"] = {"$gte": datetime.combine(start_date, datetime.min.time()),
+                         "$lte": datetime.combine(end_date, datetime.max.time())}
+    pipeline = [
+        {"$match": match},
+        {"$sort": {"Date": ASCENDING}},
+        {"$project": {field: 1 for field in WORK_HISTORY_FIELDS}},
+    ]
+    if start_date:
+        pipeline.append({"$unionWith": {
+            "coll": work_history_collection.name,
+            "pipeline": [
+                {"$match": {"employee_id": str(employee_id),
+                            "Date": {"$lt": datetime.combine(start_date, datetime.min.time())}}},
+                {"$sort": {"Date": DESCENDING}},
+                {"$limit": 1},
+                {"$project": {"_id": 0, "Hours Overtime Left": 1, "Holiday Hours": 1, "_carry_over": {"$literal": True}}},
+            ],
+        }})
+    return pipeline
+
+
 def fetch_employee_work_history(employee_id, start_date=None, end_date=None, fill_missing_days=False):
+    import streamlit as st
+
     try:
         """Fetch work history for the selected employee within a date range, 
         also retrieves 'Hours Holiday' from the record before start_date if available."""
-        query = {"employee_id": str(employee_id)}
-        
-        # Fetch the record before the start_date
+        cursor = work_history_collection.aggregate(
+            _work_history_pipeline(employee_id, start_date, end_date),
+            batchSize=WORK_HISTORY_BATCH_SIZE,
+        )
+
+        # Build the frame column by column straight from the cursor
+        columns = {field: [] for field in WORK_HISTORY_FIELDS}
+        seen_fields = set()
+        prev_record = None
+        row_count = 0
+        for doc in cursor:
+            if doc.get("_carry_over"):
+                prev_record = doc
+                continue
+            seen_fields.update(doc.keys())
+            for field, values in columns.items():
+                value = doc.get(field)
+                if field in ("IN", "OUT") and isinstance(value, float) and np.isnan(value):
+                    value = None
+                values.append(value)
+            row_count += 1
+
+        # Carry-over values from the record before start_date
         previous_hours_overtime = None
         previous_holiday_hours = None
         if start_date:
-            prev_query = {"employee_id": str(employee_id), "Date": {"$lt": datetime.combine(start_date, datetime.min.time())}}
-            prev_record = work_history_collection.find(prev_query).sort("Date", DESCENDING).limit(1)
-            prev_record = list(prev_record)
-            if prev_record and "Hours Overtime Left" in prev_record[0] and prev_record[0]["Hours Overtime Left"]:
-                previous_hours_overtime = prev_record[0]["Hours Overtime Left"]
+            if prev_record and prev_record.get("Hours Overtime Left"):
+                previous_hours_overtime = prev_record["Hours Overtime Left"]
             elif not prev_record:
                 previous_hours_overtime = "00:00"
-                
-            if prev_record and "Holiday Hours" in prev_record[0] and prev_record[0]["Holiday Hours"]:
-                previous_holiday_hours = prev_record[0]["Holiday Hours"]
-        # Add date filtering if start_date and end_date are provided
-        if start_date and end_date:
-            query["Date"] = {"$gte": datetime.combine(start_date, datetime.min.time()), 
-                            "$lte": datetime.combine(end_date, datetime.max.time())}
-        
-        work_history = list(work_history_collection.find(query).sort("Date", ASCENDING))
-        
-        if work_history:
-            work_history = pd.DataFrame(work_history) 
+
+            if prev_record and prev_record.get("Holiday Hours"):
+                previous_holiday_hours = prev_record["Holiday Hours"]
+
+        if row_count:
+            work_history = pd.DataFrame(
+                {field: pd.Series(values, dtype="object") if field in ("IN", "OUT") else values
+                 for field, values in columns.items() if field in seen_fields}
+            )
             work_history['Date'] = pd.to_datetime(work_history['Date']).dt.date
-            work_history["IN"] = work_history["IN"].replace({np.nan: None}).astype("object").values
-            work_history["OUT"] = work_history["OUT"].replace({np.nan: None}).astype("object").values
             
             # Fill missing days if requested and date range is specified
             if fill_missing_days and start_date and end_date:
@@ -507,6 +595,8 @@ def fetch_employee_work_history(employee_id, start_date=None, end_date=None, fil
         return None, None, None
     
 def delete_employee_temp_work_history(employee_id):
+    import streamlit as st
+
     try:
         """Delete temp work history for the selected employee."""
         query = {"employee_id": str(employee_id)}
@@ -520,6 +610,9 @@ def delete_employee_temp_work_history(employee_id):
 
 
 def fetch_employee_temp_work_history(employee_id):
+    import streamlit as st
+    from pymongo import ASCENDING
+
     try:
         """Fetch temp work history for the selected employee, 
         also retrieves 'Hours Holiday' from the record before start_date if available."""
@@ -556,26 +649,130 @@ def fetch_employee_temp_work_history(employee_id):
         return None, None, None
 
 
+# ----------------------
+# 9. Email: pooled SMTP connections and PDF delivery
+# ----------------------
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "465"))
+SMTP_SENDER = os.getenv("SMTP_SENDER")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+
+
+class SMTPConnectionPool:
+    """
+    Keeps logged-in SMTP_SSL connections open and hands them out to senders.
+
+    Connections are checked with NOOP before reuse and replaced when the server
+    has dropped them, so a burst of emails pays the TLS handshake and login once
+    per connection instead of once per message.
+    """
+
+    def __init__(self, host, port, user, password, size=4, timeout=30):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        if not self.user or not self.password:
+            raise ValueError("SMTP_SENDER and SMTP_PASSWORD must be set to send emails.")
+        server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        server.login(self.user, self.password)
+        return server
+
+    @staticmethod
+    def _is_alive(server):
+        try:
+            return server.noop()[0] == 250
+        except Exception:
+            return False
+
+    @contextmanager
+    def connection(self):
+        """Borrow a live connection; it is closed instead of returned if the send fails."""
+        self._slots.acquire()
+        server = None
+        try:
+            try:
+                server = self._idle.get_nowait()
+            except queue.Empty:
+                server = None
+            if server is None or not self._is_alive(server):
+                self._close(server)
+                server = self._connect()
+            yield server
+            self._idle.put(server)
+            server = None
+        finally:
+            self._close(server)
+            self._slots.release()
+
+    @staticmethod
+    def _close(server):
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            pass
+
+    def send(self, to_address, message):
+        """Send a MIME message, reconnecting once if the pooled connection was dropped."""
+        for attempt in range(2):
+            try:
+                with self.connection() as server:
+                    server.sendmail(self.user, to_address, message.as_string())
+                return
+            except smtplib.SMTPServerDisconnected:
+                if attempt:
+                    raise
+
+    def close_all(self):
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+smtp_pool = SMTPConnectionPool(SMTP_HOST, SMTP_PORT, SMTP_SENDER, SMTP_PASSWORD)
+
+
+def build_pdf_email(email, pdf_bytes, file_name, subject="Your Work History PDF", body="Please find attached your work history PDF."):
+    """Build the multipart message carrying a PDF attachment."""
+    msg = MIMEMultipart()
+    msg['From'] = SMTP_SENDER
+    msg['To'] = email
+    msg['Subject'] = subject
+    msg.attach(MIMEText(body, 'plain'))
+    part = MIMEBase('application', 'octet-stream')
+    part.set_payload(pdf_bytes)
+    encoders.encode_base64(part)
+    part.add_header('Content-Disposition', f'attachment; filename={file_name}')
+    msg.attach(part)
+    return msg
+
+
+def deliver_pdf_email(email, pdf_bytes, file_name, subject="Your Work History PDF", body="Please find attached your work history PDF."):
+    """Send a PDF over the pooled SMTP connection; raises on failure (no Streamlit output)."""
+    smtp_pool.send(email, build_pdf_email(email, pdf_bytes, file_name, subject, body))
+
+
+def get_employee_email(employee_id):
+    """Email of a Mongo employee, or None if the employee or the address is missing."""
+    employee = employees_collection.find_one({"_id": ObjectId(employee_id)}, {"email": 1})
+    return (employee or {}).get("email") or None
+
+
 def send_email_with_attachment(email, pdf_buffer, file_name, mime_type):
     """Send an email with the PDF attachment."""
+    import streamlit as st
+
     try:
-        # Create a multipart email message
-        msg = MIMEMultipart()
-        msg['From'] = "frfvipbl@gmail.com"
-        msg['To'] = email
-        msg['Subject'] = "Your Work History PDF"
-        msg.attach(MIMEText("Please find attached your work history PDF.", 'plain'))
-        # Attach the PDF file
-        part = MIMEBase('application', 'octet-stream')
-        part.set_payload(pdf_buffer.getvalue())
-        encoders.encode_base64(part)
-        part.add_header('Content-Disposition', f'attachment; filename={file_name}')
-        msg.attach(part)
-        # Send the email
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-            # server.starttls()
-            server.login("frfvipbl@gmail.com", "vwks blct zpbr qqbm")
-            server.sendmail("frfvipbl@gmail.com", email, msg.as_string())
+        deliver_pdf_email(email, pdf_buffer.getvalue(), file_name)
         st.success("Email sent successfully.")
     except Exception as e:
         st.error(f"Failed to send email: {e}")
@@ -583,6 +780,8 @@ def send_email_with_attachment(email, pdf_buffer, file_name, mime_type):
 
 
 def send_the_pdf_created_in_history_page_to_email(employee_id, pdf_buffer, file_name, mime_type):
+    import streamlit as st
+
     try:
         """Send the PDF created in the history page to the employee's email."""
         # Fetch employee email from the database
@@ -616,6 +815,8 @@ def fill_missing_days_in_work_history(work_history_df, start_date=None, end_date
     Returns:
         DataFrame with filled missing days
     """
+    import streamlit as st
+
     try:
         from datetime import date, timedelta
         import calendar
@@ -804,3 +1005,396 @@ def calculate_absence_hours(absence_type, standard_hours="08:00"):
     
     return absence_mappings.get(absence_type.lower(), (standard_hours, 'Leave'))
 
+
+
+# ----------------------
+# 10. Incremental recompute of data editor changes
+# ----------------------
+# Each recompute returns a snapshot of the rows it produced. On the next run only
+# rows that differ from that snapshot (edited, added, or never computed) are
+# recomputed; every other row already holds what a full recompute would produce.
+WORK_DURATION_COLUMNS = [
+    "Date", "IN", "OUT", "Break", "Standard Time", "Holiday",
+    "Multiplication", " Daily Total", "Work Time", "Difference", "Difference (Decimal)",
+]
+RUNNING_BALANCE_COLUMNS = [
+    "Date", "Work Time", "Standard Time", "Difference", "Difference (Decimal)", "Multiplication",
+    "Holiday", "Leave Type", "Hours Overtime Left", "Holiday Hours",
+]
+
+
+def normalized_columns(df, columns):
+    """String form of `columns` with NaN/None/"nan"/blank folded to "" (missing columns count as blank)."""
+    normalized = pd.DataFrame(index=df.index)
+    for col in columns:
+        if col not in df.columns:
+            normalized[col] = ""
+            continue
+        text = df[col].astype(object).where(df[col].notna(), "").astype(str).str.strip()
+        normalized[col] = text.mask(text.str.lower().isin(["nan", "none", "null", "nat"]), "")
+    return normalized
+
+
+def changed_rows(rows, snapshot, params=None):
+    """
+    Rows that differ from a recompute snapshot.
+
+    Args:
+        rows: normalized_columns of the current editor data.
+        snapshot: Snapshot returned by the last recompute, or None.
+        params: Settings the recompute depends on; if they differ from the snapshot's,
+            every row counts as changed.
+
+    Returns:
+        Boolean Series over rows.index.
+    """
+    if snapshot is None or snapshot["params"] != params:
+        return pd.Series(True, index=rows.index)
+    previous = snapshot["rows"].reindex(rows.index).fillna("")
+    missing = ~rows.index.isin(snapshot["rows"].index)
+    return (rows != previous).any(axis=1) | missing
+
+
+def recompute_work_duration(
+    df,
+    calendar_events_date,
+    break_rule_hours,
+    break_hours,
+    base_multiplication=1.0,
+    snapshot=None,
+):
+    """
+    Recompute Multiplication, Daily Total, Work Time, Break and Difference for changed rows only.
+
+    Multiplication is 2 on Sundays and calendar holidays (not Saturdays), otherwise
+    base_multiplication.
+
+    Returns:
+        (updated DataFrame, snapshot to pass to the next call, number of rows recomputed)
+    """
+    df = df.copy()
+    derived = ["Multiplication", " Daily Total", "Work Time", "Break", "Difference", "Difference (Decimal)"]
+    for col in derived:
+        df[col] = df[col].astype(object) if col in df.columns else None
+
+    params = (break_rule_hours, break_hours, float(base_multiplication), tuple(sorted(calendar_events_date)))
+    rows = df.index[changed_rows(normalized_columns(df, WORK_DURATION_COLUMNS), snapshot, params)]
+    for idx in rows:
+        row = df.loc[idx]
+        row_date = row.get("Date")
+        is_holiday = pd.notna(row_date) and row_date in calendar_events_date and row_date.weekday() != 5
+        daily_total = compute_work_duration(row.get("IN", ""), row.get("OUT", ""))
+        work_time, break_time = adjust_work_time_and_break(daily_total, row.get("Break"), break_rule_hours, break_hours)
+        df.at[idx, "Multiplication"] = 2.0 if is_holiday else base_multiplication
+        df.at[idx, " Daily Total"] = daily_total
+        df.at[idx, "Work Time"] = work_time
+        df.at[idx, "Break"] = break_time
+        df.at[idx, "Difference"] = compute_time_difference(work_time, row.get("Standard Time", ""), row.get("Holiday", ""), True)
+        df.at[idx, "Difference (Decimal)"] = compute_time_difference(work_time, row.get("Standard Time", ""), row.get("Holiday", ""), False)
+
+    new_snapshot = {"params": params, "rows": normalized_columns(df, WORK_DURATION_COLUMNS)}
+    return df, new_snapshot, len(rows)
+
+
+def _running_balance_rows(df, holiday_dates):
+    rows = normalized_columns(df, RUNNING_BALANCE_COLUMNS)
+    # Whether the row's date counts as a holiday event, so a change of holiday_dates marks just that row
+    rows["holiday_event"] = pd.to_datetime(df["Date"]).dt.strftime("%Y-%m-%d").isin(holiday_dates).astype(str)
+    return rows
+
+
+def recompute_running_balances(
+    df,
+    holiday_dates,
+    official_holidays,
+    holiday_hours_count,
+    initial_overtime="00:00",
+    snapshot=None,
+):
+    """
+    compute_running_holiday_hours that resumes at the first changed date.
+
+    Rows before the first changed (or deleted) date keep their balances; the ledger is
+    re-run from there on, seeded with the unrounded overtime and holiday balances of the
+    row before it (kept in the snapshot), so the result equals a full recompute.
+
+    Returns:
+        (DataFrame sorted by Date, snapshot to pass to the next call, number of rows recomputed)
+    """
+    params = (holiday_hours_count, initial_overtime, tuple(sorted(official_holidays)))
+    df_sorted = df.sort_values(by="Date").copy()
+    rows = _running_balance_rows(df_sorted, holiday_dates)
+    changed = changed_rows(rows, snapshot, params)
+    dates = pd.to_datetime(df_sorted["Date"])
+
+    start_date = dates[changed].min() if changed.any() else None
+    if snapshot is not None and snapshot["params"] == params:
+        deleted = snapshot["rows"].index.difference(df_sorted.index)
+        if len(deleted):
+            deleted_start = pd.to_datetime(snapshot["rows"].loc[deleted, "Date"], errors="coerce").min()
+            if pd.notna(deleted_start) and (start_date is None or deleted_start < start_date):
+                start_date = deleted_start
+
+    balances = snapshot.get("balances") if snapshot is not None else None
+    recomputed = 0
+    if start_date is not None:
+        head = df_sorted[dates < start_date]
+        if head.empty or balances is None or head.index[-1] not in balances.index:
+            df_sorted, balances = compute_running_holiday_hours(
+                df_sorted, holiday_dates, official_holidays, holiday_hours_count, initial_overtime,
+                with_decimal_balances=True,
+            )
+            recomputed = len(df_sorted)
+        else:
+            seed = balances.loc[head.index[-1]]
+            tail, tail_balances = compute_running_holiday_hours(
+                df_sorted[dates >= start_date],
+                holiday_dates,
+                official_holidays,
+                seed["holiday"],
+                seed["overtime"],
+                with_decimal_balances=True,
+            )
+            df_sorted = pd.concat([head, tail])
+            balances = pd.concat([balances.loc[head.index], tail_balances])
+            recomputed = len(tail)
+
+    new_snapshot = {
+        "params": params,
+        "rows": _running_balance_rows(df_sorted, holiday_dates),
+        "balances": balances,
+    }
+    return df_sorted, new_snapshot, recomputed
+
+
+# ----------------------
+# 11. Change highlighting: original vs. edited data
+# ----------------------
+# One boolean mask per compared column drives the 🟡 markers on screen, the
+# manual_modifications field and the yellow cells of the PDF table.
+MODIFIED_CELL_STYLE = "background-color: #fff3cd"
+
+
+def modification_columns(df):
+    """Columns whose manual edits are tracked: IN, OUT and the Note column (" Note" or "Note")."""
+    columns = ["IN", "OUT"]
+    if " Note" in df.columns:
+        columns.append(" Note")
+    elif "Note" in df.columns:
+        columns.append("Note")
+    return columns
+
+
+def _row_keys(df, key_columns):
+    """Alignment key per row: _id when set, otherwise Date, numbered within duplicates."""
+    keys = pd.Series("", index=df.index, dtype=object)
+    for key_column in reversed(key_columns):
+        if key_column in df.columns:
+            values = normalized_columns(df, [key_column])[key_column]
+            keys = keys.mask(values != "", key_column + ":" + values)
+    occurrence = keys.groupby(keys).cumcount().astype(str)
+    return keys.where(keys == "", keys + "#" + occurrence)
+
+
+def recorded_modifications(df, columns):
+    """Boolean mask of the columns listed in each row's manual_modifications field."""
+    mask = pd.DataFrame(False, index=df.index, columns=list(columns))
+    if "manual_modifications" not in df.columns:
+        return mask
+    recorded = "," + normalized_columns(df, ["manual_modifications"])["manual_modifications"].str.replace(r"\s*,\s*", ",", regex=True) + ","
+    for col in columns:
+        mask[col] = recorded.str.contains("," + col.strip() + ",", regex=False)
+    return mask
+
+
+def change_mask(current, original, columns, key_columns=("_id", "Date"), include_recorded=False):
+    """
+    Cells of `current` that differ from `original`, after normalization.
+
+    Rows are aligned on _id (or Date when _id is blank or missing); rows without a
+    counterpart in `original`, e.g. rows added in the editor, are not marked.
+
+    Args:
+        current: Data as edited.
+        original: Data as loaded/uploaded.
+        columns: Columns to compare.
+        key_columns: Alignment keys, in order of preference.
+        include_recorded: Also mark the columns listed in current's manual_modifications.
+
+    Returns:
+        Boolean DataFrame over current.index and `columns`.
+    """
+    columns = list(columns)
+    current_values = normalized_columns(current, columns)
+    original_values = normalized_columns(original, columns)
+    current_keys = _row_keys(current, list(key_columns))
+    original_keys = _row_keys(original, list(key_columns))
+
+    if (current_keys == "").any() or (original_keys == "").any():
+        # No usable key: compare by position, as the editor keeps row order
+        aligned = original_values.reset_index(drop=True).reindex(range(len(current_values)))
+    else:
+        original_values.index = original_keys
+        aligned = original_values.reindex(current_keys)
+    aligned.index = current_values.index
+
+    mask = (current_values != aligned) & aligned.notna()
+    missing = [col for col in columns if col not in current.columns or col not in original.columns]
+    mask[missing] = False
+    if include_recorded:
+        mask |= recorded_modifications(current, columns)
+    return mask
+
+
+def manual_modifications_from_mask(mask):
+    """manual_modifications values ("IN, OUT") per row of a change mask; None for unchanged rows."""
+    joined = pd.Series("", index=mask.index, dtype=object)
+    for col in mask.columns:
+        joined = joined + np.where(mask[col], col.strip() + ", ", "")
+    joined = joined.str[:-2]
+    return joined.where(joined != "", None)
+
+
+def highlight_changes(df, mask):
+    """
+    Styler for st.dataframe that marks changed cells with 🟡 and a yellow background.
+
+    Args:
+        df: Data to display.
+        mask: change_mask over df.index (columns not in df are ignored).
+
+    Returns:
+        pandas Styler.
+    """
+    columns = [col for col in mask.columns if col in df.columns]
+    display = df.copy()
+    values = normalized_columns(df, columns)
+    for col in columns:
+        marked = "🟡 " + display[col].astype(str).where(values[col] != "", "(empty)")
+        display[col] = display[col].astype(object).mask(mask[col], marked)
+
+    styles = pd.DataFrame("", index=display.index, columns=display.columns)
+    for col in columns:
+        styles[col] = np.where(mask[col], MODIFIED_CELL_STYLE, "")
+    return display.style.apply(lambda _: styles, axis=None)
+
+
+# ----------------------
+# 12. Month-windowed data editor for long ranges
+# ----------------------
+# The full frame stays in session state; only one month is sent to the browser.
+# The month goes to the editor with a fresh RangeIndex (st.data_editor only keeps
+# added rows for a RangeIndex); its row positions map back to the full frame.
+EDITOR_WINDOW_MIN_ROWS = 62  # ranges up to about two months are edited in one piece
+
+
+def month_window_labels(df):
+    """Month ("2025-01") of each row's Date; rows without a valid Date get ""."""
+    months = pd.to_datetime(df["Date"], errors="coerce").dt.strftime("%Y-%m")
+    return months.fillna("")
+
+
+def merge_window_edits(full, window_index, edited):
+    """
+    Merge a data editor's output for one window back into the full frame.
+
+    Args:
+        full: Full frame the window was cut from (unique index).
+        window_index: Index labels of the rows shown in the editor, in order.
+        edited: Frame returned by st.data_editor for that window, which was
+            passed in with reset_index(drop=True); index values below
+            len(window_index) are row positions, the others are added rows.
+
+    Returns:
+        (merged frame, index labels of the window rows in it). Rows keep their
+        label and position; deleted rows are dropped and added rows are appended
+        with new labels.
+    """
+    positions = edited.index.to_numpy()
+    shown = positions < len(window_index)
+    kept = edited[shown].set_axis(window_index[positions[shown]])
+    added = edited[~shown]
+    deleted = window_index.difference(kept.index)
+    if added.empty and deleted.empty and kept.equals(full.loc[kept.index, kept.columns]):
+        return full, window_index
+
+    if len(added):
+        start = int(full.index.max()) + 1 if len(full) and pd.api.types.is_integer_dtype(full.index) else len(full)
+        added = added.set_axis(pd.RangeIndex(start, start + len(added)))
+    order = full.index.drop(deleted).append(added.index)
+    merged = pd.concat([full.drop(index=window_index), kept, added]).loc[order]
+    return merged, kept.index.append(added.index)
+
+
+def windowed_data_editor(state_key, key, **editor_kwargs):
+    """
+    st.data_editor over st.session_state[state_key], one month at a time.
+
+    Short ranges are edited as a whole. Longer ones get a month navigator; the
+    shown month's edits are merged into the full frame on every run and written
+    back to state_key when another month is selected.
+
+    Args:
+        state_key: Session state key of the full frame.
+        key: Widget key prefix.
+        editor_kwargs: Passed on to st.data_editor.
+
+    Returns:
+        (full frame with the current edits, index labels of the rows shown).
+    """
+    import streamlit as st
+
+    full = st.session_state[state_key]
+    if not full.index.is_unique:
+        full = full.reset_index(drop=True)
+        st.session_state[state_key] = full
+
+    if len(full) <= EDITOR_WINDOW_MIN_ROWS or "Date" not in full.columns:
+        edited = st.data_editor(data=full, key=key, **editor_kwargs)
+        return edited, edited.index
+
+    merged_key, window_key = f"{key}_merged", f"{key}_window"
+    months = month_window_labels(full)
+    rows_per_month = months.value_counts()
+    windows = sorted(month for month in rows_per_month.index if month)
+    if st.session_state.get(window_key) not in windows:
+        st.session_state[window_key] = windows[0]
+
+    def commit_window(step=0):
+        # Keep the edits of the month being left (unless the frame was replaced since),
+        # then move to the selected one
+        base, merged = st.session_state.pop(merged_key, (None, None))
+        if base is st.session_state[state_key]:
+            st.session_state[state_key] = merged
+        position = windows.index(st.session_state[window_key]) + step
+        st.session_state[window_key] = windows[min(max(position, 0), len(windows) - 1)]
+
+    col_prev, col_month, col_next = st.columns([1, 4, 1], vertical_alignment="bottom")
+    position = windows.index(st.session_state[window_key])
+    with col_prev:
+        st.button("◀ Previous month", key=f"{key}_prev", on_click=commit_window, args=(-1,),
+                  disabled=position == 0, use_container_width=True)
+    with col_month:
+        st.selectbox(
+            f"📅 Month ({len(windows)} months, {len(full)} rows in the range)",
+            windows,
+            key=window_key,
+            on_change=commit_window,
+            format_func=lambda month: f"{month} ({rows_per_month[month]} rows)",
+        )
+    with col_next:
+        st.button("Next month ▶", key=f"{key}_next", on_click=commit_window, args=(1,),
+                  disabled=position == len(windows) - 1, use_container_width=True)
+
+    # Rows without a Date (e.g. added without one) stay visible in every month
+    window_index = full.index[(months == st.session_state[window_key]) | (months == "")]
+    edited = st.data_editor(
+        data=full.loc[window_index].reset_index(drop=True),
+        key=f"{key}_{st.session_state[window_key]}",
+        **editor_kwargs,
+    )
+    merged, shown = merge_window_edits(full, window_index, edited)
+    if merged is full:
+        merged = full.copy()
+    st.session_state[merged_key] = (full, merged)
+    return merged, shown